@@ -4,102 +4,135 @@ WealthLite 主应用入口
 整合FastAPI后端和前端UI，提供完整的桌面应用体验
 """
 
+import time
+
+# 启动计时起点（包含下面的模块导入耗时）
+_STARTUP_BEGIN = time.perf_counter()
+
 import os
 import sys
+import asyncio
 import threading
 import webbrowser
 from pathlib import Path
 from contextlib import asynccontextmanager
 import logging
-from datetime import datetime
-from src.wealth_lite.config.log_config import setup_logging, LOG_LEVEL
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from typing import Optional
+from src.wealth_lite.config.log_config import setup_logging
 import glob
-import time
+import shutil
+import tempfile
 
 import uvicorn
-from fastapi import FastAPI, HTTPException
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, RedirectResponse
+from fastapi import FastAPI, HTTPException, UploadFile, File, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, RedirectResponse, StreamingResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 # 添加src目录到Python路径
 sys.path.append(str(Path(__file__).parent / "src"))
 
-from src.wealth_lite.data.database import DatabaseManager
-from src.wealth_lite.services.wealth_service import WealthService
-from src.wealth_lite.services.enum_generator import EnumGeneratorService
-from src.wealth_lite.services.snapshot_service import SnapshotService, AIConfigService
-from src.wealth_lite.services.ai_service import ai_analysis_service
-from src.wealth_lite.models.enums import AssetType, AssetSubType, Currency, TransactionType
+from src.wealth_lite.services.container import ServiceContainer
+from src.wealth_lite.services.enum_generator import EnumGeneratorService, ENUMS_FILE_NAME, hashed_file_name
+from src.wealth_lite.services.import_service import (
+    TransactionImportService, AssetLookup, parse_records, DEFAULT_BATCH_SIZE
+)
+from src.wealth_lite.services.export_service import ExportService, EXPORT_FORMATS
+from src.wealth_lite.services.response_cache import CachedResponse, ResponseCache
+from src.wealth_lite.utils.serialization import (
+    ASSET_ENCODER, choose_encoding, compress, dumps, encode_snapshot_summaries, encode_transactions
+)
+from src.wealth_lite.utils.metrics import METRICS, MetricsMiddleware, PROMETHEUS_CONTENT_TYPE
+from src.wealth_lite.utils.startup_timer import StartupTimer
+from src.wealth_lite.utils.static_files import ASSET_MANIFEST_FILE, NoCacheStaticFiles, PrecompressedStaticFiles
+from src.wealth_lite.config.database_config import DatabaseConfig
+from src.wealth_lite.models.enums import AssetType, AssetSubType, Currency, TransactionType, CostBasisMethod
 from src.wealth_lite.config.env_loader import load_environment, get_env
 from src.wealth_lite.config.prompt_templates import get_available_prompt_types
 
+# 交易列表单页最大条数
+MAX_TRANSACTION_PAGE_SIZE = 1000
+
 # 加载环境变量
 load_environment()
 
-# 初始化日志
-setup_logging(LOG_LEVEL)
-
-db_manager = DatabaseManager()
-wealth_service = WealthService(db_manager)
-config_service = AIConfigService(db_manager)
-snapshot_service = SnapshotService(db_manager, wealth_service)
+# 初始化日志（级别按运行环境选择，WEALTH_LITE_LOG_LEVEL 可覆盖）
+setup_logging()
 
 class WealthLiteApp:
     """WealthLite 应用主类"""
     
-    def __init__(self):
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Args:
+            db_path: 数据库文件路径，默认根据环境变量自动选择（基准测试等场景指定）
+        """
+        self.db_path = db_path
         self.app = None
+        self.services = None
         self.wealth_service = None
+        self.fx_service = None
+        self.dashboard_service = None
+        self.dashboard_precomputer = None
+        self.response_cache = None
+        self.search_service = None
         self.db_manager = None
+        self.enum_generator = EnumGeneratorService()
+        self.startup_timer = StartupTimer(_STARTUP_BEGIN)
+        self.startup_timer.record("imports", time.perf_counter() - _STARTUP_BEGIN)
+        self._deferred_startup = None
         self.host = "127.0.0.1"
         self.port = 8080
         
     def initialize_services(self):
-        """初始化服务"""
+        """初始化服务（请求处理必需的部分，启动快照等耗时任务见 run_deferred_startup）"""
         try:
-            # 初始化数据库 - 根据环境变量自动选择数据库
+            # 初始化数据库与服务 - 未指定db_path时根据环境变量自动选择数据库
+            self.services = ServiceContainer(timer=self.startup_timer, db_path=self.db_path)
+            self.db_manager = self.services.db_manager
+            self.wealth_service = self.services.wealth_service
+            self.fx_service = self.services.fx_service
+            self.dashboard_service = self.services.dashboard_service
+            self.response_cache = self.services.response_cache
+            self.search_service = self.services.search_service
+            self.dashboard_precomputer = self.services.dashboard_precomputer
+            self.dashboard_precomputer.start()
             
-            self.db_manager = DatabaseManager()
-            self.wealth_service = WealthService(self.db_manager)
-            
-            # 生成前端枚举文件
-            enum_generator = EnumGeneratorService()
-            if enum_generator.generate_enums_file():
-                logging.info("✅ 前端枚举文件生成成功")
-            else:
-                logging.warning("⚠️ 前端枚举文件生成失败，前端将使用备用数据")
-            
-            # 创建启动时的自动快照
-            try:
-                from wealth_lite.services.snapshot_service import SnapshotService
-                snapshot_service = SnapshotService(self.db_manager, self.wealth_service)
-                snapshot = snapshot_service.create_startup_snapshot()
-                if snapshot:
-                    logging.info(f"✅ 自动快照创建成功: {snapshot.snapshot_id}")
-                else:
-                    logging.info("ℹ️ 今日自动快照已存在，跳过创建")
-            except Exception as e:
-                logging.warning(f"⚠️ 自动快照创建失败: {e}")
-                # 不阻断应用启动
+            # 生成前端枚举文件（内容未变化时跳过）
+            with self.startup_timer.phase("enums"):
+                if not self.enum_generator.generate_enums_file():
+                    logging.warning("⚠️ 前端枚举文件生成失败，前端将使用备用数据")
             
             logging.info("✅ 数据库服务初始化成功")
-            logging.info(f"wealth_service 初始化完成，依赖 db_manager 状态: {self.db_manager.is_connected()}")
             
         except Exception as e:
             logging.error(f"❌ 服务初始化失败: {e}", exc_info=True)
             raise
     
+    async def run_deferred_startup(self):
+        """服务器开始接受请求后在后台执行的启动任务：创建启动自动快照（需完整重建投资组合）"""
+        await asyncio.sleep(0)
+        await run_in_threadpool(self.services.create_startup_snapshot)
+    
     def create_app(self) -> FastAPI:
         """创建FastAPI应用"""
         
         @asynccontextmanager
         async def lifespan(app: FastAPI):
-            # 启动时初始化服务
+            # 启动时初始化服务，启动快照推迟到后台执行
             self.initialize_services()
+            if self.services:
+                self._deferred_startup = asyncio.create_task(self.run_deferred_startup())
+            self.startup_timer.report()
             yield
             # 关闭时清理资源
-            if self.db_manager:
+            if self._deferred_startup and not self._deferred_startup.done():
+                self._deferred_startup.cancel()
+            if self.services:
+                self.services.close()
+            elif self.db_manager:
                 self.db_manager.close()
         
         app = FastAPI(
@@ -116,27 +149,25 @@ class WealthLiteApp:
             allow_credentials=True,
             allow_methods=["*"],
             allow_headers=["*"],
+            expose_headers=["ETag", "X-Next-Cursor", "Server-Timing"],
         )
+
+        # 请求级性能指标（按路由的耗时直方图、SQL/AI耗时），最外层以计入全部处理时间
+        app.add_middleware(MetricsMiddleware, registry=METRICS)
         
         # 注册API路由
         self.register_api_routes(app)
         
-        # 静态文件服务（开发环境禁用缓存）
-        ui_path = Path(__file__).parent / "src" / "wealth_lite" / "ui" / "app"
-        if ui_path.exists():
-            # 创建自定义静态文件类，禁用缓存
-            class NoCacheStaticFiles(StaticFiles):
-                def __init__(self, *args, **kwargs):
-                    super().__init__(*args, **kwargs)
-                
-                def file_response(self, *args, **kwargs):
-                    response = super().file_response(*args, **kwargs)
-                    # 添加禁用缓存的响应头
-                    response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
-                    response.headers["Pragma"] = "no-cache"
-                    response.headers["Expires"] = "0"
-                    return response
-            
+        # 静态文件服务：生产环境优先使用 build.py --production 的构建产物（预压缩、长期缓存），
+        # 开发环境直接服务源码并禁用缓存
+        ui_root = Path(__file__).parent / "src" / "wealth_lite" / "ui"
+        ui_path = ui_root / "app"
+        dist_path = ui_root / "dist"
+        if DatabaseConfig.is_production_environment() and (dist_path / ASSET_MANIFEST_FILE).exists():
+            app.mount("/static", PrecompressedStaticFiles(directory=str(dist_path), html=True), name="static")
+        elif ui_path.exists():
+            if DatabaseConfig.is_production_environment():
+                logging.warning("⚠️ 未找到生产构建产物，请运行 python build.py --production；当前直接服务源码")
             app.mount("/static", NoCacheStaticFiles(directory=str(ui_path), html=True), name="static")
         
         # 根路径重定向到主页
@@ -155,51 +186,88 @@ class WealthLiteApp:
         
         return app
     
+    def cached_json_response(self, request: Request, key: str, builder) -> Response:
+        """
+        返回按数据版本缓存的JSON响应
+        
+        数据未变化时直接返回缓存的序列化结果；客户端的If-None-Match与ETag一致时返回304。
+        """
+        return self.serialized_json_response(request, self.response_cache.get(key, builder))
+    
+    @staticmethod
+    def serialized_json_response(request: Request, cached: CachedResponse) -> Response:
+        """返回已序列化的JSON响应，If-None-Match与ETag一致时返回304"""
+        headers = {"ETag": cached.etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+        if ResponseCache.matches(request.headers.get("if-none-match"), cached.etag):
+            return Response(status_code=304, headers=headers)
+        body, encoding = cached.encoded_body(request.headers.get("accept-encoding"))
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        return Response(content=body, media_type="application/json", headers=headers)
+    
+    @staticmethod
+    def json_bytes_response(request: Request, content, headers: dict = None) -> Response:
+        """序列化为JSON字节串直接返回（跳过jsonable_encoder），较大的响应体按Accept-Encoding压缩"""
+        body = dumps(content)
+        encoding = choose_encoding(request.headers.get("accept-encoding"), len(body))
+        headers = {**(headers or {}), "Vary": "Accept-Encoding"}
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        return Response(content=compress(body, encoding), media_type="application/json", headers=headers)
+    
     def register_api_routes(self, app: FastAPI):
         """注册API路由"""
         
+        # 枚举文件：注册在/static挂载之前，优先于静态文件处理
+        @app.get(f"/static/data/{ENUMS_FILE_NAME}")
+        @app.get("/static/data/enums.{content_hash}.json")
+        async def get_enums(request: Request, content_hash: str = None):
+            """
+            前端枚举数据
+            
+            ETag为内容哈希（强校验）。带哈希的文件名内容不会变化，可长期缓存；
+            不带哈希的文件名每次向服务端校验。
+            """
+            content, current_hash = self.enum_generator.render()
+            if content_hash is not None and content_hash != current_hash:
+                raise HTTPException(status_code=404, detail=f"{hashed_file_name(content_hash)} 不存在")
+            etag = f'"{current_hash}"'
+            headers = {
+                "ETag": etag,
+                "Cache-Control": "public, max-age=31536000, immutable" if content_hash else "no-cache",
+            }
+            if ResponseCache.matches(request.headers.get("if-none-match"), etag):
+                return Response(status_code=304, headers=headers)
+            return Response(content=content.encode("utf-8"), media_type="application/json", headers=headers)
+        
         @app.get("/api/health")
         async def health_check():
             """健康检查"""
-            return {"status": "healthy", "service": "WealthLite"}
+            return {"status": "healthy", "service": "WealthLite", "startup": self.startup_timer.to_dict()}
+
+        @app.get("/api/metrics")
+        async def get_metrics():
+            """性能指标（Prometheus文本格式）"""
+            return Response(content=METRICS.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+        @app.get("/api/metrics/queries")
+        async def get_query_metrics(limit: int = 20):
+            """SQL查询分析：按指纹汇总的耗时分位数、最近的慢查询（含查询计划）与疑似N+1"""
+            profiler = self.db_manager.profiler if self.db_manager else None
+            if profiler is None:
+                return {"success": False, "message": "SQL查询分析器未启用（WEALTH_LITE_SQL_PROFILER=0）"}
+            return {"success": True, "data": profiler.report(limit)}
 
         # ==================== 快照管理 API ====================
         
         @app.get("/api/portfolio/current")
-        async def get_current_portfolio():
+        async def get_current_portfolio(request: Request):
             """获取当前投资组合状态"""
             try:
-                from wealth_lite.services.snapshot_service import SnapshotService
-                
-                # 使用SnapshotService获取当前投资组合状态
-                portfolio = self.wealth_service.get_portfolio()
-                
-                if not portfolio:
-                    return {
-                        "success": True,
-                        "data": {
-                            "total_value": 0,
-                            "total_cost": 0,
-                            "total_return": 0,
-                            "total_return_rate": 0
-                        }
-                    }
-                
-                # 计算当前投资组合状态
-                total_value = sum(pos.current_book_value for pos in portfolio.positions)
-                total_cost = sum(pos.net_invested for pos in portfolio.positions)
-                total_return = total_value - total_cost
-                total_return_rate = (total_return / total_cost * 100) if total_cost > 0 else 0
-                
-                return {
+                return self.cached_json_response(request, "portfolio/current", lambda: {
                     "success": True,
-                    "data": {
-                        "total_value": float(total_value),
-                        "total_cost": float(total_cost),
-                        "total_return": float(total_return),
-                        "total_return_rate": float(total_return_rate)
-                    }
-                }
+                    "data": self.dashboard_service.get_current_portfolio()
+                })
                 
             except Exception as e:
                 logging.error(f"❌ 获取当前投资组合失败: {e}", exc_info=True)
@@ -212,28 +280,16 @@ class WealthLiteApp:
         async def get_snapshots(type: str = "auto", limit: int = 50, offset: int = 0):
             """获取快照列表"""
             try:
-                from wealth_lite.services.snapshot_service import SnapshotService
                 from wealth_lite.models.enums import SnapshotType
                 
                 # 转换快照类型
                 snapshot_type = SnapshotType.AUTO if type.lower() == 'auto' else SnapshotType.MANUAL
                 
                 # 获取快照列表
-                snapshots = snapshot_service.get_snapshots_by_type(snapshot_type, limit, offset)
+                snapshots = self.services.snapshot_service.get_snapshots_by_type(snapshot_type, limit, offset)
                 
                 # 转换为前端格式
-                snapshots_data = []
-                for snapshot in snapshots:
-                    snapshots_data.append({
-                        "snapshot_id": snapshot.snapshot_id,
-                        "snapshot_date": snapshot.snapshot_date.isoformat(),
-                        "snapshot_type": snapshot.snapshot_type.value,
-                        "total_value": float(snapshot.total_value),
-                        "total_return": float(snapshot.total_return),
-                        "total_return_rate": float(snapshot.total_return_rate),
-                        "notes": snapshot.notes,
-                        "is_today": snapshot.is_today
-                    })
+                snapshots_data = encode_snapshot_summaries(snapshots)
                 
                 # 统计信息
                 stats = {
@@ -260,12 +316,11 @@ class WealthLiteApp:
         async def create_snapshot(snapshot_data: dict):
             """创建手动快照"""
             try:
-                from wealth_lite.services.snapshot_service import SnapshotService
                 
                 notes = snapshot_data.get("notes", "")
                 
                 # 创建手动快照
-                snapshot = snapshot_service.create_manual_snapshot(notes)
+                snapshot = self.services.snapshot_service.create_manual_snapshot(notes)
                 
                 return {
                     "success": True,
@@ -291,7 +346,7 @@ class WealthLiteApp:
             """获取快照详情"""
             try:
                 # 不要在这里 import 或 new SnapshotService
-                snapshot = snapshot_service.get_snapshot_by_id(snapshot_id)
+                snapshot = self.services.snapshot_service.get_snapshot_by_id(snapshot_id)
                 if not snapshot:
                     return {
                         "success": False,
@@ -314,9 +369,8 @@ class WealthLiteApp:
         async def delete_snapshot(snapshot_id: str):
             """删除快照"""
             try:
-                from wealth_lite.services.snapshot_service import SnapshotService
                 
-                result = snapshot_service.delete_snapshot(snapshot_id)
+                result = self.services.snapshot_service.delete_snapshot(snapshot_id)
                 
                 if result:
                     return {
@@ -340,11 +394,10 @@ class WealthLiteApp:
         async def check_today_manual_snapshot():
             """检查今日是否已有手动快照"""
             try:
-                from wealth_lite.services.snapshot_service import SnapshotService
                 from wealth_lite.models.enums import SnapshotType
                 from datetime import date
                 
-                snapshot = snapshot_service.get_snapshot_by_date_and_type(date.today(), SnapshotType.MANUAL)
+                snapshot = self.services.snapshot_service.get_snapshot_by_date_and_type(date.today(), SnapshotType.MANUAL)
                 
                 return {
                     "success": True,
@@ -368,7 +421,6 @@ class WealthLiteApp:
         async def compare_snapshots(comparison_data: dict):
             """对比两个快照"""
             try:
-                from wealth_lite.services.snapshot_service import SnapshotService
                 
                 snapshot1_id = comparison_data.get("snapshot1_id")
                 snapshot2_id = comparison_data.get("snapshot2_id")
@@ -380,7 +432,7 @@ class WealthLiteApp:
                     }
                 
                 # 进行快照对比
-                comparison = snapshot_service.compare_snapshots(snapshot1_id, snapshot2_id)
+                comparison = self.services.snapshot_service.compare_snapshots(snapshot1_id, snapshot2_id)
                 
                 return {
                     "success": True,
@@ -400,8 +452,8 @@ class WealthLiteApp:
         async def get_ai_configs():
             """获取AI配置列表"""
             try:
-                configs = config_service.get_all_configs()
-                default_config = config_service.get_default_config()
+                configs = self.services.config_service.get_all_configs()
+                default_config = self.services.config_service.get_default_config()
                 
                 configs_data = []
                 for config in configs:
@@ -443,7 +495,7 @@ class WealthLiteApp:
                         "message": "需要提供AI类型"
                     }
                 ai_type = AIType.LOCAL if ai_type_str == "LOCAL" else AIType.CLOUD
-                config = config_service.switch_ai_type(ai_type)
+                config = self.services.config_service.switch_ai_type(ai_type)
                 return {
                     "success": True,
                     "data": {
@@ -475,8 +527,8 @@ class WealthLiteApp:
                 result_template_type = analysis_data.get("result_template_type", "default")
                 
                 # 获取快照
-                snapshot1 = snapshot_service.get_snapshot_by_id(snapshot1_id)
-                snapshot2 = snapshot_service.get_snapshot_by_id(snapshot2_id) if snapshot2_id else None
+                snapshot1 = self.services.snapshot_service.get_snapshot_by_id(snapshot1_id)
+                snapshot2 = self.services.snapshot_service.get_snapshot_by_id(snapshot2_id) if snapshot2_id else None
                 
                 if not snapshot1:
                     return {
@@ -485,7 +537,7 @@ class WealthLiteApp:
                     }
                 
                 # 获取AI配置
-                ai_config = config_service.get_config_by_id(config_id) if config_id else config_service.get_default_config()
+                ai_config = self.services.config_service.get_config_by_id(config_id) if config_id else self.services.config_service.get_default_config()
                 
                 if not ai_config:
                     return {
@@ -496,13 +548,13 @@ class WealthLiteApp:
                 # 执行分析
                 if snapshot2:
                     # 对比分析
-                    result = ai_analysis_service.compare_snapshots(
+                    result = self.services.ai_analysis_service.compare_snapshots(
                         snapshot1, snapshot2, ai_config, user_prompt, conversation_id,
                         system_prompt_type, user_prompt_type, result_template_type
                     )
                 else:
                     # 单快照分析
-                    result = ai_analysis_service.analyze_snapshot(
+                    result = self.services.ai_analysis_service.analyze_snapshot(
                         snapshot1, ai_config, user_prompt, conversation_id,
                         system_prompt_type, user_prompt_type, result_template_type
                     )
@@ -540,10 +592,10 @@ class WealthLiteApp:
                     }
                 
                 # 获取AI配置
-                ai_config = config_service.get_config_by_id(config_id) if config_id else config_service.get_default_config()
+                ai_config = self.services.config_service.get_config_by_id(config_id) if config_id else self.services.config_service.get_default_config()
                 
                 # 继续对话
-                response = ai_analysis_service.continue_conversation(conversation_id, user_message, ai_config)
+                response = self.services.ai_analysis_service.continue_conversation(conversation_id, user_message, ai_config)
                 
                 return {
                     "success": True,
@@ -564,7 +616,7 @@ class WealthLiteApp:
         async def get_ai_conversation(conversation_id: str):
             """获取AI对话历史"""
             try:
-                conversation = ai_analysis_service.get_conversation(conversation_id)
+                conversation = self.services.ai_analysis_service.get_conversation(conversation_id)
                 
                 if not conversation:
                     return {
@@ -591,7 +643,7 @@ class WealthLiteApp:
         async def delete_ai_conversation(conversation_id: str):
             """删除AI对话历史"""
             try:
-                success = ai_analysis_service.clear_conversation(conversation_id)
+                success = self.services.ai_analysis_service.clear_conversation(conversation_id)
                 
                 if success:
                     return {
@@ -659,7 +711,7 @@ class WealthLiteApp:
                 )
                 
                 # 保存配置
-                success = config_service.save_config(config)
+                success = self.services.config_service.save_config(config)
                 
                 if success:
                     return {
@@ -702,7 +754,7 @@ class WealthLiteApp:
                 )
                 
                 # 测试配置
-                test_result = ai_analysis_service.test_ai_config(config)
+                test_result = self.services.ai_analysis_service.test_ai_config(config)
                 
                 return {
                     "success": True,
@@ -720,7 +772,7 @@ class WealthLiteApp:
         async def create_predefined_configs():
             """创建预定义的AI配置"""
             try:
-                configs = config_service.create_predefined_configs()
+                configs = self.services.config_service.create_predefined_configs()
                 
                 return {
                     "success": True,
@@ -757,112 +809,10 @@ class WealthLiteApp:
 
 
         @app.get("/api/dashboard/summary")
-        async def get_dashboard_summary():
-            """获取仪表板总览数据"""
+        async def get_dashboard_summary(request: Request):
+            """获取仪表板总览数据（返回写入后预计算的结果，stale字段标记是否落后于最新写入）"""
             try:
-                logging.info("🔄 开始获取仪表板数据...")
-                portfolio = self.wealth_service.get_portfolio()
-                logging.info(f"✅ 获取到投资组合，包含 {len(portfolio.positions)} 个持仓")
-                
-                # 计算总资产
-                total_assets = sum(pos.current_book_value for pos in portfolio.positions)
-                logging.info(f"📊 总资产: {total_assets}")
-                
-                # 按资产类型分组
-                cash_assets = sum(
-                    pos.current_book_value
-                    for pos in portfolio.positions
-                    if pos.asset.asset_type.name == "CASH"
-                )
-                
-                fixed_income_assets = sum(
-                    pos.current_book_value
-                    for pos in portfolio.positions
-                    if pos.asset.asset_type.name == "FIXED_INCOME"
-                )
-                
-                logging.info(f"💰 现金资产: {cash_assets}, 固定收益: {fixed_income_assets}")
-                
-                # 获取完整的持仓数据
-                assets_list = []
-                for pos in portfolio.positions:
-                    try:
-                        # 计算持有天数
-                        holding_days = 0
-                        if pos.first_transaction_date:
-                            holding_days = (datetime.now().date() - pos.first_transaction_date).days
-                        
-                        # 计算当前价值
-                        current_value = pos.calculate_current_value()
-                        total_return = pos.calculate_total_return(current_value)
-                        total_return_rate = pos.calculate_total_return_rate(current_value) / 100  # 转换为小数
-                        annualized_return = pos.calculate_annualized_return(current_value) / 100  # 转换为小数
-                        
-                        logging.info(f"📈 处理持仓: {pos.asset_name}, 状态: {pos.status}, 收益: {total_return}")
-                        
-                        assets_list.append({
-                            # 基本信息
-                            "id": pos.asset.asset_id,
-                            "name": pos.asset.asset_name,
-                            "type": pos.asset.asset_type.name.lower(),
-                            "asset_subtype": pos.asset.asset_subtype.value if pos.asset.asset_subtype else "未知",
-                            "currency": pos.asset.currency.name,
-                            
-                            # 持仓价值（基础货币 - 人民币）
-                            "amount": float(pos.current_book_value),
-                            "current_value": float(current_value),
-                            "current_book_value": float(pos.current_book_value),
-                            
-                            # 持仓价值（原币种）
-                            "amount_original_currency": float(pos.current_book_value_original_currency),
-                            "current_value_original_currency": float(pos.current_book_value_original_currency),
-                            "current_book_value_original_currency": float(pos.current_book_value_original_currency),
-                            
-                            # 收益数据
-                            "total_return": float(total_return),
-                            "total_return_rate": float(total_return_rate),
-                            "annualized_return": float(annualized_return),
-                            "unrealized_pnl": float(pos.calculate_unrealized_pnl()),
-                            "realized_pnl": float(pos.calculate_realized_pnl()),
-                            
-                            # 交易统计
-                            "transaction_count": pos.transaction_count,
-                            "first_transaction_date": pos.first_transaction_date.isoformat() if pos.first_transaction_date else None,
-                            "last_transaction_date": pos.last_transaction_date.isoformat() if pos.last_transaction_date else None,
-                            "holding_days": holding_days,
-                            "firstTransactionDate": pos.first_transaction_date.isoformat() if pos.first_transaction_date else None,  # 兼容前端
-                            
-                            # 资金流水
-                            "total_invested": float(pos.total_invested),
-                            "total_withdrawn": float(pos.total_withdrawn),
-                            "total_income": float(pos.total_income),
-                            "total_fees": float(pos.total_fees),
-                            "net_invested": float(pos.net_invested),
-                            "principal_amount": float(pos.principal_amount),
-                            
-                            # 持仓状态
-                            "status": pos.status.name,
-                            
-                            # 兼容字段
-                            "symbol": pos.asset.symbol or "",
-                            "quantity": float(pos.current_book_value),
-                        })
-                        
-                    except Exception as pos_error:
-                        logging.error(f"❌ 处理持仓 {pos.asset_name} 时出错: {pos_error}", exc_info=True)
-                        continue
-                
-                logging.info(f"✅ 成功处理 {len(assets_list)} 个持仓")
-                
-                return {
-                    "total_assets": float(total_assets),
-                    "total_change": float(portfolio.calculate_total_return()),  # 使用正确的方法名
-                    "total_change_percent": float(portfolio.calculate_total_return_rate()),  # 已经是百分比
-                    "cash_assets": float(cash_assets),
-                    "fixed_income_assets": float(fixed_income_assets),
-                    "assets": assets_list,
-                    "last_updated": datetime.now().isoformat()
-                }
+                return self.serialized_json_response(request, self.dashboard_precomputer.get_response())
                 
             except Exception as e:
                 logging.error(f"❌ 获取仪表板数据失败: {e}", exc_info=True)
@@ -966,6 +916,96 @@ class WealthLiteApp:
                     "last_updated": datetime.now().isoformat()
                 }
         
+        @app.get("/api/export/{dataset}")
+        async def export_data(dataset: str, format: str = "csv"):
+            """流式导出交易/持仓/快照（csv、jsonl、xlsx）"""
+            if dataset not in ExportService.DATASETS:
+                raise HTTPException(status_code=404, detail=f"不支持的导出数据集: {dataset}")
+            if format not in EXPORT_FORMATS:
+                raise HTTPException(status_code=400, detail=f"不支持的导出格式: {format}")
+
+            try:
+                export_service = ExportService(self.db_manager)
+                content = export_service.stream(dataset, format)
+            except RuntimeError as e:
+                raise HTTPException(status_code=501, detail=str(e))
+
+            filename = ExportService.build_filename(dataset, format)
+            return StreamingResponse(
+                content,
+                media_type=EXPORT_FORMATS[format],
+                headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+            )
+
+        @app.get("/api/portfolio/revalue")
+        async def revalue_portfolio(currency: str = "CNY", as_of: str = None):
+            """按指定币种和日期的汇率重估当前投资组合"""
+            try:
+                target = Currency[currency.upper()]
+                valuation_date = datetime.fromisoformat(as_of).date() if as_of else None
+            except (KeyError, ValueError):
+                raise HTTPException(status_code=400, detail=f"无效的币种或日期: {currency}, {as_of}")
+
+            try:
+                portfolio = self.wealth_service.get_portfolio()
+                valuation = self.fx_service.revalue_portfolio(portfolio, target, valuation_date)
+            except ValueError as e:
+                raise HTTPException(status_code=422, detail=str(e))
+            return {"success": True, "data": valuation.to_dict()}
+
+        @app.get("/api/portfolio/allocation")
+        async def get_portfolio_allocation():
+            """按资产类型的配置（当前持仓的当前价值）"""
+            allocation = self.wealth_service.get_asset_allocation()
+            return {"success": True, "data": {
+                asset_type: {"value": float(info['value']), "percentage": float(info['percentage']),
+                             "count": info['count']}
+                for asset_type, info in allocation.items()
+            }}
+
+        @app.get("/api/fx/rate")
+        async def get_fx_rate(base: str, quote: str, as_of: str = None):
+            """查询as-of汇率（直接、反向或经中间货币交叉）"""
+            try:
+                base_currency, quote_currency = Currency[base.upper()], Currency[quote.upper()]
+                rate_date = datetime.fromisoformat(as_of).date() if as_of else None
+            except (KeyError, ValueError):
+                raise HTTPException(status_code=400, detail=f"无效的币种或日期: {base}/{quote}, {as_of}")
+
+            try:
+                rate = self.fx_service.get_rate(base_currency, quote_currency, rate_date)
+            except ValueError as e:
+                raise HTTPException(status_code=404, detail=str(e))
+            return {"success": True, "data": {"base": base_currency.name, "quote": quote_currency.name,
+                                              "as_of": as_of, "rate": float(rate)}}
+
+        @app.get("/api/prices/valuation")
+        async def get_market_valuation(as_of: str = None):
+            """权益类持仓按最新收盘价估值（含价格日期与过期状态）"""
+            try:
+                valuation_date = datetime.fromisoformat(as_of).date() if as_of else None
+            except ValueError:
+                raise HTTPException(status_code=400, detail=f"无效的日期: {as_of}")
+
+            positions = [p for p in self.wealth_service.get_all_positions()
+                         if p.asset.asset_type == AssetType.EQUITY]
+            valuations = self.wealth_service.prices.value_positions(positions, valuation_date)
+            return {"success": True, "data": [v.to_dict() for v in valuations]}
+
+        @app.get("/api/positions/{asset_id}/lots")
+        async def get_position_lots(asset_id: str, method: str = "FIFO"):
+            """权益类持仓的未平仓批次与已实现损益"""
+            try:
+                cost_method = CostBasisMethod[method.upper()]
+            except KeyError:
+                raise HTTPException(status_code=400, detail=f"无效的成本计价方法: {method}")
+
+            try:
+                book = self.wealth_service.lots.get_book(asset_id, cost_method)
+            except ValueError as e:
+                raise HTTPException(status_code=422, detail=str(e))
+            return {"success": True, "data": book.to_dict()}
+
         @app.get("/api/debug/data")
         async def debug_data():
             """调试：查看数据库中的数据"""
@@ -1021,22 +1061,12 @@ class WealthLiteApp:
                 return {"error": str(e)}
 
         @app.get("/api/assets")
-        async def get_assets():
+        async def get_assets(request: Request):
             """获取资产列表"""
             try:
-                assets = self.wealth_service.get_all_assets()
-                return [
-                    {
-                        "id": asset.asset_id,
-                        "name": asset.asset_name,
-                        "asset_type": asset.asset_type.name,
-                        "asset_subtype": asset.asset_subtype.name if asset.asset_subtype else None,
-                        "currency": asset.currency.name,
-                        "description": asset.description,
-                        "created_at": asset.created_date.isoformat()
-                    }
-                    for asset in assets
-                ]
+                return self.cached_json_response(
+                    request, "assets", lambda: ASSET_ENCODER.encode_many(self.wealth_service.get_all_assets())
+                )
             except Exception as e:
                 logging.error(f"❌ 获取资产列表失败: {e}", exc_info=True)
                 return []
@@ -1116,79 +1146,46 @@ class WealthLiteApp:
                 logging.error(f"❌ 创建资产失败: {e}", exc_info=True)
                 raise HTTPException(status_code=500, detail=f"创建资产失败: {str(e)}")
         
+        @app.get("/api/search")
+        async def search(request: Request, q: str = "", limit: int = 20):
+            """全文检索资产（名称、描述、发行方）与交易备注，按相关度排序并返回高亮片段"""
+            try:
+                return self.json_bytes_response(request, self.search_service.search(q, limit))
+            except Exception as e:
+                logging.error(f"❌ 搜索失败: {e}", exc_info=True)
+                raise HTTPException(status_code=500, detail=f"搜索失败: {str(e)}")
+        
         @app.get("/api/transactions")
-        async def get_transactions(limit: int = 50):
-            """获取交易记录"""
+        async def get_transactions(request: Request, limit: int = 50, cursor: str = None,
+                                   asset_id: str = None, type: str = None, currency: str = None,
+                                   start_date: str = None, end_date: str = None,
+                                   min_amount: str = None, max_amount: str = None, q: str = None):
+            """
+            获取交易记录（按交易日期倒序，支持过滤与游标分页）
+            
+            下一页游标通过响应头X-Next-Cursor返回，没有更多数据时不返回该响应头。
+            """
             try:
-                transactions = self.wealth_service.get_recent_transactions(limit)
-                result = []
-                
-                for tx in transactions:
-                    # 基础交易信息
-                    tx_data = {
-                        "id": tx.transaction_id,
-                        "asset_id": tx.asset_id,
-                        "type": tx.transaction_type.name,
-                        "amount": float(tx.amount),
-                        "date": tx.transaction_date.isoformat(),
-                        "currency": tx.currency.name,
-                        "exchange_rate": float(tx.exchange_rate) if tx.exchange_rate else 1.0,
-                        "amount_base_currency": float(tx.amount_base_currency) if tx.amount_base_currency else float(tx.amount),
-                        "notes": tx.notes,
-                        "reference_number": tx.reference_number,
-                        "created_date": tx.created_date.isoformat() if tx.created_date else None,
-                        "transaction_class": tx.__class__.__name__  # 交易类型类名
+                try:
+                    filters = {
+                        "asset_id": asset_id,
+                        "transaction_type": TransactionType[type.upper()] if type else None,
+                        "currency": Currency[currency.upper()] if currency else None,
+                        "start_date": date.fromisoformat(start_date) if start_date else None,
+                        "end_date": date.fromisoformat(end_date) if end_date else None,
+                        "min_amount": Decimal(min_amount) if min_amount else None,
+                        "max_amount": Decimal(max_amount) if max_amount else None,
+                        "notes": q,
                     }
-                    
-                    # 添加特定类型的详细信息
-                    if hasattr(tx, 'quantity') and tx.quantity:
-                        tx_data["quantity"] = float(tx.quantity)
-                    if hasattr(tx, 'price_per_share') and tx.price_per_share:
-                        tx_data["price_per_share"] = float(tx.price_per_share)
-                    if hasattr(tx, 'commission') and tx.commission:
-                        tx_data["commission"] = float(tx.commission)
-                    
-                    # 固定收益特有字段
-                    if hasattr(tx, 'annual_rate') and tx.annual_rate:
-                        tx_data["annual_rate"] = float(tx.annual_rate)
-                    if hasattr(tx, 'start_date') and tx.start_date:
-                        tx_data["start_date"] = tx.start_date.isoformat()
-                    if hasattr(tx, 'maturity_date') and tx.maturity_date:
-                        tx_data["maturity_date"] = tx.maturity_date.isoformat()
-                    if hasattr(tx, 'interest_type'):
-                        tx_data["interest_type"] = tx.interest_type.name if hasattr(tx.interest_type, 'name') else str(tx.interest_type)
-                    if hasattr(tx, 'payment_frequency'):
-                        tx_data["payment_frequency"] = tx.payment_frequency.name if hasattr(tx.payment_frequency, 'name') else str(tx.payment_frequency)
-                    if hasattr(tx, 'face_value') and tx.face_value:
-                        tx_data["face_value"] = float(tx.face_value)
-                    if hasattr(tx, 'coupon_rate') and tx.coupon_rate:
-                        tx_data["coupon_rate"] = float(tx.coupon_rate)
-                    
-                    # 现金类特有字段
-                    if hasattr(tx, 'account_type'):
-                        tx_data["account_type"] = tx.account_type
-                    if hasattr(tx, 'interest_rate') and tx.interest_rate:
-                        tx_data["interest_rate"] = float(tx.interest_rate)
-                    if hasattr(tx, 'compound_frequency'):
-                        tx_data["compound_frequency"] = tx.compound_frequency
-                    
-                    # 房产特有字段
-                    if hasattr(tx, 'property_area') and tx.property_area:
-                        tx_data["property_area"] = float(tx.property_area)
-                    if hasattr(tx, 'price_per_unit') and tx.price_per_unit:
-                        tx_data["price_per_unit"] = float(tx.price_per_unit)
-                    if hasattr(tx, 'rental_income') and tx.rental_income:
-                        tx_data["rental_income"] = float(tx.rental_income)
-                    if hasattr(tx, 'property_type'):
-                        tx_data["property_type"] = tx.property_type
-                    if hasattr(tx, 'location'):
-                        tx_data["location"] = tx.location
-                    if hasattr(tx, 'tax_amount') and tx.tax_amount:
-                        tx_data["tax_amount"] = float(tx.tax_amount)
-                    
-                    result.append(tx_data)
+                    limit = max(1, min(limit, MAX_TRANSACTION_PAGE_SIZE))
+                    transactions, next_cursor = self.wealth_service.find_transactions(limit, cursor, **filters)
+                except (KeyError, ValueError, InvalidOperation) as e:
+                    raise HTTPException(status_code=400, detail=f"无效的查询参数: {e}")
                 
-                return result
+                headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+                return self.json_bytes_response(request, encode_transactions(transactions), headers)
+            except HTTPException:
+                raise
             except Exception as e:
                 logging.error(f"❌ 获取交易记录失败: {e}", exc_info=True)
                 return []
@@ -1430,6 +1427,62 @@ class WealthLiteApp:
                 logging.error(f"❌ 创建交易失败: {e}", exc_info=True)
                 raise HTTPException(status_code=500, detail=f"创建交易失败: {str(e)}")
 
+        @app.post("/api/transactions/batch")
+        async def create_transactions_batch(batch_data: dict):
+            """批量创建交易（全部成功或全部回滚）"""
+            records = batch_data.get("transactions")
+            if not isinstance(records, list) or not records:
+                raise HTTPException(status_code=400, detail="缺少交易列表字段: transactions")
+
+            assets = AssetLookup(self.wealth_service.get_all_assets())
+            transactions, errors = parse_records(records, assets)
+            if errors:
+                raise HTTPException(status_code=400, detail={
+                    "message": f"{len(errors)} 条交易校验失败，未写入任何交易",
+                    "errors": [e.to_dict() for e in errors]
+                })
+
+            try:
+                created = self.wealth_service.create_transactions(transactions)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            except Exception as e:
+                logging.error(f"❌ 批量创建交易失败: {e}", exc_info=True)
+                raise HTTPException(status_code=500, detail=f"批量创建交易失败: {str(e)}")
+
+            return {
+                "success": True,
+                "count": len(created),
+                "ids": [tx.transaction_id for tx in created]
+            }
+
+        @app.post("/api/transactions/import")
+        async def import_transactions(file: UploadFile = File(...), batch_size: int = DEFAULT_BATCH_SIZE):
+            """批量导入交易（CSV/XLSX文件）"""
+            suffix = Path(file.filename or "").suffix.lower()
+            if suffix not in (".csv", ".xlsx", ".xlsm"):
+                raise HTTPException(status_code=400, detail=f"不支持的文件格式: {suffix or '未知'}")
+
+            tmp_path = None
+            try:
+                # 上传内容先流式写入临时文件，再由导入管道逐行读取
+                with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
+                    shutil.copyfileobj(file.file, tmp)
+                    tmp_path = tmp.name
+
+                import_service = TransactionImportService(self.db_manager)
+                result = await run_in_threadpool(import_service.import_file, tmp_path, batch_size)
+                logging.info(f"✅ 交易导入完成: 成功 {result.rows_imported} 行, 失败 {result.rows_failed} 行")
+                return result.to_dict(max_errors=100)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            except Exception as e:
+                logging.error(f"❌ 导入交易失败: {e}", exc_info=True)
+                raise HTTPException(status_code=500, detail=f"导入交易失败: {str(e)}")
+            finally:
+                if tmp_path:
+                    os.unlink(tmp_path)
+
         @app.put("/api/transactions/{tx_id}")
         async def update_transaction(tx_id: str, tx_data: dict):
             """更新交易（仅支持现金类部分字段）"""
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+数据导出基准测试
+
+生成N笔交易（默认100万）的临时数据库，每种导出方式在独立子进程中运行，
+以 ru_maxrss 统计峰值内存。对照组为先通过 TransactionRepository.get_all()
+加载全部交易再写出CSV的全量物化方式。
+
+用法:
+    python scripts/benchmark_export.py --rows 1000000
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import resource
+import tempfile
+import subprocess
+from pathlib import Path
+from datetime import date, timedelta
+from decimal import Decimal
+
+# 添加项目根目录和src目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "src"))
+
+from wealth_lite.data.database import DatabaseManager
+from wealth_lite.data.repositories import RepositoryManager
+from wealth_lite.models.asset import Asset
+from wealth_lite.models.enums import AssetType, Currency, TransactionType
+from wealth_lite.models.transaction import CashTransaction
+from wealth_lite.services.export_service import ExportService, iter_csv
+
+
+def build_database(db_path: str, rows: int, batch_size: int = 20000, seed: int = 42):
+    """生成包含N笔现金交易的数据库"""
+    rng = random.Random(seed)
+    db_manager = DatabaseManager(db_path)
+    repos = RepositoryManager(db_manager)
+    assets = []
+    for i in range(20):
+        asset = Asset(asset_name=f"基准资产{i}", asset_type=AssetType.CASH, currency=Currency.CNY)
+        repos.assets.create(asset)
+        assets.append(asset)
+
+    start = date(2015, 1, 1)
+    types = [TransactionType.DEPOSIT, TransactionType.INTEREST, TransactionType.WITHDRAW]
+    for offset in range(0, rows, batch_size):
+        batch = [
+            CashTransaction(
+                asset_id=assets[i % len(assets)].asset_id,
+                transaction_type=rng.choice(types),
+                amount=Decimal(f"{rng.uniform(1, 100000):.2f}"),
+                transaction_date=start + timedelta(days=rng.randrange(3650)),
+                notes=f"bench-{i}"
+            )
+            for i in range(offset, min(offset + batch_size, rows))
+        ]
+        repos.transactions.create_many(batch)
+    db_manager.close()
+
+
+def run_worker(db_path: str, mode: str, output: str):
+    """子进程：执行一次导出并输出耗时与峰值内存"""
+    db_manager = DatabaseManager(db_path)
+    started = time.perf_counter()
+    if mode == 'materialized':
+        transactions = RepositoryManager(db_manager).transactions.get_all()
+        columns = list(transactions[0].to_dict().keys()) if transactions else []
+        rows = [tuple(t.to_dict().values()) for t in transactions]
+        with open(output, 'wb') as f:
+            for chunk in iter_csv(columns, rows):
+                f.write(chunk)
+    else:
+        ExportService(db_manager).export_to_file('transactions', mode, output)
+    elapsed = time.perf_counter() - started
+    db_manager.close()
+
+    # Linux下ru_maxrss单位为KB，macOS下为字节
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        max_rss //= 1024
+    print(json.dumps({'mode': mode, 'seconds': elapsed, 'peak_rss_mb': max_rss / 1024,
+                      'size_mb': os.path.getsize(output) / 1024 / 1024}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='数据导出基准测试')
+    parser.add_argument('--rows', type=int, default=1_000_000, help='交易笔数')
+    parser.add_argument('--modes', default='csv,jsonl,xlsx,materialized', help='逗号分隔的导出方式')
+    parser.add_argument('--worker', nargs=3, metavar=('DB', 'MODE', 'OUTPUT'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(*args.worker)
+        return
+
+    with tempfile.TemporaryDirectory(prefix='wealth_lite_bench_') as tmp:
+        db_path = str(Path(tmp) / 'export.db')
+        print(f"生成 {args.rows} 笔交易...")
+        build_database(db_path, args.rows)
+
+        for mode in args.modes.split(','):
+            ext = 'csv' if mode == 'materialized' else mode
+            output = str(Path(tmp) / f'out_{mode}.{ext}')
+            proc = subprocess.run(
+                [sys.executable, __file__, '--worker', db_path, mode, output],
+                capture_output=True, text=True
+            )
+            if proc.returncode != 0:
+                print(f"{mode:>12}: 失败 - {proc.stderr.strip().splitlines()[-1]}")
+                continue
+            result = json.loads(proc.stdout.strip().splitlines()[-1])
+            print(f"{mode:>12}: {result['seconds']:.1f} 秒, 峰值RSS {result['peak_rss_mb']:.0f} MB, "
+                  f"文件 {result['size_mb']:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+汇率重估基准测试
+
+生成9种货币对USD的10年日汇率，以及N个（默认10万）分布在10种货币上的持仓，对比：
+- scalar:     逐个持仓查询汇率并用Decimal折算
+- vectorized: FxService.convert_minor_many（每币种查询一次汇率，整列折算）
+以及 revalue_portfolio 全流程（含持仓估值）的耗时，
+并统计交叉汇率缓存前后的查询耗时。
+
+用法:
+    python scripts/benchmark_fx.py --positions 100000
+"""
+
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+from datetime import date, timedelta
+from decimal import Decimal
+
+# 添加项目根目录和src目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "src"))
+
+from wealth_lite.data.database import DatabaseManager
+from wealth_lite.models.asset import Asset
+from wealth_lite.models.enums import AssetType, Currency, TransactionType
+from wealth_lite.models.money import from_minor, to_minor
+from wealth_lite.models.portfolio import Portfolio
+from wealth_lite.models.position import Position
+from wealth_lite.models.transaction import CashTransaction
+from wealth_lite.services.fx_service import FxService
+
+# 各货币对USD的大致汇率
+BASE_RATES = {
+    Currency.CNY: 7.1, Currency.EUR: 0.92, Currency.GBP: 0.79, Currency.JPY: 150.0,
+    Currency.HKD: 7.8, Currency.AUD: 1.52, Currency.CAD: 1.36, Currency.SGD: 1.34, Currency.KRW: 1330.0,
+}
+
+
+def build_rates(service: FxService, days: int, seed: int = 42) -> int:
+    """生成 USD/XXX 日汇率（随机游走）"""
+    rng = random.Random(seed)
+    start = date.today() - timedelta(days=days)
+    rows = []
+    for currency, rate in BASE_RATES.items():
+        for offset in range(days):
+            rate *= 1 + rng.uniform(-0.003, 0.003)
+            rows.append((start + timedelta(days=offset), Currency.USD, currency, rate))
+    return service.add_rates(rows, source='benchmark')
+
+
+def build_portfolio(count: int, seed: int = 42) -> Portfolio:
+    """生成分布在10种货币上的单笔存款持仓"""
+    rng = random.Random(seed)
+    currencies = list(BASE_RATES) + [Currency.USD]
+    positions = []
+    for i in range(count):
+        currency = currencies[i % len(currencies)]
+        asset = Asset(asset_name=f"持仓{i}", asset_type=AssetType.CASH, currency=currency)
+        tx = CashTransaction(asset_id=asset.asset_id, transaction_type=TransactionType.DEPOSIT,
+                             amount=Decimal(f"{rng.uniform(100, 100000):.2f}"), currency=currency,
+                             transaction_date=date(2024, 1, 1))
+        positions.append(Position(asset=asset, transactions=[tx], base_currency=currency))
+    # 基础货币与各持仓币种一致，市值即原币账面价值
+    return Portfolio(positions=positions, base_currency=Currency.CNY)
+
+
+def convert_scalar(service: FxService, amounts, currencies, target: Currency, as_of: date) -> Decimal:
+    """逐个持仓查询汇率并用Decimal折算"""
+    total = Decimal('0')
+    for amount, currency in zip(amounts, currencies):
+        total += service.convert(amount, currency, target, as_of)
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="汇率重估基准测试")
+    parser.add_argument('--positions', type=int, default=100_000, help='持仓数量')
+    parser.add_argument('--days', type=int, default=3650, help='汇率天数')
+    args = parser.parse_args()
+
+    db_manager = DatabaseManager(":memory:")
+    service = FxService(db_manager)
+    print(f"📦 生成 {build_rates(service, args.days):,} 条汇率, {args.positions:,} 个持仓...")
+    portfolio = build_portfolio(args.positions)
+    as_of = date.today() - timedelta(days=30)
+
+    started = time.perf_counter()
+    service.index.rate('EUR', 'JPY', as_of)
+    first_cross = time.perf_counter() - started
+    started = time.perf_counter()
+    for _ in range(10000):
+        service.index.rate('EUR', 'JPY', as_of)
+    cached_cross = (time.perf_counter() - started) / 10000
+    print(f"🔀 交叉汇率 EUR/JPY: 首次合成(含加载) {first_cross * 1000:.1f} ms, 缓存后 {cached_cross * 1e6:.1f} µs/次")
+
+    started = time.perf_counter()
+    local_values = [service._local_value(p, portfolio.base_currency) for p in portfolio.positions]
+    currencies = [p.asset.currency for p in portfolio.positions]
+    print(f"📐 持仓原币市值计算: {time.perf_counter() - started:.2f}s（两种方式共用）")
+    local_minor = [to_minor(v) for v in local_values]
+
+    for target in (Currency.CNY, Currency.EUR):
+        started = time.perf_counter()
+        scalar_total = convert_scalar(service, local_values, currencies, target, as_of)
+        scalar_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        converted, _ = service.convert_minor_many(local_minor, currencies, target, as_of)
+        vector_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        valuation = service.revalue_portfolio(portfolio, target, as_of)
+        total_time = time.perf_counter() - started
+
+        drift = abs(from_minor(sum(converted)) - scalar_total)
+        print(f"💱 -> {target.name}: 折算 scalar {scalar_time * 1000:.0f} ms, "
+              f"vectorized {vector_time * 1000:.0f} ms ({scalar_time / vector_time:.0f}x), "
+              f"差异 {drift}; revalue_portfolio 全流程 {total_time:.2f}s")
+        assert valuation.total_value == from_minor(sum(converted))
+    db_manager.close()
+
+
+if __name__ == "__main__":
+    main()
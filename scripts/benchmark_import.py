@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+交易批量导入基准测试
+
+生成N行合成CSV（默认100万行），分别导入到临时数据库，
+对比逐条 TransactionRepository.create、批量 create_many 与导入管道的吞吐量。
+
+用法:
+    python scripts/benchmark_import.py --rows 1000000
+    python scripts/benchmark_import.py --rows 20000 --single-rows 2000
+"""
+
+import sys
+import csv
+import time
+import random
+import argparse
+import tempfile
+from pathlib import Path
+from datetime import date, timedelta
+from decimal import Decimal
+
+# 添加项目根目录和src目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "src"))
+
+from wealth_lite.data.database import DatabaseManager
+from wealth_lite.data.repositories import RepositoryManager
+from wealth_lite.models.asset import Asset
+from wealth_lite.models.enums import AssetType, Currency, TransactionType
+from wealth_lite.models.transaction import CashTransaction
+from wealth_lite.services.import_service import TransactionImportService
+
+
+def create_assets(db_manager: DatabaseManager, count: int = 20):
+    """创建基准测试使用的资产"""
+    repos = RepositoryManager(db_manager)
+    assets = []
+    for i in range(count):
+        asset_type = AssetType.CASH if i % 2 == 0 else AssetType.FIXED_INCOME
+        asset = Asset(asset_name=f"基准资产{i}", asset_type=asset_type, currency=Currency.CNY)
+        repos.assets.create(asset)
+        assets.append(asset)
+    return assets
+
+
+def write_csv(path: Path, assets, rows: int, seed: int = 42):
+    """生成合成交易CSV"""
+    rng = random.Random(seed)
+    start = date(2015, 1, 1)
+    types = [TransactionType.DEPOSIT.name, TransactionType.INTEREST.name, TransactionType.WITHDRAW.name]
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['asset_id', 'type', 'date', 'amount', 'currency', 'notes'])
+        for i in range(rows):
+            asset = assets[i % len(assets)]
+            writer.writerow([
+                asset.asset_id,
+                rng.choice(types),
+                (start + timedelta(days=rng.randrange(3650))).isoformat(),
+                f"{rng.uniform(1, 100000):.2f}",
+                'CNY',
+                f"bench-{i}"
+            ])
+
+
+def bench_single(db_path: str, rows: int) -> float:
+    """逐条创建交易（每条一次提交）的吞吐量"""
+    db_manager = DatabaseManager(db_path)
+    assets = [a for a in create_assets(db_manager) if a.asset_type == AssetType.CASH]
+    repos = RepositoryManager(db_manager)
+    started = time.perf_counter()
+    for i in range(rows):
+        repos.transactions.create(CashTransaction(
+            asset_id=assets[i % len(assets)].asset_id,
+            transaction_type=TransactionType.DEPOSIT,
+            amount=Decimal('100.00'),
+            transaction_date=date(2020, 1, 1)
+        ))
+    elapsed = time.perf_counter() - started
+    db_manager.close()
+    return rows / elapsed
+
+
+def bench_create_many(db_path: str, rows: int, batch_size: int) -> float:
+    """TransactionRepository.create_many（每批一次提交）的吞吐量"""
+    db_manager = DatabaseManager(db_path)
+    assets = [a for a in create_assets(db_manager) if a.asset_type == AssetType.CASH]
+    repos = RepositoryManager(db_manager)
+    transactions = [
+        CashTransaction(
+            asset_id=assets[i % len(assets)].asset_id,
+            transaction_type=TransactionType.DEPOSIT,
+            amount=Decimal('100.00'),
+            transaction_date=date(2020, 1, 1)
+        )
+        for i in range(rows)
+    ]
+    started = time.perf_counter()
+    for offset in range(0, rows, batch_size):
+        repos.transactions.create_many(transactions[offset:offset + batch_size])
+    elapsed = time.perf_counter() - started
+    db_manager.close()
+    return rows / elapsed
+
+
+def bench_import(db_path: str, csv_path: Path, rows: int, batch_size: int):
+    """批量导入管道的吞吐量"""
+    db_manager = DatabaseManager(db_path)
+    assets = create_assets(db_manager)
+    write_csv(csv_path, assets, rows)
+    service = TransactionImportService(db_manager)
+    started = time.perf_counter()
+    result = service.import_file(str(csv_path), batch_size=batch_size)
+    elapsed = time.perf_counter() - started
+    db_manager.close()
+    return result, rows / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='交易批量导入基准测试')
+    parser.add_argument('--rows', type=int, default=1_000_000, help='批量导入的行数')
+    parser.add_argument('--single-rows', type=int, default=2000, help='逐条写入对照组的行数')
+    parser.add_argument('--batch-size', type=int, default=10000, help='每批提交的行数')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='wealth_lite_bench_') as tmp:
+        tmp_dir = Path(tmp)
+
+        single_rate = bench_single(str(tmp_dir / 'single.db'), args.single_rows)
+        print(f"逐条写入: {args.single_rows} 行, {single_rate:,.0f} 行/秒")
+
+        many_rows = min(args.rows, 100_000)
+        many_rate = bench_create_many(str(tmp_dir / 'many.db'), many_rows, args.batch_size)
+        print(f"create_many: {many_rows} 行, {many_rate:,.0f} 行/秒 ({many_rate / single_rate:.1f}x)")
+
+        result, import_rate = bench_import(
+            str(tmp_dir / 'import.db'), tmp_dir / 'import.csv', args.rows, args.batch_size
+        )
+        print(f"批量导入: {result.rows_imported} 行 (失败 {result.rows_failed}), {import_rate:,.0f} 行/秒")
+        print(f"加速比: {import_rate / single_rate:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
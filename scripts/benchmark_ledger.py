@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+列式账本基准测试
+
+生成N笔交易（默认100万，分布在M个资产上）的内存数据库，对比：
+- objects: 逐笔交易对象，按资产构建Position后汇总（旧方式）
+- ledger:  TransactionRepository.load_ledger() 构建一次，之后每次重算只做分组归约
+
+用法:
+    python scripts/benchmark_ledger.py --rows 1000000 --assets 500
+"""
+
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+from datetime import date
+
+# 添加项目根目录和src目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "src"))
+
+from wealth_lite.data.database import DatabaseManager
+from wealth_lite.data.repositories import RepositoryManager
+from wealth_lite.models.asset import Asset
+from wealth_lite.models.enums import AssetType, Currency, TransactionType
+from wealth_lite.models.money import from_minor
+from wealth_lite.models.position import Position
+from wealth_lite.models.transaction import CashTransaction
+
+
+def build_database(rows: int, asset_count: int, seed: int = 42):
+    """直接写入交易主表生成测试数据（金额为最小单位整数）"""
+    rng = random.Random(seed)
+    db_manager = DatabaseManager(":memory:")
+    repos = RepositoryManager(db_manager)
+    assets = []
+    for i in range(asset_count):
+        asset = Asset(asset_name=f"基准资产{i}", asset_type=AssetType.CASH, currency=Currency.CNY)
+        repos.assets.create(asset)
+        assets.append(asset)
+
+    types = ['DEPOSIT', 'DEPOSIT', 'INTEREST', 'WITHDRAW', 'FEE']
+    start = date(2015, 1, 1).toordinal()
+    with db_manager.transaction() as conn:
+        conn.executemany(
+            """INSERT INTO transactions (transaction_id, asset_id, transaction_date, transaction_type,
+                   amount, currency, exchange_rate, amount_base_currency)
+               VALUES (?, ?, ?, ?, ?, 'CNY', 1.0, ?)""",
+            (
+                (f"tx-{i}", assets[i % asset_count].asset_id,
+                 date.fromordinal(start + rng.randrange(3650)).isoformat(),
+                 rng.choice(types), amount, amount)
+                for i, amount in ((i, rng.randrange(100, 100_000_000)) for i in range(rows))
+            )
+        )
+    return db_manager, repos, assets
+
+
+def load_objects(db_manager: DatabaseManager):
+    """按行直接构建交易对象（不含详情表查询，只比较汇总开销）"""
+    transactions = {}
+    query = "SELECT asset_id, transaction_date, transaction_type, amount, amount_base_currency FROM transactions"
+    for asset_id, tx_date, tx_type, amount, base in db_manager.iter_query(query, chunk_size=10000):
+        transactions.setdefault(asset_id, []).append(CashTransaction(
+            asset_id=asset_id,
+            transaction_date=date.fromisoformat(tx_date),
+            transaction_type=TransactionType[tx_type],
+            amount=from_minor(amount),
+            amount_base_currency=from_minor(base),
+        ))
+    return transactions
+
+
+def recompute_objects(assets, transactions):
+    """旧方式：Position逐笔遍历汇总"""
+    positions = [Position(asset=a, transactions=transactions.get(a.asset_id, [])) for a in assets]
+    return sum(p.current_book_value for p in positions), sum(p.principal_amount for p in positions)
+
+
+def recompute_ledger(ledger, asset_types):
+    """新方式：分组归约"""
+    summary = ledger.summary()
+    ledger.allocation(asset_types)
+    return summary['book_value'], summary['total_cost']
+
+
+def timed(func, *args, repeat: int = 5):
+    """返回最佳耗时与结果"""
+    best, result = None, None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="列式账本基准测试")
+    parser.add_argument('--rows', type=int, default=1_000_000, help='交易笔数')
+    parser.add_argument('--assets', type=int, default=500, help='资产数量')
+    args = parser.parse_args()
+
+    print(f"📦 生成 {args.rows:,} 笔交易 / {args.assets} 个资产...")
+    db_manager, repos, assets = build_database(args.rows, args.assets)
+    asset_types = {a.asset_id: a.asset_type.name for a in assets}
+
+    build_time, ledger = timed(repos.transactions.load_ledger, repeat=1)
+    ledger_time, ledger_result = timed(recompute_ledger, ledger, asset_types)
+    print(f"🧮 构建账本: {build_time:.2f}s（一次性）")
+    print(f"⚡ 账本重算: {ledger_time * 1000:.1f} ms")
+
+    load_time, transactions = timed(load_objects, db_manager, repeat=1)
+    object_time, object_result = timed(recompute_objects, assets, transactions, repeat=1)
+    print(f"🐢 构建交易对象: {load_time:.2f}s（一次性）")
+    print(f"🐢 对象重算: {object_time * 1000:.1f} ms")
+
+    assert ledger_result == object_result, f"结果不一致: {ledger_result} != {object_result}"
+    print(f"\n✅ 结果一致，加速 {object_time / ledger_time:.0f}x，目标 <100 ms: "
+          f"{'达成' if ledger_time < 0.1 else '未达成'}")
+    db_manager.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+交易对象内存占用基准测试
+
+生成N笔交易（默认10万）的内存数据库，用tracemalloc统计
+TransactionRepository 将全部数据行转换为交易对象后的内存占用（不含SQLite自身缓存），
+以及在此基础上构建持仓的额外开销。
+
+用法:
+    python scripts/benchmark_memory.py --rows 100000
+"""
+
+import sys
+import time
+import random
+import argparse
+import tracemalloc
+from pathlib import Path
+from datetime import date, timedelta
+from decimal import Decimal
+
+# 添加项目根目录和src目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "src"))
+
+from wealth_lite.data.database import DatabaseManager
+from wealth_lite.data.repositories import RepositoryManager
+from wealth_lite.models.asset import Asset
+from wealth_lite.models.enums import AssetType, Currency, TransactionType
+from wealth_lite.models.position import Position
+from wealth_lite.models.transaction import CashTransaction
+
+
+def build_database(rows: int, batch_size: int = 20000, seed: int = 42):
+    """生成包含N笔现金交易的内存数据库"""
+    rng = random.Random(seed)
+    db_manager = DatabaseManager(":memory:")
+    repos = RepositoryManager(db_manager)
+    assets = []
+    for i in range(20):
+        asset = Asset(asset_name=f"基准资产{i}", asset_type=AssetType.CASH, currency=Currency.CNY)
+        repos.assets.create(asset)
+        assets.append(asset)
+
+    start = date(2015, 1, 1)
+    types = [TransactionType.DEPOSIT, TransactionType.INTEREST, TransactionType.WITHDRAW]
+    for offset in range(0, rows, batch_size):
+        repos.transactions.create_many([
+            CashTransaction(
+                asset_id=assets[i % len(assets)].asset_id,
+                transaction_type=rng.choice(types),
+                amount=Decimal(f"{rng.uniform(1, 100000):.2f}"),
+                transaction_date=start + timedelta(days=rng.randrange(3650)),
+            )
+            for i in range(offset, min(offset + batch_size, rows))
+        ])
+    return db_manager, repos, assets
+
+
+def main():
+    parser = argparse.ArgumentParser(description="交易对象内存占用基准测试")
+    parser.add_argument('--rows', type=int, default=100_000, help='交易笔数')
+    args = parser.parse_args()
+
+    print(f"📦 生成 {args.rows:,} 笔交易...")
+    db_manager, repos, assets = build_database(args.rows)
+    rows = db_manager.execute_query("SELECT * FROM transactions")
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    transactions = repos.transactions._rows_to_transactions(rows)
+    elapsed = time.perf_counter() - started
+    loaded, _ = tracemalloc.get_traced_memory()
+
+    by_asset = {}
+    for transaction in transactions:
+        by_asset.setdefault(transaction.asset_id, []).append(transaction)
+    positions = [Position(asset=a, transactions=by_asset.get(a.asset_id, [])) for a in assets]
+    total = sum(p.current_book_value for p in positions)
+    with_positions, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"⏱️  转换耗时: {elapsed:.2f}s")
+    print(f"💾 交易对象: {loaded / 1024 / 1024:.1f} MiB ({loaded / len(transactions):.0f} B/笔)")
+    print(f"💾 含持仓:   {with_positions / 1024 / 1024:.1f} MiB, 峰值 {peak / 1024 / 1024:.1f} MiB")
+    print(f"ℹ️  账面价值合计: {total}")
+    db_manager.close()
+
+
+if __name__ == "__main__":
+    main()
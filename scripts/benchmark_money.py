@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+金额聚合基准测试
+
+对比N笔交易（默认100万）按类别汇总金额的两种路径：
+- decimal: 旧方式，REAL列读出后逐行 Decimal(str(x))，再按类别分别用生成器求和
+- integer: 新方式，INTEGER最小单位列读出后单次遍历整数累加
+- sql: 整数列直接在SQLite中 SUM 聚合
+
+同时校验两种路径的结果一致，以及REAL列 SUM 的浮点误差。
+
+用法:
+    python scripts/benchmark_money.py --rows 1000000
+"""
+
+import sys
+import time
+import random
+import sqlite3
+import argparse
+from pathlib import Path
+from decimal import Decimal
+
+# 添加项目根目录和src目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "src"))
+
+from wealth_lite.models.money import to_minor, from_minor
+
+CATEGORIES = {
+    'DEPOSIT': 'invested', 'BUY': 'invested',
+    'WITHDRAW': 'withdrawn', 'SELL': 'withdrawn',
+    'INTEREST': 'income', 'DIVIDEND': 'income',
+    'FEE': 'fees',
+}
+
+
+def build_tables(rows: int, seed: int = 42) -> sqlite3.Connection:
+    """生成REAL与INTEGER两张交易表，金额相同"""
+    rng = random.Random(seed)
+    conn = sqlite3.connect(':memory:')
+    conn.execute("CREATE TABLE tx_real (transaction_type TEXT, amount REAL)")
+    conn.execute("CREATE TABLE tx_int (transaction_type TEXT, amount INTEGER)")
+    types = list(CATEGORIES)
+    data = [(rng.choice(types), Decimal(f"{rng.uniform(0.01, 100000):.4f}")) for _ in range(rows)]
+    conn.executemany("INSERT INTO tx_real VALUES (?, ?)", ((t, float(a)) for t, a in data))
+    conn.executemany("INSERT INTO tx_int VALUES (?, ?)", ((t, to_minor(a)) for t, a in data))
+    conn.commit()
+    return conn
+
+
+def aggregate_decimal(conn: sqlite3.Connection):
+    """旧路径：Decimal(str(float)) + 按类别多次遍历"""
+    transactions = [(t, Decimal(str(a))) for t, a in conn.execute("SELECT transaction_type, amount FROM tx_real")]
+    return {
+        category: sum((a for t, a in transactions if CATEGORIES[t] == category), Decimal('0'))
+        for category in ('invested', 'withdrawn', 'income', 'fees')
+    }
+
+
+def aggregate_integer(conn: sqlite3.Connection):
+    """新路径：整数单次遍历"""
+    totals = dict.fromkeys(('invested', 'withdrawn', 'income', 'fees'), 0)
+    for t, a in conn.execute("SELECT transaction_type, amount FROM tx_int"):
+        totals[CATEGORIES[t]] += a
+    return {k: from_minor(v) for k, v in totals.items()}
+
+
+def aggregate_sql(conn: sqlite3.Connection, table: str = 'tx_int'):
+    """在SQLite中按类型SUM后再归类"""
+    totals = dict.fromkeys(('invested', 'withdrawn', 'income', 'fees'), 0)
+    for t, a in conn.execute(f"SELECT transaction_type, SUM(amount) FROM {table} GROUP BY transaction_type"):
+        totals[CATEGORIES[t]] += a
+    if table == 'tx_int':
+        return {k: from_minor(v) for k, v in totals.items()}
+    return totals
+
+
+def timed(func, *args, repeat: int = 3):
+    """返回最佳耗时与结果"""
+    best, result = None, None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="金额聚合基准测试")
+    parser.add_argument('--rows', type=int, default=1_000_000, help='交易笔数')
+    parser.add_argument('--repeat', type=int, default=3, help='每种方式重复次数（取最佳）')
+    args = parser.parse_args()
+
+    print(f"📦 生成 {args.rows:,} 笔交易...")
+    conn = build_tables(args.rows)
+
+    decimal_time, decimal_totals = timed(aggregate_decimal, conn, repeat=args.repeat)
+    integer_time, integer_totals = timed(aggregate_integer, conn, repeat=args.repeat)
+    sql_time, sql_totals = timed(aggregate_sql, conn, repeat=args.repeat)
+    _, float_totals = timed(aggregate_sql, conn, 'tx_real', repeat=1)
+
+    print(f"\n{'方式':<10}{'耗时(s)':>10}{'加速比':>10}")
+    for name, elapsed in (('decimal', decimal_time), ('integer', integer_time), ('sql', sql_time)):
+        print(f"{name:<10}{elapsed:>10.3f}{decimal_time / elapsed:>9.1f}x")
+
+    assert decimal_totals == integer_totals == sql_totals, "聚合结果不一致"
+    print("\n✅ 三种方式结果一致")
+    drift = max(abs(Decimal(repr(float_totals[k])) - integer_totals[k]) for k in integer_totals)
+    print(f"ℹ️  REAL列 SUM 的最大浮点误差: {drift}")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+全文检索基准测试
+
+生成N笔（默认100万）带随机中英文备注的交易，统计：
+- 写入耗时（全文索引由触发器同步维护）
+- SearchService.search 对不同查询词的耗时（FTS5索引）
+- 同样条件下LIKE全表扫描的耗时作为对照
+
+用法:
+    python scripts/benchmark_search.py --rows 1000000
+"""
+
+import os
+import sys
+import time
+import uuid
+import random
+import argparse
+import tempfile
+from pathlib import Path
+from datetime import date, timedelta
+
+# 添加项目根目录和src目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "src"))
+
+from wealth_lite.data.database import DatabaseManager
+from wealth_lite.services.search_service import SearchService
+
+WORDS = ["工资", "奖金", "房租", "押金", "利息", "分红", "定投", "赎回", "转账", "报销",
+         "salary", "bonus", "dividend", "rebalance", "transfer", "招商银行", "国债", "基金", "理财", "信用卡"]
+
+QUERIES = ["rebalance", "招商银行", "dividend 国债", "押金退", "工资 奖金", "不存在的词"]
+
+
+def build_database(db_path: str, rows: int, batch_size: int = 50000, seed: int = 42) -> float:
+    """写入N笔交易（直接批量插入交易表，触发器同步全文索引），返回耗时"""
+    rng = random.Random(seed)
+    db = DatabaseManager(db_path)
+    started = time.perf_counter()
+    start = date(2015, 1, 1)
+    with db.transaction() as conn:
+        conn.execute("INSERT INTO assets (asset_id, asset_name, asset_type, currency) VALUES ('bench', '基准资产', 'CASH', 'CNY')")
+        for offset in range(0, rows, batch_size):
+            batch = []
+            for _ in range(min(batch_size, rows - offset)):
+                notes = " ".join(rng.sample(WORDS, 3)) + f" #{rng.randrange(100000)}"
+                batch.append((str(uuid.UUID(int=rng.getrandbits(128))), 'bench',
+                              (start + timedelta(days=rng.randrange(3650))).isoformat(),
+                              'DEPOSIT', 1000000, 'CNY', 1.0, 1000000, notes))
+            conn.executemany("""
+                INSERT INTO transactions (transaction_id, asset_id, transaction_date, transaction_type,
+                                          amount, currency, exchange_rate, amount_base_currency, notes)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, batch)
+    return time.perf_counter() - started
+
+
+def timed(func, repeat: int = 5):
+    """取多次运行的最短耗时"""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="全文检索基准测试")
+    parser.add_argument('--rows', type=int, default=1_000_000, help='交易数量')
+    parser.add_argument('--limit', type=int, default=20, help='每次检索返回条数')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        print(f"📦 写入 {args.rows:,} 笔交易（含全文索引）...")
+        print(f"   耗时 {build_database(db_path, args.rows):.1f}s, 数据库 {os.path.getsize(db_path) / 2**20:.0f} MiB")
+
+        db = DatabaseManager(db_path)
+        service = SearchService(db)
+        for query in QUERIES:
+            elapsed, result = timed(lambda: service.search(query, args.limit))
+            like_conditions = " AND ".join("notes LIKE ?" for _ in query.split())
+            like_params = tuple(f"%{t}%" for t in query.split())
+            like_time, _ = timed(lambda: db.execute_query(
+                f"SELECT transaction_id FROM transactions WHERE {like_conditions} "
+                f"ORDER BY transaction_date DESC LIMIT {args.limit}", like_params), repeat=1)
+            print(f"🔍 {query!r:>16}: {elapsed * 1000:7.1f} ms, {len(result['transactions'])} 条"
+                  f" | LIKE全表扫描 {like_time * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+API序列化基准测试
+
+生成N笔（默认1万）现金、固定收益、权益类交易，对比交易列表API的两种序列化方式：
+- legacy: 逐笔hasattr探测拼装字典，再经FastAPI的jsonable_encoder与json.dumps编码
+- fast:   预编译的交易编码器 + serialization.dumps（安装了orjson时走orjson）
+并统计gzip/br压缩后的大小与耗时。
+
+用法:
+    python scripts/benchmark_serialization.py --rows 10000
+"""
+
+import sys
+import json
+import time
+import random
+import argparse
+from pathlib import Path
+from datetime import date, timedelta
+from decimal import Decimal
+
+# 添加项目根目录和src目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "src"))
+
+from wealth_lite.models.enums import Currency, TransactionType
+from wealth_lite.models.transaction import CashTransaction, EquityTransaction, FixedIncomeTransaction
+from wealth_lite.utils import serialization
+from wealth_lite.utils.serialization import choose_encoding, compress, dumps, encode_transactions
+
+
+def build_transactions(rows: int, seed: int = 42):
+    """生成三类交易各占三分之一"""
+    rng = random.Random(seed)
+    start = date(2020, 1, 1)
+    transactions = []
+    for i in range(rows):
+        tx_date = start + timedelta(days=rng.randrange(1800))
+        amount = Decimal(f"{rng.uniform(100, 100000):.2f}")
+        kind = i % 3
+        if kind == 0:
+            tx = CashTransaction(asset_id=f"cash-{i % 50}", transaction_type=TransactionType.DEPOSIT,
+                                 amount=amount, currency=Currency.CNY, transaction_date=tx_date,
+                                 interest_rate=Decimal('1.5'), notes="工资")
+        elif kind == 1:
+            tx = FixedIncomeTransaction(asset_id=f"bond-{i % 50}", transaction_type=TransactionType.DEPOSIT,
+                                        amount=amount, currency=Currency.CNY, transaction_date=tx_date,
+                                        annual_rate=Decimal('2.75'),
+                                        maturity_date=tx_date + timedelta(days=365))
+        else:
+            tx = EquityTransaction(asset_id=f"stock-{i % 50}", transaction_type=TransactionType.BUY,
+                                   currency=Currency.USD, transaction_date=tx_date,
+                                   exchange_rate=Decimal('7.1'),
+                                   quantity=Decimal(rng.randint(1, 500)),
+                                   price_per_share=Decimal(f"{rng.uniform(5, 500):.2f}"),
+                                   commission=Decimal('1.5'))
+        transactions.append(tx)
+    return transactions
+
+
+def legacy_encode(tx) -> dict:
+    """交易列表API原有的逐字段hasattr探测写法"""
+    tx_data = {
+        "id": tx.transaction_id,
+        "asset_id": tx.asset_id,
+        "type": tx.transaction_type.name,
+        "amount": float(tx.amount),
+        "date": tx.transaction_date.isoformat(),
+        "currency": tx.currency.name,
+        "exchange_rate": float(tx.exchange_rate) if tx.exchange_rate else 1.0,
+        "amount_base_currency": float(tx.amount_base_currency) if tx.amount_base_currency else float(tx.amount),
+        "notes": tx.notes,
+        "reference_number": tx.reference_number,
+        "created_date": tx.created_date.isoformat() if tx.created_date else None,
+        "transaction_class": tx.__class__.__name__
+    }
+    for attr in ('quantity', 'price_per_share', 'commission', 'annual_rate'):
+        if hasattr(tx, attr) and getattr(tx, attr):
+            tx_data[attr] = float(getattr(tx, attr))
+    for attr in ('start_date', 'maturity_date'):
+        if hasattr(tx, attr) and getattr(tx, attr):
+            tx_data[attr] = getattr(tx, attr).isoformat()
+    for attr in ('interest_type', 'payment_frequency'):
+        if hasattr(tx, attr):
+            value = getattr(tx, attr)
+            tx_data[attr] = value.name if hasattr(value, 'name') else str(value)
+    for attr in ('face_value', 'coupon_rate', 'interest_rate', 'property_area', 'price_per_unit',
+                 'rental_income', 'tax_amount'):
+        if hasattr(tx, attr) and getattr(tx, attr):
+            tx_data[attr] = float(getattr(tx, attr))
+    for attr in ('account_type', 'compound_frequency', 'property_type', 'location'):
+        if hasattr(tx, attr):
+            tx_data[attr] = getattr(tx, attr)
+    return tx_data
+
+
+def legacy_serialize(transactions) -> bytes:
+    """legacy方式：拼装字典 + jsonable_encoder + JSONResponse.render的json.dumps参数"""
+    from fastapi.encoders import jsonable_encoder
+    content = jsonable_encoder([legacy_encode(tx) for tx in transactions])
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None,
+                      separators=(",", ":")).encode("utf-8")
+
+
+def timed(func, repeat: int):
+    """取多次运行的最短耗时"""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API序列化基准测试")
+    parser.add_argument('--rows', type=int, default=10_000, help='交易数量')
+    parser.add_argument('--repeat', type=int, default=5, help='重复次数（取最短耗时）')
+    args = parser.parse_args()
+
+    transactions = build_transactions(args.rows)
+    backend = "orjson" if serialization.orjson is not None else "json"
+    print(f"📦 {args.rows:,} 笔交易, 序列化后端: {backend}")
+
+    try:
+        legacy_time, legacy_body = timed(lambda: legacy_serialize(transactions), args.repeat)
+    except ImportError:
+        legacy_time, legacy_body = None, None
+        print("⚠️ 未安装fastapi，跳过legacy对照组")
+
+    encode_time, encoded = timed(lambda: encode_transactions(transactions), args.repeat)
+    dumps_time, body = timed(lambda: dumps(encoded), args.repeat)
+    fast_time = encode_time + dumps_time
+    print(f"⚡ fast:   编码 {encode_time * 1000:.0f} ms + 序列化 {dumps_time * 1000:.0f} ms"
+          f" = {fast_time * 1000:.0f} ms, {len(body) / 1024:.0f} KiB")
+    if legacy_time is not None:
+        print(f"🐢 legacy: {legacy_time * 1000:.0f} ms, {len(legacy_body) / 1024:.0f} KiB"
+              f" ({legacy_time / fast_time:.1f}x)")
+        assert json.loads(legacy_body) == json.loads(body), "两种方式的输出不一致"
+
+    for accept in ("gzip", "br"):
+        encoding = choose_encoding(accept, len(body))
+        if encoding is None:
+            print(f"ℹ️ {accept}: 未安装或未启用，跳过")
+            continue
+        compress_time, compressed = timed(lambda: compress(body, encoding), args.repeat)
+        print(f"🗜️ {encoding}: {len(compressed) / 1024:.0f} KiB"
+              f" ({len(compressed) / len(body):.0%}), {compress_time * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+列式分析快照导出脚本（增量）
+
+用法:
+    python scripts/export_analytics.py analytics/
+    python scripts/export_analytics.py analytics/ --format arrow --db user_data/wealth_lite.db
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+# 添加项目根目录和src目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "src"))
+
+from wealth_lite.data.database import DatabaseManager
+from wealth_lite.services.analytics_export import AnalyticsExportService, FILE_FORMATS, TABLES
+
+
+def main():
+    parser = argparse.ArgumentParser(description='WealthLite 列式分析快照导出')
+    parser.add_argument('output_dir', help='输出目录（包含水位线文件）')
+    parser.add_argument('--format', choices=sorted(FILE_FORMATS), default='parquet', help='文件格式')
+    parser.add_argument('--table', choices=sorted(TABLES), help='只导出指定表')
+    parser.add_argument('--db', help='数据库文件路径（默认根据环境变量选择）')
+    args = parser.parse_args()
+
+    db_manager = DatabaseManager(args.db)
+    try:
+        exporter = AnalyticsExportService(db_manager, args.output_dir, args.format)
+        results = [exporter.export_table(args.table)] if args.table else exporter.export_all()
+    except Exception as e:
+        print(f"❌ 导出失败: {e}")
+        sys.exit(1)
+    finally:
+        db_manager.close()
+
+    for result in results:
+        target = result.path or '无新增数据'
+        print(f"✅ {result.table}: {result.rows} 行 -> {target}")
+
+
+if __name__ == "__main__":
+    main()
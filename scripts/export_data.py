@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+数据导出脚本
+
+用法:
+    python scripts/export_data.py transactions --format csv --output transactions.csv
+    python scripts/export_data.py positions --format xlsx
+    python scripts/export_data.py snapshots --format jsonl --db user_data/wealth_lite.db
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+# 添加项目根目录和src目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "src"))
+
+from wealth_lite.data.database import DatabaseManager
+from wealth_lite.services.export_service import ExportService, EXPORT_FORMATS
+
+
+def main():
+    parser = argparse.ArgumentParser(description='WealthLite 数据导出')
+    parser.add_argument('dataset', choices=ExportService.DATASETS, help='导出的数据集')
+    parser.add_argument('--format', choices=sorted(EXPORT_FORMATS), default='csv', help='导出格式')
+    parser.add_argument('--output', help='输出文件路径（默认按数据集和日期命名）')
+    parser.add_argument('--db', help='数据库文件路径（默认根据环境变量选择）')
+    args = parser.parse_args()
+
+    output = args.output or ExportService.build_filename(args.dataset, args.format)
+    db_manager = DatabaseManager(args.db)
+    try:
+        ExportService(db_manager).export_to_file(args.dataset, args.format, output)
+    except Exception as e:
+        print(f"❌ 导出失败: {e}")
+        sys.exit(1)
+    finally:
+        db_manager.close()
+
+    print(f"✅ 导出完成: {output}")
+
+
+if __name__ == "__main__":
+    main()
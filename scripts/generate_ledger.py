@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+合成账本生成脚本（压力测试、长时间运行测试用）
+
+生成多年的现金、固定收益阶梯、权益、汇率与月度快照数据，直接批量写入SQLite。
+同一 --seed 与参数生成的数据完全一致。
+
+用法:
+    python scripts/generate_ledger.py --db user_data/load_test.db --transactions 10000000 --assets 10000
+    python scripts/generate_ledger.py --db user_data/load_test.db --transactions 100000 --years 5 --overwrite
+"""
+
+import sys
+import argparse
+from datetime import date
+from pathlib import Path
+
+# 添加项目根目录和src目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "src"))
+
+from wealth_lite.data.database import DatabaseManager
+from wealth_lite.data.ledger_generator import LedgerGenerator, DEFAULT_BATCH_SIZE
+
+
+def main():
+    parser = argparse.ArgumentParser(description='WealthLite 合成账本生成')
+    parser.add_argument('--db', required=True, help='目标数据库文件路径')
+    parser.add_argument('--transactions', type=int, default=1_000_000, help='交易笔数')
+    parser.add_argument('--assets', type=int, default=1000, help='资产数量')
+    parser.add_argument('--years', type=int, default=10, help='覆盖年数')
+    parser.add_argument('--start-date', type=date.fromisoformat, default=date(2015, 1, 1),
+                        help='起始日期（YYYY-MM-DD）')
+    parser.add_argument('--seed', type=int, default=42, help='随机种子')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='每批写入的行数')
+    parser.add_argument('--no-snapshots', action='store_true', help='不生成月度快照')
+    parser.add_argument('--overwrite', action='store_true', help='删除已存在的数据库文件后重新生成')
+    args = parser.parse_args()
+
+    db_file = Path(args.db)
+    if args.overwrite:
+        for path in (db_file, db_file.with_name(db_file.name + '-journal')):
+            path.unlink(missing_ok=True)
+
+    db_manager = DatabaseManager(args.db)
+    generator = LedgerGenerator(seed=args.seed, start_date=args.start_date, years=args.years,
+                                batch_size=args.batch_size)
+
+    def report(count):
+        print(f"\r📝 已生成 {count:,} / {args.transactions:,} 笔交易", end='', flush=True)
+
+    try:
+        result = generator.generate(db_manager, args.transactions, args.assets,
+                                    snapshots=not args.no_snapshots, progress=report)
+    except Exception as e:
+        print(f"\n❌ 生成失败: {e}")
+        sys.exit(1)
+    finally:
+        db_manager.close()
+
+    print(f"\n✅ 生成完成: {len(result.asset_ids):,} 个资产, {result.transactions:,} 笔交易, "
+          f"{result.fx_rates:,} 条汇率, {result.prices:,} 条价格, {result.snapshots} 个快照, "
+          f"耗时 {result.seconds:.1f} 秒 ({result.transactions / result.seconds:,.0f} 笔/秒)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+交易批量导入脚本
+
+用法:
+    python scripts/import_transactions.py statements.csv
+    python scripts/import_transactions.py statements.xlsx --db user_data/wealth_lite.db --error-report errors.csv
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+# 添加项目根目录和src目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "src"))
+
+from wealth_lite.data.database import DatabaseManager
+from wealth_lite.services.import_service import TransactionImportService, DEFAULT_BATCH_SIZE
+
+
+def main():
+    parser = argparse.ArgumentParser(description='WealthLite 交易批量导入')
+    parser.add_argument('file', help='CSV或XLSX文件路径')
+    parser.add_argument('--db', help='数据库文件路径（默认根据环境变量选择）')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='每批提交的行数')
+    parser.add_argument('--error-report', help='失败行的CSV错误报告输出路径')
+    args = parser.parse_args()
+
+    db_manager = DatabaseManager(args.db)
+    service = TransactionImportService(db_manager)
+
+    def report(progress):
+        print(f"\r📥 已读取 {progress.rows_read} 行, 成功 {progress.rows_imported} 行, "
+              f"失败 {progress.rows_failed} 行", end='', flush=True)
+
+    try:
+        result = service.import_file(args.file, batch_size=args.batch_size, progress_callback=report)
+    except Exception as e:
+        print(f"\n❌ 导入失败: {e}")
+        sys.exit(1)
+    finally:
+        db_manager.close()
+
+    print()
+    print(f"✅ 导入完成: 成功 {result.rows_imported} 行, 失败 {result.rows_failed} 行, "
+          f"耗时 {result.elapsed_seconds:.2f} 秒")
+
+    if result.errors:
+        if args.error_report:
+            result.write_error_report(args.error_report)
+            print(f"📝 错误报告已写入: {args.error_report}")
+        else:
+            for error in result.errors[:20]:
+                print(f"  第 {error.row_number} 行: {error.message}")
+            if result.rows_failed > 20:
+                print(f"  ... 共 {result.rows_failed} 行失败，使用 --error-report 输出完整报告")
+
+
+if __name__ == "__main__":
+    main()
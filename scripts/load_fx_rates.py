@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+汇率批量导入脚本
+
+CSV表头: date,base,quote,rate 或 date,pair,rate（pair形如 USD/CNY）
+
+用法:
+    python scripts/load_fx_rates.py rates.csv
+    python scripts/load_fx_rates.py rates.csv --db user_data/wealth_lite.db
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# 添加项目根目录和src目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "src"))
+
+from wealth_lite.data.database import DatabaseManager
+from wealth_lite.services.fx_service import FxService, FX_BATCH_SIZE
+
+
+def main():
+    parser = argparse.ArgumentParser(description='WealthLite 汇率批量导入')
+    parser.add_argument('file', help='CSV文件路径')
+    parser.add_argument('--db', help='数据库文件路径（默认根据环境变量选择）')
+    parser.add_argument('--batch-size', type=int, default=FX_BATCH_SIZE, help='每批提交的行数')
+    args = parser.parse_args()
+
+    db_manager = DatabaseManager(args.db)
+    service = FxService(db_manager)
+    started = time.perf_counter()
+    try:
+        count = service.load_csv(args.file, batch_size=args.batch_size)
+        pairs = service.repository.get_pairs()
+    except Exception as e:
+        print(f"❌ 导入失败: {e}")
+        sys.exit(1)
+    finally:
+        db_manager.close()
+
+    print(f"✅ 导入完成: {count} 行, {len(pairs)} 个货币对, 耗时 {time.perf_counter() - started:.2f} 秒")
+
+
+if __name__ == "__main__":
+    main()
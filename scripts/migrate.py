@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+数据库迁移脚本
+
+在发布前对已有数据库分批执行未完成的迁移，可限定本次执行时长，
+中断或超时后再次运行会从检查点继续。应用启动时也会自动执行剩余迁移。
+
+用法:
+    python scripts/migrate.py --db user_data/wealth_lite.db
+    python scripts/migrate.py --db user_data/wealth_lite.db --max-seconds 30 --batch-size 2000
+    python scripts/migrate.py --status
+"""
+
+import sys
+import time
+import sqlite3
+import logging
+import argparse
+from contextlib import nullcontext
+from pathlib import Path
+
+# 添加项目根目录和src目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "src"))
+
+from wealth_lite.config.database_config import DatabaseConfig
+from wealth_lite.data.data_version import DataVersion
+from wealth_lite.data.migrations import MigrationRunner, DEFAULT_MIGRATION_BATCH_SIZE
+
+
+def main():
+    parser = argparse.ArgumentParser(description='WealthLite 数据库迁移')
+    parser.add_argument('--db', help='数据库文件路径（默认根据环境变量选择）')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_MIGRATION_BATCH_SIZE, help='每批处理的行数')
+    parser.add_argument('--max-seconds', type=float, help='本次最多执行的秒数（默认执行到底）')
+    parser.add_argument('--status', action='store_true', help='只显示迁移状态')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(message)s')
+    db_path = args.db or DatabaseConfig.get_db_path()
+    if not Path(db_path).exists():
+        print(f"❌ 数据库不存在: {db_path}")
+        sys.exit(1)
+
+    conn = sqlite3.connect(db_path, timeout=30.0)
+    try:
+        runner = MigrationRunner(conn, batch_size=args.batch_size)
+        if not args.status:
+            started = time.perf_counter()
+            had_pending = bool(runner.pending())
+            completed = runner.run(max_seconds=args.max_seconds)
+            # 迁移（含未完成的批次）改写了数据，递增数据版本使运行中服务的响应缓存失效
+            has_versions = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'data_versions'").fetchone()
+            if had_pending and has_versions:
+                DataVersion(lambda: nullcontext(conn)).bump()
+            print(f"✅ 本次完成 {len(completed)} 个迁移, 耗时 {time.perf_counter() - started:.2f} 秒")
+
+        for record in runner.history():
+            print(f"  {record['version']:>4}  {record['name']:<32} {record['status']:<8} {record['applied_date'] or ''}")
+        pending = runner.pending()
+        if pending:
+            print(f"⏳ 未完成: {', '.join(m.name for m in pending)}")
+        else:
+            print(f"📌 当前版本: {runner.current_version}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -52,6 +52,16 @@ class DatabaseConfig:
         else:
             raise ValueError(f"未知的环境类型: {env}")
     
+    @classmethod
+    def is_query_profiler_enabled(cls) -> bool:
+        """是否启用SQL查询分析器（WEALTH_LITE_SQL_PROFILER=0 关闭）"""
+        return os.getenv('WEALTH_LITE_SQL_PROFILER', '1').lower() not in ('0', 'false', 'off', 'no')
+
+    @classmethod
+    def get_slow_query_ms(cls) -> float:
+        """慢查询阈值（毫秒），默认100"""
+        return float(os.getenv('WEALTH_LITE_SLOW_QUERY_MS', '100'))
+
     @classmethod
     def is_memory_db(cls, env: Optional[str] = None) -> bool:
         """判断是否为内存数据库"""
@@ -1,41 +1,116 @@
+"""
+日志配置
+
+日志经 QueueHandler 放入队列，由后台 QueueListener 线程写入文件与控制台，
+请求处理线程不再等待磁盘IO：
+- 日志级别按运行环境选择，可由 WEALTH_LITE_LOG_LEVEL 覆盖
+- 日志文件按大小轮转（logs/wealth_lite.log，保留 LOG_BACKUP_COUNT 个备份）
+- WEALTH_LITE_LOG_FORMAT=json 时日志文件输出每行一个JSON对象，便于检索与采集
+"""
+
+import atexit
+import json
 import logging
+import logging.handlers
 import os
-import glob
-import time
+import queue
 from datetime import datetime
+from typing import Optional
 
-# 日志保留天数
-LOG_RETENTION_DAYS = 30
+from .database_config import DatabaseConfig
 
-# 日志级别（可由外部覆盖）
-LOG_LEVEL = logging.DEBUG  # 可选: logging.INFO, logging.WARNING, logging.ERROR, logging.CRITICAL
+# 各运行环境的默认日志级别
+ENVIRONMENT_LOG_LEVELS = {
+    DatabaseConfig.PRODUCTION: logging.INFO,
+    DatabaseConfig.DEVELOPMENT: logging.INFO,
+    DatabaseConfig.TEST: logging.WARNING,
+}
 
 # 日志目录和文件名
 LOG_DIR = "logs"
-LOG_FILE = f"{LOG_DIR}/wealth_lite_{datetime.now().strftime('%Y%m%d')}.log"
+LOG_FILE = f"{LOG_DIR}/wealth_lite.log"
+
+# 单个日志文件上限与保留的轮转文件数
+LOG_MAX_BYTES = 10 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s %(message)s"
+
+# 根日志器上的队列处理器与后台写日志的监听线程（setup_logging 创建）
+_queue_handler: Optional[logging.handlers.QueueHandler] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """每条日志输出为一行JSON"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "thread": record.threadName,
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
 
 
-def setup_logging(log_level=LOG_LEVEL):
+def get_log_level() -> int:
+    """当前环境的日志级别（WEALTH_LITE_LOG_LEVEL 优先，如 DEBUG / INFO / WARNING）"""
+    configured = os.getenv("WEALTH_LITE_LOG_LEVEL")
+    if configured:
+        level = logging.getLevelName(configured.strip().upper())
+        if isinstance(level, int):
+            return level
+    return ENVIRONMENT_LOG_LEVELS.get(DatabaseConfig.get_environment(), logging.INFO)
+
+
+def setup_logging(log_level: Optional[int] = None) -> logging.handlers.QueueListener:
+    """
+    配置根日志器：QueueHandler -> 队列 -> 后台线程写入轮转文件与控制台
+
+    重复调用时只更新日志级别。
+
+    Args:
+        log_level: 日志级别，默认按 get_log_level() 选择
+    """
+    global _queue_handler, _listener
+    log_level = get_log_level() if log_level is None else log_level
+    root = logging.getLogger()
+    root.setLevel(log_level)
+    if _listener is not None:
+        return _listener
+
     os.makedirs(LOG_DIR, exist_ok=True)
-    logging.basicConfig(
-        level=log_level,
-        format="%(asctime)s %(levelname)s %(name)s %(message)s",
-        handlers=[
-            logging.FileHandler(LOG_FILE, encoding="utf-8"),
-            logging.StreamHandler()
-        ]
+    file_handler = logging.handlers.RotatingFileHandler(
+        LOG_FILE, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding="utf-8"
     )
-    cleanup_old_logs()
-
-
-def cleanup_old_logs():
-    now = time.time()
-    for log_file in glob.glob(f"{LOG_DIR}/wealth_lite_*.log"):
-        if os.path.isfile(log_file):
-            mtime = os.path.getmtime(log_file)
-            if now - mtime > LOG_RETENTION_DAYS * 86400:
-                try:
-                    os.remove(log_file)
-                    logging.info(f"已自动删除过期日志文件: {log_file}")
-                except Exception as e:
-                    logging.warning(f"删除日志文件失败: {log_file}, 错误: {e}") 
\ No newline at end of file
+    if os.getenv("WEALTH_LITE_LOG_FORMAT", "text").lower() == "json":
+        file_handler.setFormatter(JsonFormatter())
+    else:
+        file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _queue_handler = logging.handlers.QueueHandler(log_queue)
+    root.addHandler(_queue_handler)
+    _listener = logging.handlers.QueueListener(log_queue, file_handler, stream_handler,
+                                               respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    return _listener
+
+
+def shutdown_logging() -> None:
+    """写完队列中剩余的日志并停止后台线程"""
+    global _queue_handler, _listener
+    if _listener is None:
+        return
+    logging.getLogger().removeHandler(_queue_handler)
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _queue_handler = _listener = None
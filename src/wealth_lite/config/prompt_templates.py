@@ -123,28 +123,26 @@ RESULT_TEMPLATES = {
 def get_system_prompt(prompt_type: str = "default") -> str:
     """获取系统提示模板"""
     prompt = SYSTEM_PROMPTS.get(prompt_type, SYSTEM_PROMPTS["default"])
-    logger.info(f"使用系统提示类型: {prompt_type}")
-    logger.debug(f"系统提示内容: {prompt[:100]}...")
+    logger.debug("使用系统提示类型: %s，内容: %.100s...", prompt_type, prompt)
     return prompt
 
 def get_user_prompt(prompt_type: str = "default") -> str:
     """获取用户提示模板"""
     prompt = USER_PROMPTS.get(prompt_type, USER_PROMPTS["default"])
-    logger.info(f"使用用户提示类型: {prompt_type}")
-    logger.debug(f"用户提示模板: {prompt[:100]}...")
+    logger.debug("使用用户提示类型: %s，模板: %.100s...", prompt_type, prompt)
     return prompt
 
 def get_result_template(template_type: str = "default") -> Dict[str, Any]:
     """获取结果模板配置"""
     template = RESULT_TEMPLATES.get(template_type, RESULT_TEMPLATES["default"])
-    logger.info(f"使用结果模板类型: {template_type}")
+    logger.debug("使用结果模板类型: %s", template_type)
     return template
 
 def format_user_prompt(prompt_type: str, user_prompt: str, data: str) -> str:
     """格式化用户提示"""
     template = get_user_prompt(prompt_type)
     formatted = template.format(user_prompt=user_prompt, data=data)
-    logger.info(f"已格式化用户提示，类型: {prompt_type}, 长度: {len(formatted)}")
+    logger.debug("已格式化用户提示，类型: %s, 长度: %d", prompt_type, len(formatted))
     return formatted
 
 def get_available_prompt_types() -> Dict[str, Dict[str, str]]:
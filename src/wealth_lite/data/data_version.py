@@ -0,0 +1,145 @@
+"""
+WealthLite 数据版本计数器
+
+Repository写入成功后调用bump()递增版本号，读取方以版本号作为缓存键：
+- version: 全局版本，任何写入都会递增
+- asset_version(asset_id): 资产级版本，只有涉及该资产的写入（或全局性写入）才会变化
+
+版本号持久化在数据库的data_versions/asset_versions表中，其他进程（导入脚本、迁移脚本）
+写入或恢复备份后，读取version时会重新读取并发现变化；同一数据库文件的多个DatabaseManager
+共享同一个计数器，内存中只缓存最近一次读到的版本。未提供数据库连接时退化为纯内存计数器。
+"""
+
+import os
+import sqlite3
+import threading
+import uuid
+from typing import Callable, ContextManager, Dict, Iterable, List, Optional
+
+ConnectionFactory = Callable[[], ContextManager[sqlite3.Connection]]
+
+
+class DataVersion:
+    """数据版本计数器（线程安全）"""
+
+    _registry: Dict[str, 'DataVersion'] = {}
+    _registry_lock = threading.Lock()
+
+    @classmethod
+    def for_database(cls, db_path: str, connect: Optional[ConnectionFactory] = None) -> 'DataVersion':
+        """获取数据库文件对应的共享计数器（内存数据库各自独立）"""
+        if db_path == ":memory:":
+            return cls(connect)
+        with cls._registry_lock:
+            key = os.path.abspath(db_path)
+            if key not in cls._registry:
+                cls._registry[key] = cls(connect)
+            return cls._registry[key]
+
+    def __init__(self, connect: Optional[ConnectionFactory] = None):
+        self.boot_id = uuid.uuid4().hex[:8]
+        self._connect = connect
+        self._lock = threading.Lock()
+        self._version = 0
+        self._all_version = 0  # 最近一次影响全部资产的写入
+        self._asset_versions: Dict[str, int] = {}
+        self._listeners: List[Callable[[int], None]] = []
+
+    @property
+    def version(self) -> int:
+        """全局版本（从数据库读取最新值）"""
+        return self.refresh()
+
+    def asset_version(self, asset_id: str) -> int:
+        """资产级版本（使用最近一次refresh()读到的值）"""
+        return max(self._asset_versions.get(asset_id, 0), self._all_version)
+
+    def refresh(self) -> int:
+        """
+        重新读取数据库中的版本号
+
+        其他进程写入后全局版本变大，只重新加载变化的资产版本；版本变小说明数据库文件
+        被外部替换，递增一次版本，保证缓存键不会与替换前的版本重复。
+
+        Returns:
+            当前全局版本
+        """
+        if self._connect is None:
+            return self._version
+        with self._connect() as conn:
+            version, all_version = conn.execute(
+                "SELECT version, all_version FROM data_versions WHERE id = 1").fetchone()
+            if version == self._version:
+                return version
+            if version < self._version:
+                return self.bump()
+            changed = conn.execute(
+                "SELECT asset_id, version FROM asset_versions WHERE version > ?", (self._version,)
+            ).fetchall()
+
+        with self._lock:
+            if version <= self._version:
+                return self._version
+            self._version = version
+            self._all_version = all_version
+            self._asset_versions.update((row[0], row[1]) for row in changed)
+            listeners = list(self._listeners)
+
+        for listener in listeners:
+            listener(version)
+        return version
+
+    def bump(self, asset_ids: Optional[Iterable[str]] = None) -> int:
+        """
+        递增版本
+
+        Args:
+            asset_ids: 受影响的资产ID；None表示影响全部资产（如汇率变化）
+
+        Returns:
+            新的全局版本
+        """
+        asset_ids = None if asset_ids is None else list(asset_ids)
+        with self._lock:
+            if self._connect is None:
+                version = self._version + 1
+            else:
+                version = self._persist(asset_ids)
+            self._version = version
+            if asset_ids is None:
+                self._all_version = version
+            else:
+                for asset_id in asset_ids:
+                    self._asset_versions[asset_id] = version
+            listeners = list(self._listeners)
+
+        for listener in listeners:
+            listener(version)
+        return version
+
+    def _persist(self, asset_ids: Optional[List[str]]) -> int:
+        """在数据库中递增版本并返回新版本（不低于内存中已见过的版本，恢复旧备份后仍单调递增）"""
+        with self._connect() as conn:
+            conn.execute("UPDATE data_versions SET version = MAX(version, ?) + 1 WHERE id = 1",
+                         (self._version,))
+            version = conn.execute("SELECT version FROM data_versions WHERE id = 1").fetchone()[0]
+            if asset_ids is None:
+                conn.execute("UPDATE data_versions SET all_version = version WHERE id = 1")
+            else:
+                conn.executemany(
+                    "INSERT INTO asset_versions (asset_id, version) VALUES (?, ?) "
+                    "ON CONFLICT(asset_id) DO UPDATE SET version = excluded.version",
+                    [(asset_id, version) for asset_id in asset_ids])
+            conn.commit()
+        return version
+
+    def subscribe(self, listener: Callable[[int], None]) -> None:
+        """注册版本变化回调（在写入线程中调用，回调应尽快返回）"""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[int], None]) -> None:
+        """取消版本变化回调"""
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
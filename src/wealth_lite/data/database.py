@@ -7,15 +7,21 @@ WealthLite 数据库管理器
 
 import os
 import sqlite3
-import json
 import logging
+import time
 from pathlib import Path
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, List, Tuple, Iterator, Callable
 from contextlib import contextmanager
 from datetime import datetime
 
 from ..models.enums import Currency
 from ..config.database_config import DatabaseConfig
+from .data_version import DataVersion
+from .migrations import MigrationRunner
+from .query_profiler import QueryProfiler
+
+# 查询钩子：hook(sql, 耗时秒数, 行数)，查询为读取行数，写入为影响行数
+QueryHook = Callable[[str, float, int], None]
 
 
 class DatabaseManager:
@@ -29,7 +35,7 @@ class DatabaseManager:
     - 处理事务管理
     """
     
-    def __init__(self, db_path: Optional[str] = None):
+    def __init__(self, db_path: Optional[str] = None, profiler: Optional[QueryProfiler] = None):
         """
         初始化数据库管理器
         
@@ -38,6 +44,7 @@ class DatabaseManager:
                     - 测试环境：使用内存数据库 ":memory:"
                     - 开发环境：使用 user_data/wealth_lite_dev.db
                     - 生产环境：使用 user_data/wealth_lite.db
+            profiler: SQL查询分析器，默认按环境变量创建（WEALTH_LITE_SQL_PROFILER=0 时不启用）
         """
         if db_path is None:
             # 使用配置类根据环境自动选择数据库路径
@@ -53,6 +60,17 @@ class DatabaseManager:
         self.logger = logging.getLogger(__name__)
         self._connection: Optional[sqlite3.Connection] = None
         
+        # 数据版本计数器，Repository写入后递增，供响应缓存判断失效
+        self.data_version = DataVersion.for_database(self.db_path, self.get_connection)
+
+        # 查询钩子（请求级性能指标等），经execute_*/iter_query执行的语句完成后调用
+        self._query_hooks: List[QueryHook] = []
+
+        # SQL查询分析器：trace回调统计事务外的语句，execute_*记录耗时、慢查询与查询计划
+        self.profiler = profiler or QueryProfiler.from_config(explain=self.explain_query)
+        if self.profiler and self.profiler.explain is None:
+            self.profiler.explain = self.explain_query
+        
         # 初始化数据库
         self._initialize_database()
     
@@ -67,8 +85,29 @@ class DatabaseManager:
             
             # 创建索引
             self._create_indexes(conn)
+            
+            # 执行未完成的版本迁移
+            self.migration_runner = MigrationRunner(conn)
+            migrated = self.migration_runner.run()
+            
+            # 全文检索索引（SQLite未编译FTS5时退化为LIKE查询）
+            self.fts_enabled = self._create_search_index(conn)
+            conn.commit()
             self._connection = conn
             self.logger.info(f"数据库初始化完成: {self.db_path}")
+        if migrated:
+            # 迁移改写了已有数据
+            self.data_version.bump()
+    
+    # 记录原地修改/删除的源表 -> 计入的导出表（详情表的修改计入交易表）
+    MODIFICATION_TRACKED_TABLES = {
+        'assets': 'assets',
+        'transactions': 'transactions',
+        'cash_transactions': 'transactions',
+        'fixed_income_transactions': 'transactions',
+        'equity_transactions': 'transactions',
+        'portfolio_snapshots': 'portfolio_snapshots',
+    }
     
     def _create_tables(self, conn: sqlite3.Connection) -> None:
         """创建所有数据表"""
@@ -97,10 +136,10 @@ class DatabaseManager:
                 asset_id TEXT NOT NULL,                                   -- 关联的资产ID（软关联到assets表）
                 transaction_date DATE NOT NULL,                           -- 交易发生日期（YYYY-MM-DD格式）
                 transaction_type TEXT NOT NULL,                           -- 交易类型（BUY/SELL/DEPOSIT/WITHDRAW/INTEREST/DIVIDEND等）
-                amount DECIMAL(15,4) NOT NULL,                           -- 交易金额（原币种，最多15位数字，4位小数）
+                amount INTEGER NOT NULL,                                  -- 交易金额（原币种，最小单位整数，放大10^4）
                 currency TEXT NOT NULL,                                   -- 交易币种（CNY/USD/EUR等）
                 exchange_rate DECIMAL(10,6) NOT NULL DEFAULT 1.0,        -- 对基础货币的汇率（默认1.0表示同币种）
-                amount_base_currency DECIMAL(15,4) NOT NULL,             -- 基础货币金额（用于统一计算）
+                amount_base_currency INTEGER NOT NULL,                   -- 基础货币金额（最小单位整数，用于统一计算）
                 notes TEXT,                                              -- 交易备注信息
                 created_date DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP -- 记录创建时间
             )
@@ -125,7 +164,7 @@ class DatabaseManager:
                 maturity_date DATE,                     -- 到期日期（YYYY-MM-DD格式）
                 interest_type TEXT,                     -- 利息类型（SIMPLE/COMPOUND/FLOATING）
                 payment_frequency TEXT,                 -- 付息频率（MATURITY/MONTHLY/QUARTERLY/ANNUALLY）
-                face_value DECIMAL(15,4),              -- 面值金额
+                face_value INTEGER,                     -- 面值金额（最小单位整数）
                 coupon_rate DECIMAL(8,4)               -- 票面利率（百分比）
             )
         """)
@@ -162,17 +201,17 @@ class DatabaseManager:
                 base_currency TEXT NOT NULL,                                -- 基础货币（CNY/USD等）
                 
                 -- 组合概览数据
-                total_value DECIMAL(20,2) NOT NULL,                        -- 总价值（基础货币）
-                total_cost DECIMAL(20,2) NOT NULL,                         -- 总成本（基础货币）
-                total_return DECIMAL(20,2) NOT NULL,                       -- 总收益（基础货币）
+                total_value INTEGER NOT NULL,                              -- 总价值（基础货币，最小单位整数）
+                total_cost INTEGER NOT NULL,                               -- 总成本（基础货币，最小单位整数）
+                total_return INTEGER NOT NULL,                             -- 总收益（基础货币，最小单位整数）
                 total_return_rate DECIMAL(10,4) NOT NULL,                  -- 总收益率（小数形式）
                 
                 -- 分类统计
-                cash_value DECIMAL(20,2) DEFAULT 0,                        -- 现金价值
-                fixed_income_value DECIMAL(20,2) DEFAULT 0,                -- 固收价值
-                equity_value DECIMAL(20,2) DEFAULT 0,                      -- 权益价值
-                real_estate_value DECIMAL(20,2) DEFAULT 0,                 -- 房产价值
-                commodity_value DECIMAL(20,2) DEFAULT 0,                   -- 商品价值
+                cash_value INTEGER DEFAULT 0,                              -- 现金价值
+                fixed_income_value INTEGER DEFAULT 0,                      -- 固收价值
+                equity_value INTEGER DEFAULT 0,                            -- 权益价值
+                real_estate_value INTEGER DEFAULT 0,                       -- 房产价值
+                commodity_value INTEGER DEFAULT 0,                         -- 商品价值
                 
                 -- 业绩指标
                 annualized_return DECIMAL(10,4) DEFAULT 0,                 -- 年化收益率
@@ -255,6 +294,115 @@ class DatabaseManager:
             )
         """)
         
+        # 10. 汇率表 - 存储每日汇率（1单位基础货币 = rate 单位报价货币）
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS fx_rates (
+                rate_date DATE NOT NULL,                                  -- 汇率日期（YYYY-MM-DD格式）
+                base_currency TEXT NOT NULL,                              -- 基础货币（如USD）
+                quote_currency TEXT NOT NULL,                             -- 报价货币（如CNY）
+                rate REAL NOT NULL,                                       -- 汇率
+                source TEXT,                                              -- 数据来源（如CSV文件名）
+                PRIMARY KEY (base_currency, quote_currency, rate_date)
+            )
+        """)
+        
+        # 11. 资产价格表 - 存储每日收盘价（资产币种，最小单位整数）
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS asset_prices (
+                asset_id TEXT NOT NULL,                                   -- 资产ID（软关联到assets表）
+                price_date DATE NOT NULL,                                 -- 价格日期（YYYY-MM-DD格式）
+                close_price INTEGER NOT NULL,                             -- 收盘价（资产币种，最小单位）
+                source TEXT,                                              -- 数据来源（如CSV文件名）
+                PRIMARY KEY (asset_id, price_date)
+            )
+        """)
+        
+        # 12. 批次账簿表 - 持久化权益类持仓的成本计价状态，新增交易只需增量应用
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS lot_books (
+                asset_id TEXT NOT NULL,                                   -- 资产ID（软关联到assets表）
+                method TEXT NOT NULL,                                     -- 成本计价方法（FIFO/LIFO/AVERAGE）
+                realized INTEGER NOT NULL DEFAULT 0,                      -- 已实现交易损益（最小单位整数）
+                applied_count INTEGER NOT NULL DEFAULT 0,                 -- 已应用的交易笔数
+                last_rowid INTEGER NOT NULL DEFAULT 0,                    -- 已应用的最大交易rowid
+                last_date DATE,                                           -- 最后应用的交易日期
+                updated_date DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP, -- 更新时间
+                PRIMARY KEY (asset_id, method)
+            )
+        """)
+        
+        # 13. 未平仓批次表 - 批次账簿的明细
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS open_lots (
+                asset_id TEXT NOT NULL,                                   -- 资产ID
+                method TEXT NOT NULL,                                     -- 成本计价方法
+                seq INTEGER NOT NULL,                                     -- 批次顺序
+                transaction_id TEXT NOT NULL,                             -- 建立批次的交易ID
+                acquired_date DATE NOT NULL,                              -- 建立日期
+                quantity TEXT NOT NULL,                                   -- 未平仓数量（十进制文本，拆股后保持精确）
+                cost INTEGER NOT NULL,                                    -- 未平仓成本（最小单位整数）
+                PRIMARY KEY (asset_id, method, seq)
+            )
+        """)
+        
+        # 14. 批次账簿失效计数表 - 交易被修改或删除时由触发器递增，
+        #     保存账簿时校验计数未变，避免并发读取到的旧数据覆盖失效
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS lot_invalidations (
+                asset_id TEXT PRIMARY KEY,                                -- 资产ID
+                generation INTEGER NOT NULL DEFAULT 0                     -- 失效次数
+            )
+        """)
+        
+        # 交易被修改（含移到其他资产）或删除时，在同一事务中清除涉及资产的批次账簿
+        for event, assets in (('UPDATE', ('old', 'new')), ('DELETE', ('old',))):
+            statements = "".join(f"""
+                    DELETE FROM lot_books WHERE asset_id = {row}.asset_id;
+                    DELETE FROM open_lots WHERE asset_id = {row}.asset_id;
+                    INSERT INTO lot_invalidations (asset_id, generation) VALUES ({row}.asset_id, 1)
+                        ON CONFLICT(asset_id) DO UPDATE SET generation = generation + 1;"""
+                for row in assets)
+            conn.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS transactions_lots_{event[0].lower()}
+                AFTER {event} ON transactions BEGIN{statements}
+                END
+            """)
+        
+        # 15. 数据版本表 - 单行全局版本，写入成功后递增，跨进程判断响应缓存是否失效
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS data_versions (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                version INTEGER NOT NULL DEFAULT 0,                       -- 全局版本
+                all_version INTEGER NOT NULL DEFAULT 0                    -- 最近一次影响全部资产的版本
+            )
+        """)
+        conn.execute("INSERT OR IGNORE INTO data_versions (id, version, all_version) VALUES (1, 0, 0)")
+        
+        # 16. 资产数据版本表 - 最近一次涉及该资产的写入版本
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS asset_versions (
+                asset_id TEXT PRIMARY KEY,                                -- 资产ID
+                version INTEGER NOT NULL                                  -- 版本
+            )
+        """)
+        
+        # 17. 原地修改计数表 - 行被更新或删除时由触发器递增，增量导出据此判断能否只追加新行
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS table_modifications (
+                table_name TEXT PRIMARY KEY,                              -- 导出表名
+                generation INTEGER NOT NULL DEFAULT 0                     -- 修改/删除次数
+            )
+        """)
+        for source, target in self.MODIFICATION_TRACKED_TABLES.items():
+            for event in ('UPDATE', 'DELETE'):
+                conn.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS {source}_modified_{event[0].lower()}
+                    AFTER {event} ON {source} BEGIN
+                        INSERT INTO table_modifications (table_name, generation) VALUES ('{target}', 1)
+                            ON CONFLICT(table_name) DO UPDATE SET generation = generation + 1;
+                    END
+                """)
+        
         self.logger.info("数据表创建完成")
     
     def _create_indexes(self, conn: sqlite3.Connection) -> None:
@@ -270,6 +418,11 @@ class DatabaseManager:
         conn.execute("CREATE INDEX IF NOT EXISTS idx_transactions_date ON transactions(transaction_date)")
         conn.execute("CREATE INDEX IF NOT EXISTS idx_transactions_type ON transactions(transaction_type)")
         conn.execute("CREATE INDEX IF NOT EXISTS idx_transactions_currency ON transactions(currency)")
+        # 交易列表的键集分页：全表按日期倒序，以及按资产过滤后按日期倒序
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_transactions_date_created "
+                     "ON transactions(transaction_date DESC, created_date DESC, transaction_id DESC)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_transactions_asset_date "
+                     "ON transactions(asset_id, transaction_date DESC, created_date DESC, transaction_id DESC)")
         
         # 详情表索引
         conn.execute("CREATE INDEX IF NOT EXISTS idx_cash_transaction_id ON cash_transactions(transaction_id)")
@@ -294,19 +447,129 @@ class DatabaseManager:
         
         self.logger.info("索引创建完成")
     
+    # 全文检索表：(FTS表名, 源表名, 索引列)
+    # 使用外部内容表（content=源表，按rowid关联），由触发器与源表保持同步；
+    # trigram分词支持中文子串匹配（查询词至少3个字符）
+    SEARCH_INDEXES = (
+        ('assets_fts', 'assets', ('asset_name', 'description', 'issuer')),
+        ('transaction_notes_fts', 'transactions', ('notes',)),
+    )
+    
+    def _create_search_index(self, conn: sqlite3.Connection) -> bool:
+        """
+        创建全文检索表与同步触发器，新建时从源表导入已有数据
+        
+        Returns:
+            是否支持全文检索
+        """
+        try:
+            for fts, source, columns in self.SEARCH_INDEXES:
+                exists = conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts,)
+                ).fetchone()
+                column_list = ", ".join(columns)
+                new_values = ", ".join(f"new.{col}" for col in columns)
+                old_values = ", ".join(f"old.{col}" for col in columns)
+                conn.execute(f"""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+                        {column_list}, content='{source}', content_rowid='rowid', tokenize='trigram'
+                    )
+                """)
+                conn.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {source} BEGIN
+                        INSERT INTO {fts}(rowid, {column_list}) VALUES (new.rowid, {new_values});
+                    END
+                """)
+                conn.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {source} BEGIN
+                        INSERT INTO {fts}({fts}, rowid, {column_list}) VALUES ('delete', old.rowid, {old_values});
+                    END
+                """)
+                conn.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {column_list} ON {source} BEGIN
+                        INSERT INTO {fts}({fts}, rowid, {column_list}) VALUES ('delete', old.rowid, {old_values});
+                        INSERT INTO {fts}(rowid, {column_list}) VALUES (new.rowid, {new_values});
+                    END
+                """)
+                if not exists:
+                    conn.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+            conn.commit()
+            return True
+        except sqlite3.OperationalError as e:
+            self.logger.warning(f"⚠️ SQLite不支持FTS5全文检索，搜索将使用LIKE查询: {e}")
+            return False
+    
+    def rebuild_search_index(self) -> None:
+        """从源表重建全文检索索引"""
+        if not self.fts_enabled:
+            return
+        with self.transaction() as conn:
+            for fts, _, _ in self.SEARCH_INDEXES:
+                conn.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+    @contextmanager
+    def bulk_load(self, tables: Tuple[str, ...]):
+        """
+        批量导入上下文管理器（合成数据、大批量导入）
+
+        导入期间删除指定表上的二级索引与全文检索的插入触发器，关闭同步写盘与SQL跟踪，
+        所有写入在同一事务中完成；结束后按原定义重建索引与触发器、重建全文检索并递增数据版本。
+        导入失败时回滚并同样恢复索引与触发器。
+
+        Args:
+            tables: 将要批量写入的表名
+        """
+        with self.get_connection() as conn:
+            conn.set_trace_callback(None)
+            placeholders = ", ".join("?" for _ in tables)
+            objects = conn.execute(
+                f"""SELECT type, name, sql FROM sqlite_master
+                    WHERE tbl_name IN ({placeholders}) AND sql IS NOT NULL
+                      AND (type = 'index' OR (type = 'trigger' AND name LIKE '%\\_fts\\_ai' ESCAPE '\\'))""",
+                tables
+            ).fetchall()
+            conn.execute("PRAGMA synchronous = OFF")
+            conn.execute("PRAGMA cache_size = -262144")
+            conn.execute("PRAGMA temp_store = MEMORY")
+            for object_type, name, _ in objects:
+                conn.execute(f"DROP {object_type.upper()} IF EXISTS {name}")
+            try:
+                yield conn
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                for _, _, sql in objects:
+                    conn.execute(sql)
+                if self.fts_enabled:
+                    for fts, source, _ in self.SEARCH_INDEXES:
+                        if source in tables:
+                            conn.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+                conn.commit()
+                conn.execute("PRAGMA synchronous = FULL")
+                if self.profiler:
+                    conn.set_trace_callback(self.profiler.trace)
+                self.logger.info(f"批量导入完成，已重建 {len(objects)} 个索引/触发器: {', '.join(tables)}")
+        self.data_version.bump()
+
     @contextmanager
     def get_connection(self):
         """获取数据库连接的上下文管理器"""
         if self.db_path == ":memory:":
             # 内存数据库需要保持持久连接
             if self._connection is None:
-                self._connection = sqlite3.connect(self.db_path)
+                self._connection = sqlite3.connect(self.db_path, detect_types=sqlite3.PARSE_COLNAMES)
                 self._connection.row_factory = sqlite3.Row
+                if self.profiler:
+                    self._connection.set_trace_callback(self.profiler.trace)
             yield self._connection
         else:
             # 文件数据库使用临时连接
-            conn = sqlite3.connect(self.db_path)
+            conn = sqlite3.connect(self.db_path, detect_types=sqlite3.PARSE_COLNAMES)
             conn.row_factory = sqlite3.Row
+            if self.profiler:
+                conn.set_trace_callback(self.profiler.trace)
             try:
                 yield conn
             finally:
@@ -314,34 +577,103 @@ class DatabaseManager:
     
     @contextmanager
     def transaction(self):
-        """事务上下文管理器"""
+        """
+        事务上下文管理器
+
+        事务主要用于批量写入：SQL跟踪回调对executemany的每一行都会触发，
+        开销可达写入本身的数倍，因此事务期间与bulk_load一样关闭跟踪，结束后恢复。
+        """
         with self.get_connection() as conn:
+            conn.set_trace_callback(None)
             try:
                 yield conn
                 conn.commit()
             except Exception:
                 conn.rollback()
                 raise
+            finally:
+                if self.profiler:
+                    conn.set_trace_callback(self.profiler.trace)
     
+    def add_query_hook(self, hook: QueryHook) -> None:
+        """注册查询钩子"""
+        if hook not in self._query_hooks:
+            self._query_hooks.append(hook)
+
+    def remove_query_hook(self, hook: QueryHook) -> None:
+        """移除查询钩子"""
+        if hook in self._query_hooks:
+            self._query_hooks.remove(hook)
+
+    def explain_query(self, query: str, params: Tuple = ()) -> List[str]:
+        """获取查询计划（EXPLAIN QUERY PLAN的明细列）"""
+        with self.get_connection() as conn:
+            return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {query}", params).fetchall()]
+
+    def _notify_query(self, query: str, params: Tuple, seconds: float, rows: int) -> None:
+        """通知查询分析器与查询钩子，钩子异常不影响查询本身"""
+        if self.profiler:
+            self.profiler.observe(query, params, seconds, rows)
+        for hook in self._query_hooks:
+            try:
+                hook(query, seconds, rows)
+            except Exception as e:
+                self.logger.warning(f"查询钩子执行失败: {e}")
+
     def execute_query(self, query: str, params: Tuple = ()) -> List[sqlite3.Row]:
         """执行查询并返回结果"""
+        started = time.perf_counter()
         with self.get_connection() as conn:
             cursor = conn.execute(query, params)
-            return cursor.fetchall()
-    
+            rows = cursor.fetchall()
+        if self.profiler or self._query_hooks:
+            self._notify_query(query, params, time.perf_counter() - started, len(rows))
+        return rows
+
+    def iter_query(self, query: str, params: Tuple = (), chunk_size: int = 1000) -> Iterator[sqlite3.Row]:
+        """
+        流式执行查询，按chunk_size分批从游标读取
+
+        与execute_query不同，结果不会一次性加载到内存，适用于导出等大结果集场景。
+        连接在迭代结束（或生成器关闭）时释放。耗时只统计数据库部分，不含调用方处理结果的时间。
+        """
+        elapsed, count = 0.0, 0
+        with self.get_connection() as conn:
+            started = time.perf_counter()
+            cursor = conn.execute(query, params)
+            try:
+                while True:
+                    rows = cursor.fetchmany(chunk_size)
+                    elapsed += time.perf_counter() - started
+                    if not rows:
+                        break
+                    count += len(rows)
+                    yield from rows
+                    started = time.perf_counter()
+            finally:
+                cursor.close()
+                if self.profiler or self._query_hooks:
+                    self._notify_query(query, params, elapsed, count)
+
     def execute_update(self, query: str, params: Tuple = ()) -> int:
         """执行更新操作并返回影响的行数"""
+        started = time.perf_counter()
         with self.get_connection() as conn:
             cursor = conn.execute(query, params)
             conn.commit()
-            return cursor.rowcount
+        if self.profiler or self._query_hooks:
+            self._notify_query(query, params, time.perf_counter() - started, max(cursor.rowcount, 0))
+        return cursor.rowcount
     
     def execute_insert(self, query: str, params: Tuple = ()) -> str:
         """执行插入操作并返回最后插入的行ID"""
+        started = time.perf_counter()
         with self.get_connection() as conn:
             cursor = conn.execute(query, params)
             conn.commit()
-            return cursor.lastrowid
+        if self.profiler or self._query_hooks:
+            self._notify_query(query, params, time.perf_counter() - started, max(cursor.rowcount, 0))
+        return cursor.lastrowid
     
     def get_table_info(self, table_name: str) -> List[sqlite3.Row]:
         """获取表结构信息"""
@@ -355,6 +687,8 @@ class DatabaseManager:
         """清理数据库，回收空间"""
         with self.get_connection() as conn:
             conn.execute("VACUUM")
+        # VACUUM可能改变没有INTEGER PRIMARY KEY的表的rowid，按rowid关联的全文索引需要重建
+        self.rebuild_search_index()
         self.logger.info("数据库清理完成")
     
     def backup_database(self, backup_path: Optional[str] = None) -> str:
@@ -399,25 +733,24 @@ class DatabaseManager:
         import shutil
         shutil.copy2(backup_path, self.db_path)
         
+        # 备份可能来自旧版本：补齐表结构与迁移，并递增数据版本使缓存失效
+        self._initialize_database()
+        self.data_version.bump()
+        
         self.logger.info(f"数据库恢复完成: {backup_path}")
     
     def get_version_info(self) -> Dict[str, Any]:
-        """获取数据库版本信息"""
-        try:
-            # 尝试从配置文件读取版本信息
-            config_path = self.db_path.parent / "config" / "db_version.json"
-            if config_path.exists():
-                with open(config_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-        except Exception:
-            pass
-        
-        # 默认版本信息
-        return {
-            "version": "1.0.0",
-            "created_date": datetime.now().isoformat(),
-            "last_migration": None
-        }
+        """获取数据库版本信息（来自schema_version迁移记录）"""
+        with self.get_connection() as conn:
+            runner = MigrationRunner(conn)
+            history = runner.history()
+            return {
+                "version": runner.current_version,
+                "latest_version": max((m.version for m in runner.migrations), default=0),
+                "pending": [m.name for m in runner.pending()],
+                "last_migration": history[-1] if history else None,
+                "history": history,
+            }
     
     def close(self) -> None:
         """关闭数据库连接"""
@@ -0,0 +1,73 @@
+"""
+WealthLite 汇率数据访问层
+
+提供 fx_rates 表的批量写入与读取。
+汇率含义：1单位 base_currency = rate 单位 quote_currency。
+"""
+
+import logging
+from datetime import date
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from .database import DatabaseManager
+
+
+# (汇率日期, 基础货币, 报价货币, 汇率, 来源)
+FxRateRow = Tuple[date, str, str, float, Optional[str]]
+
+
+class FxRateRepository:
+    """汇率数据访问层"""
+
+    _UPSERT_SQL = """
+        INSERT OR REPLACE INTO fx_rates (rate_date, base_currency, quote_currency, rate, source)
+        VALUES (?, ?, ?, ?, ?)
+    """
+
+    def __init__(self, db_manager: DatabaseManager):
+        self.db = db_manager
+        self.logger = logging.getLogger(__name__)
+
+    def save_many(self, rows: Iterable[FxRateRow]) -> int:
+        """
+        批量写入汇率（同一日期同一货币对覆盖旧值），在单个事务中完成
+
+        Returns:
+            写入的行数
+        """
+        params = [
+            (rate_date.isoformat(), base, quote, float(rate), source)
+            for rate_date, base, quote, rate, source in rows
+        ]
+        if not params:
+            return 0
+        with self.db.transaction() as conn:
+            conn.executemany(self._UPSERT_SQL, params)
+        # 汇率影响全部外币资产
+        self.db.data_version.bump()
+        return len(params)
+
+    def iter_all(self) -> Iterator[Tuple[str, str, str, float]]:
+        """按货币对、日期顺序读取全部汇率：(日期文本, 基础货币, 报价货币, 汇率)"""
+        query = """
+            SELECT rate_date, base_currency, quote_currency, rate FROM fx_rates
+            ORDER BY base_currency, quote_currency, rate_date
+        """
+        for row in self.db.iter_query(query, chunk_size=10000):
+            yield row['rate_date'], row['base_currency'], row['quote_currency'], row['rate']
+
+    def get_pairs(self) -> List[Tuple[str, str]]:
+        """获取已有的货币对"""
+        query = "SELECT DISTINCT base_currency, quote_currency FROM fx_rates ORDER BY 1, 2"
+        return [(row[0], row[1]) for row in self.db.execute_query(query)]
+
+    def count(self) -> int:
+        """汇率记录数"""
+        return self.db.execute_query("SELECT COUNT(*) FROM fx_rates")[0][0]
+
+    def delete_pair(self, base_currency: str, quote_currency: str) -> int:
+        """删除某个货币对的全部汇率"""
+        query = "DELETE FROM fx_rates WHERE base_currency = ? AND quote_currency = ?"
+        deleted = self.db.execute_update(query, (base_currency, quote_currency))
+        self.db.data_version.bump()
+        return deleted
@@ -0,0 +1,483 @@
+"""
+合成账本生成器（压力测试、长时间运行测试用）
+
+按随机种子生成多年的完整投资组合，直接批量写入SQLite：
+- 资产覆盖全部 AssetSubType，外币资产按每日汇率折算（汇率同时写入 fx_rates）
+- 现金：开户存入、工资式定期存入、随机取出（不超过余额）、按月结息
+- 固定收益：阶梯式配置，每档买入后按付息频率付息，到期赎回后滚动买入下一档
+- 权益：按月价格随机游走（写入 asset_prices），定投买入、部分卖出、按季分红
+- 快照：按月末汇总各类资产价值生成自动快照
+
+交易按资产逐个生成、分批写入，内存占用与总笔数无关；
+写入经 DatabaseManager.bulk_load 完成，导入期间不维护二级索引与全文检索。
+同一随机种子与参数生成的数据完全一致。
+"""
+
+import json
+import logging
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from ..models.enums import AssetSubType, AssetType
+from ..models.money import MONEY_FACTOR
+from .database import DatabaseManager
+
+# 每批写入的行数
+DEFAULT_BATCH_SIZE = 50_000
+
+# 外币及生成起点的汇率（1单位外币 = rate 人民币）与日波动率
+FX_CURRENCIES: Dict[str, Tuple[float, float]] = {
+    "USD": (6.2, 0.003),
+    "HKD": (0.80, 0.003),
+    "EUR": (7.0, 0.005),
+    "GBP": (9.5, 0.006),
+    "JPY": (0.055, 0.006),
+}
+
+# 各子类型的资产占比权重
+SUBTYPE_WEIGHTS: Dict[AssetSubType, int] = {
+    AssetSubType.CHECKING_ACCOUNT: 20,
+    AssetSubType.MONEY_MARKET_FUND: 10,
+    AssetSubType.TIME_DEPOSIT: 10,
+    AssetSubType.FOREIGN_CURRENCY_DEPOSIT: 4,
+    AssetSubType.BANK_WEALTH_PRODUCT: 8,
+    AssetSubType.GOVERNMENT_BOND: 6,
+    AssetSubType.CORPORATE_BOND: 6,
+    AssetSubType.DOMESTIC_STOCK: 16,
+    AssetSubType.FOREIGN_STOCK: 6,
+    AssetSubType.MUTUAL_FUND: 8,
+    AssetSubType.ETF: 6,
+}
+
+# 必为外币计价的子类型；其余子类型有 FOREIGN_RATIO 的概率为外币
+FOREIGN_SUBTYPES = (AssetSubType.FOREIGN_CURRENCY_DEPOSIT, AssetSubType.FOREIGN_STOCK)
+FOREIGN_RATIO = 0.1
+
+# 固定收益阶梯的期限（年）与付息频率
+LADDER_TERMS = (1, 2, 3, 5)
+PAYMENT_FREQUENCIES = (("MATURITY", 0), ("ANNUALLY", 12), ("SEMI_ANNUALLY", 6), ("QUARTERLY", 3), ("MONTHLY", 1))
+
+ISSUERS = ("招商银行", "工商银行", "建设银行", "中国银行", "华夏基金", "易方达", "财政部", "国家开发银行", "汇丰银行")
+
+# 部分交易带备注（全文检索的数据来源）
+NOTE_RATIO = 0.05
+NOTES = ("工资存入", "年终奖", "定投", "到期赎回", "再平衡", "家庭备用金", "旅行基金", "子女教育金", "税费缴纳")
+
+_MAIN_INSERT_SQL = """
+    INSERT INTO transactions (transaction_id, asset_id, transaction_date, transaction_type,
+        amount, currency, exchange_rate, amount_base_currency, notes)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_CASH_INSERT_SQL = """
+    INSERT INTO cash_transactions (transaction_id, account_type, interest_rate, compound_frequency)
+    VALUES (?, ?, ?, ?)
+"""
+_FIXED_INCOME_INSERT_SQL = """
+    INSERT INTO fixed_income_transactions (transaction_id, annual_rate, start_date, maturity_date,
+        interest_type, payment_frequency, face_value, coupon_rate)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_PRICE_INSERT_SQL = """
+    INSERT INTO asset_prices (asset_id, price_date, close_price, source) VALUES (?, ?, ?, 'generator')
+"""
+_EQUITY_INSERT_SQL = """
+    INSERT INTO equity_transactions (transaction_id, quantity, price_per_share, dividend_amount, split_ratio)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+
+@dataclass
+class GeneratedLedger:
+    """生成结果统计"""
+    asset_ids: List[str] = field(default_factory=list)
+    transactions: int = 0
+    fx_rates: int = 0
+    prices: int = 0
+    snapshots: int = 0
+    seconds: float = 0.0
+
+
+@dataclass
+class _AssetPlan:
+    """单个资产的生成参数"""
+    asset_id: str
+    asset_type: AssetType
+    subtype: AssetSubType
+    currency: str
+    open_day: int       # 开户/首次买入日（距起始日的天数）
+    quota: int          # 交易笔数
+
+
+class LedgerGenerator:
+    """
+    合成账本生成器
+
+    Args:
+        seed: 随机种子
+        start_date: 账本起始日期
+        years: 覆盖年数
+        batch_size: 每批写入的行数
+    """
+
+    def __init__(self, seed: int = 42, start_date: date = date(2015, 1, 1), years: int = 10,
+                 batch_size: int = DEFAULT_BATCH_SIZE):
+        self.seed = seed
+        self.start_date = start_date
+        self.days = int(years * 365.25)
+        self.batch_size = batch_size
+        self.logger = logging.getLogger(__name__)
+        self.rng = random.Random(seed)
+        # 日期文本、所属月份序号、每月第一天按天预先计算，生成时只做下标访问
+        dates = [start_date + timedelta(days=d) for d in range(self.days + 1)]
+        self._iso = [d.isoformat() for d in dates]
+        self._month = [(d.year - start_date.year) * 12 + d.month - start_date.month for d in dates]
+        self.months = self._month[-1] + 1
+        self._month_starts = [0] * self.months
+        for day in range(self.days, -1, -1):
+            self._month_starts[self._month[day]] = day
+        # 各月按资产类型记录的价值变化与净投入变化（基础货币），生成快照时累加
+        self._values: Dict[AssetType, List[float]] = {}
+        self._invested: List[float] = []
+        self._fx: Dict[str, List[float]] = {}
+        self._type_by_subtype = {
+            subtype: asset_type
+            for asset_type in AssetType
+            for subtype in AssetSubType.get_subtypes_by_asset_type(asset_type)
+        }
+
+    def generate(self, db_manager: DatabaseManager, transactions: int, assets: int,
+                 snapshots: bool = True, progress: Optional[Callable[[int], None]] = None) -> GeneratedLedger:
+        """
+        生成账本并写入数据库
+
+        Args:
+            db_manager: DatabaseManager
+            transactions: 交易笔数（精确值）
+            assets: 资产数量（不超过交易笔数）
+            snapshots: 是否按月生成自动快照
+            progress: 进度回调，参数为已写入的交易笔数
+
+        Returns:
+            生成结果统计
+        """
+        if transactions <= 0 or assets <= 0:
+            raise ValueError("交易笔数与资产数量必须大于0")
+        assets = min(assets, transactions)
+        started = time.perf_counter()
+        result = GeneratedLedger()
+        plans = self._plan_assets(transactions, assets)
+        result.asset_ids = [plan.asset_id for plan in plans]
+
+        self._values = {asset_type: [0.0] * self.months for asset_type in AssetType}
+        self._invested = [0.0] * self.months
+
+        tables = ("assets", "transactions", "cash_transactions", "fixed_income_transactions",
+                  "equity_transactions", "fx_rates", "asset_prices", "portfolio_snapshots")
+        with db_manager.bulk_load(tables) as conn:
+            result.fx_rates = self._write_fx_rates(conn)
+            conn.executemany(
+                """INSERT INTO assets (asset_id, asset_name, asset_type, asset_subtype, currency, description, issuer)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                [self._asset_row(plan) for plan in plans]
+            )
+            batches = {sql: [] for sql in (_MAIN_INSERT_SQL, _CASH_INSERT_SQL,
+                                           _FIXED_INCOME_INSERT_SQL, _EQUITY_INSERT_SQL)}
+            prices: List[Tuple] = []
+            for plan in plans:
+                for main_row, detail_sql, detail_row in self._transactions_for(plan, prices):
+                    batches[_MAIN_INSERT_SQL].append(main_row)
+                    batches[detail_sql].append(detail_row)
+                    result.transactions += 1
+                if len(batches[_MAIN_INSERT_SQL]) >= self.batch_size:
+                    self._flush(conn, batches)
+                    if progress:
+                        progress(result.transactions)
+                if len(prices) >= self.batch_size:
+                    conn.executemany(_PRICE_INSERT_SQL, prices)
+                    result.prices += len(prices)
+                    prices.clear()
+            self._flush(conn, batches)
+            conn.executemany(_PRICE_INSERT_SQL, prices)
+            result.prices += len(prices)
+            if progress:
+                progress(result.transactions)
+            if snapshots:
+                result.snapshots = self._write_snapshots(conn)
+
+        result.seconds = time.perf_counter() - started
+        self.logger.info(
+            "合成账本生成完成: %d 个资产, %d 笔交易, %d 条汇率, %d 条价格, %d 个快照, 耗时 %.1f 秒",
+            len(plans), result.transactions, result.fx_rates, result.prices, result.snapshots, result.seconds
+        )
+        return result
+
+    @staticmethod
+    def _flush(conn, batches: Dict[str, List[Tuple]]) -> None:
+        """写入并清空各表的待写入行（主表先写）"""
+        for sql, rows in batches.items():
+            if rows:
+                conn.executemany(sql, rows)
+                rows.clear()
+
+    # ------------------------------------------------------------------
+    # 资产与汇率
+    # ------------------------------------------------------------------
+
+    def _plan_assets(self, transactions: int, assets: int) -> List[_AssetPlan]:
+        """确定每个资产的类型、币种、开户日与交易笔数（笔数合计等于 transactions）"""
+        rng = self.rng
+        subtypes = list(SUBTYPE_WEIGHTS)
+        weights = list(SUBTYPE_WEIGHTS.values())
+        foreign = list(FX_CURRENCIES)
+        # 交易笔数按对数正态分布分配：少数活跃账户占多数交易
+        shares = [rng.lognormvariate(0, 0.75) for _ in range(assets)]
+        scale = (transactions - assets) / sum(shares)
+        quotas = [1 + int(share * scale) for share in shares]
+        for i in range(transactions - sum(quotas)):
+            quotas[i % assets] += 1
+
+        plans = []
+        for i, quota in enumerate(quotas):
+            subtype = rng.choices(subtypes, weights)[0]
+            if subtype in FOREIGN_SUBTYPES or rng.random() < FOREIGN_RATIO:
+                currency = rng.choice(foreign)
+            else:
+                currency = "CNY"
+            plans.append(_AssetPlan(
+                asset_id=f"gen{self.seed}-asset-{i:07d}",
+                asset_type=self._type_by_subtype[subtype],
+                subtype=subtype,
+                currency=currency,
+                open_day=rng.randrange(self.days // 2),
+                quota=quota,
+            ))
+        return plans
+
+    def _asset_row(self, plan: _AssetPlan) -> Tuple:
+        number = plan.asset_id.rsplit("-", 1)[1]
+        issuer = self.rng.choice(ISSUERS)
+        return (plan.asset_id, f"{issuer}{plan.subtype.display_name}{number}", plan.asset_type.name,
+                plan.subtype.name, plan.currency, f"合成数据 {plan.subtype.display_name}", issuer)
+
+    def _write_fx_rates(self, conn) -> int:
+        """各外币对人民币的每日汇率（几何随机游走）"""
+        rows = []
+        for currency, (rate, volatility) in FX_CURRENCIES.items():
+            series = []
+            for day in range(self.days + 1):
+                series.append(round(rate, 6))
+                rate *= math.exp(self.rng.gauss(0, volatility))
+            self._fx[currency] = series
+            rows.extend((self._iso[day], currency, "CNY", series[day], "generator") for day in range(self.days + 1))
+        self._fx["CNY"] = [1.0] * (self.days + 1)
+        conn.executemany("INSERT OR REPLACE INTO fx_rates (rate_date, base_currency, quote_currency, rate, source) "
+                         "VALUES (?, ?, ?, ?, ?)", rows)
+        return len(rows)
+
+    # ------------------------------------------------------------------
+    # 交易
+    # ------------------------------------------------------------------
+
+    def _event_days(self, plan: _AssetPlan, count: int) -> List[int]:
+        """开户日之后按日期排序的 count 个交易日"""
+        return sorted(self.rng.randrange(plan.open_day, self.days + 1) for _ in range(count))
+
+    def _note(self) -> Optional[str]:
+        return self.rng.choice(NOTES) if self.rng.random() < NOTE_RATIO else None
+
+    def _transactions_for(self, plan: _AssetPlan, prices: List[Tuple]) -> Iterator[Tuple[Tuple, str, Tuple]]:
+        """按日期顺序生成单个资产的交易：(主表行, 详情表SQL, 详情表行)"""
+        if plan.asset_type is AssetType.CASH:
+            rows = self._cash_transactions(plan)
+        elif plan.asset_type is AssetType.FIXED_INCOME:
+            rows = self._fixed_income_transactions(plan)
+        else:
+            rows = self._equity_transactions(plan, prices)
+        fx = self._fx[plan.currency]
+        prefix = f"{plan.asset_id.replace('asset', 'tx')}-"
+        for n, (day, tx_type, amount, detail_sql, detail) in enumerate(rows):
+            tx_id = f"{prefix}{n:06d}"
+            minor = round(amount * MONEY_FACTOR)
+            rate = fx[day]
+            yield ((tx_id, plan.asset_id, self._iso[day], tx_type, minor, plan.currency, rate,
+                    int(minor * rate), self._note()),
+                   detail_sql, (tx_id,) + detail)
+
+    def _record(self, asset_type: AssetType, day: int, value_delta: float, invested_delta: float) -> None:
+        """记录资产价值与净投入的变化（基础货币），生成快照时按月累加"""
+        month = self._month[day]
+        self._values[asset_type][month] += value_delta
+        self._invested[month] += invested_delta
+
+    def _cash_transactions(self, plan: _AssetPlan):
+        """现金：开户存入，之后每月结息，其余为存入/取出（取出不超过余额）"""
+        rng = self.rng
+        rate_pct = round(rng.uniform(0.2, 2.5), 2)
+        account_type = "CHECKING" if plan.subtype is AssetSubType.CHECKING_ACCOUNT else "SAVINGS"
+        detail = (account_type, rate_pct, "MONTHLY")
+        fx = self._fx[plan.currency]
+        # 约三分之一的交易为月度结息
+        interest_months = set()
+        months_open = self._month[self.days] - self._month[plan.open_day]
+        if plan.quota > 2 and months_open > 0:
+            first = self._month[plan.open_day]
+            count = min(months_open, (plan.quota - 1) // 3)
+            interest_months = set(rng.sample(range(first + 1, first + months_open + 1), count))
+        balance = 0.0
+        days = self._event_days(plan, plan.quota - 1 - len(interest_months))
+        # 结息日取当月第一天（与普通交易合并后按日期排序）
+        month_starts = self._month_starts
+        events = [(plan.open_day, "OPEN")] + [(d, "FLOW") for d in days]
+        events += [(month_starts[m], "INTEREST") for m in interest_months]
+        events.sort()
+        for day, kind in events:
+            if kind == "INTEREST":
+                amount = round(max(balance, 100.0) * rate_pct / 100 / 12, 2) or 0.01
+                tx_type = "INTEREST"
+                balance += amount
+                self._record(AssetType.CASH, day, amount * fx[day], 0.0)
+            elif kind == "OPEN" or balance < 1000 or rng.random() < 0.65:
+                amount = round(rng.uniform(500, 50_000) if kind == "FLOW" else rng.uniform(10_000, 200_000), 2)
+                tx_type = "DEPOSIT"
+                balance += amount
+                self._record(AssetType.CASH, day, amount * fx[day], amount * fx[day])
+            else:
+                amount = round(balance * rng.uniform(0.05, 0.5), 2)
+                tx_type = "WITHDRAW"
+                balance -= amount
+                self._record(AssetType.CASH, day, -amount * fx[day], -amount * fx[day])
+            yield day, tx_type, amount, _CASH_INSERT_SQL, detail
+
+    def _fixed_income_transactions(self, plan: _AssetPlan):
+        """固定收益阶梯：逐档买入、按付息频率付息、到期赎回后滚动买入"""
+        rng = self.rng
+        fx = self._fx[plan.currency]
+        remaining = plan.quota
+        rung_start = plan.open_day
+        while remaining > 0:
+            term = rng.choice(LADDER_TERMS)
+            frequency, step_months = rng.choice(PAYMENT_FREQUENCIES)
+            annual_rate = round(rng.uniform(1.5, 5.5), 2)
+            face = round(rng.uniform(10_000, 500_000), 2)
+            maturity_day = rung_start + int(term * 365.25)
+            detail = (annual_rate, self._iso[rung_start], (self.start_date + timedelta(days=maturity_day)).isoformat(),
+                      "SIMPLE", frequency)
+            yield rung_start, "BUY", face, _FIXED_INCOME_INSERT_SQL, detail + (round(face * MONEY_FACTOR), annual_rate)
+            self._record(AssetType.FIXED_INCOME, rung_start, face * fx[rung_start], face * fx[rung_start])
+            remaining -= 1
+            # 付息
+            coupon_days = []
+            if step_months:
+                coupon_days = list(range(rung_start + int(step_months * 30.44), min(maturity_day, self.days + 1),
+                                         int(step_months * 30.44)))
+            else:
+                coupon_days = [maturity_day] if maturity_day <= self.days else []
+            coupon_base = face * annual_rate / 100 * ((step_months / 12) if step_months else term)
+            for day in coupon_days[:remaining]:
+                coupon = round(coupon_base, 2)
+                yield day, "INTEREST", coupon, _FIXED_INCOME_INSERT_SQL, detail + (None, annual_rate)
+                self._record(AssetType.FIXED_INCOME, day, 0.0, -coupon * fx[day])
+                remaining -= 1
+            if maturity_day > self.days or remaining <= 0:
+                # 最后一档持有至账本结束
+                if remaining > 0:
+                    rung_start = rng.randrange(plan.open_day, self.days + 1)
+                    continue
+                break
+            yield maturity_day, "SELL", face, _FIXED_INCOME_INSERT_SQL, detail + (round(face * MONEY_FACTOR), annual_rate)
+            self._record(AssetType.FIXED_INCOME, maturity_day, -face * fx[maturity_day], -face * fx[maturity_day])
+            remaining -= 1
+            rung_start = min(maturity_day + rng.randrange(0, 30), self.days)
+
+    def _equity_transactions(self, plan: _AssetPlan, prices: List[Tuple]):
+        """权益：月度价格随机游走，定投买入、部分卖出、季度分红"""
+        rng = self.rng
+        fx = self._fx[plan.currency]
+        month_starts = self._month_starts
+        # 月初价格（资产币种），开户前的月份同样生成，价格序列完整
+        price = rng.uniform(5, 200)
+        drift, volatility = rng.uniform(-0.002, 0.012), rng.uniform(0.03, 0.1)
+        monthly_prices = []
+        for month in range(self.months):
+            monthly_prices.append(round(price, 4))
+            prices.append((plan.asset_id, self._iso[month_starts[month]], round(round(price, 4) * MONEY_FACTOR)))
+            price *= math.exp(rng.gauss(drift, volatility))
+
+        quantity = 0.0
+        quantity_change = [0.0] * self.months
+        dividend_yield = rng.uniform(0.0, 0.04)
+        days = [plan.open_day] + self._event_days(plan, plan.quota - 1)
+        for n, day in enumerate(days):
+            month = self._month[day]
+            unit_price = monthly_prices[month]
+            roll = rng.random()
+            if n == 0 or quantity < 1 or roll < 0.6:
+                shares = float(rng.randrange(1, 50) * 100) if unit_price < 50 else float(rng.randrange(1, 200))
+                amount = round(shares * unit_price, 2)
+                quantity += shares
+                quantity_change[month] += shares
+                self._record(AssetType.EQUITY, day, 0.0, amount * fx[day])
+                yield day, "BUY", amount, _EQUITY_INSERT_SQL, (shares, unit_price, 0, 1)
+            elif roll < 0.85:
+                shares = float(max(1, int(quantity * rng.uniform(0.1, 0.5))))
+                amount = round(shares * unit_price, 2)
+                quantity -= shares
+                quantity_change[month] -= shares
+                self._record(AssetType.EQUITY, day, 0.0, -amount * fx[day])
+                yield day, "SELL", amount, _EQUITY_INSERT_SQL, (shares, unit_price, 0, 1)
+            else:
+                per_share = round(unit_price * dividend_yield / 4, 4) or 0.01
+                amount = round(max(quantity * per_share, 0.01), 2)
+                self._record(AssetType.EQUITY, day, 0.0, -amount * fx[day])
+                yield day, "DIVIDEND", amount, _EQUITY_INSERT_SQL, (0, unit_price, per_share, 1)
+
+        # 权益价值 = 月末持仓数量 × 月初价格 × 汇率（按月直接计入，不参与累加）
+        held = 0.0
+        values = self._values[AssetType.EQUITY]
+        for month in range(self.months):
+            held += quantity_change[month]
+            values[month] += held * monthly_prices[month] * fx[month_starts[month]]
+
+    # ------------------------------------------------------------------
+    # 快照
+    # ------------------------------------------------------------------
+
+    def _write_snapshots(self, conn) -> int:
+        """每月末一个自动快照（总价值、成本、收益与资产配置）"""
+        month_starts = self._month_starts
+        running = {asset_type: 0.0 for asset_type in AssetType}
+        invested = 0.0
+        rows = []
+        for month in range(self.months):
+            for asset_type in (AssetType.CASH, AssetType.FIXED_INCOME):
+                running[asset_type] += self._values[asset_type][month]
+            running[AssetType.EQUITY] = self._values[AssetType.EQUITY][month]
+            invested += self._invested[month]
+            end_day = month_starts[month + 1] - 1 if month + 1 < self.months else self.days
+            total = sum(running.values())
+            total_return = total - invested
+            allocation = {asset_type.name: round(value, 2) for asset_type, value in running.items()}
+            snapshot_time = datetime.combine(self.start_date + timedelta(days=end_day), datetime.min.time())
+            rows.append((
+                f"gen{self.seed}-snapshot-{month:04d}", self._iso[end_day], snapshot_time.isoformat(), "AUTO", "CNY",
+                round(total * MONEY_FACTOR), round(invested * MONEY_FACTOR), round(total_return * MONEY_FACTOR),
+                round(total_return / invested, 4) if invested else 0.0,
+                round(running[AssetType.CASH] * MONEY_FACTOR), round(running[AssetType.FIXED_INCOME] * MONEY_FACTOR),
+                round(running[AssetType.EQUITY] * MONEY_FACTOR),
+                "[]", json.dumps(allocation), json.dumps({"total_return": str(round(total_return, 2))}),
+                snapshot_time.isoformat(),
+            ))
+        conn.executemany(
+            """INSERT OR REPLACE INTO portfolio_snapshots (
+                   snapshot_id, snapshot_date, snapshot_time, snapshot_type, base_currency,
+                   total_value, total_cost, total_return, total_return_rate,
+                   cash_value, fixed_income_value, equity_value,
+                   position_snapshots, asset_allocation, performance_metrics, created_date)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            rows
+        )
+        return len(rows)
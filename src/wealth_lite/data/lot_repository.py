@@ -0,0 +1,131 @@
+"""
+WealthLite 批次账簿数据访问层
+
+提供 lot_books / open_lots 表的读写，以及按资产增量读取交易事件。
+"""
+
+import logging
+from datetime import date
+from decimal import Decimal
+from typing import Iterator, Optional, Tuple
+
+from .database import DatabaseManager
+from ..models.enums import CostBasisMethod, TransactionType
+from ..models.lots import Lot, LotBook
+
+
+# (rowid, 交易ID, 交易日期, 交易类型, 数量或None, 基础货币金额最小单位, 拆股比例或None)
+LotEvent = Tuple[int, str, date, TransactionType, Optional[Decimal], int, Optional[Decimal]]
+
+
+class LotRepository:
+    """批次账簿数据访问层"""
+
+    def __init__(self, db_manager: DatabaseManager):
+        self.db = db_manager
+        self.logger = logging.getLogger(__name__)
+
+    def load(self, asset_id: str, method: CostBasisMethod) -> Optional[Tuple[LotBook, int]]:
+        """
+        读取已持久化的批次账簿
+
+        Returns:
+            (LotBook, 已应用的最大交易rowid)，不存在时返回None
+        """
+        rows = self.db.execute_query(
+            "SELECT * FROM lot_books WHERE asset_id = ? AND method = ?", (asset_id, method.name)
+        )
+        if not rows:
+            return None
+        row = rows[0]
+        lots = [
+            Lot(lot['transaction_id'], date.fromisoformat(lot['acquired_date']),
+                Decimal(lot['quantity']), lot['cost'])
+            for lot in self.db.execute_query(
+                "SELECT * FROM open_lots WHERE asset_id = ? AND method = ? ORDER BY seq",
+                (asset_id, method.name)
+            )
+        ]
+        book = LotBook(
+            method, lots, realized=row['realized'], applied_count=row['applied_count'],
+            last_date=date.fromisoformat(row['last_date']) if row['last_date'] else None,
+        )
+        return book, row['last_rowid']
+
+    def get_generation(self, asset_id: str) -> int:
+        """资产批次账簿的失效计数（交易被修改或删除时由触发器递增）"""
+        rows = self.db.execute_query(
+            "SELECT generation FROM lot_invalidations WHERE asset_id = ?", (asset_id,)
+        )
+        return rows[0][0] if rows else 0
+
+    def save(self, asset_id: str, book: LotBook, last_rowid: int, generation: int) -> bool:
+        """
+        在单个事务中覆盖保存批次账簿及其未平仓批次
+
+        Args:
+            generation: 读取交易前的失效计数；期间有交易被修改或删除时账簿基于旧数据，不保存
+
+        Returns:
+            是否已保存
+        """
+        method = book.method.name
+        with self.db.transaction() as conn:
+            # 校验与写入在同一条语句中完成，不会与交易写入交错
+            cur = conn.execute("""
+                INSERT OR REPLACE INTO lot_books
+                    (asset_id, method, realized, applied_count, last_rowid, last_date, updated_date)
+                SELECT ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP
+                WHERE COALESCE((SELECT generation FROM lot_invalidations WHERE asset_id = ?), 0) = ?
+            """, (asset_id, method, book.realized, book.applied_count, last_rowid,
+                  book.last_date.isoformat() if book.last_date else None, asset_id, generation))
+            if cur.rowcount == 0:
+                self.logger.debug("批次账簿读取期间交易已变化，不保存: %s", asset_id)
+                return False
+            conn.execute("DELETE FROM open_lots WHERE asset_id = ? AND method = ?", (asset_id, method))
+            conn.executemany("""
+                INSERT INTO open_lots (asset_id, method, seq, transaction_id, acquired_date, quantity, cost)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, [
+                (asset_id, method, seq, lot.transaction_id, lot.acquired_date.isoformat(),
+                 str(lot.quantity), lot.cost)
+                for seq, lot in enumerate(book.lots)
+            ])
+        return True
+
+    def delete(self, asset_id: str) -> None:
+        """删除资产的全部批次账簿（强制下次查询时重建）"""
+        with self.db.transaction() as conn:
+            conn.execute("DELETE FROM lot_books WHERE asset_id = ?", (asset_id,))
+            conn.execute("DELETE FROM open_lots WHERE asset_id = ?", (asset_id,))
+
+    def get_transaction_stats(self, asset_id: str, last_rowid: int) -> Tuple[int, Optional[str]]:
+        """
+        校验增量应用的前提
+
+        Returns:
+            (rowid不超过last_rowid的交易笔数, rowid超过last_rowid的交易中最早的日期)
+        """
+        row = self.db.execute_query("""
+            SELECT COUNT(CASE WHEN rowid <= ? THEN 1 END),
+                   MIN(CASE WHEN rowid > ? THEN transaction_date END)
+            FROM transactions WHERE asset_id = ?
+        """, (last_rowid, last_rowid, asset_id))[0]
+        return row[0], row[1]
+
+    def iter_events(self, asset_id: str, after_rowid: int = 0) -> Iterator[LotEvent]:
+        """按（交易日期, rowid）顺序读取资产在after_rowid之后的交易事件"""
+        query = """
+            SELECT t.rowid, t.transaction_id, t.transaction_date, t.transaction_type,
+                   t.amount_base_currency, e.quantity, e.split_ratio
+            FROM transactions t LEFT JOIN equity_transactions e ON e.transaction_id = t.transaction_id
+            WHERE t.asset_id = ? AND t.rowid > ?
+            ORDER BY t.transaction_date, t.rowid
+        """
+        for row in self.db.iter_query(query, (asset_id, after_rowid)):
+            yield (
+                row[0], row[1], date.fromisoformat(row[2]), TransactionType[row[3]],
+                Decimal(str(row[5])) if row[5] is not None else None,
+                row[4],
+                Decimal(str(row[6])) if row[6] is not None else None,
+            )
@@ -0,0 +1,252 @@
+"""
+WealthLite 数据库迁移
+
+基线表结构由DatabaseManager以CREATE TABLE IF NOT EXISTS创建，此后的结构与数据变更
+按版本号登记在MIGRATIONS中，由MigrationRunner依次执行并记录到schema_version表：
+- schema: 结构变更（如加列、建索引），在单个事务中执行，应可重复执行
+- batch:  数据迁移，按rowid分批执行；每批与检查点在同一事务中提交，
+          中断后从检查点继续，批次之间释放写锁，大库迁移不会长时间阻塞其他连接
+"""
+
+import json
+import logging
+import sqlite3
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from ..models.money import MONEY_COLUMNS, MONEY_FACTOR
+
+# 数据迁移每批处理的行数
+DEFAULT_MIGRATION_BATCH_SIZE = 5000
+
+# 迁移状态
+STATUS_RUNNING = 'RUNNING'
+STATUS_APPLIED = 'APPLIED'
+
+# 分批函数：(连接, 检查点, 批大小) -> 新检查点；返回None表示已完成
+BatchFunction = Callable[[sqlite3.Connection, Optional[Dict[str, Any]], int], Optional[Dict[str, Any]]]
+
+
+@dataclass(frozen=True)
+class Migration:
+    """单个迁移"""
+    version: int
+    name: str
+    schema: Optional[Callable[[sqlite3.Connection], None]] = None
+    batch: Optional[BatchFunction] = None
+    # 已有数据库满足该条件时直接登记为已执行（兼容迁移框架之前的标记方式）
+    already_applied: Optional[Callable[[sqlite3.Connection], bool]] = None
+
+
+# ==================== 工具函数 ====================
+
+def table_columns(conn: sqlite3.Connection, table: str) -> List[str]:
+    """获取表的列名"""
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def add_column(conn: sqlite3.Connection, table: str, column: str, definition: str) -> bool:
+    """
+    添加列（列已存在时跳过）
+
+    Returns:
+        是否新增了列
+    """
+    if column in table_columns(conn, table):
+        return False
+    conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+    return True
+
+
+def rowid_batches(table: str, update_sql: str) -> BatchFunction:
+    """
+    构造按rowid分批更新的迁移函数
+
+    Args:
+        table: 表名
+        update_sql: UPDATE语句，须包含"WHERE rowid > ? AND rowid <= ?"条件占位
+    """
+    def run(conn: sqlite3.Connection, checkpoint: Optional[Dict[str, Any]], batch_size: int):
+        last = (checkpoint or {}).get(table, 0)
+        upper = conn.execute(
+            f"SELECT MAX(rowid) FROM (SELECT rowid FROM {table} WHERE rowid > ? ORDER BY rowid LIMIT ?)",
+            (last, batch_size)
+        ).fetchone()[0]
+        if upper is None:
+            return None
+        conn.execute(update_sql, (last, upper))
+        return {**(checkpoint or {}), table: upper}
+    return run
+
+
+def chain_batches(*steps: BatchFunction) -> BatchFunction:
+    """按顺序串联多个分批函数，检查点记录当前步骤"""
+    def run(conn: sqlite3.Connection, checkpoint: Optional[Dict[str, Any]], batch_size: int):
+        checkpoint = dict(checkpoint or {})
+        step = checkpoint.pop('_step', 0)
+        while step < len(steps):
+            result = steps[step](conn, checkpoint, batch_size)
+            if result is not None:
+                return {**result, '_step': step}
+            step += 1
+        return None
+    return run
+
+
+# ==================== 迁移定义 ====================
+
+def _money_already_migrated(conn: sqlite3.Connection) -> bool:
+    """迁移框架之前通过PRAGMA user_version = 1标记金额列已迁移"""
+    return conn.execute("PRAGMA user_version").fetchone()[0] >= 1
+
+
+def _money_batches() -> BatchFunction:
+    """金额列由浮点数转为最小单位整数，逐表按rowid分批"""
+    steps = []
+    for table, columns in MONEY_COLUMNS.items():
+        assignments = ", ".join(f"{col} = CAST(ROUND({col} * {MONEY_FACTOR}) AS INTEGER)" for col in columns)
+        steps.append(rowid_batches(table, f"UPDATE {table} SET {assignments} WHERE rowid > ? AND rowid <= ?"))
+    return chain_batches(*steps)
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(
+        version=1,
+        name="money_columns_to_integer",
+        batch=_money_batches(),
+        already_applied=_money_already_migrated,
+    ),
+]
+
+
+# ==================== 执行器 ====================
+
+class MigrationRunner:
+    """迁移执行器"""
+
+    def __init__(self, conn: sqlite3.Connection, migrations: Optional[List[Migration]] = None,
+                 batch_size: int = DEFAULT_MIGRATION_BATCH_SIZE):
+        self.conn = conn
+        self.migrations = sorted(migrations if migrations is not None else MIGRATIONS, key=lambda m: m.version)
+        self.batch_size = batch_size
+        self.logger = logging.getLogger(__name__)
+        self._ensure_table()
+
+    def _ensure_table(self) -> None:
+        """创建schema_version表"""
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,                              -- 迁移版本号
+                name TEXT NOT NULL,                                       -- 迁移名称
+                status TEXT NOT NULL,                                     -- 状态（RUNNING/APPLIED）
+                checkpoint TEXT,                                          -- 分批迁移的检查点（JSON）
+                started_date DATETIME NOT NULL,                           -- 开始时间
+                applied_date DATETIME                                     -- 完成时间
+            )
+        """)
+        self.conn.commit()
+
+    def _records(self) -> Dict[int, sqlite3.Row]:
+        """已登记的迁移"""
+        rows = self.conn.execute("SELECT version, name, status, checkpoint FROM schema_version").fetchall()
+        return {row[0]: row for row in rows}
+
+    @property
+    def current_version(self) -> int:
+        """已完成的最高迁移版本"""
+        row = self.conn.execute(
+            "SELECT MAX(version) FROM schema_version WHERE status = ?", (STATUS_APPLIED,)
+        ).fetchone()
+        return row[0] or 0
+
+    def pending(self) -> List[Migration]:
+        """未完成的迁移（含中断的迁移）"""
+        records = self._records()
+        return [m for m in self.migrations
+                if m.version not in records or records[m.version][2] != STATUS_APPLIED]
+
+    def run(self, max_seconds: Optional[float] = None) -> List[int]:
+        """
+        依次执行未完成的迁移
+
+        Args:
+            max_seconds: 本次最多执行的秒数，到时在批次边界停止（下次调用从检查点继续）；None表示执行到底
+
+        Returns:
+            本次完成的迁移版本号
+        """
+        deadline = time.monotonic() + max_seconds if max_seconds is not None else None
+        completed = []
+        for migration in self.pending():
+            if not self._run_one(migration, deadline):
+                break
+            completed.append(migration.version)
+        if completed:
+            # 同步到PRAGMA user_version，便于外部工具查看
+            self.conn.execute(f"PRAGMA user_version = {self.current_version}")
+            self.conn.commit()
+        return completed
+
+    def _run_one(self, migration: Migration, deadline: Optional[float]) -> bool:
+        """执行单个迁移，返回是否已完成"""
+        record = self._records().get(migration.version)
+        now = datetime.now().isoformat()
+
+        if record is None:
+            if migration.already_applied is not None and migration.already_applied(self.conn):
+                self.conn.execute(
+                    "INSERT INTO schema_version (version, name, status, started_date, applied_date) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (migration.version, migration.name, STATUS_APPLIED, now, now)
+                )
+                self.conn.commit()
+                return True
+            with self.conn:
+                if migration.schema is not None:
+                    migration.schema(self.conn)
+                self.conn.execute(
+                    "INSERT INTO schema_version (version, name, status, started_date) VALUES (?, ?, ?, ?)",
+                    (migration.version, migration.name, STATUS_RUNNING, now)
+                )
+            checkpoint = None
+            self.logger.info(f"开始数据库迁移 {migration.version}: {migration.name}")
+        else:
+            checkpoint = json.loads(record[3]) if record[3] else None
+            self.logger.info(f"继续数据库迁移 {migration.version}: {migration.name}（检查点 {checkpoint}）")
+
+        batches = 0
+        if migration.batch is not None:
+            while True:
+                if deadline is not None and time.monotonic() >= deadline:
+                    self.logger.info(f"数据库迁移 {migration.version} 暂停于检查点 {checkpoint}，已执行 {batches} 批")
+                    return False
+                # 每批数据更新与检查点在同一事务中提交
+                with self.conn:
+                    checkpoint = migration.batch(self.conn, checkpoint, self.batch_size)
+                    if checkpoint is None:
+                        break
+                    self.conn.execute(
+                        "UPDATE schema_version SET checkpoint = ? WHERE version = ?",
+                        (json.dumps(checkpoint), migration.version)
+                    )
+                batches += 1
+
+        with self.conn:
+            self.conn.execute(
+                "UPDATE schema_version SET status = ?, checkpoint = NULL, applied_date = ? WHERE version = ?",
+                (STATUS_APPLIED, datetime.now().isoformat(), migration.version)
+            )
+        self.logger.info(f"数据库迁移完成 {migration.version}: {migration.name}（{batches} 批）")
+        return True
+
+    def history(self) -> List[Dict[str, Any]]:
+        """迁移记录"""
+        rows = self.conn.execute(
+            "SELECT version, name, status, started_date, applied_date FROM schema_version ORDER BY version"
+        ).fetchall()
+        return [
+            {"version": r[0], "name": r[1], "status": r[2], "started_date": r[3], "applied_date": r[4]}
+            for r in rows
+        ]
@@ -0,0 +1,91 @@
+"""
+WealthLite 资产价格数据访问层
+
+提供 asset_prices 表的批量写入与查询。
+收盘价以资产币种计价，按最小单位整数存储。
+"""
+
+import logging
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .database import DatabaseManager
+from ..models.money import to_minor
+
+
+# (资产ID, 价格日期, 收盘价, 来源)
+PriceRow = Tuple[str, date, Decimal, Optional[str]]
+
+
+class PriceRepository:
+    """资产价格数据访问层"""
+
+    _UPSERT_SQL = """
+        INSERT OR REPLACE INTO asset_prices (asset_id, price_date, close_price, source)
+        VALUES (?, ?, ?, ?)
+    """
+
+    def __init__(self, db_manager: DatabaseManager):
+        self.db = db_manager
+        self.logger = logging.getLogger(__name__)
+
+    def save_many(self, rows: Iterable[PriceRow]) -> int:
+        """
+        批量写入收盘价（同一资产同一日期覆盖旧值），在单个事务中完成
+
+        Returns:
+            写入的行数
+        """
+        params = [
+            (asset_id, price_date.isoformat(), to_minor(close_price), source)
+            for asset_id, price_date, close_price, source in rows
+        ]
+        if not params:
+            return 0
+        with self.db.transaction() as conn:
+            conn.executemany(self._UPSERT_SQL, params)
+        self.db.data_version.bump({row[0] for row in params})
+        return len(params)
+
+    def get_latest(self, as_of: Optional[date] = None) -> Dict[str, Tuple[str, int]]:
+        """
+        各资产在as_of（含）之前的最新收盘价，单条SQL完成
+
+        Returns:
+            资产ID -> (价格日期文本, 收盘价最小单位)
+        """
+        # SQLite中与MAX()同时选择的裸列取自最大值所在行
+        query = """
+            SELECT asset_id, MAX(price_date) AS price_date, close_price FROM asset_prices
+            WHERE (? IS NULL OR price_date <= ?)
+            GROUP BY asset_id
+        """
+        as_of_text = as_of.isoformat() if as_of else None
+        return {
+            row['asset_id']: (row['price_date'], row['close_price'])
+            for row in self.db.execute_query(query, (as_of_text, as_of_text))
+        }
+
+    def get_history(self, asset_id: str, start_date: Optional[date] = None,
+                    end_date: Optional[date] = None) -> List[Tuple[str, int]]:
+        """获取资产的历史收盘价：[(日期文本, 收盘价最小单位)]，按日期升序"""
+        query = """
+            SELECT price_date, close_price FROM asset_prices
+            WHERE asset_id = ? AND (? IS NULL OR price_date >= ?) AND (? IS NULL OR price_date <= ?)
+            ORDER BY price_date
+        """
+        start_text = start_date.isoformat() if start_date else None
+        end_text = end_date.isoformat() if end_date else None
+        rows = self.db.execute_query(query, (asset_id, start_text, start_text, end_text, end_text))
+        return [(row['price_date'], row['close_price']) for row in rows]
+
+    def count(self) -> int:
+        """价格记录数"""
+        return self.db.execute_query("SELECT COUNT(*) FROM asset_prices")[0][0]
+
+    def delete_by_asset(self, asset_id: str) -> int:
+        """删除某个资产的全部价格"""
+        deleted = self.db.execute_update("DELETE FROM asset_prices WHERE asset_id = ?", (asset_id,))
+        self.db.data_version.bump([asset_id])
+        return deleted
@@ -0,0 +1,199 @@
+"""
+SQL查询分析器
+
+- 通过 sqlite3 的 set_trace_callback 记录连接上执行的每条语句（DatabaseManager.transaction 与 bulk_load
+  期间不跟踪：executemany每行都会触发回调，批量写入会慢数倍），语句归一化为指纹（字面量替换为 ?，IN列表折叠）后按指纹汇总执行次数
+- 经 DatabaseManager.execute_*/iter_query 执行的语句同时记录耗时，按指纹统计总耗时与 P50/P95/P99
+- 超过阈值的慢查询记录日志并附 EXPLAIN QUERY PLAN
+- 同一请求内同一指纹的查询重复执行达到阈值时记为疑似N+1
+"""
+
+import logging
+import re
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from ..config.database_config import DatabaseConfig
+from ..utils.metrics import current_request_metrics
+
+# 每个指纹保留的最近耗时样本数（用于计算分位数）
+SAMPLE_SIZE = 512
+
+# 保留的最近慢查询 / N+1 记录数
+RECENT_EVENTS = 50
+
+# 同一请求内同一查询指纹重复执行达到该次数时视为N+1
+DEFAULT_N_PLUS_ONE_THRESHOLD = 10
+
+# 不参与统计的语句：事务控制，以及SQLite对触发器、FTS等内部子语句的trace（以 -- 开头）
+_IGNORED_PREFIXES = ("BEGIN", "COMMIT", "ROLLBACK", "SAVEPOINT", "RELEASE", "END", "--")
+
+# 可以执行 EXPLAIN QUERY PLAN 的语句
+_EXPLAINABLE_PREFIXES = ("SELECT", "WITH", "UPDATE", "DELETE", "INSERT", "REPLACE")
+
+_STRING_LITERAL = re.compile(r"[xX]?'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_VALUES_LIST = re.compile(r"(\(\.\.\.\))(?:\s*,\s*\(\.\.\.\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(sql: str) -> str:
+    """
+    将SQL语句归一化为指纹：字面量替换为 ?，多值列表折叠为 (...)，空白合并
+
+    参数化语句与trace回调得到的展开语句（参数已替换为字面量）得到相同的指纹。
+    """
+    normalized = _STRING_LITERAL.sub("?", sql)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _WHITESPACE.sub(" ", normalized).strip().rstrip(";")
+    normalized = _IN_LIST.sub("(...)", normalized)
+    return _VALUES_LIST.sub(r"\1", normalized)
+
+
+@dataclass
+class QueryStats:
+    """单个查询指纹的统计"""
+    fingerprint: str
+    count: int = 0
+    timed: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    rows: int = 0
+    n_plus_one: int = 0
+    samples: Deque[float] = field(default_factory=lambda: deque(maxlen=SAMPLE_SIZE))
+
+    def percentile(self, p: float) -> float:
+        """最近样本的耗时分位数（秒，最近秩法）"""
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        index = max(0, min(len(ordered) - 1, round(p / 100 * len(ordered) + 0.5) - 1))
+        return ordered[index]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "fingerprint": self.fingerprint,
+            "count": self.count,
+            "timed": self.timed,
+            "total_ms": round(self.total_seconds * 1000, 3),
+            "mean_ms": round(self.total_seconds / self.timed * 1000, 3) if self.timed else 0.0,
+            "p50_ms": round(self.percentile(50) * 1000, 3),
+            "p95_ms": round(self.percentile(95) * 1000, 3),
+            "p99_ms": round(self.percentile(99) * 1000, 3),
+            "max_ms": round(self.max_seconds * 1000, 3),
+            "rows": self.rows,
+            "n_plus_one": self.n_plus_one,
+        }
+
+
+class QueryProfiler:
+    """SQL查询分析器（线程安全）"""
+
+    def __init__(self, slow_query_ms: float = 100.0,
+                 n_plus_one_threshold: int = DEFAULT_N_PLUS_ONE_THRESHOLD,
+                 explain: Optional[Callable[[str, Tuple], List[str]]] = None):
+        """
+        Args:
+            slow_query_ms: 慢查询阈值（毫秒）
+            n_plus_one_threshold: 同一请求内同一查询重复执行多少次视为N+1
+            explain: 获取查询计划的函数 explain(sql, params) -> 计划明细，由DatabaseManager提供
+        """
+        self.slow_query_seconds = slow_query_ms / 1000
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.explain = explain
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._stats: Dict[str, QueryStats] = {}
+        self.slow_queries: Deque[Dict[str, Any]] = deque(maxlen=RECENT_EVENTS)
+        self.n_plus_one_events: Deque[Dict[str, Any]] = deque(maxlen=RECENT_EVENTS)
+
+    @classmethod
+    def from_config(cls, explain: Optional[Callable[[str, Tuple], List[str]]] = None) -> Optional["QueryProfiler"]:
+        """按环境变量创建分析器（WEALTH_LITE_SQL_PROFILER=0 时不启用）"""
+        if not DatabaseConfig.is_query_profiler_enabled():
+            return None
+        return cls(slow_query_ms=DatabaseConfig.get_slow_query_ms(), explain=explain)
+
+    def _get_stats(self, fp: str) -> QueryStats:
+        stats = self._stats.get(fp)
+        if stats is None:
+            stats = self._stats[fp] = QueryStats(fp)
+        return stats
+
+    def trace(self, statement: str) -> None:
+        """sqlite3 trace回调：每条语句执行前调用，语句中的参数已展开为字面量"""
+        if statement.lstrip()[:9].upper().startswith(_IGNORED_PREFIXES):
+            return
+        fp = fingerprint(statement)
+        request = current_request_metrics()
+        with self._lock:
+            stats = self._get_stats(fp)
+            stats.count += 1
+            if request is None or not fp[:6].upper().startswith("SELECT"):
+                return
+            request.statements[fp] += 1
+            repeated = request.statements[fp]
+            if repeated == self.n_plus_one_threshold:
+                stats.n_plus_one += 1
+                self.n_plus_one_events.append({"request": request.path, "fingerprint": fp})
+        if repeated == self.n_plus_one_threshold:
+            self.logger.warning(f"⚠️ 疑似N+1查询: {request.path} 中同一查询已执行 {repeated} 次: {fp}")
+
+    def observe(self, sql: str, params: Tuple, seconds: float, rows: int) -> None:
+        """记录一条语句的耗时与行数，超过阈值时记录慢查询"""
+        fp = fingerprint(sql)
+        with self._lock:
+            stats = self._get_stats(fp)
+            stats.timed += 1
+            stats.total_seconds += seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+            stats.rows += rows
+            stats.samples.append(seconds)
+        if seconds >= self.slow_query_seconds:
+            self._log_slow_query(sql, params, seconds, rows, fp)
+
+    def _log_slow_query(self, sql: str, params: Tuple, seconds: float, rows: int, fp: str) -> None:
+        """记录慢查询及其查询计划"""
+        plan: List[str] = []
+        if self.explain and sql.lstrip()[:7].upper().startswith(_EXPLAINABLE_PREFIXES):
+            try:
+                plan = self.explain(sql, params)
+            except Exception as e:
+                plan = [f"无法获取查询计划: {e}"]
+        request = current_request_metrics()
+        self.slow_queries.append({
+            "fingerprint": fp,
+            "duration_ms": round(seconds * 1000, 3),
+            "rows": rows,
+            "request": request.path if request else None,
+            "plan": plan,
+        })
+        plan_text = "".join(f"\n    {line}" for line in plan)
+        self.logger.warning(f"🐢 慢查询 {seconds * 1000:.1f} ms（{rows} 行）: {fp}{plan_text}")
+
+    def report(self, limit: int = 20) -> Dict[str, Any]:
+        """按总耗时（其次执行次数）排序的统计报告"""
+        with self._lock:
+            ranked = sorted(self._stats.values(), key=lambda s: (s.total_seconds, s.count), reverse=True)
+            queries = [stats.to_dict() for stats in ranked[:limit]]
+            slow_queries = list(self.slow_queries)
+            n_plus_one = list(self.n_plus_one_events)
+        return {
+            "slow_query_ms": self.slow_query_seconds * 1000,
+            "n_plus_one_threshold": self.n_plus_one_threshold,
+            "queries": queries,
+            "slow_queries": slow_queries,
+            "n_plus_one": n_plus_one,
+        }
+
+    def reset(self) -> None:
+        """清空统计"""
+        with self._lock:
+            self._stats.clear()
+            self.slow_queries.clear()
+            self.n_plus_one_events.clear()
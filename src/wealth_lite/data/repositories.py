@@ -5,12 +5,16 @@
 封装所有数据库操作细节，支持事务管理和数据一致性。
 """
 
+import base64
 import json
+import sys
 import sqlite3
 from datetime import datetime, date
+from functools import lru_cache
 from typing import List, Optional, Dict, Any, Tuple
 from decimal import Decimal
 import logging
+from enum import Enum
 
 from ..models.asset import Asset
 from ..models.transaction import (
@@ -18,11 +22,63 @@ from ..models.transaction import (
     EquityTransaction, RealEstateTransaction
 )
 from ..models.position import Position
+from ..models.ledger import Ledger
 from ..models.portfolio import Portfolio, PortfolioSnapshot
 from ..models.enums import AssetType, TransactionType, Currency, AssetSubType
+from ..models.money import to_minor, from_minor
 from .database import DatabaseManager
 
 
+# IN (...) 列表每批的参数个数（低于旧版SQLite默认的999个变量上限）
+_IN_CHUNK_SIZE = 500
+
+
+def _enum_name(value: Any) -> Any:
+    """枚举取英文名称，字符串等其他值原样返回"""
+    return value.name if isinstance(value, Enum) else value
+
+
+# 以下解析函数带缓存：相同取值的行共享同一个不可变对象（date/datetime/Decimal），
+# 大量交易加载时避免每行重复创建
+@lru_cache(maxsize=65536)
+def _shared_date(text: str) -> date:
+    """解析日期文本"""
+    return datetime.fromisoformat(text).date()
+
+
+@lru_cache(maxsize=65536)
+def _shared_timestamp(text: str) -> datetime:
+    """解析时间戳文本"""
+    return datetime.fromisoformat(text)
+
+
+@lru_cache(maxsize=4096)
+def _shared_rate(value: float) -> Decimal:
+    """解析汇率/利率/数量等小数"""
+    return Decimal(str(value))
+
+
+def encode_page_cursor(values: Tuple[Any, ...]) -> str:
+    """将分页位置（排序键取值）编码为不透明的游标字符串"""
+    return base64.urlsafe_b64encode(json.dumps(values, separators=(',', ':')).encode('utf-8')).decode('ascii')
+
+
+def decode_page_cursor(cursor: str, size: int) -> Tuple[Any, ...]:
+    """
+    解码游标字符串
+
+    Raises:
+        ValueError: 游标格式无效
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except (ValueError, UnicodeError) as e:
+        raise ValueError(f"无效的分页游标: {cursor}") from e
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError(f"无效的分页游标: {cursor}")
+    return tuple(values)
+
+
 class AssetRepository:
     """资产数据访问对象"""
     
@@ -50,9 +106,9 @@ class AssetRepository:
                 asset.credit_rating,
                 json.dumps(asset.extended_attributes) if asset.extended_attributes else None
             )
-            logging.debug(f"[AssetRepository.create] SQL: {query.strip()} | params: {params}")
             self.db.execute_insert(query, params)
-            logging.info(f"[AssetRepository.create] 资产插入成功: {asset.asset_id}")
+            self.db.data_version.bump([asset.asset_id])
+            logging.debug("[AssetRepository.create] 资产插入成功: %s", asset.asset_id)
             return True
         except Exception as e:
             logging.error(f"[AssetRepository.create] 创建资产失败: {e}", exc_info=True)
@@ -124,6 +180,7 @@ class AssetRepository:
             )
             
             rows_affected = self.db.execute_update(query, params)
+            self.db.data_version.bump([asset.asset_id])
             return rows_affected > 0
             
         except Exception as e:
@@ -143,6 +200,7 @@ class AssetRepository:
         try:
             query = "DELETE FROM assets WHERE asset_id = ?"
             rows_affected = self.db.execute_update(query, (asset_id,))
+            self.db.data_version.bump([asset_id])
             return rows_affected > 0
             
         except Exception as e:
@@ -186,40 +244,100 @@ class TransactionRepository:
     def __init__(self, db_manager: DatabaseManager):
         self.db = db_manager
     
+    # 主交易表插入语句（单条与批量写入共用）
+    _MAIN_INSERT_SQL = """
+        INSERT INTO transactions (
+            transaction_id, asset_id, transaction_date, transaction_type,
+            amount, currency, exchange_rate, amount_base_currency, notes
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    
+    _CASH_DETAIL_INSERT_SQL = """
+        INSERT INTO cash_transactions (
+            transaction_id, account_type, interest_rate, compound_frequency
+        ) VALUES (?, ?, ?, ?)
+    """
+    
+    _FIXED_INCOME_DETAIL_INSERT_SQL = """
+        INSERT INTO fixed_income_transactions (
+            transaction_id, annual_rate, start_date, maturity_date,
+            interest_type, payment_frequency, face_value, coupon_rate
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    
+    _EQUITY_DETAIL_INSERT_SQL = """
+        INSERT INTO equity_transactions (
+            transaction_id, quantity, price_per_share, dividend_amount, split_ratio
+        ) VALUES (?, ?, ?, ?, ?)
+    """
+    
+    _MAIN_UPDATE_SQL = """
+        UPDATE transactions SET 
+            asset_id = ?, transaction_date = ?, transaction_type = ?,
+            amount = ?, currency = ?, exchange_rate = ?, 
+            amount_base_currency = ?, notes = ?
+        WHERE transaction_id = ?
+    """
+    
+    # 各类交易详情表
+    _DETAIL_TABLES = (
+        'cash_transactions',
+        'fixed_income_transactions', 
+        'equity_transactions',
+        'real_estate_transactions'
+    )
+    
     def create(self, transaction: BaseTransaction) -> bool:
         """创建交易记录"""
         try:
             with self.db.transaction() as conn:
                 # 插入主交易记录
-                main_query = """
-                    INSERT INTO transactions (
-                        transaction_id, asset_id, transaction_date, transaction_type,
-                        amount, currency, exchange_rate, amount_base_currency, notes
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """
-                main_params = (
-                    transaction.transaction_id,
-                    transaction.asset_id,
-                    transaction.transaction_date.isoformat(),
-                    transaction.transaction_type.name,  # 使用英文名称
-                    float(transaction.amount),
-                    transaction.currency.name,          # 使用英文名称
-                    float(transaction.exchange_rate),
-                    float(transaction.amount_base_currency),
-                    transaction.notes
-                )
-                
-                conn.execute(main_query, main_params)
+                conn.execute(self._MAIN_INSERT_SQL, self._main_params(transaction))
                 
                 # 插入特定类型的详情记录
                 self._create_transaction_details(conn, transaction)
                 
+            self.db.data_version.bump([transaction.asset_id])
             return True
             
         except Exception as e:
             print(f"创建交易失败: {e}")
             return False
     
+    def insert_batch(self, conn: sqlite3.Connection, transactions: List[BaseTransaction]) -> None:
+        """
+        在调用方提供的连接中批量写入交易（不提交事务）
+        
+        主表使用一次executemany写入；详情记录按交易类别分组，
+        每张详情表同样只执行一次executemany。
+        调用方提交后需自行调用 db.data_version.bump()。
+        
+        Args:
+            conn: 数据库连接，事务的提交/回滚由调用方负责
+            transactions: 待写入的交易列表
+        """
+        if not transactions:
+            return
+        
+        conn.executemany(self._MAIN_INSERT_SQL, [self._main_params(t) for t in transactions])
+        self._insert_details_batch(conn, transactions)
+    
+    def create_many(self, transactions: List[BaseTransaction]) -> bool:
+        """
+        批量创建交易记录（全部成功或全部回滚）
+        
+        整批只打开一次连接、提交一次。
+        """
+        try:
+            with self.db.transaction() as conn:
+                self.insert_batch(conn, transactions)
+            self.db.data_version.bump({t.asset_id for t in transactions})
+            return True
+            
+        except Exception as e:
+            print(f"批量创建交易失败: {e}")
+            return False
+    
     def get_by_id(self, transaction_id: str) -> Optional[BaseTransaction]:
         """根据ID获取交易"""
         query = "SELECT * FROM transactions WHERE transaction_id = ?"
@@ -228,8 +346,7 @@ class TransactionRepository:
         if not results:
             return None
             
-        row = results[0]
-        return self._row_to_transaction(row)
+        return self._rows_to_transactions(results)[0]
     
     def get_by_asset(self, asset_id: str) -> List[BaseTransaction]:
         """获取指定资产的所有交易"""
@@ -240,7 +357,7 @@ class TransactionRepository:
         """
         results = self.db.execute_query(query, (asset_id,))
         
-        return [self._row_to_transaction(row) for row in results]
+        return self._rows_to_transactions(results)
     
     def get_by_date_range(self, start_date: date, end_date: date) -> List[BaseTransaction]:
         """获取指定日期范围内的交易"""
@@ -251,171 +368,447 @@ class TransactionRepository:
         """
         results = self.db.execute_query(query, (start_date.isoformat(), end_date.isoformat()))
         
-        return [self._row_to_transaction(row) for row in results]
+        return self._rows_to_transactions(results)
     
     def get_all(self) -> List[BaseTransaction]:
         """获取所有交易"""
         query = "SELECT * FROM transactions ORDER BY transaction_date DESC, created_date DESC"
         results = self.db.execute_query(query)
         
-        return [self._row_to_transaction(row) for row in results]
+        return self._rows_to_transactions(results)
+    
+    def find_page(self, limit: int = 50, cursor: Optional[str] = None,
+                  asset_id: Optional[str] = None,
+                  transaction_type: Optional[TransactionType] = None,
+                  currency: Optional[Currency] = None,
+                  start_date: Optional[date] = None, end_date: Optional[date] = None,
+                  min_amount: Optional[Decimal] = None, max_amount: Optional[Decimal] = None,
+                  notes: Optional[str] = None) -> Tuple[List[BaseTransaction], Optional[str]]:
+        """
+        按条件分页查询交易（按交易日期、创建时间倒序）
+        
+        使用键集分页：游标记录上一页最后一行的（交易日期, 创建时间, 交易ID），
+        下一页从该位置之后开始，借助组合索引定位，翻到多深都不需要OFFSET扫描。
+        
+        Args:
+            limit: 每页条数
+            cursor: 上一页返回的游标，None表示第一页
+            asset_id/transaction_type/currency: 精确匹配
+            start_date/end_date: 交易日期范围（含两端）
+            min_amount/max_amount: 原币金额范围（含两端）
+            notes: 备注包含的文本
+            
+        Returns:
+            (交易列表, 下一页游标；没有更多数据时为None)
+            
+        Raises:
+            ValueError: 游标格式无效
+        """
+        conditions, params = [], []
+        if asset_id:
+            conditions.append("asset_id = ?")
+            params.append(asset_id)
+        if transaction_type is not None:
+            conditions.append("transaction_type = ?")
+            params.append(_enum_name(transaction_type))
+        if currency is not None:
+            conditions.append("currency = ?")
+            params.append(_enum_name(currency))
+        if start_date is not None:
+            conditions.append("transaction_date >= ?")
+            params.append(start_date.isoformat())
+        if end_date is not None:
+            conditions.append("transaction_date <= ?")
+            params.append(end_date.isoformat())
+        if min_amount is not None:
+            conditions.append("amount >= ?")
+            params.append(to_minor(min_amount))
+        if max_amount is not None:
+            conditions.append("amount <= ?")
+            params.append(to_minor(max_amount))
+        if notes:
+            escaped = notes.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            conditions.append("notes LIKE ? ESCAPE '\\'")
+            params.append(f"%{escaped}%")
+        if cursor:
+            conditions.append("(transaction_date, created_date, transaction_id) < (?, ?, ?)")
+            params.extend(decode_page_cursor(cursor, 3))
+        
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        query = f"""
+            SELECT * FROM transactions {where}
+            ORDER BY transaction_date DESC, created_date DESC, transaction_id DESC
+            LIMIT ?
+        """
+        # 多取一行用于判断是否还有下一页
+        rows = self.db.execute_query(query, tuple(params) + (limit + 1,))
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_page_cursor(
+                (last['transaction_date'], last['created_date'], last['transaction_id'])
+            )
+        return self._rows_to_transactions(rows), next_cursor
+    
+    # Python的date.toordinal()与SQLite julianday()的差值
+    _ORDINAL_OFFSET = 1721424.5
+    
+    def load_ledger(self, asset_ids: Optional[List[str]] = None) -> Ledger:
+        """
+        直接从交易表构建列式账本（不创建交易对象）
+        
+        日期在SQL中转换为date.toordinal()序数，金额为最小单位整数。
+        
+        Args:
+            asset_ids: 只加载这些资产的交易，默认加载全部
+        """
+        query = f"""
+            SELECT asset_id,
+                   CAST(julianday(transaction_date) - {self._ORDINAL_OFFSET} AS INTEGER),
+                   transaction_type, amount, amount_base_currency, currency
+            FROM transactions
+        """
+        params: Tuple = ()
+        if asset_ids is not None:
+            query += f" WHERE asset_id IN ({', '.join('?' for _ in asset_ids)})"
+            params = tuple(asset_ids)
+        return Ledger.from_rows(self.db.iter_query(query, params, chunk_size=10000))
+    
+    def load_quantities(self, as_of: Optional[date] = None) -> Dict[str, Decimal]:
+        """
+        按资产汇总权益交易的持有数量（不创建交易对象）
+        
+        买入/转入计为正，卖出/转出计为负；拆股按（交易日期, rowid）顺序先调整已有数量，
+        与批次账簿一致。没有拆股的资产由单条SQL汇总，有拆股的资产按顺序累加。数量保留6位小数。
+        
+        Args:
+            as_of: 只统计该日期（含）之前的交易
+        """
+        signed_quantity = """
+            CASE WHEN t.transaction_type IN ('BUY', 'TRANSFER_IN') THEN e.quantity
+                 WHEN t.transaction_type IN ('SELL', 'TRANSFER_OUT') THEN -e.quantity
+                 ELSE 0 END
+        """
+        query = f"""
+            SELECT t.asset_id, SUM({signed_quantity}), MAX(COALESCE(e.split_ratio, 1) != 1)
+            FROM transactions t JOIN equity_transactions e ON e.transaction_id = t.transaction_id
+            WHERE (? IS NULL OR t.transaction_date <= ?)
+            GROUP BY t.asset_id
+        """
+        as_of_text = as_of.isoformat() if as_of else None
+        totals = {}
+        split_assets = []
+        for asset_id, total, has_split in self.db.execute_query(query, (as_of_text, as_of_text)):
+            if has_split:
+                split_assets.append(asset_id)
+            else:
+                totals[asset_id] = total or 0
+
+        for start in range(0, len(split_assets), _IN_CHUNK_SIZE):
+            chunk = split_assets[start:start + _IN_CHUNK_SIZE]
+            query = f"""
+                SELECT t.asset_id, {signed_quantity}, e.split_ratio
+                FROM transactions t JOIN equity_transactions e ON e.transaction_id = t.transaction_id
+                WHERE t.asset_id IN ({', '.join('?' * len(chunk))}) AND (? IS NULL OR t.transaction_date <= ?)
+                ORDER BY t.asset_id, t.transaction_date, t.rowid
+            """
+            for asset_id, quantity, split_ratio in self.db.iter_query(query, (*chunk, as_of_text, as_of_text)):
+                total = totals.get(asset_id, 0)
+                if split_ratio and split_ratio != 1:
+                    total *= split_ratio
+                totals[asset_id] = total + (quantity or 0)
+
+        return {asset_id: Decimal(str(round(total, 6))) for asset_id, total in totals.items()}
     
     def get_recent(self, limit: int = 50) -> List[BaseTransaction]:
         """获取最近N条交易，按交易日期倒序"""
         query = "SELECT * FROM transactions ORDER BY transaction_date DESC, created_date DESC LIMIT ?"
         results = self.db.execute_query(query, (limit,))
-        return [self._row_to_transaction(row) for row in results]
+        return self._rows_to_transactions(results)
     
     def update(self, transaction: BaseTransaction) -> bool:
         """更新交易记录"""
         try:
             with self.db.transaction() as conn:
-                # 更新主交易记录
-                main_query = """
-                    UPDATE transactions SET 
-                        asset_id = ?, transaction_date = ?, transaction_type = ?,
-                        amount = ?, currency = ?, exchange_rate = ?, 
-                        amount_base_currency = ?, notes = ?
-                    WHERE transaction_id = ?
-                """
-                main_params = (
-                    transaction.asset_id,
-                    transaction.transaction_date.isoformat(),
-                    transaction.transaction_type.name,  # 使用英文名称
-                    float(transaction.amount),
-                    transaction.currency.name,          # 使用英文名称
-                    float(transaction.exchange_rate),
-                    float(transaction.amount_base_currency),
-                    transaction.notes,
-                    transaction.transaction_id
-                )
+                # 交易可能被移到其他资产，原资产同样需要递增版本
+                asset_ids = self._asset_ids_of(conn, [transaction.transaction_id])
                 
-                conn.execute(main_query, main_params)
+                # 更新主交易记录
+                conn.execute(self._MAIN_UPDATE_SQL, self._update_params(transaction))
                 
                 # 更新特定类型的详情记录
                 self._update_transaction_details(conn, transaction)
                 
+            self.db.data_version.bump(asset_ids | {transaction.asset_id})
             return True
             
         except Exception as e:
             print(f"更新交易失败: {e}")
             return False
     
+    def update_many(self, transactions: List[BaseTransaction]) -> bool:
+        """
+        批量更新交易记录（全部成功或全部回滚）
+        
+        任一交易不存在时整批回滚并返回False。
+        """
+        if not transactions:
+            return True
+        try:
+            with self.db.transaction() as conn:
+                asset_ids = self._asset_ids_of(conn, [t.transaction_id for t in transactions])
+                cur = conn.executemany(self._MAIN_UPDATE_SQL, [self._update_params(t) for t in transactions])
+                if cur.rowcount != len(transactions):
+                    raise ValueError(f"部分交易不存在: 期望更新 {len(transactions)} 条，实际 {cur.rowcount} 条")
+                
+                # 先删除旧的详情记录，再按类别批量插入
+                id_params = [(t.transaction_id,) for t in transactions]
+                for table in self._DETAIL_TABLES:
+                    conn.executemany(f"DELETE FROM {table} WHERE transaction_id = ?", id_params)
+                self._insert_details_batch(conn, transactions)
+            self.db.data_version.bump(asset_ids | {t.asset_id for t in transactions})
+            return True
+            
+        except Exception as e:
+            print(f"批量更新交易失败: {e}")
+            return False
+    
     def delete(self, transaction_id: str) -> bool:
         """删除交易记录"""
         try:
             with self.db.transaction() as conn:
+                asset_ids = self._asset_ids_of(conn, [transaction_id])
                 # 删除详情记录
-                detail_tables = [
-                    'cash_transactions',
-                    'fixed_income_transactions', 
-                    'equity_transactions',
-                    'real_estate_transactions'
-                ]
-                for table in detail_tables:
+                for table in self._DETAIL_TABLES:
                     conn.execute(f"DELETE FROM {table} WHERE transaction_id = ?", (transaction_id,))
                 # 删除主记录
                 cur = conn.execute("DELETE FROM transactions WHERE transaction_id = ?", (transaction_id,))
                 if cur.rowcount == 0:
                     return False
+            self.db.data_version.bump(asset_ids)
             return True
         except Exception as e:
             print(f"删除交易失败: {e}")
             return False
     
+    def delete_many(self, transaction_ids: List[str]) -> bool:
+        """
+        批量删除交易记录（全部成功或全部回滚）
+        
+        任一交易不存在时整批回滚并返回False。
+        """
+        if not transaction_ids:
+            return True
+        try:
+            with self.db.transaction() as conn:
+                asset_ids = self._asset_ids_of(conn, transaction_ids)
+                id_params = [(transaction_id,) for transaction_id in transaction_ids]
+                for table in self._DETAIL_TABLES:
+                    conn.executemany(f"DELETE FROM {table} WHERE transaction_id = ?", id_params)
+                cur = conn.executemany("DELETE FROM transactions WHERE transaction_id = ?", id_params)
+                if cur.rowcount != len(transaction_ids):
+                    raise ValueError(f"部分交易不存在: 期望删除 {len(transaction_ids)} 条，实际 {cur.rowcount} 条")
+            self.db.data_version.bump(asset_ids)
+            return True
+        except Exception as e:
+            print(f"批量删除交易失败: {e}")
+            return False
+    
+    @staticmethod
+    def _asset_ids_of(conn: sqlite3.Connection, transaction_ids: List[str]) -> set:
+        """查询交易当前所属的资产ID（用于更新、删除后的版本递增），按IN列表分批查询"""
+        asset_ids = set()
+        for start in range(0, len(transaction_ids), _IN_CHUNK_SIZE):
+            chunk = transaction_ids[start:start + _IN_CHUNK_SIZE]
+            placeholders = ", ".join("?" for _ in chunk)
+            asset_ids.update(row[0] for row in conn.execute(
+                f"SELECT DISTINCT asset_id FROM transactions WHERE transaction_id IN ({placeholders})", chunk
+            ))
+        return asset_ids
+    
     def _create_transaction_details(self, conn: sqlite3.Connection, transaction: BaseTransaction):
         """创建交易详情记录"""
         if isinstance(transaction, CashTransaction):
-            query = """
-                INSERT INTO cash_transactions (
-                    transaction_id, account_type, interest_rate, compound_frequency
-                ) VALUES (?, ?, ?, ?)
-            """
-            params = (
-                transaction.transaction_id,
-                transaction.account_type,
-                float(transaction.interest_rate) if transaction.interest_rate else None,
-                transaction.compound_frequency if transaction.compound_frequency else None
-            )
-            conn.execute(query, params)
+            conn.execute(self._CASH_DETAIL_INSERT_SQL, self._cash_detail_params(transaction))
             
         elif isinstance(transaction, FixedIncomeTransaction):
-            query = """
-                INSERT INTO fixed_income_transactions (
-                    transaction_id, annual_rate, start_date, maturity_date,
-                    interest_type, payment_frequency, face_value, coupon_rate
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """
-            params = (
-                transaction.transaction_id,
-                float(transaction.annual_rate) if transaction.annual_rate else None,
-                transaction.start_date.isoformat() if transaction.start_date else None,
-                transaction.maturity_date.isoformat() if transaction.maturity_date else None,
-                transaction.interest_type if transaction.interest_type else None,
-                transaction.payment_frequency if transaction.payment_frequency else None,
-                float(transaction.face_value) if transaction.face_value else None,
-                float(transaction.coupon_rate) if transaction.coupon_rate else None
-            )
-            conn.execute(query, params)
+            conn.execute(self._FIXED_INCOME_DETAIL_INSERT_SQL, self._fixed_income_detail_params(transaction))
+            
+        elif isinstance(transaction, EquityTransaction):
+            conn.execute(self._EQUITY_DETAIL_INSERT_SQL, self._equity_detail_params(transaction))
+    
+    def _insert_details_batch(self, conn: sqlite3.Connection, transactions: List[BaseTransaction]):
+        """按交易类别分组，每张详情表执行一次executemany"""
+        cash_rows = []
+        fixed_income_rows = []
+        equity_rows = []
+        for transaction in transactions:
+            if isinstance(transaction, CashTransaction):
+                cash_rows.append(self._cash_detail_params(transaction))
+            elif isinstance(transaction, FixedIncomeTransaction):
+                fixed_income_rows.append(self._fixed_income_detail_params(transaction))
+            elif isinstance(transaction, EquityTransaction):
+                equity_rows.append(self._equity_detail_params(transaction))
+        
+        if cash_rows:
+            conn.executemany(self._CASH_DETAIL_INSERT_SQL, cash_rows)
+        if fixed_income_rows:
+            conn.executemany(self._FIXED_INCOME_DETAIL_INSERT_SQL, fixed_income_rows)
+        if equity_rows:
+            conn.executemany(self._EQUITY_DETAIL_INSERT_SQL, equity_rows)
+    
+    @staticmethod
+    def _main_params(transaction: BaseTransaction) -> Tuple:
+        """构建主交易表的插入参数"""
+        return (
+            transaction.transaction_id,
+            transaction.asset_id,
+            transaction.transaction_date.isoformat(),
+            transaction.transaction_type.name,  # 使用英文名称
+            to_minor(transaction.amount),       # 金额以最小单位整数存储
+            transaction.currency.name,          # 使用英文名称
+            float(transaction.exchange_rate),
+            to_minor(transaction.amount_base_currency),
+            transaction.notes
+        )
+    
+    @staticmethod
+    def _update_params(transaction: BaseTransaction) -> Tuple:
+        """构建主交易表的更新参数"""
+        return (
+            transaction.asset_id,
+            transaction.transaction_date.isoformat(),
+            transaction.transaction_type.name,  # 使用英文名称
+            to_minor(transaction.amount),       # 金额以最小单位整数存储
+            transaction.currency.name,          # 使用英文名称
+            float(transaction.exchange_rate),
+            to_minor(transaction.amount_base_currency),
+            transaction.notes,
+            transaction.transaction_id
+        )
+    
+    @staticmethod
+    def _cash_detail_params(transaction: CashTransaction) -> Tuple:
+        """构建现金交易详情表的插入参数"""
+        return (
+            transaction.transaction_id,
+            transaction.account_type,
+            float(transaction.interest_rate) if transaction.interest_rate else None,
+            transaction.compound_frequency if transaction.compound_frequency else None
+        )
+    
+    @staticmethod
+    def _fixed_income_detail_params(transaction: FixedIncomeTransaction) -> Tuple:
+        """构建固定收益交易详情表的插入参数"""
+        return (
+            transaction.transaction_id,
+            float(transaction.annual_rate) if transaction.annual_rate else None,
+            transaction.start_date.isoformat() if transaction.start_date else None,
+            transaction.maturity_date.isoformat() if transaction.maturity_date else None,
+            _enum_name(transaction.interest_type) if transaction.interest_type else None,
+            _enum_name(transaction.payment_frequency) if transaction.payment_frequency else None,
+            to_minor(transaction.face_value) if transaction.face_value else None,
+            float(transaction.coupon_rate) if transaction.coupon_rate else None
+        )
+    
+    @staticmethod
+    def _equity_detail_params(transaction: EquityTransaction) -> Tuple:
+        """构建权益交易详情表的插入参数"""
+        return (
+            transaction.transaction_id,
+            float(transaction.quantity),
+            float(transaction.price_per_share),
+            float(transaction.dividend_amount),
+            float(transaction.split_ratio)
+        )
     
     def _update_transaction_details(self, conn: sqlite3.Connection, transaction: BaseTransaction):
         """更新交易详情记录"""
         # 先删除旧的详情记录，再插入新的
-        detail_tables = [
-            'cash_transactions',
-            'fixed_income_transactions', 
-            'equity_transactions',
-            'real_estate_transactions'
-        ]
-        
-        for table in detail_tables:
+        for table in self._DETAIL_TABLES:
             conn.execute(f"DELETE FROM {table} WHERE transaction_id = ?", (transaction.transaction_id,))
         
         # 重新创建详情记录
         self._create_transaction_details(conn, transaction)
     
-    def _row_to_transaction(self, row: sqlite3.Row) -> BaseTransaction:
-        """将数据库行转换为Transaction对象"""
+    # 按优先级识别交易子类的详情表（同一交易ID在多个表中出现时取靠前的）
+    _SUBTYPE_DETAIL_TABLES = (
+        'fixed_income_transactions',
+        'equity_transactions',
+        'cash_transactions',
+    )
+    
+    def _rows_to_transactions(self, rows: List[sqlite3.Row]) -> List[BaseTransaction]:
+        """将数据库行批量转换为Transaction对象（每个详情表按交易ID分批查询，而不是逐行查询）"""
+        details = self._load_details([row['transaction_id'] for row in rows])
+        return [self._row_to_transaction(row, details) for row in rows]
+    
+    def _load_details(self, transaction_ids: List[str]) -> Dict[str, Dict[str, Dict]]:
+        """批量读取详情记录：详情表 -> {交易ID: 详情}"""
+        details: Dict[str, Dict[str, Dict]] = {table: {} for table in self._SUBTYPE_DETAIL_TABLES}
+        for start in range(0, len(transaction_ids), _IN_CHUNK_SIZE):
+            chunk = transaction_ids[start:start + _IN_CHUNK_SIZE]
+            placeholders = ', '.join('?' * len(chunk))
+            for table, found in details.items():
+                query = f"SELECT * FROM {table} WHERE transaction_id IN ({placeholders})"
+                found.update((row['transaction_id'], dict(row)) for row in self.db.execute_query(query, tuple(chunk)))
+        return details
+    
+    def _row_to_transaction(self, row: sqlite3.Row,
+                            details: Optional[Dict[str, Dict[str, Dict]]] = None) -> BaseTransaction:
+        """
+        将数据库行转换为Transaction对象
+        
+        Args:
+            details: _load_details()预先读取的详情记录；None时单独读取该行的详情
+        """
         # 根据交易类型确定具体的Transaction子类
         transaction_type = TransactionType[row['transaction_type']]  # 使用英文名称查找枚举
         
-        # 基础参数
+        amount = from_minor(row['amount'])
+        
+        # 基础参数（资产ID驻留，同一资产的交易共享字符串）
         base_params = {
             'transaction_id': row['transaction_id'],
-            'asset_id': row['asset_id'],
-            'transaction_date': datetime.fromisoformat(row['transaction_date']).date(),
+            'asset_id': sys.intern(row['asset_id']),
+            'transaction_date': _shared_date(row['transaction_date']),
             'transaction_type': transaction_type,
-            'amount': Decimal(str(row['amount'])),
+            'amount': amount,
             'currency': Currency[row['currency']],  # 使用英文名称查找枚举
-            'exchange_rate': Decimal(str(row['exchange_rate'])),
-            'notes': row['notes']
+            'exchange_rate': _shared_rate(row['exchange_rate']),
+            # 同币种交易的基础货币金额与原金额相同，共用同一个Decimal
+            'amount_base_currency': (
+                amount if row['amount_base_currency'] == row['amount']
+                else from_minor(row['amount_base_currency'])
+            ),
+            'notes': row['notes'],
+            'created_date': _shared_timestamp(row['created_date'])
         }
         
+        if details is None:
+            details = self._load_details([row['transaction_id']])
+        transaction_id = row['transaction_id']
+        
         # 先检查是否有固定收益详情，如果有则创建FixedIncomeTransaction
-        fixed_income_details = self._get_fixed_income_details(row['transaction_id'])
+        fixed_income_details = details['fixed_income_transactions'].get(transaction_id)
         if fixed_income_details:
             return self._create_fixed_income_transaction(base_params, fixed_income_details)
         
-        # 检查是否有现金交易详情，如果有则创建CashTransaction
-        cash_details = self._get_cash_details(row['transaction_id'])
-        if cash_details:
-            return self._create_cash_transaction(base_params)
-        
-        # 如果没有详情表记录，根据交易类型创建默认对象
-        if transaction_type in [TransactionType.DEPOSIT, TransactionType.WITHDRAW, TransactionType.INTEREST]:
-            return self._create_cash_transaction(base_params)
+        # 检查是否有权益交易详情，如果有则创建EquityTransaction
+        equity_details = details['equity_transactions'].get(transaction_id)
+        if equity_details:
+            return self._create_equity_transaction(base_params, equity_details)
         
-        # 默认返回现金交易对象
-        return self._create_cash_transaction(base_params)
+        # 现金交易详情可能不存在（没有详情表记录时默认为现金交易对象）
+        return self._create_cash_transaction(base_params, details['cash_transactions'].get(transaction_id))
     
-    def _create_cash_transaction(self, base_params: Dict) -> CashTransaction:
+    def _create_cash_transaction(self, base_params: Dict, details: Optional[Dict]) -> CashTransaction:
         """创建现金交易对象"""
-        details = self._get_cash_details(base_params['transaction_id'])
-        
         if details:
             base_params.update({
                 'account_type': details.get('account_type'),
-                'interest_rate': Decimal(str(details['interest_rate'])) if details.get('interest_rate') else None,
+                'interest_rate': _shared_rate(details['interest_rate']) if details.get('interest_rate') else None,
                 'compound_frequency': details.get('compound_frequency')
             })
         
@@ -424,28 +817,27 @@ class TransactionRepository:
     def _create_fixed_income_transaction(self, base_params: Dict, details: Dict) -> FixedIncomeTransaction:
         """创建固定收益交易对象"""
         base_params.update({
-            'annual_rate': Decimal(str(details['annual_rate'])) if details.get('annual_rate') else None,
-            'start_date': datetime.fromisoformat(details['start_date']).date() if details.get('start_date') else None,
-            'maturity_date': datetime.fromisoformat(details['maturity_date']).date() if details.get('maturity_date') else None,
+            'annual_rate': _shared_rate(details['annual_rate']) if details.get('annual_rate') else None,
+            'start_date': _shared_date(details['start_date']) if details.get('start_date') else None,
+            'maturity_date': _shared_date(details['maturity_date']) if details.get('maturity_date') else None,
             'interest_type': details.get('interest_type'),
             'payment_frequency': details.get('payment_frequency'),
-            'face_value': Decimal(str(details['face_value'])) if details.get('face_value') else None,
-            'coupon_rate': Decimal(str(details['coupon_rate'])) if details.get('coupon_rate') else None
+            'face_value': from_minor(details['face_value']) if details.get('face_value') else None,
+            'coupon_rate': _shared_rate(details['coupon_rate']) if details.get('coupon_rate') else None
         })
         
         return FixedIncomeTransaction(**base_params)
     
-    def _get_cash_details(self, transaction_id: str) -> Optional[Dict]:
-        """获取现金交易详情"""
-        query = "SELECT * FROM cash_transactions WHERE transaction_id = ?"
-        results = self.db.execute_query(query, (transaction_id,))
-        return dict(results[0]) if results else None
-    
-    def _get_fixed_income_details(self, transaction_id: str) -> Optional[Dict]:
-        """获取固定收益交易详情"""
-        query = "SELECT * FROM fixed_income_transactions WHERE transaction_id = ?"
-        results = self.db.execute_query(query, (transaction_id,))
-        return dict(results[0]) if results else None
+    def _create_equity_transaction(self, base_params: Dict, details: Dict) -> EquityTransaction:
+        """创建权益交易对象"""
+        base_params.update({
+            'quantity': _shared_rate(details['quantity']) if details.get('quantity') else Decimal('0'),
+            'price_per_share': _shared_rate(details['price_per_share']) if details.get('price_per_share') else Decimal('0'),
+            'dividend_amount': _shared_rate(details['dividend_amount']) if details.get('dividend_amount') else Decimal('0'),
+            'split_ratio': _shared_rate(details['split_ratio']) if details.get('split_ratio') else Decimal('1')
+        })
+        
+        return EquityTransaction(**base_params)
 
 
 class PortfolioSnapshotRepository:
@@ -457,21 +849,24 @@ class PortfolioSnapshotRepository:
     def create(self, snapshot: PortfolioSnapshot) -> bool:
         """创建投资组合快照"""
         try:
+            # 旧版快照模型与portfolio_snapshots表的对应：description -> notes，return_rate -> total_return_rate
             query = """
                 INSERT INTO portfolio_snapshots (
-                    snapshot_id, snapshot_date, base_currency, description,
-                    total_value, total_cost, total_return, return_rate,
+                    snapshot_id, snapshot_date, snapshot_time, snapshot_type, base_currency, notes,
+                    total_value, total_cost, total_return, total_return_rate,
                     asset_allocation, performance_metrics, position_snapshots
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """
             params = (
                 snapshot.snapshot_id,
+                snapshot.snapshot_date.date().isoformat(),
                 snapshot.snapshot_date.isoformat(),
+                'MANUAL',
                 snapshot.base_currency.name,  # 使用英文名称
                 snapshot.description,
-                float(snapshot.total_value),
-                float(snapshot.total_cost),
-                float(snapshot.total_return),
+                to_minor(snapshot.total_value),
+                to_minor(snapshot.total_cost),
+                to_minor(snapshot.total_return),
                 float(snapshot.return_rate),
                 json.dumps(snapshot.asset_allocation, default=str),
                 json.dumps(snapshot.performance_metrics, default=str),
@@ -518,15 +913,7 @@ class PortfolioSnapshotRepository:
         return [self._row_to_snapshot(row) for row in results]
     
     def delete(self, snapshot_id: str) -> bool:
-        """删除快照（检查是否为不可变）"""
-        # 检查快照是否为不可变
-        check_query = "SELECT is_immutable FROM portfolio_snapshots WHERE snapshot_id = ?"
-        result = self.db.execute_query(check_query, (snapshot_id,))
-        
-        if result and result[0]['is_immutable']:
-            print(f"无法删除快照 {snapshot_id}：快照为不可变状态")
-            return False
-        
+        """删除快照"""
         try:
             query = "DELETE FROM portfolio_snapshots WHERE snapshot_id = ?"
             rows_affected = self.db.execute_update(query, (snapshot_id,))
@@ -546,13 +933,13 @@ class PortfolioSnapshotRepository:
         
         return PortfolioSnapshot(
             snapshot_id=row['snapshot_id'],
-            snapshot_date=datetime.fromisoformat(row['snapshot_date']),
+            snapshot_date=datetime.fromisoformat(row['snapshot_time']),
             base_currency=Currency[row['base_currency']],  # 使用英文名称查找枚举
-            description=row['description'],
-            total_value=Decimal(str(row['total_value'])),
-            total_cost=Decimal(str(row['total_cost'])),
-            total_return=Decimal(str(row['total_return'])),
-            return_rate=Decimal(str(row['return_rate'])),
+            description=row['notes'] or "",
+            total_value=from_minor(row['total_value']),
+            total_cost=from_minor(row['total_cost']),
+            total_return=from_minor(row['total_return']),
+            return_rate=float(row['total_return_rate']),
             asset_allocation=json.loads(row['asset_allocation']),
             performance_metrics=json.loads(row['performance_metrics']),
             position_snapshots=position_snapshots
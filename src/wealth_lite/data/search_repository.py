@@ -0,0 +1,132 @@
+"""
+WealthLite 全文检索数据访问层
+
+基于FTS5外部内容表检索资产（名称、描述、发行方）与交易备注：
+- 查询词按空白拆分，各词之间为AND关系；trigram分词下每个词按子串匹配（包含前缀匹配）
+- 少于3个字符的词无法使用trigram索引，改为在源表列上做LIKE过滤
+- 结果按bm25相关度排序（LIKE查询按名称/日期排序）；交易备注只在最近录入的
+  RANK_CANDIDATES条命中记录中排序，常见词命中数十万行时不必为全部命中计算相关度
+- SQLite未编译FTS5时全部退化为LIKE查询
+"""
+
+import logging
+from typing import Any, Dict, List, Sequence, Tuple
+
+from .database import DatabaseManager
+
+
+# trigram分词可索引的最短查询词长度
+MIN_FTS_TERM_LENGTH = 3
+
+# 交易备注参与相关度排序的最大命中数（按rowid倒序，即最近录入的记录）
+RANK_CANDIDATES = 2000
+
+# 资产各列的bm25权重：名称 > 发行方 > 描述
+ASSET_COLUMN_WEIGHTS = (10.0, 1.0, 3.0)
+
+
+def _fts_phrase(term: str) -> str:
+    """将查询词转为FTS5字符串（双引号转义），避免用户输入被解析为查询语法"""
+    return '"' + term.replace('"', '""') + '"'
+
+
+def _like_pattern(term: str) -> str:
+    """将查询词转为LIKE子串模式（转义通配符）"""
+    escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f"%{escaped}%"
+
+
+class SearchRepository:
+    """全文检索数据访问层"""
+
+    def __init__(self, db_manager: DatabaseManager):
+        self.db = db_manager
+        self.logger = logging.getLogger(__name__)
+
+    def _build_conditions(self, terms: Sequence[str], fts: str, alias: str,
+                          columns: Sequence[str]) -> Tuple[List[str], List[Any], bool]:
+        """
+        构造检索条件
+
+        Returns:
+            (WHERE条件列表, 参数列表, 是否使用了FTS索引)
+        """
+        conditions, params = [], []
+        fts_terms = [t for t in terms if len(t) >= MIN_FTS_TERM_LENGTH] if self.db.fts_enabled else []
+        if fts_terms:
+            conditions.append(f"{fts} MATCH ?")
+            params.append(" ".join(_fts_phrase(t) for t in fts_terms))
+        for term in terms:
+            if term in fts_terms:
+                continue
+            conditions.append("(" + " OR ".join(f"{alias}.{col} LIKE ? ESCAPE '\\'" for col in columns) + ")")
+            params.extend([_like_pattern(term)] * len(columns))
+        return conditions, params, bool(fts_terms)
+
+    def search_assets(self, terms: Sequence[str], limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        检索资产
+
+        Returns:
+            [{asset_id, asset_type, currency, asset_name, description, issuer}]
+        """
+        columns = ('asset_name', 'description', 'issuer')
+        conditions, params, use_fts = self._build_conditions(terms, 'assets_fts', 'a', columns)
+        if not conditions:
+            return []
+        select = "SELECT a.asset_id, a.asset_type, a.currency, a.asset_name, a.description, a.issuer"
+        if use_fts:
+            query = select + f"""
+                FROM assets_fts JOIN assets a ON a.rowid = assets_fts.rowid
+                WHERE {' AND '.join(conditions)}
+                ORDER BY bm25(assets_fts, {', '.join(str(w) for w in ASSET_COLUMN_WEIGHTS)})
+                LIMIT ?
+            """
+        else:
+            query = select + f"""
+                FROM assets a
+                WHERE {' AND '.join(conditions)}
+                ORDER BY a.asset_name
+                LIMIT ?
+            """
+        return [dict(row) for row in self.db.execute_query(query, tuple(params) + (limit,))]
+
+    def search_transactions(self, terms: Sequence[str], limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        按备注检索交易
+
+        Returns:
+            [{transaction_id, asset_id, asset_name, transaction_date, transaction_type, amount, currency, notes}]，
+            amount为最小单位整数
+        """
+        conditions, params, use_fts = self._build_conditions(terms, 'transaction_notes_fts', 't', ('notes',))
+        if not conditions:
+            return []
+        select = """
+            SELECT t.transaction_id, t.asset_id, a.asset_name, t.transaction_date,
+                   t.transaction_type, t.amount, t.currency, t.notes
+        """
+        if use_fts:
+            query = select + f"""
+                FROM (
+                    SELECT transaction_notes_fts.rowid AS rowid, bm25(transaction_notes_fts) AS score
+                    FROM transaction_notes_fts
+                    JOIN transactions t ON t.rowid = transaction_notes_fts.rowid
+                    WHERE {' AND '.join(conditions)}
+                    ORDER BY transaction_notes_fts.rowid DESC
+                    LIMIT {RANK_CANDIDATES}
+                ) m
+                JOIN transactions t ON t.rowid = m.rowid
+                LEFT JOIN assets a ON a.asset_id = t.asset_id
+                ORDER BY m.score, t.transaction_date DESC
+                LIMIT ?
+            """
+        else:
+            query = select + f"""
+                FROM transactions t
+                LEFT JOIN assets a ON a.asset_id = t.asset_id
+                WHERE {' AND '.join(conditions)}
+                ORDER BY t.transaction_date DESC, t.created_date DESC
+                LIMIT ?
+            """
+        return [dict(row) for row in self.db.execute_query(query, tuple(params) + (limit,))]
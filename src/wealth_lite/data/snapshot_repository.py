@@ -16,6 +16,7 @@ from decimal import Decimal
 from .database import DatabaseManager
 from ..models.snapshot import PortfolioSnapshot, AIAnalysisConfig, AIAnalysisResult
 from ..models.enums import SnapshotType, AIType, Currency
+from ..models.money import to_minor, from_minor
 
 
 class SnapshotRepository:
@@ -45,15 +46,15 @@ class SnapshotRepository:
                 snapshot.snapshot_time.isoformat(),
                 snapshot.snapshot_type.value,
                 snapshot.base_currency.name,
-                round(float(snapshot.total_value), 2),
-                round(float(snapshot.total_cost), 2),
-                round(float(snapshot.total_return), 4),
+                to_minor(round(Decimal(snapshot.total_value), 2)),
+                to_minor(round(Decimal(snapshot.total_cost), 2)),
+                to_minor(round(Decimal(snapshot.total_return), 4)),
                 round(float(snapshot.total_return_rate), 4),
-                round(float(snapshot.cash_value), 2),
-                round(float(snapshot.fixed_income_value), 2),
-                round(float(snapshot.equity_value), 2),
-                round(float(snapshot.real_estate_value), 2),
-                round(float(snapshot.commodity_value), 2),
+                to_minor(round(Decimal(snapshot.cash_value), 2)),
+                to_minor(round(Decimal(snapshot.fixed_income_value), 2)),
+                to_minor(round(Decimal(snapshot.equity_value), 2)),
+                to_minor(round(Decimal(snapshot.real_estate_value), 2)),
+                to_minor(round(Decimal(snapshot.commodity_value), 2)),
                 round(float(snapshot.annualized_return), 4),
                 float(snapshot.volatility),
                 float(snapshot.sharpe_ratio),
@@ -191,15 +192,15 @@ class SnapshotRepository:
             snapshot_time=datetime.fromisoformat(row['snapshot_time']),
             snapshot_type=SnapshotType[row['snapshot_type']],
             base_currency=Currency[row['base_currency']],
-            total_value=Decimal(str(row['total_value'])),
-            total_cost=Decimal(str(row['total_cost'])),
-            total_return=Decimal(str(row['total_return'])),
+            total_value=from_minor(row['total_value']),
+            total_cost=from_minor(row['total_cost']),
+            total_return=from_minor(row['total_return']),
             total_return_rate=Decimal(str(row['total_return_rate'])),
-            cash_value=Decimal(str(row['cash_value'] or 0)),
-            fixed_income_value=Decimal(str(row['fixed_income_value'] or 0)),
-            equity_value=Decimal(str(row['equity_value'] or 0)),
-            real_estate_value=Decimal(str(row['real_estate_value'] or 0)),
-            commodity_value=Decimal(str(row['commodity_value'] or 0)),
+            cash_value=from_minor(row['cash_value'] or 0),
+            fixed_income_value=from_minor(row['fixed_income_value'] or 0),
+            equity_value=from_minor(row['equity_value'] or 0),
+            real_estate_value=from_minor(row['real_estate_value'] or 0),
+            commodity_value=from_minor(row['commodity_value'] or 0),
             annualized_return=Decimal(str(row['annualized_return'] or 0)),
             volatility=Decimal(str(row['volatility'] or 0)),
             sharpe_ratio=Decimal(str(row['sharpe_ratio'] or 0)),
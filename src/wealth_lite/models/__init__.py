@@ -6,12 +6,14 @@ WealthLite 数据模型包
 - 资产定义：Asset类
 - 交易事件：BaseTransaction及其子类
 - 持仓计算：Position类
+- 列式账本：Ledger类（批量汇总）
+- 持仓批次：Lot, LotBook类（权益类成本计价）
 - 投资组合：Portfolio, PortfolioSnapshot类
 """
 
 from .enums import (
     AssetType, AssetSubType, TransactionType, Currency, InterestType, PaymentFrequency,
-    PositionStatus, RiskLevel, LiquidityLevel, SnapshotType, AIType
+    PositionStatus, RiskLevel, LiquidityLevel, SnapshotType, AIType, CostBasisMethod
 )
 from .asset import Asset
 from .transaction import (
@@ -21,7 +23,9 @@ from .transaction import (
     EquityTransaction,
     RealEstateTransaction
 )
-from .position import Position
+from .position import Position, LazyPosition
+from .ledger import Ledger
+from .lots import Lot, LotBook
 from .portfolio import Portfolio, PortfolioSnapshot
 from .snapshot import PortfolioSnapshot as ExtendedPortfolioSnapshot, AIAnalysisConfig, AIAnalysisResult
 
@@ -38,6 +42,7 @@ __all__ = [
     "LiquidityLevel",
     "SnapshotType",
     "AIType",
+    "CostBasisMethod",
     
     # 核心模型
     "Asset",
@@ -47,6 +52,10 @@ __all__ = [
     "EquityTransaction",
     "RealEstateTransaction",
     "Position",
+    "LazyPosition",
+    "Ledger",
+    "Lot",
+    "LotBook",
     "Portfolio",
     "PortfolioSnapshot",
     "ExtendedPortfolioSnapshot",
@@ -7,7 +7,7 @@ WealthLite 枚举类型定义
 枚举分组：
 1. 核心业务枚举 - 资产、交易、货币
 2. 资产分类枚举 - 资产子类型
-3. 金融产品枚举 - 利息、付息频率
+3. 金融产品枚举 - 利息、付息频率、成本计价方法
 4. 状态评级枚举 - 持仓状态、风险等级、流动性等级
 5. 工具函数 - 枚举查找和转换
 
@@ -286,6 +286,22 @@ class PaymentFrequency(Enum):
         return [cls.MONTHLY, cls.QUARTERLY]
 
 
+class CostBasisMethod(Enum):
+    """
+    成本计价方法枚举
+    
+    定义权益类卖出时与买入批次（lot）的匹配方式，用于计算已实现损益。
+    """
+    FIFO = "先进先出"
+    LIFO = "后进先出"
+    AVERAGE = "移动加权平均"
+
+    @property
+    def display_name(self) -> str:
+        """返回显示名称"""
+        return self.value
+
+
 # ============================================================================
 # 状态评级枚举
 # ============================================================================
@@ -483,6 +499,7 @@ def get_all_enum_classes() -> Dict[str, type]:
         'AssetSubType': AssetSubType,
         'InterestType': InterestType,
         'PaymentFrequency': PaymentFrequency,
+        'CostBasisMethod': CostBasisMethod,
         'PositionStatus': PositionStatus,
         'RiskLevel': RiskLevel,
         'LiquidityLevel': LiquidityLevel,
@@ -0,0 +1,284 @@
+"""
+WealthLite 列式账本
+
+Ledger以列数组（struct-of-arrays）保存全部交易，用于批量计算持仓与组合汇总：
+- 每列一个NumPy数组：资产索引、日期序数、交易类型码、原币金额、基础货币金额（最小单位整数）、币种码
+- 构建时按（资产、日期）排序，各资产的交易连续存放，
+  汇总使用 np.add.reduceat 分段归约，整数运算结果精确
+- 只负责交易金额层面的汇总；估值（如固定收益按期计息）仍由Position完成
+
+需要安装numpy（可选依赖）。
+"""
+
+from datetime import date
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .enums import Currency, TransactionType
+from .money import from_minor, to_minor
+
+
+def _load_numpy():
+    """按需导入numpy"""
+    try:
+        import numpy
+    except ImportError as e:
+        raise RuntimeError("列式账本需要安装numpy: pip install numpy") from e
+    return numpy
+
+
+# 交易类型/币种的整数编码（按枚举定义顺序）
+TYPE_CODES: Dict[str, int] = {t.name: i for i, t in enumerate(TransactionType)}
+CURRENCY_CODES: Dict[str, int] = {c.name: i for i, c in enumerate(Currency)}
+
+# 汇总类别，顺序与Position的汇总键一致
+CATEGORIES = ('invested', 'withdrawn', 'income', 'fees')
+
+_CATEGORY_TYPES = {
+    'invested': (TransactionType.BUY, TransactionType.DEPOSIT, TransactionType.TRANSFER_IN),
+    'withdrawn': (TransactionType.SELL, TransactionType.WITHDRAW, TransactionType.TRANSFER_OUT),
+    'income': (TransactionType.INTEREST, TransactionType.DIVIDEND),
+    'fees': (TransactionType.FEE,),
+}
+
+# 交易类型码 -> 类别序号（不参与汇总的类型为 len(CATEGORIES)）
+_TYPE_CATEGORY = [len(CATEGORIES)] * len(TYPE_CODES)
+for _index, _category in enumerate(CATEGORIES):
+    for _type in _CATEGORY_TYPES[_category]:
+        _TYPE_CATEGORY[TYPE_CODES[_type.name]] = _index
+del _index, _category, _type
+
+# Ledger.from_rows 接受的行格式
+LedgerRow = Tuple[str, int, str, int, int, str]
+
+
+class Ledger:
+    """
+    列式账本
+
+    Attributes:
+        asset_ids: 资产索引 -> 资产ID
+        asset_idx / date_ordinal / type_code / amount / base_amount / currency_code: 各交易列
+    """
+
+    __slots__ = (
+        'asset_ids', 'asset_index', 'asset_idx', 'date_ordinal', 'type_code',
+        'category', 'amount', 'base_amount', 'currency_code', '_starts',
+    )
+
+    def __init__(self, asset_ids: Sequence[str], asset_idx, date_ordinal, type_code,
+                 amount, base_amount, currency_code):
+        np = _load_numpy()
+        self.asset_ids: List[str] = list(asset_ids)
+        self.asset_index: Dict[str, int] = {asset_id: i for i, asset_id in enumerate(self.asset_ids)}
+
+        # 按（资产、日期）排序，使每个资产的交易连续
+        order = np.lexsort((date_ordinal, asset_idx))
+        self.asset_idx = np.asarray(asset_idx, dtype=np.int32)[order]
+        self.date_ordinal = np.asarray(date_ordinal, dtype=np.int32)[order]
+        self.type_code = np.asarray(type_code, dtype=np.int8)[order]
+        self.amount = np.asarray(amount, dtype=np.int64)[order]
+        self.base_amount = np.asarray(base_amount, dtype=np.int64)[order]
+        self.currency_code = np.asarray(currency_code, dtype=np.int8)[order]
+        self.category = np.asarray(_TYPE_CATEGORY, dtype=np.int8)[self.type_code]
+
+        # 每个资产段的起始位置（资产索引从0连续编号，每个资产至少一笔交易）
+        self._starts = np.searchsorted(self.asset_idx, np.arange(len(self.asset_ids)))
+
+    # ==================== 构建 ====================
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[LedgerRow]) -> 'Ledger':
+        """
+        从数据行构建
+
+        Args:
+            rows: (asset_id, 日期序数, 交易类型名, 金额最小单位, 基础货币金额最小单位, 币种名)
+        """
+        np = _load_numpy()
+        asset_index: Dict[str, int] = {}
+        columns: Tuple[List[int], ...] = ([], [], [], [], [], [])
+        asset_col, date_col, type_col, amount_col, base_col, currency_col = columns
+        for asset_id, ordinal, type_name, amount, base_amount, currency in rows:
+            index = asset_index.get(asset_id)
+            if index is None:
+                index = asset_index[asset_id] = len(asset_index)
+            asset_col.append(index)
+            date_col.append(ordinal)
+            type_col.append(TYPE_CODES[type_name])
+            amount_col.append(amount)
+            base_col.append(base_amount)
+            currency_col.append(CURRENCY_CODES[currency])
+
+        return cls(
+            list(asset_index),
+            np.array(asset_col, dtype=np.int32),
+            np.array(date_col, dtype=np.int32),
+            np.array(type_col, dtype=np.int8),
+            np.array(amount_col, dtype=np.int64),
+            np.array(base_col, dtype=np.int64),
+            np.array(currency_col, dtype=np.int8),
+        )
+
+    @classmethod
+    def from_transactions(cls, transactions: Iterable) -> 'Ledger':
+        """从交易对象构建"""
+        return cls.from_rows(
+            (
+                t.asset_id,
+                t.transaction_date.toordinal(),
+                t.transaction_type.name,
+                to_minor(t.amount),
+                to_minor(t.amount_base_currency),
+                t.currency.name,
+            )
+            for t in transactions
+        )
+
+    def __len__(self) -> int:
+        return len(self.amount)
+
+    # ==================== 汇总 ====================
+
+    def totals(self, as_of: Optional[date] = None, original_currency: bool = False):
+        """
+        按资产、类别汇总金额
+
+        Args:
+            as_of: 只统计该日期（含）之前的交易
+            original_currency: True时汇总原币金额，否则汇总基础货币金额
+
+        Returns:
+            形状为 (资产数, len(CATEGORIES)) 的int64数组，单位为最小单位
+        """
+        np = _load_numpy()
+        result = np.zeros((len(self.asset_ids), len(CATEGORIES)), dtype=np.int64)
+        if not len(self):
+            return result
+
+        values = self.amount if original_currency else self.base_amount
+        if as_of is not None:
+            values = np.where(self.date_ordinal <= as_of.toordinal(), values, 0)
+        for index in range(len(CATEGORIES)):
+            masked = np.where(self.category == index, values, 0)
+            result[:, index] = np.add.reduceat(masked, self._starts)
+        return result
+
+    def position_totals(self, asset_id: str, as_of: Optional[date] = None) -> Dict[str, int]:
+        """单个资产的汇总（键与Position的汇总键一致，含原币种）"""
+        index = self.asset_index.get(asset_id)
+        if index is None:
+            return {key: 0 for category in CATEGORIES for key in (category, category + '_original')}
+        return self._position_totals_at(index, as_of)
+
+    def all_position_totals(self, as_of: Optional[date] = None) -> Dict[str, Dict[str, int]]:
+        """全部资产的汇总：资产ID -> 汇总字典"""
+        base = self.totals(as_of).tolist()
+        original = self.totals(as_of, original_currency=True).tolist()
+        result = {}
+        for asset_id, base_row, original_row in zip(self.asset_ids, base, original):
+            totals = {}
+            for category, base_value, original_value in zip(CATEGORIES, base_row, original_row):
+                totals[category] = base_value
+                totals[category + '_original'] = original_value
+            result[asset_id] = totals
+        return result
+
+    def activity(self) -> Dict[str, Tuple[int, date, date]]:
+        """各资产的交易笔数与首末交易日期：资产ID -> (笔数, 首次交易日期, 最后交易日期)"""
+        np = _load_numpy()
+        if not len(self):
+            return {}
+        ends = np.append(self._starts[1:], len(self))
+        counts = (ends - self._starts).tolist()
+        firsts = self.date_ordinal[self._starts].tolist()
+        lasts = self.date_ordinal[ends - 1].tolist()
+        return {
+            asset_id: (count, date.fromordinal(first), date.fromordinal(last))
+            for asset_id, count, first, last in zip(self.asset_ids, counts, firsts, lasts)
+        }
+
+    def book_values(self, as_of: Optional[date] = None):
+        """
+        各资产账面价值（基础货币，最小单位）
+
+        账面价值 = 投入 - 取出 - 费用 + 收入，与Position.current_book_value口径一致
+        """
+        totals = self.totals(as_of)
+        return totals[:, 0] - totals[:, 1] - totals[:, 3] + totals[:, 2]
+
+    def summary(self, as_of: Optional[date] = None) -> Dict[str, Decimal]:
+        """组合层面的汇总（基础货币）"""
+        invested, withdrawn, income, fees = (int(v) for v in self.totals(as_of).sum(axis=0))
+        net_invested = invested - withdrawn
+        principal = net_invested - fees
+        return {
+            'total_invested': from_minor(invested),
+            'total_withdrawn': from_minor(withdrawn),
+            'total_income': from_minor(income),
+            'total_fees': from_minor(fees),
+            'net_invested': from_minor(net_invested),
+            'total_cost': from_minor(principal),
+            'book_value': from_minor(principal + income),
+        }
+
+    def allocation(self, asset_types: Dict[str, str], as_of: Optional[date] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        按资产类型汇总账面价值
+
+        Args:
+            asset_types: 资产ID -> 资产类型名
+
+        Returns:
+            资产类型 -> {'value': Decimal, 'percentage': float, 'count': int}
+        """
+        np = _load_numpy()
+        type_names = sorted(set(asset_types.values()))
+        type_index = {name: i for i, name in enumerate(type_names)}
+        groups = np.array([type_index.get(asset_types.get(a), -1) for a in self.asset_ids], dtype=np.int64)
+        values = self.book_values(as_of)
+
+        # 只统计有持仓（账面价值为正）且类型已知的资产
+        held = (values > 0) & (groups >= 0)
+        sums = np.zeros(len(type_names), dtype=np.int64)
+        np.add.at(sums, groups[held], values[held])
+        counts = np.bincount(groups[held], minlength=len(type_names))
+
+        total = int(sums.sum())
+        allocation = {}
+        for name, value, count in zip(type_names, sums.tolist(), counts.tolist()):
+            if count:
+                allocation[name] = {
+                    'value': from_minor(value),
+                    'percentage': value / total * 100 if total > 0 else 0.0,
+                    'count': count,
+                }
+        return allocation
+
+    def apply_to(self, positions: Iterable, as_of: Optional[date] = None) -> None:
+        """将汇总结果注入Position，免去逐笔遍历交易"""
+        all_totals = self.all_position_totals(as_of)
+        for position in positions:
+            totals = all_totals.get(position.asset.asset_id)
+            if totals is not None:
+                position.set_totals(totals)
+
+    def _position_totals_at(self, index: int, as_of: Optional[date]) -> Dict[str, int]:
+        """计算单个资产段的汇总"""
+        np = _load_numpy()
+        start = self._starts[index]
+        end = self._starts[index + 1] if index + 1 < len(self._starts) else len(self)
+        category = self.category[start:end]
+        base = self.base_amount[start:end]
+        amount = self.amount[start:end]
+        if as_of is not None:
+            mask = self.date_ordinal[start:end] <= as_of.toordinal()
+            base = np.where(mask, base, 0)
+            amount = np.where(mask, amount, 0)
+
+        totals = {}
+        for index_, name in enumerate(CATEGORIES):
+            selected = category == index_
+            totals[name] = int(base[selected].sum())
+            totals[name + '_original'] = int(amount[selected].sum())
+        return totals
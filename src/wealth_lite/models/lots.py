@@ -0,0 +1,187 @@
+"""
+WealthLite 持仓批次（lot）
+
+LotBook按交易顺序维护权益类持仓的未平仓批次，计算成本基础与已实现损益：
+- FIFO/LIFO：批次保存在deque中，卖出时从队首/队尾匹配
+- AVERAGE：只保留一个合并批次（移动加权平均成本）
+- 拆股：split_ratio不为1的权益交易先按比例调整全部未平仓批次的数量（总成本不变）
+- 金额为基础货币最小单位整数，数量为Decimal
+
+LotBook只依赖已应用的交易，可持久化后对新增交易增量应用，无需重放全部历史。
+"""
+
+from collections import deque
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from typing import Deque, Iterable, Optional
+
+from .enums import CostBasisMethod, TransactionType
+from .money import from_minor, to_minor
+
+
+# 建立批次 / 减少批次的交易类型
+_OPEN_TYPES = (TransactionType.BUY, TransactionType.TRANSFER_IN)
+_CLOSE_TYPES = (TransactionType.SELL, TransactionType.TRANSFER_OUT)
+
+
+@dataclass(slots=True)
+class Lot:
+    """未平仓批次"""
+    transaction_id: str    # 建立批次的交易ID（平均法下为首笔买入）
+    acquired_date: date
+    quantity: Decimal
+    cost: int              # 总成本（基础货币，最小单位）
+
+    def take(self, quantity: Decimal) -> int:
+        """从批次中取出部分数量，返回对应的成本（最小单位）"""
+        if quantity >= self.quantity:
+            cost = self.cost
+        else:
+            cost = int((Decimal(self.cost) * quantity / self.quantity).to_integral_value())
+        self.quantity -= quantity
+        self.cost -= cost
+        return cost
+
+
+class LotBook:
+    """
+    单个持仓的批次账簿
+
+    Attributes:
+        method: 成本计价方法
+        lots: 未平仓批次（按建立顺序）
+        realized: 已实现交易损益（基础货币，最小单位，不含分红利息）
+        applied_count: 已应用的交易笔数
+        last_date: 最后应用的交易日期
+    """
+
+    __slots__ = ('method', 'lots', 'realized', 'applied_count', 'last_date')
+
+    def __init__(self, method: CostBasisMethod = CostBasisMethod.FIFO, lots: Iterable[Lot] = (),
+                 realized: int = 0, applied_count: int = 0, last_date: Optional[date] = None):
+        self.method = method
+        self.lots: Deque[Lot] = deque(lots)
+        self.realized = realized
+        self.applied_count = applied_count
+        self.last_date = last_date
+
+    @classmethod
+    def from_transactions(cls, transactions: Iterable, method: CostBasisMethod = CostBasisMethod.FIFO) -> 'LotBook':
+        """按交易日期顺序应用全部交易（稳定排序，同日按传入顺序）"""
+        book = cls(method)
+        for transaction in sorted(transactions, key=lambda t: t.transaction_date):
+            book.apply(transaction)
+        return book
+
+    # ==================== 应用交易 ====================
+
+    def apply(self, transaction) -> None:
+        """应用一笔交易对象（非权益交易只计数）"""
+        self.apply_event(
+            transaction.transaction_id,
+            transaction.transaction_date,
+            transaction.transaction_type,
+            getattr(transaction, 'quantity', None),
+            to_minor(transaction.amount_base_currency),
+            getattr(transaction, 'split_ratio', None),
+        )
+
+    def apply_event(self, transaction_id: str, transaction_date: date, transaction_type: TransactionType,
+                    quantity: Optional[Decimal], amount: int, split_ratio: Optional[Decimal] = None) -> None:
+        """
+        应用一笔交易
+
+        Args:
+            quantity: 权益交易数量，None表示非权益交易（不影响批次）
+            amount: 交易金额（基础货币，最小单位）
+            split_ratio: 拆股比例（如2表示1拆2）
+
+        Raises:
+            ValueError: 卖出/转出数量超过持有数量
+        """
+        self.applied_count += 1
+        self.last_date = transaction_date
+        if quantity is None:
+            return
+
+        if split_ratio and split_ratio != 1:
+            for lot in self.lots:
+                lot.quantity *= split_ratio
+
+        if quantity <= 0:
+            return
+        if transaction_type in _OPEN_TYPES:
+            self._open(Lot(transaction_id, transaction_date, quantity, amount))
+        elif transaction_type in _CLOSE_TYPES:
+            cost = self._close(quantity, transaction_id)
+            # 转出不是卖出，成本随数量转出，不产生损益
+            if transaction_type == TransactionType.SELL:
+                self.realized += amount - cost
+
+    def _open(self, lot: Lot) -> None:
+        """建立批次"""
+        if self.method == CostBasisMethod.AVERAGE and self.lots:
+            merged = self.lots[0]
+            merged.quantity += lot.quantity
+            merged.cost += lot.cost
+        else:
+            self.lots.append(lot)
+
+    def _close(self, quantity: Decimal, transaction_id: str) -> int:
+        """按计价方法匹配批次，返回被平仓部分的成本"""
+        if quantity > self.open_quantity:
+            raise ValueError(f"卖出数量超过持有数量: {transaction_id} ({quantity} > {self.open_quantity})")
+
+        cost = 0
+        from_end = self.method == CostBasisMethod.LIFO
+        while quantity > 0:
+            lot = self.lots[-1] if from_end else self.lots[0]
+            matched = min(quantity, lot.quantity)
+            cost += lot.take(matched)
+            quantity -= matched
+            if lot.quantity <= 0:
+                if from_end:
+                    self.lots.pop()
+                else:
+                    self.lots.popleft()
+        return cost
+
+    # ==================== 查询 ====================
+
+    @property
+    def open_quantity(self) -> Decimal:
+        """未平仓数量"""
+        return sum((lot.quantity for lot in self.lots), Decimal('0'))
+
+    @property
+    def open_cost(self) -> int:
+        """未平仓成本（最小单位）"""
+        return sum(lot.cost for lot in self.lots)
+
+    @property
+    def realized_pnl(self) -> Decimal:
+        """已实现交易损益"""
+        return from_minor(self.realized)
+
+    def unrealized_pnl(self, market_value: Decimal) -> Decimal:
+        """未实现损益 = 市值 - 未平仓成本"""
+        return from_minor(to_minor(market_value) - self.open_cost)
+
+    def to_dict(self) -> dict:
+        """转换为字典格式"""
+        return {
+            'method': self.method.name,
+            'open_quantity': float(self.open_quantity),
+            'open_cost': round(float(from_minor(self.open_cost)), 2),
+            'realized_pnl': round(float(self.realized_pnl), 2),
+            'lots': [
+                {
+                    'transaction_id': lot.transaction_id,
+                    'acquired_date': lot.acquired_date.isoformat(),
+                    'quantity': float(lot.quantity),
+                    'cost': round(float(from_minor(lot.cost)), 2),
+                }
+                for lot in self.lots
+            ],
+        }
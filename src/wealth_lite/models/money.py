@@ -0,0 +1,160 @@
+"""
+WealthLite 定点金额
+
+金额在数据库中以INTEGER最小单位（放大10^4的整数）存储，避免float↔Decimal往返：
+- to_minor / from_minor: Decimal与最小单位整数之间的精确转换
+- Money: 以整数为底层表示的定点金额类型，聚合计算只做整数加减
+- sqlite3适配器/转换器: Money可直接作为SQL参数写入；
+  列别名带 [MONEY] 且连接启用 PARSE_COLNAMES 时读出为Money
+"""
+
+import sqlite3
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Union
+
+
+# 金额小数位数与放大倍数（与原 DECIMAL(15,4) 列精度一致）
+MONEY_SCALE = 4
+MONEY_FACTOR = 10 ** MONEY_SCALE
+
+# 数据库中以最小单位存储的金额列（表名 -> 列名）
+MONEY_COLUMNS = {
+    'transactions': ('amount', 'amount_base_currency'),
+    'fixed_income_transactions': ('face_value',),
+    'portfolio_snapshots': (
+        'total_value', 'total_cost', 'total_return',
+        'cash_value', 'fixed_income_value', 'equity_value',
+        'real_estate_value', 'commodity_value',
+    ),
+}
+
+_QUANTUM = Decimal(1).scaleb(-MONEY_SCALE)
+
+Number = Union[Decimal, int, float, str]
+
+
+def to_minor(value: Number) -> int:
+    """
+    将金额转换为最小单位整数（四舍五入到4位小数）
+
+    float按其十进制字符串表示转换，避免二进制误差被放大。
+    """
+    if isinstance(value, Money):
+        return value.minor
+    if isinstance(value, int):
+        return value * MONEY_FACTOR
+    if not isinstance(value, Decimal):
+        value = Decimal(str(value))
+    return int(value.quantize(_QUANTUM, rounding=ROUND_HALF_UP).scaleb(MONEY_SCALE))
+
+
+def from_minor(minor: int) -> Decimal:
+    """将最小单位整数转换为Decimal（精确，保留4位小数）"""
+    return Decimal(int(minor)).scaleb(-MONEY_SCALE)
+
+
+def minor_to_float(minor: int) -> float:
+    """
+    将最小单位整数转换为float，用于JSON/表格输出
+
+    整数除法结果是离该十进制值最近的双精度数，repr后即为原始的十进制表示。
+    """
+    return minor / MONEY_FACTOR
+
+
+class Money:
+    """
+    定点金额
+
+    底层为最小单位整数，加减与比较均为整数运算；
+    与Decimal互转通过 from_decimal / to_decimal 完成。
+    """
+
+    __slots__ = ('minor',)
+
+    def __init__(self, minor: int = 0):
+        self.minor = int(minor)
+
+    @classmethod
+    def from_decimal(cls, value: Number) -> 'Money':
+        """从Decimal/数字创建"""
+        return cls(to_minor(value))
+
+    def to_decimal(self) -> Decimal:
+        """转换为Decimal"""
+        return from_minor(self.minor)
+
+    def __add__(self, other: 'Money') -> 'Money':
+        if isinstance(other, Money):
+            return Money(self.minor + other.minor)
+        if other == 0:
+            # 支持 sum() 的初始值0
+            return self
+        return NotImplemented
+
+    __radd__ = __add__
+
+    def __sub__(self, other: 'Money') -> 'Money':
+        if isinstance(other, Money):
+            return Money(self.minor - other.minor)
+        return NotImplemented
+
+    def __neg__(self) -> 'Money':
+        return Money(-self.minor)
+
+    def __mul__(self, factor: Number) -> 'Money':
+        """乘以数量或汇率，结果四舍五入到最小单位"""
+        if isinstance(factor, int):
+            return Money(self.minor * factor)
+        return Money.from_decimal(self.to_decimal() * Decimal(str(factor)))
+
+    __rmul__ = __mul__
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Money):
+            return self.minor == other.minor
+        if isinstance(other, (int, Decimal)):
+            return self.to_decimal() == other
+        return NotImplemented
+
+    def __lt__(self, other: 'Money') -> bool:
+        return self.minor < other.minor
+
+    def __le__(self, other: 'Money') -> bool:
+        return self.minor <= other.minor
+
+    def __gt__(self, other: 'Money') -> bool:
+        return self.minor > other.minor
+
+    def __ge__(self, other: 'Money') -> bool:
+        return self.minor >= other.minor
+
+    def __hash__(self) -> int:
+        # 与等值的Decimal/int哈希一致（__eq__可与二者比较）
+        return hash(self.to_decimal())
+
+    def __bool__(self) -> bool:
+        return self.minor != 0
+
+    def __float__(self) -> float:
+        return minor_to_float(self.minor)
+
+    def __str__(self) -> str:
+        return str(self.to_decimal())
+
+    def __repr__(self) -> str:
+        return f"Money('{self.to_decimal()}')"
+
+
+# ==================== sqlite3 适配器/转换器 ====================
+
+def _adapt_money(value: Money) -> int:
+    return value.minor
+
+
+def _convert_money(raw: bytes) -> Money:
+    return Money(int(raw))
+
+
+sqlite3.register_adapter(Money, _adapt_money)
+sqlite3.register_converter('MONEY', _convert_money)
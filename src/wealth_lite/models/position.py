@@ -7,15 +7,40 @@ Position类负责基于交易记录计算持仓状态，所有数值都从交易
 
 from datetime import datetime, date
 from decimal import Decimal
-from typing import List, Dict, Any, Optional
+from typing import Callable, List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass, field
+from operator import attrgetter
 
 from .asset import Asset
 from .transaction import BaseTransaction
-from .enums import PositionStatus, Currency
-
-
-@dataclass
+from .enums import AssetType, PositionStatus, Currency, TransactionType, CostBasisMethod
+from .lots import LotBook
+from .money import to_minor, from_minor
+
+
+# 交易类型 -> 金额汇总类别
+_AMOUNT_CATEGORIES = {
+    TransactionType.BUY: 'invested',
+    TransactionType.DEPOSIT: 'invested',
+    TransactionType.TRANSFER_IN: 'invested',
+    TransactionType.SELL: 'withdrawn',
+    TransactionType.WITHDRAW: 'withdrawn',
+    TransactionType.TRANSFER_OUT: 'withdrawn',
+    TransactionType.INTEREST: 'income',
+    TransactionType.DIVIDEND: 'income',
+    TransactionType.FEE: 'fees',
+}
+
+_TOTAL_KEYS = tuple(
+    key for category in ('invested', 'withdrawn', 'income', 'fees')
+    for key in (category, category + '_original')
+)
+
+# 影响金额汇总的交易字段：缓存的汇总按这些字段的当前取值校验，交易被原地修改后重新汇总
+_AMOUNT_SIGNATURE = attrgetter('transaction_type', 'amount', 'amount_base_currency')
+
+
+@dataclass(slots=True)
 class Position:
     """
     持仓状态类
@@ -29,6 +54,17 @@ class Position:
     asset: Asset
     transactions: List[BaseTransaction] = field(default_factory=list)
     base_currency: Currency = Currency.CNY
+    _totals_cache: Optional[Tuple[Any, Dict[str, int]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # 按市价批量估值的结果（基础货币），由PriceService注入
+    _market_value: Optional[Decimal] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # 持久化的批次账簿（权益类），由LotService注入
+    _lot_book: Optional[LotBook] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def __post_init__(self):
         """初始化后处理"""
@@ -79,121 +115,136 @@ class Position:
             return (date.today() - self.first_transaction_date).days
         return 0
 
+    def _totals(self) -> Dict[str, int]:
+        """
+        单次遍历交易，按类别汇总金额（最小单位整数）
+
+        结果按各笔交易的类型与金额缓存，增删交易或原地修改交易（如update_exchange_rate）后
+        重新汇总；各金额属性均从该汇总换算，避免多次遍历与Decimal累加。
+        """
+        cache = self._totals_cache
+        signature = self._totals_signature()
+        if cache is not None and cache[0] == signature:
+            return cache[1]
+
+        totals = dict.fromkeys(_TOTAL_KEYS, 0)
+        for t in self.transactions:
+            category = _AMOUNT_CATEGORIES.get(t.transaction_type)
+            if category is not None:
+                totals[category] += to_minor(t.amount_base_currency)
+                totals[category + '_original'] += to_minor(t.amount)
+
+        self._totals_cache = (signature, totals)
+        return totals
+
+    def _totals_signature(self) -> Any:
+        """汇总缓存的校验值：各笔交易影响金额的字段"""
+        return list(map(_AMOUNT_SIGNATURE, self.transactions))
+
+    def _book_value_minor(self, suffix: str = '') -> int:
+        """账面价值（最小单位）：投入 - 取出 - 费用 + 收入，suffix为'_original'时按原币种"""
+        totals = self._totals()
+        return (totals['invested' + suffix] - totals['withdrawn' + suffix]
+                - totals['fees' + suffix] + totals['income' + suffix])
+
+    def set_totals(self, totals: Dict[str, int]) -> None:
+        """注入批量计算（如Ledger）得到的汇总结果，键与_totals()一致"""
+        self._totals_cache = (self._totals_signature(), dict(totals))
+
+    def set_market_value(self, value: Optional[Decimal]) -> None:
+        """注入按市价批量估值的市值（基础货币），None表示清除"""
+        self._market_value = value
+
+    def set_lot_book(self, book: Optional[LotBook]) -> None:
+        """注入持久化的批次账簿（LotService.get_book的结果），None表示清除"""
+        self._lot_book = book
+
+    @property
+    def quantity(self) -> Decimal:
+        """持有数量（权益类交易：买入/转入为正，卖出/转出为负）"""
+        from .transaction import EquityTransaction
+        quantity = Decimal('0')
+        for t in self.transactions:
+            if isinstance(t, EquityTransaction):
+                if t.transaction_type in (TransactionType.BUY, TransactionType.TRANSFER_IN):
+                    quantity += t.quantity
+                elif t.transaction_type in (TransactionType.SELL, TransactionType.TRANSFER_OUT):
+                    quantity -= t.quantity
+        return quantity
+
     @property
     def total_invested(self) -> Decimal:
         """总投入金额（基础货币）"""
-        from .enums import TransactionType
-        investment_types = [TransactionType.BUY, TransactionType.DEPOSIT, TransactionType.TRANSFER_IN]
-        
-        return sum(
-            t.amount_base_currency for t in self.transactions
-            if t.transaction_type in investment_types
-        )
+        return from_minor(self._totals()['invested'])
 
     @property
     def total_withdrawn(self) -> Decimal:
         """总取出金额（基础货币）"""
-        from .enums import TransactionType
-        withdrawal_types = [TransactionType.SELL, TransactionType.WITHDRAW, TransactionType.TRANSFER_OUT]
-        
-        return sum(
-            t.amount_base_currency for t in self.transactions
-            if t.transaction_type in withdrawal_types
-        )
+        return from_minor(self._totals()['withdrawn'])
 
     @property
     def total_income(self) -> Decimal:
         """总收入金额（基础货币）"""
-        from .enums import TransactionType
-        income_types = [TransactionType.INTEREST, TransactionType.DIVIDEND]
-        
-        return sum(
-            t.amount_base_currency for t in self.transactions
-            if t.transaction_type in income_types
-        )
+        return from_minor(self._totals()['income'])
 
     @property
     def total_fees(self) -> Decimal:
         """总费用（基础货币）"""
-        from .enums import TransactionType
-        
-        return sum(
-            t.amount_base_currency for t in self.transactions
-            if t.transaction_type == TransactionType.FEE
-        )
+        return from_minor(self._totals()['fees'])
 
     @property
     def net_invested(self) -> Decimal:
         """净投入金额（投入 - 取出）"""
-        return self.total_invested - self.total_withdrawn
+        totals = self._totals()
+        return from_minor(totals['invested'] - totals['withdrawn'])
 
     @property
     def principal_amount(self) -> Decimal:
         """本金金额（净投入 - 费用）"""
-        return self.net_invested - self.total_fees
+        totals = self._totals()
+        return from_minor(totals['invested'] - totals['withdrawn'] - totals['fees'])
 
     @property
     def current_book_value(self) -> Decimal:
         """当前账面价值（本金 + 收入）- 基础货币"""
-        return self.principal_amount + self.total_income
+        return from_minor(self._book_value_minor())
     
     @property
     def current_book_value_original_currency(self) -> Decimal:
         """当前账面价值（原币种）"""
-        return self.principal_amount_original_currency + self.total_income_original_currency
+        return from_minor(self._book_value_minor('_original'))
     
     @property
     def total_invested_original_currency(self) -> Decimal:
         """总投入金额（原币种）"""
-        from .enums import TransactionType
-        investment_types = [TransactionType.BUY, TransactionType.DEPOSIT, TransactionType.TRANSFER_IN]
-        
-        return sum(
-            t.amount for t in self.transactions
-            if t.transaction_type in investment_types
-        )
+        return from_minor(self._totals()['invested_original'])
     
     @property
     def total_withdrawn_original_currency(self) -> Decimal:
         """总取出金额（原币种）"""
-        from .enums import TransactionType
-        withdrawal_types = [TransactionType.SELL, TransactionType.WITHDRAW, TransactionType.TRANSFER_OUT]
-        
-        return sum(
-            t.amount for t in self.transactions
-            if t.transaction_type in withdrawal_types
-        )
+        return from_minor(self._totals()['withdrawn_original'])
     
     @property
     def total_income_original_currency(self) -> Decimal:
         """总收入金额（原币种）"""
-        from .enums import TransactionType
-        income_types = [TransactionType.INTEREST, TransactionType.DIVIDEND]
-        
-        return sum(
-            t.amount for t in self.transactions
-            if t.transaction_type in income_types
-        )
+        return from_minor(self._totals()['income_original'])
     
     @property
     def total_fees_original_currency(self) -> Decimal:
         """总费用（原币种）"""
-        from .enums import TransactionType
-        
-        return sum(
-            t.amount for t in self.transactions
-            if t.transaction_type == TransactionType.FEE
-        )
+        return from_minor(self._totals()['fees_original'])
     
     @property
     def net_invested_original_currency(self) -> Decimal:
         """净投入金额（原币种）"""
-        return self.total_invested_original_currency - self.total_withdrawn_original_currency
+        totals = self._totals()
+        return from_minor(totals['invested_original'] - totals['withdrawn_original'])
     
     @property
     def principal_amount_original_currency(self) -> Decimal:
         """本金金额（原币种）"""
-        return self.net_invested_original_currency - self.total_fees_original_currency
+        totals = self._totals()
+        return from_minor(totals['invested_original'] - totals['withdrawn_original'] - totals['fees_original'])
 
     @property
     def status(self) -> PositionStatus:
@@ -224,6 +275,10 @@ class Position:
             # 使用提供的市场价格
             return self._calculate_market_value(market_price)
         
+        if self._market_value is not None:
+            # 已按市价批量估值
+            return self._market_value
+        
         # 根据资产类型使用不同的估值方法
         if self.asset.asset_type.name == 'CASH':
             # 现金类资产：账面价值即为市值
@@ -236,10 +291,25 @@ class Position:
             return self.current_book_value
 
     def _calculate_market_value(self, market_price: Decimal) -> Decimal:
-        """使用市场价格计算市值"""
-        # 这里需要根据具体的资产类型和持有数量来计算
-        # 简化实现：假设市场价格是每单位价格
-        return market_price * self.net_invested
+        """使用市场价格（资产币种的单位价格）计算市值：持有数量 × 价格"""
+        quantity = self.quantity
+        if quantity <= 0:
+            # 没有数量信息，无法按市价估值
+            return self.current_book_value
+        return self.to_base_currency(quantity * market_price)
+
+    def to_base_currency(self, local_value: Decimal) -> Decimal:
+        """
+        资产币种金额折算为基础货币（按平均记账汇率）
+
+        资产币种与基础货币相同、或没有原币账面价值时原样返回。
+        """
+        if self.asset.currency == self.base_currency:
+            return local_value
+        book_local = self._book_value_minor('_original')
+        if not book_local:
+            return local_value
+        return from_minor(to_minor(local_value * self._book_value_minor() / book_local))
 
     def _calculate_fixed_income_value(self) -> Decimal:
         """计算固定收益产品的当前价值"""
@@ -356,6 +426,7 @@ class Position:
         Returns:
             未实现损益（基础货币）
         """
+        market_value_given = market_value is not None
         if market_value is None:
             market_value = self.calculate_current_value()
         
@@ -374,8 +445,13 @@ class Position:
                 # 持有期间：当前估值 - 成本基础
                 cost_basis = self.principal_amount
                 return market_value - cost_basis
+        elif self._has_equity_transactions() and (book := self._valid_lot_book()) is not None:
+            # 权益类：未实现损益 = 市值 - 未平仓批次成本；没有市价时为0
+            if market_value_given or self._market_value is not None:
+                return book.unrealized_pnl(market_value)
+            return Decimal('0')
         else:
-            # 其他类型资产（如股票、基金等）：
+            # 其他类型资产：
             # 未实现损益 = 当前市值 - 成本基础 - 已实现收益
             cost_basis = self.principal_amount
             return market_value - cost_basis - self.total_income
@@ -390,9 +466,38 @@ class Position:
         # 已实现损益主要来自于：
         # 1. 利息收入
         # 2. 分红收入
-        # 3. 卖出交易的收益（如果有的话）
+        # 3. 卖出交易的收益（权益类按批次匹配买入成本）
+        if self._has_equity_transactions() and (book := self._valid_lot_book()) is not None:
+            return self.total_income + book.realized_pnl
         return self.total_income
 
+    def lot_book(self, method: CostBasisMethod = CostBasisMethod.FIFO) -> LotBook:
+        """
+        批次账簿（权益类）
+
+        优先使用LotService注入的持久化账簿；未注入（如未经服务层构建的持仓）时
+        按交易日期重放，同日按持仓中的交易顺序（按写入顺序传入时与LotService的（交易日期, rowid）顺序一致）。
+        """
+        book = self._lot_book
+        if book is not None and book.method == method:
+            return book
+        return LotBook.from_transactions(self.transactions, method)
+
+    def _valid_lot_book(self) -> Optional[LotBook]:
+        """
+        损益计算使用的批次账簿；交易无法构成有效账簿（卖出数量超过持有数量）时返回None，
+        由调用方退回到不按批次匹配的计算，读取路径上不抛出异常
+        """
+        try:
+            return self.lot_book()
+        except ValueError:
+            return None
+
+    def _has_equity_transactions(self) -> bool:
+        """是否包含权益类交易"""
+        from .transaction import EquityTransaction
+        return any(isinstance(t, EquityTransaction) for t in self.transactions)
+
     def get_transactions_by_type(self, transaction_type) -> List[BaseTransaction]:
         """获取指定类型的交易记录"""
         return [t for t in self.transactions if t.transaction_type == transaction_type]
@@ -410,6 +515,9 @@ class Position:
             raise ValueError("交易记录的资产ID与持仓资产ID不匹配")
         
         self.transactions.append(transaction)
+        self._totals_cache = None
+        self._market_value = None
+        self._lot_book = None
         # 重新排序
         self.transactions.sort(key=lambda t: t.transaction_date)
 
@@ -418,6 +526,9 @@ class Position:
         for i, transaction in enumerate(self.transactions):
             if transaction.transaction_id == transaction_id:
                 del self.transactions[i]
+                self._totals_cache = None
+                self._market_value = None
+                self._lot_book = None
                 return True
         return False
 
@@ -459,7 +570,7 @@ class Position:
     def __repr__(self) -> str:
         """详细字符串表示"""
         return (f"Position(asset={self.asset_name}, status={self.status.name}, "
-                f"net_invested={self.net_invested}, transactions={len(self.transactions)})")
+                f"net_invested={self.net_invested}, transactions={self.transaction_count})")
 
     def __eq__(self, other) -> bool:
         """相等性比较"""
@@ -469,4 +580,83 @@ class Position:
 
     def __hash__(self) -> int:
         """哈希值"""
-        return hash(self.position_id) 
\ No newline at end of file
+        return hash(self.position_id) 
+
+# Position.transactions 的槽描述符，LazyPosition 的属性经它读写实际存储的交易列表
+_TRANSACTIONS_SLOT = Position.__dict__['transactions']
+
+
+class LazyPosition(Position):
+    """
+    由列式账本构建的持仓
+
+    金额汇总、交易笔数与首末交易日期来自账本，交易明细在首次访问 transactions 时
+    （固定收益估值、含明细的to_dict等）才通过loader按资产加载。
+    现金与权益类持仓的常规计算不需要加载交易。
+    """
+
+    __slots__ = ('_loader', '_count', '_first_date', '_last_date')
+
+    def __init__(self, asset: Asset, loader: Callable[[str], List[BaseTransaction]], totals: Dict[str, int],
+                 count: int, first_date: date, last_date: date, base_currency: Currency = Currency.CNY):
+        """
+        Args:
+            asset: 资产
+            loader: 按资产ID加载交易的函数
+            totals: 账本汇总（Ledger.all_position_totals() 的单个资产结果）
+            count: 交易笔数
+            first_date: 首次交易日期
+            last_date: 最后交易日期
+        """
+        self._loader = None
+        Position.__init__(self, asset=asset, base_currency=base_currency)
+        self._count, self._first_date, self._last_date = count, first_date, last_date
+        self._loader = loader
+        self.set_totals(totals)
+
+    @property
+    def transactions(self) -> List[BaseTransaction]:
+        loader = self._loader
+        if loader is not None:
+            self._loader = None
+            loaded = loader(self.asset.asset_id)
+            loaded.sort(key=lambda t: t.transaction_date)
+            _TRANSACTIONS_SLOT.__set__(self, loaded)
+        return _TRANSACTIONS_SLOT.__get__(self)
+
+    @transactions.setter
+    def transactions(self, value: List[BaseTransaction]) -> None:
+        _TRANSACTIONS_SLOT.__set__(self, value)
+
+    @property
+    def is_loaded(self) -> bool:
+        """交易明细是否已加载"""
+        return self._loader is None
+
+    @property
+    def transaction_count(self) -> int:
+        return len(self.transactions) if self.is_loaded else self._count
+
+    @property
+    def first_transaction_date(self) -> Optional[date]:
+        return Position.first_transaction_date.fget(self) if self.is_loaded else self._first_date
+
+    @property
+    def last_transaction_date(self) -> Optional[date]:
+        return Position.last_transaction_date.fget(self) if self.is_loaded else self._last_date
+
+    @property
+    def status(self) -> PositionStatus:
+        # 只有固定收益类需要逐笔检查到期日
+        if not self.is_loaded and self.asset.asset_type != AssetType.FIXED_INCOME:
+            return PositionStatus.CLOSED if self.net_invested <= 0 else PositionStatus.ACTIVE
+        return Position.status.fget(self)
+
+    def _totals_signature(self) -> Any:
+        # 未加载时汇总只能来自账本注入，加载后按交易校验（不一致时重新汇总）
+        return Position._totals_signature(self) if self.is_loaded else None
+
+    def _has_equity_transactions(self) -> bool:
+        if not self.is_loaded:
+            return self.asset.asset_type == AssetType.EQUITY and self._count > 0
+        return Position._has_equity_transactions(self)
@@ -7,6 +7,8 @@ WealthLite 交易模型
 - FixedIncomeTransaction: 固定收益交易
 - EquityTransaction: 权益类交易
 - RealEstateTransaction: 房产交易
+
+交易类均为 slots 数据类（无实例__dict__），以降低大量交易加载时的内存占用。
 """
 
 import uuid
@@ -19,7 +21,7 @@ from abc import ABC, abstractmethod
 from .enums import TransactionType, Currency, InterestType, PaymentFrequency
 
 
-@dataclass
+@dataclass(slots=True)
 class BaseTransaction(ABC):
     """
     通用交易基类
@@ -134,7 +136,7 @@ class BaseTransaction(ABC):
                 f"type={self.transaction_type.name}, amount={self.amount})")
 
 
-@dataclass
+@dataclass(slots=True)
 class CashTransaction(BaseTransaction):
     """
     现金类交易
@@ -181,7 +183,7 @@ class CashTransaction(BaseTransaction):
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class FixedIncomeTransaction(BaseTransaction):
     """
     固定收益交易
@@ -200,7 +202,8 @@ class FixedIncomeTransaction(BaseTransaction):
 
     def __post_init__(self):
         """初始化后处理"""
-        super().__post_init__()
+        # slots=True 的数据类会重建类对象，无参super()不可用
+        BaseTransaction.__post_init__(self)
         
         # 设置默认起息日期
         if self.start_date is None:
@@ -277,7 +280,7 @@ class FixedIncomeTransaction(BaseTransaction):
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class EquityTransaction(BaseTransaction):
     """
     权益类交易
@@ -294,11 +297,11 @@ class EquityTransaction(BaseTransaction):
 
     def __post_init__(self):
         """初始化后处理"""
-        super().__post_init__()
-        
-        # 自动计算金额（如果未设置）
+        # 自动计算金额（如果未设置），需在基础校验之前完成
         if self.amount == 0 and self.quantity > 0 and self.price_per_share > 0:
             self.amount = self.quantity * self.price_per_share + self.commission
+        
+        BaseTransaction.__post_init__(self)
 
     @property
     def total_cost(self) -> Decimal:
@@ -343,7 +346,7 @@ class EquityTransaction(BaseTransaction):
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class RealEstateTransaction(BaseTransaction):
     """
     房产交易
@@ -361,7 +364,7 @@ class RealEstateTransaction(BaseTransaction):
 
     def __post_init__(self):
         """初始化后处理"""
-        super().__post_init__()
+        BaseTransaction.__post_init__(self)
         
         # 自动计算金额（如果未设置）
         if self.amount == 0 and self.property_area > 0 and self.price_per_unit > 0:
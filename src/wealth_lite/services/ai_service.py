@@ -13,8 +13,6 @@ import time
 import os
 from typing import Dict, Any, Optional, List
 from datetime import datetime
-import requests
-from openai import OpenAI
 import uuid # Added for conversation_id
 
 from ..models.snapshot import AIAnalysisConfig, AIAnalysisResult, PortfolioSnapshot
@@ -23,6 +21,18 @@ from src.wealth_lite.config.prompt_templates import (
     get_system_prompt, get_user_prompt, get_result_template, 
     format_user_prompt, get_available_prompt_types
 )
+from ..utils.metrics import ai_call
+
+
+def __getattr__(name: str):
+    """按需导入较重的可选依赖（openai、requests），避免拖慢应用启动"""
+    if name == "OpenAI":
+        from openai import OpenAI
+        return OpenAI
+    if name == "requests":
+        import requests
+        return requests
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class CloudAIService:
@@ -122,19 +132,21 @@ class OpenRouterService(CloudAIService):
         system_prompt = next((m["content"] for m in messages if m["role"] == "system"), None)
         user_prompt = next((m["content"] for m in messages if m["role"] == "user"), None)
         
-        self.logger.info(f"系统提示: {system_prompt[:100]}..." if system_prompt else "无系统提示")
-        self.logger.info(f"用户提示: {user_prompt[:100]}..." if user_prompt else "无用户提示")
-        self.logger.info(f"使用模型: {self.model}, 温度: {self.config.temperature}, 最大token: {self.config.max_tokens}")
+        self.logger.debug("系统提示: %.100s...", system_prompt or "无系统提示")
+        self.logger.debug("用户提示: %.100s...", user_prompt or "无用户提示")
+        self.logger.info("使用模型: %s, 温度: %s, 最大token: %s", self.model, self.config.temperature,
+                         self.config.max_tokens)
         
-        self.logger.info(f"使用requests库发送请求到: {url}")
-        response = requests.post(url, headers=headers, json=payload, timeout=30)
+        self.logger.debug("使用requests库发送请求到: %s", url)
+        with ai_call():
+            response = requests.post(url, headers=headers, json=payload, timeout=30)
         response.raise_for_status()
         
         result = response.json()
         if "choices" in result and len(result["choices"]) > 0:
             content = result["choices"][0]["message"]["content"]
-            self.logger.info(f"使用requests库分析完成，模型: {self.model}")
-            self.logger.info(f"分析结果: {content}")
+            self.logger.info("使用requests库分析完成，模型: %s，结果长度: %d", self.model, len(content))
+            self.logger.debug("分析结果: %s", content)
             return content
         else:
             raise Exception("API返回空响应")
@@ -366,11 +378,13 @@ class LocalAIService(CloudAIService):
                 "stream": False
             }
             
-            response = requests.post(
-                url, 
-                json=payload, 
-                timeout=self.config.timeout_seconds
-            )
+            import requests
+            with ai_call():
+                response = requests.post(
+                    url, 
+                    json=payload, 
+                    timeout=self.config.timeout_seconds
+                )
             response.raise_for_status()
             
             result = response.json()
@@ -383,8 +397,10 @@ class LocalAIService(CloudAIService):
     def test_connection(self) -> bool:
         """测试本地AI连接"""
         try:
+            import requests
             url = f"{self.base_url}/api/tags"
-            response = requests.get(url, timeout=5)
+            with ai_call():
+                response = requests.get(url, timeout=5)
             return response.status_code == 200
             
         except Exception as e:
@@ -0,0 +1,502 @@
+"""
+列式分析快照导出（Parquet / Arrow IPC）
+
+将 assets、transactions、portfolio_snapshots 导出为带类型的列式文件，供离线分析使用：
+- 金额/利率等Decimal列存为按固定小数位缩放的int64（字段元数据记录scale），避免浮点误差；
+  金额列在库中已是最小单位整数，直接写出
+- 日期列为date32，时间戳列为timestamp[us]
+- 增量导出：按rowid水位线只追加新插入的行，每次导出写入一个新的part文件；
+  上次导出后有行被原地修改或删除（table_modifications计数变化）时整表重写
+- 配套加载器可将文件读回为pyarrow.Table或领域模型
+
+需要安装pyarrow（可选依赖）。
+"""
+
+import json
+import logging
+import os
+import re
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal, ROUND_HALF_UP
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from ..data.database import DatabaseManager
+from ..models.asset import Asset
+from ..models.enums import AssetSubType, AssetType, Currency, SnapshotType, TransactionType
+from ..models.money import MONEY_SCALE
+from ..models.snapshot import PortfolioSnapshot
+from ..models.transaction import BaseTransaction, CashTransaction, EquityTransaction, FixedIncomeTransaction
+
+
+# 每个RecordBatch的行数
+BATCH_ROWS = 50000
+
+# 水位线文件名
+WATERMARK_FILE = '_watermark.json'
+
+# 支持的文件格式及扩展名
+FILE_FORMATS = {'parquet': '.parquet', 'arrow': '.arrow'}
+
+# part文件名中的序号
+_PART_NUMBER = re.compile(r'part-(\d+)\.')
+
+
+def _load_pyarrow():
+    """按需导入pyarrow"""
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise RuntimeError("列式导出需要安装pyarrow: pip install pyarrow") from e
+    return pyarrow
+
+
+@dataclass(frozen=True)
+class ColumnSpec:
+    """
+    列定义：kind为 string / decimal / money / date / timestamp
+
+    decimal列需指定scale；money列在库中已是最小单位整数，按MONEY_SCALE原样写出
+    """
+    name: str
+    kind: str
+    scale: int = 0
+
+
+@dataclass(frozen=True)
+class TableSpec:
+    """导出表定义"""
+    name: str
+    query: str          # 首列为rowid，需包含 {where} 占位符并按rowid排序
+    columns: Tuple[ColumnSpec, ...]
+
+
+def _s(name: str) -> ColumnSpec:
+    """字符串列"""
+    return ColumnSpec(name, 'string')
+
+
+def _d(name: str, scale: int) -> ColumnSpec:
+    """缩放整数存储的Decimal列"""
+    return ColumnSpec(name, 'decimal', scale)
+
+
+def _m(name: str) -> ColumnSpec:
+    """金额列（最小单位整数）"""
+    return ColumnSpec(name, 'money', MONEY_SCALE)
+
+
+# 以缩放整数写出的列类型
+_SCALED_KINDS = ('decimal', 'money')
+
+
+TABLES: Dict[str, TableSpec] = {
+    'assets': TableSpec(
+        name='assets',
+        query="""
+            SELECT a.rowid, asset_id, asset_name, asset_type, asset_subtype, currency, description,
+                   issuer, credit_rating, extended_attributes, created_date, updated_date
+            FROM assets a
+            {where}
+            ORDER BY a.rowid
+        """,
+        columns=(
+            _s('asset_id'), _s('asset_name'), _s('asset_type'), _s('asset_subtype'), _s('currency'),
+            _s('description'), _s('issuer'), _s('credit_rating'), _s('extended_attributes'),
+            ColumnSpec('created_date', 'timestamp'), ColumnSpec('updated_date', 'timestamp'),
+        ),
+    ),
+    'transactions': TableSpec(
+        name='transactions',
+        query="""
+            SELECT
+                t.rowid, t.transaction_id, t.asset_id, t.transaction_date, t.transaction_type,
+                t.amount, t.currency, t.exchange_rate, t.amount_base_currency, t.notes, t.created_date,
+                CASE WHEN f.transaction_id IS NOT NULL THEN 'FIXED_INCOME'
+                     WHEN e.transaction_id IS NOT NULL THEN 'EQUITY'
+                     WHEN c.transaction_id IS NOT NULL THEN 'CASH' END AS detail_type,
+                c.account_type, c.interest_rate, c.compound_frequency,
+                f.annual_rate, f.start_date, f.maturity_date, f.interest_type,
+                f.payment_frequency, f.face_value, f.coupon_rate,
+                e.quantity, e.price_per_share, e.dividend_amount, e.split_ratio
+            FROM transactions t
+            LEFT JOIN cash_transactions c ON c.transaction_id = t.transaction_id
+            LEFT JOIN fixed_income_transactions f ON f.transaction_id = t.transaction_id
+            LEFT JOIN equity_transactions e ON e.transaction_id = t.transaction_id
+            {where}
+            ORDER BY t.rowid
+        """,
+        columns=(
+            _s('transaction_id'), _s('asset_id'), ColumnSpec('transaction_date', 'date'),
+            _s('transaction_type'), _m('amount'), _s('currency'), _d('exchange_rate', 6),
+            _m('amount_base_currency'), _s('notes'), ColumnSpec('created_date', 'timestamp'),
+            _s('detail_type'), _s('account_type'), _d('interest_rate', 4), _s('compound_frequency'),
+            _d('annual_rate', 4), ColumnSpec('start_date', 'date'), ColumnSpec('maturity_date', 'date'),
+            _s('interest_type'), _s('payment_frequency'), _m('face_value'), _d('coupon_rate', 4),
+            _d('quantity', 6), _d('price_per_share', 4), _d('dividend_amount', 4), _d('split_ratio', 4),
+        ),
+    ),
+    'portfolio_snapshots': TableSpec(
+        name='portfolio_snapshots',
+        query="""
+            SELECT s.rowid, snapshot_id, snapshot_date, snapshot_time, snapshot_type, base_currency,
+                   total_value, total_cost, total_return, total_return_rate,
+                   cash_value, fixed_income_value, equity_value, real_estate_value, commodity_value,
+                   annualized_return, volatility, sharpe_ratio, max_drawdown,
+                   position_snapshots, asset_allocation, performance_metrics, created_date, notes
+            FROM portfolio_snapshots s
+            {where}
+            ORDER BY s.rowid
+        """,
+        columns=(
+            _s('snapshot_id'), ColumnSpec('snapshot_date', 'date'), ColumnSpec('snapshot_time', 'timestamp'),
+            _s('snapshot_type'), _s('base_currency'),
+            _m('total_value'), _m('total_cost'), _m('total_return'), _d('total_return_rate', 4),
+            _m('cash_value'), _m('fixed_income_value'), _m('equity_value'),
+            _m('real_estate_value'), _m('commodity_value'),
+            _d('annualized_return', 4), _d('volatility', 4), _d('sharpe_ratio', 4), _d('max_drawdown', 4),
+            _s('position_snapshots'), _s('asset_allocation'), _s('performance_metrics'),
+            ColumnSpec('created_date', 'timestamp'), _s('notes'),
+        ),
+    ),
+}
+
+# 各表水位线条件使用的表别名
+_TABLE_ALIASES = {'assets': 'a', 'transactions': 't', 'portfolio_snapshots': 's'}
+
+
+# ==================== 值转换 ====================
+
+def to_scaled_int(value: Any, scale: int) -> Optional[int]:
+    """将SQLite中的数值转换为按scale缩放的整数（四舍五入）"""
+    if value is None or value == '':
+        return None
+    return int(Decimal(str(value)).scaleb(scale).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def from_scaled_int(value: Optional[int], scale: int) -> Optional[Decimal]:
+    """将缩放整数还原为Decimal"""
+    if value is None:
+        return None
+    return Decimal(value).scaleb(-scale)
+
+
+def _to_date(value: Any) -> Optional[date]:
+    """解析SQLite中的日期文本"""
+    if not value:
+        return None
+    return date.fromisoformat(str(value)[:10])
+
+
+def _to_timestamp(value: Any) -> Optional[datetime]:
+    """解析SQLite中的时间戳文本（CURRENT_TIMESTAMP或ISO格式）"""
+    if not value:
+        return None
+    return datetime.fromisoformat(str(value))
+
+
+def _convert_column(spec: ColumnSpec, values: List[Any]) -> List[Any]:
+    """将一列SQLite值转换为Arrow列值"""
+    if spec.kind == 'decimal':
+        return [to_scaled_int(v, spec.scale) for v in values]
+    if spec.kind == 'money':
+        return [None if v is None else int(v) for v in values]
+    if spec.kind == 'date':
+        return [_to_date(v) for v in values]
+    if spec.kind == 'timestamp':
+        return [_to_timestamp(v) for v in values]
+    return [None if v is None else str(v) for v in values]
+
+
+def build_schema(table: TableSpec):
+    """构建Arrow schema，decimal/money列在字段元数据中记录scale"""
+    pa = _load_pyarrow()
+    fields = []
+    for column in table.columns:
+        if column.kind in _SCALED_KINDS:
+            fields.append(pa.field(column.name, pa.int64(), metadata={'scale': str(column.scale)}))
+        elif column.kind == 'date':
+            fields.append(pa.field(column.name, pa.date32()))
+        elif column.kind == 'timestamp':
+            fields.append(pa.field(column.name, pa.timestamp('us')))
+        else:
+            fields.append(pa.field(column.name, pa.string()))
+    return pa.schema(fields, metadata={'table': table.name})
+
+
+# ==================== 导出 ====================
+
+@dataclass
+class ExportRunResult:
+    """单表一次导出的结果"""
+    table: str
+    rows: int
+    path: Optional[str]
+
+
+class AnalyticsExportService:
+    """列式分析快照导出服务"""
+
+    def __init__(self, db_manager: DatabaseManager, output_dir: str, file_format: str = 'parquet'):
+        if file_format not in FILE_FORMATS:
+            raise ValueError(f"不支持的文件格式: {file_format}")
+        self.db_manager = db_manager
+        self.output_dir = Path(output_dir)
+        self.file_format = file_format
+        self.logger = logging.getLogger(__name__)
+
+    def export_all(self) -> List[ExportRunResult]:
+        """增量导出所有表"""
+        return [self.export_table(name) for name in TABLES]
+
+    def export_table(self, table_name: str) -> ExportRunResult:
+        """
+        增量导出单表：只写出rowid水位线之后的新行
+
+        无新行时不生成文件。上次导出后有行被UPDATE或DELETE时（触发器递增修改计数），
+        追加无法反映这些变化（删除最大rowid后该rowid还会被复用），改为整表重写：
+        写出全部行到新的part文件后删除旧part文件。
+        INSERT OR REPLACE（如快照覆盖）会产生新rowid，因此会作为新行导出。
+        """
+        pa = _load_pyarrow()
+        table = TABLES[table_name]
+        watermarks = self._read_watermarks()
+        mark = watermarks.get(table_name)
+        # 先读修改计数再读数据：导出期间发生的修改在下次导出时仍会被发现
+        generation = self._modification_generation(table_name)
+        full_rewrite = mark is None or mark.get('generation') != generation
+
+        alias = _TABLE_ALIASES[table_name]
+        where, params = '', ()
+        if not full_rewrite:
+            where = f"WHERE {alias}.rowid > ?"
+            params = (mark['rowid'],)
+
+        rows = self.db_manager.iter_query(table.query.format(where=where), params, chunk_size=BATCH_ROWS)
+        schema = build_schema(table)
+        table_dir = self.output_dir / table_name
+        old_parts = self._part_files(table_dir) if full_rewrite else []
+        path = table_dir / f"part-{self._next_part_number(table_dir):05d}{FILE_FORMATS[self.file_format]}"
+
+        writer = None
+        count = 0
+        last_rowid = None
+        try:
+            for chunk in _chunks(rows, BATCH_ROWS):
+                if writer is None:
+                    table_dir.mkdir(parents=True, exist_ok=True)
+                    writer = self._open_writer(pa, path, schema)
+                # 首列为rowid，仅用于水位线
+                last_rowid = chunk[-1][0]
+                columns = list(zip(*chunk))[1:]
+                arrays = [
+                    pa.array(_convert_column(spec, list(values)), type=schema.field(i).type)
+                    for i, (spec, values) in enumerate(zip(table.columns, columns))
+                ]
+                writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+                count += len(chunk)
+        finally:
+            if writer is not None:
+                writer.close()
+
+        # 新文件完整写出后再删除旧文件；中断时水位线未更新，下次仍会整表重写
+        for part in old_parts:
+            part.unlink()
+
+        if last_rowid is None and not full_rewrite:
+            self.logger.info(f"{table_name}: 无新增数据")
+            return ExportRunResult(table_name, 0, None)
+
+        watermarks[table_name] = {'rowid': last_rowid or 0, 'generation': generation}
+        self._write_watermarks(watermarks)
+        if last_rowid is None:
+            self.logger.info(f"{table_name}: 整表重写，表为空")
+            return ExportRunResult(table_name, 0, None)
+        self.logger.info(f"{table_name}: {'整表重写' if full_rewrite else '导出'} {count} 行 -> {path}")
+        return ExportRunResult(table_name, count, str(path))
+
+    def _modification_generation(self, table_name: str) -> int:
+        """表的原地修改/删除计数"""
+        rows = self.db_manager.execute_query(
+            "SELECT generation FROM table_modifications WHERE table_name = ?", (table_name,))
+        return rows[0][0] if rows else 0
+
+    def _open_writer(self, pa, path: Path, schema):
+        """打开Parquet或Arrow IPC写出器"""
+        if self.file_format == 'parquet':
+            import pyarrow.parquet as pq
+            return pq.ParquetWriter(str(path), schema)
+        return pa.ipc.new_file(str(path), schema)
+
+    @staticmethod
+    def _part_files(table_dir: Path) -> List[Path]:
+        """已有的part文件"""
+        if not table_dir.exists():
+            return []
+        return [p for p in table_dir.iterdir() if _PART_NUMBER.match(p.name)]
+
+    def _next_part_number(self, table_dir: Path) -> int:
+        """下一个part文件序号（已有最大序号+1，删除过文件也不会覆盖已有文件）"""
+        return max((int(_PART_NUMBER.match(p.name).group(1)) for p in self._part_files(table_dir)), default=0) + 1
+
+    def _read_watermarks(self) -> Dict[str, Dict[str, int]]:
+        """读取各表水位线"""
+        path = self.output_dir / WATERMARK_FILE
+        if not path.exists():
+            return {}
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _write_watermarks(self, watermarks: Dict[str, Dict[str, int]]) -> None:
+        """先写临时文件再替换，避免中断时水位线文件损坏"""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        path = self.output_dir / WATERMARK_FILE
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(watermarks, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+
+
+def _chunks(rows: Iterator, size: int) -> Iterator[List[Tuple]]:
+    """按固定行数分块"""
+    chunk = []
+    for row in rows:
+        chunk.append(tuple(row))
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# ==================== 加载 ====================
+
+def load_table(output_dir: str, table_name: str):
+    """
+    读取某表的全部part文件并合并为pyarrow.Table
+
+    同一主键可能因快照被替换而出现多次，模型加载函数会保留最后一次。
+    旧版本导出的part文件缺少后来新增的列，读取时补为空值。
+    """
+    pa = _load_pyarrow()
+    table_dir = Path(output_dir) / table_name
+    schema = build_schema(TABLES[table_name])
+    parts = sorted(table_dir.glob('part-*')) if table_dir.exists() else []
+    tables = []
+    for part in parts:
+        if part.suffix == '.parquet':
+            import pyarrow.parquet as pq
+            tables.append(pq.read_table(str(part)))
+        else:
+            with pa.ipc.open_file(str(part)) as reader:
+                tables.append(reader.read_all())
+    if not tables:
+        return schema.empty_table()
+    return pa.concat_tables([_align_schema(pa, t, schema) for t in tables])
+
+
+def _align_schema(pa, table, schema):
+    """按当前schema补齐缺失列并统一列顺序"""
+    for field in schema:
+        if field.name not in table.column_names:
+            table = table.append_column(field, pa.nulls(table.num_rows, type=field.type))
+    return table.select(schema.names).cast(schema)
+
+
+def _iter_records(output_dir: str, table_name: str) -> Iterator[Dict[str, Any]]:
+    """逐行产出字典，decimal列还原为Decimal"""
+    spec = TABLES[table_name]
+    scales = {c.name: c.scale for c in spec.columns if c.kind in _SCALED_KINDS}
+    for record in load_table(output_dir, table_name).to_pylist():
+        for name, scale in scales.items():
+            record[name] = from_scaled_int(record[name], scale)
+        yield record
+
+
+def load_assets(output_dir: str) -> List[Asset]:
+    """读回资产模型"""
+    assets: Dict[str, Asset] = {}
+    for r in _iter_records(output_dir, 'assets'):
+        assets[r['asset_id']] = Asset(
+            asset_id=r['asset_id'],
+            asset_name=r['asset_name'],
+            asset_type=AssetType[r['asset_type']],
+            asset_subtype=AssetSubType[r['asset_subtype']] if r['asset_subtype'] else None,
+            currency=Currency[r['currency']],
+            description=r['description'] or '',
+            issuer=r['issuer'] or '',
+            credit_rating=r['credit_rating'] or '',
+            created_date=r['created_date'] or datetime.now(),
+            updated_date=r['updated_date'] or datetime.now(),
+            extended_attributes=json.loads(r['extended_attributes']) if r['extended_attributes'] else {}
+        )
+    return list(assets.values())
+
+
+def load_transactions(output_dir: str) -> List[BaseTransaction]:
+    """读回交易模型（与TransactionRepository相同，按详情表类型选择子类）"""
+    transactions: Dict[str, BaseTransaction] = {}
+    for r in _iter_records(output_dir, 'transactions'):
+        base_params = dict(
+            transaction_id=r['transaction_id'],
+            asset_id=r['asset_id'],
+            transaction_date=r['transaction_date'],
+            transaction_type=TransactionType[r['transaction_type']],
+            amount=r['amount'],
+            currency=Currency[r['currency']],
+            exchange_rate=r['exchange_rate'],
+            amount_base_currency=r['amount_base_currency'],
+            notes=r['notes'],
+            created_date=r['created_date'] or datetime.now(),
+        )
+        if r['detail_type'] == 'FIXED_INCOME':
+            transaction = FixedIncomeTransaction(
+                annual_rate=r['annual_rate'],
+                start_date=r['start_date'],
+                maturity_date=r['maturity_date'],
+                interest_type=r['interest_type'],
+                payment_frequency=r['payment_frequency'],
+                face_value=r['face_value'],
+                coupon_rate=r['coupon_rate'],
+                **base_params
+            )
+        elif r['detail_type'] == 'EQUITY':
+            transaction = EquityTransaction(
+                quantity=r['quantity'] if r['quantity'] is not None else Decimal('0'),
+                price_per_share=r['price_per_share'] if r['price_per_share'] is not None else Decimal('0'),
+                dividend_amount=r['dividend_amount'] if r['dividend_amount'] is not None else Decimal('0'),
+                split_ratio=r['split_ratio'] if r['split_ratio'] is not None else Decimal('1'),
+                **base_params
+            )
+        else:
+            transaction = CashTransaction(
+                account_type=r['account_type'],
+                interest_rate=r['interest_rate'],
+                compound_frequency=r['compound_frequency'],
+                **base_params
+            )
+        transactions[transaction.transaction_id] = transaction
+    return list(transactions.values())
+
+
+def load_snapshots(output_dir: str) -> List[PortfolioSnapshot]:
+    """读回投资组合快照模型"""
+    decimal_fields = [c.name for c in TABLES['portfolio_snapshots'].columns if c.kind in _SCALED_KINDS]
+    snapshots: Dict[str, PortfolioSnapshot] = {}
+    for r in _iter_records(output_dir, 'portfolio_snapshots'):
+        values = {name: r[name] if r[name] is not None else Decimal('0') for name in decimal_fields}
+        snapshots[r['snapshot_id']] = PortfolioSnapshot(
+            snapshot_id=r['snapshot_id'],
+            snapshot_date=r['snapshot_date'],
+            snapshot_time=r['snapshot_time'],
+            snapshot_type=SnapshotType[r['snapshot_type']],
+            base_currency=Currency[r['base_currency']],
+            position_snapshots=json.loads(r['position_snapshots']) if r['position_snapshots'] else [],
+            asset_allocation=json.loads(r['asset_allocation']) if r['asset_allocation'] else {},
+            performance_metrics=json.loads(r['performance_metrics']) if r['performance_metrics'] else {},
+            created_date=r['created_date'] or datetime.now(),
+            notes=r['notes'] or '',
+            **values
+        )
+    return list(snapshots.values())
@@ -0,0 +1,83 @@
+"""
+WealthLite 服务容器
+
+应用内所有服务共用同一个DatabaseManager与WealthService，由容器统一创建：
+- 请求处理必需的服务在构造时创建，各步骤计入启动耗时统计
+- 快照、AI配置与AI分析服务在首次使用时才创建（AI分析模块依赖较重的可选库）
+"""
+
+import logging
+from functools import cached_property
+from typing import Optional
+
+from ..data.database import DatabaseManager
+from ..utils.metrics import record_query
+from ..utils.startup_timer import StartupTimer
+from .dashboard_service import DashboardPrecomputer, DashboardService
+from .fx_service import FxService
+from .response_cache import ResponseCache
+from .search_service import SearchService
+from .wealth_service import WealthService
+
+
+class ServiceContainer:
+    """服务容器"""
+
+    def __init__(self, db_manager: Optional[DatabaseManager] = None, timer: Optional[StartupTimer] = None,
+                 db_path: Optional[str] = None):
+        """
+        Args:
+            db_manager: 数据库管理器，默认按db_path创建
+            timer: 启动计时器，默认新建
+            db_path: 数据库文件路径，默认根据环境变量自动选择
+        """
+        self.timer = timer or StartupTimer()
+        self.logger = logging.getLogger(__name__)
+
+        with self.timer.phase("database"):
+            self.db_manager = db_manager or DatabaseManager(db_path)
+            # SQL次数、耗时与行数计入请求级性能指标
+            self.db_manager.add_query_hook(record_query)
+        with self.timer.phase("services"):
+            self.wealth_service = WealthService(self.db_manager)
+            self.fx_service = FxService(self.db_manager)
+            self.dashboard_service = DashboardService(self.wealth_service)
+            self.response_cache = ResponseCache(self.db_manager.data_version)
+            self.search_service = SearchService(self.db_manager)
+            self.dashboard_precomputer = DashboardPrecomputer(self.dashboard_service)
+
+    @cached_property
+    def snapshot_service(self):
+        """快照服务"""
+        from .snapshot_service import SnapshotService
+        return SnapshotService(self.db_manager, self.wealth_service)
+
+    @cached_property
+    def config_service(self):
+        """AI配置服务"""
+        from .snapshot_service import AIConfigService
+        return AIConfigService(self.db_manager)
+
+    @cached_property
+    def ai_analysis_service(self):
+        """AI分析服务（进程内单例）"""
+        from .ai_service import ai_analysis_service
+        return ai_analysis_service
+
+    def create_startup_snapshot(self) -> None:
+        """创建启动时的自动快照（失败不影响应用运行）"""
+        try:
+            with self.timer.phase("startup_snapshot"):
+                snapshot = self.snapshot_service.create_startup_snapshot()
+            if snapshot:
+                self.logger.info(f"✅ 自动快照创建成功: {snapshot.snapshot_id}")
+            else:
+                self.logger.info("ℹ️ 今日自动快照已存在，跳过创建")
+        except Exception as e:
+            self.logger.warning(f"⚠️ 自动快照创建失败: {e}")
+
+    def close(self) -> None:
+        """停止后台任务并关闭数据库连接"""
+        self.dashboard_precomputer.stop()
+        self.db_manager.remove_query_hook(record_query)
+        self.db_manager.close()
@@ -0,0 +1,322 @@
+"""
+WealthLite 仪表板服务
+
+为 /api/dashboard/summary 与 /api/portfolio/current 计算持仓汇总：
+- 每个持仓的仪表板条目按（资产版本, 日期）缓存，只有数据版本变化的资产才重新计算，
+  新增一笔存款不会重算其他持仓
+- 日期变化时全部重算（持有天数、固定收益按期计息随日期变化）
+- DashboardPrecomputer在写入后由后台线程去抖重建总览数据并原子替换，
+  读取只返回已序列化的结果
+"""
+
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..models.enums import AssetType
+from ..models.position import Position
+from ..utils.serialization import dumps
+from .response_cache import CachedResponse
+
+# 写入后等待的静默时间（秒），期间的连续写入合并为一次重建
+DASHBOARD_DEBOUNCE_SECONDS = 0.3
+
+
+@dataclass
+class DashboardEntry:
+    """单个持仓的仪表板条目"""
+    sort_key: str
+    asset_type: str
+    book_value: Decimal
+    current_value: Decimal
+    principal: Decimal
+    net_invested: Decimal
+    data: Dict[str, Any]
+
+
+class DashboardService:
+    """仪表板服务"""
+
+    def __init__(self, wealth_service):
+        self.wealth_service = wealth_service
+        self.data_version = wealth_service.db_manager.data_version
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        # 资产ID -> (资产版本, 日期, 条目或None（无持仓）)
+        self._entries: Dict[str, Tuple[int, date, Optional[DashboardEntry]]] = {}
+
+    def get_entries(self) -> List[DashboardEntry]:
+        """获取全部持仓条目（按资产名称排序），只重算数据版本变化的资产"""
+        with self._lock:
+            today = date.today()
+            self.data_version.refresh()  # 读取其他进程写入后的资产版本
+            assets = self.wealth_service.get_all_assets()
+            stale = []
+            for asset in assets:
+                version = self.data_version.asset_version(asset.asset_id)
+                cached = self._entries.get(asset.asset_id)
+                if cached is None or cached[0] != version or cached[1] != today:
+                    stale.append((asset, version))
+
+            if stale:
+                self.logger.debug("重算仪表板条目: %d/%d 个资产", len(stale), len(assets))
+                self._refresh(stale, today)
+
+            asset_ids = {asset.asset_id for asset in assets}
+            for asset_id in set(self._entries) - asset_ids:
+                del self._entries[asset_id]
+
+            entries = [self._entries[a.asset_id][2] for a in assets]
+            return sorted((e for e in entries if e is not None), key=lambda e: e.sort_key)
+
+    def _refresh(self, stale, today: date) -> None:
+        """重算指定资产的条目（持仓由账本汇总构建，只统计有持仓的资产）"""
+        positions = {
+            p.asset.asset_id: p for p in self.wealth_service.get_positions([asset for asset, _ in stale])
+        }
+
+        for asset, version in stale:
+            position = positions.get(asset.asset_id)
+            entry = None
+            if position is not None:
+                try:
+                    entry = self._build_entry(position, today)
+                except Exception as e:
+                    self.logger.error(f"❌ 处理持仓 {position.asset_name} 时出错: {e}", exc_info=True)
+            self._entries[asset.asset_id] = (version, today, entry)
+
+    @staticmethod
+    def _build_entry(pos: Position, today: date) -> DashboardEntry:
+        """计算单个持仓的仪表板数据"""
+        holding_days = (today - pos.first_transaction_date).days if pos.first_transaction_date else 0
+
+        # 市值与状态各只计算一次，再传给依赖它们的收益计算
+        current_value = pos.calculate_current_value()
+        status = pos.status
+        total_return = pos.calculate_total_return(current_value)
+        total_return_rate = pos.calculate_total_return_rate(current_value) / 100  # 转换为小数
+        annualized_return = pos.calculate_annualized_return(current_value) / 100  # 转换为小数
+        # 权益类没有市价时不估计未实现损益，不能传入按账面价值得到的市值
+        unrealized_pnl = (
+            pos.calculate_unrealized_pnl() if pos.asset.asset_type == AssetType.EQUITY
+            else pos.calculate_unrealized_pnl(current_value)
+        )
+        book_value = pos.current_book_value
+        book_value_original = pos.current_book_value_original_currency
+        first_date = pos.first_transaction_date.isoformat() if pos.first_transaction_date else None
+
+        data = {
+            # 基本信息
+            "id": pos.asset.asset_id,
+            "name": pos.asset.asset_name,
+            "type": pos.asset.asset_type.name.lower(),
+            "asset_subtype": pos.asset.asset_subtype.value if pos.asset.asset_subtype else "未知",
+            "currency": pos.asset.currency.name,
+
+            # 持仓价值（基础货币 - 人民币）
+            "amount": float(book_value),
+            "current_value": float(current_value),
+            "current_book_value": float(book_value),
+
+            # 持仓价值（原币种）
+            "amount_original_currency": float(book_value_original),
+            "current_value_original_currency": float(book_value_original),
+            "current_book_value_original_currency": float(book_value_original),
+
+            # 收益数据
+            "total_return": float(total_return),
+            "total_return_rate": float(total_return_rate),
+            "annualized_return": float(annualized_return),
+            "unrealized_pnl": float(unrealized_pnl),
+            "realized_pnl": float(pos.calculate_realized_pnl()),
+
+            # 交易统计
+            "transaction_count": pos.transaction_count,
+            "first_transaction_date": first_date,
+            "last_transaction_date": pos.last_transaction_date.isoformat() if pos.last_transaction_date else None,
+            "holding_days": holding_days,
+            "firstTransactionDate": first_date,  # 兼容前端
+
+            # 资金流水
+            "total_invested": float(pos.total_invested),
+            "total_withdrawn": float(pos.total_withdrawn),
+            "total_income": float(pos.total_income),
+            "total_fees": float(pos.total_fees),
+            "net_invested": float(pos.net_invested),
+            "principal_amount": float(pos.principal_amount),
+
+            # 持仓状态
+            "status": status.name,
+
+            # 兼容字段
+            "symbol": pos.asset.symbol or "",
+            "quantity": float(book_value),
+        }
+        return DashboardEntry(
+            sort_key=pos.asset_name,
+            asset_type=pos.asset.asset_type.name,
+            book_value=book_value,
+            current_value=current_value,
+            principal=pos.principal_amount,
+            net_invested=pos.net_invested,
+            data=data,
+        )
+
+    # ==================== 汇总 ====================
+
+    def get_summary(self) -> Dict[str, Any]:
+        """仪表板总览数据"""
+        entries = self.get_entries()
+        total_assets = sum((e.book_value for e in entries), Decimal('0'))
+        total_value = sum((e.current_value for e in entries), Decimal('0'))
+        total_cost = sum((e.principal for e in entries), Decimal('0'))
+        total_change = total_value - total_cost
+
+        return {
+            "total_assets": float(total_assets),
+            "total_change": float(total_change),
+            "total_change_percent": float(total_change / total_cost * 100) if total_cost > 0 else 0.0,
+            "cash_assets": float(sum((e.book_value for e in entries if e.asset_type == "CASH"), Decimal('0'))),
+            "fixed_income_assets": float(sum(
+                (e.book_value for e in entries if e.asset_type == "FIXED_INCOME"), Decimal('0')
+            )),
+            "assets": [e.data for e in entries],
+            "last_updated": datetime.now().isoformat()
+        }
+
+    def get_current_portfolio(self) -> Dict[str, Any]:
+        """当前投资组合状态（账面价值口径）"""
+        entries = self.get_entries()
+        total_value = sum((e.book_value for e in entries), Decimal('0'))
+        total_cost = sum((e.net_invested for e in entries), Decimal('0'))
+        total_return = total_value - total_cost
+        total_return_rate = (total_return / total_cost * 100) if total_cost > 0 else 0
+
+        return {
+            "total_value": float(total_value),
+            "total_cost": float(total_cost),
+            "total_return": float(total_return),
+            "total_return_rate": float(total_return_rate)
+        }
+
+
+@dataclass
+class DashboardSnapshot:
+    """预计算的仪表板总览数据"""
+    version: int
+    day: date
+    payload: Dict[str, Any]
+    response: CachedResponse
+    stale_response: Optional[CachedResponse] = None
+
+
+class DashboardPrecomputer:
+    """
+    仪表板总览预计算
+
+    订阅数据版本变化：每次写入只唤醒后台线程，线程等待写入静默后重建一次总览数据，
+    再原子替换当前快照。读取时若快照落后于数据版本（或日期已变化），
+    返回旧快照并在数据中标记 stale=true，同时触发重建。
+    未启动后台线程时（如测试环境）读取过期快照会同步重建。
+    """
+
+    def __init__(self, dashboard_service: DashboardService, debounce_seconds: float = DASHBOARD_DEBOUNCE_SECONDS):
+        self.dashboard_service = dashboard_service
+        self.data_version = dashboard_service.data_version
+        self.debounce_seconds = debounce_seconds
+        self.logger = logging.getLogger(__name__)
+        self._snapshot: Optional[DashboardSnapshot] = None
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._rebuild_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    # ==================== 生命周期 ====================
+
+    def start(self) -> None:
+        """启动后台重建线程"""
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self.data_version.subscribe(self._on_write)
+        self._thread = threading.Thread(target=self._run, name="dashboard-precompute", daemon=True)
+        self._thread.start()
+        self._wakeup.set()  # 启动后立即预热
+
+    def stop(self) -> None:
+        """停止后台重建线程"""
+        if self._thread is None:
+            return
+        self.data_version.unsubscribe(self._on_write)
+        self._stopping.set()
+        self._wakeup.set()
+        self._thread.join(timeout=5)
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        """后台线程是否在运行"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def _on_write(self, version: int) -> None:
+        """数据版本变化回调（写入线程中执行，只做唤醒）"""
+        self._wakeup.set()
+
+    def _run(self) -> None:
+        """后台线程：等待唤醒，去抖后重建"""
+        while not self._stopping.is_set():
+            self._wakeup.wait()
+            if self._stopping.is_set():
+                break
+            # 去抖：直到静默debounce_seconds秒没有新的写入
+            while True:
+                self._wakeup.clear()
+                if not self._wakeup.wait(self.debounce_seconds) or self._stopping.is_set():
+                    break
+            if self._stopping.is_set():
+                break
+            try:
+                self.rebuild()
+            except Exception as e:
+                self.logger.error(f"❌ 仪表板预计算失败: {e}", exc_info=True)
+
+    # ==================== 重建与读取 ====================
+
+    def rebuild(self) -> DashboardSnapshot:
+        """重建总览数据并原子替换当前快照"""
+        with self._rebuild_lock:
+            # 版本号在计算之前读取：计算期间的写入会让快照立即显示为过期并再次重建
+            version, day = self.data_version.version, date.today()
+            payload = self.dashboard_service.get_summary()
+            payload['data_version'] = version
+            payload['stale'] = False
+            snapshot = DashboardSnapshot(version, day, payload, self._serialize(payload, version, day))
+            self._snapshot = snapshot
+            return snapshot
+
+    def get_response(self) -> CachedResponse:
+        """获取已序列化的总览数据"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = self.rebuild()
+
+        if snapshot.version == self.data_version.version and snapshot.day == date.today():
+            return snapshot.response
+
+        if not self.running:
+            return self.rebuild().response
+
+        self._wakeup.set()
+        if snapshot.stale_response is None:
+            payload = dict(snapshot.payload, stale=True)
+            snapshot.stale_response = self._serialize(payload, snapshot.version, snapshot.day, stale=True)
+        return snapshot.stale_response
+
+    def _serialize(self, payload: Dict[str, Any], version: int, day: date, stale: bool = False) -> CachedResponse:
+        """序列化总览数据并生成ETag"""
+        body = dumps(payload)
+        etag = f'"{self.data_version.boot_id}-{version}-{day.toordinal()}{"-stale" if stale else ""}"'
+        return CachedResponse((version, day.toordinal()), etag, body)
@@ -2,38 +2,88 @@
 枚举生成器服务
 
 在服务器启动时生成前端需要的枚举JSON文件，实现前后端枚举数据的统一管理。
+文件内容附带内容哈希：服务端以哈希作为强ETag，带哈希的文件名（enums.<hash>.json）
+内容不会变化，可长期缓存；构建脚本据此把UI中的引用替换为带哈希的文件名。
 """
 
+import hashlib
 import json
 import os
 import logging
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 
 from ..models.enums import AssetType, AssetSubType, Currency, TransactionType, RiskLevel, LiquidityLevel
 
+# 枚举文件名
+ENUMS_FILE_NAME = "enums.json"
+
+# 文件名中内容哈希的长度（十六进制字符）
+ENUMS_HASH_LENGTH = 12
+
+
+def hashed_file_name(content_hash: str) -> str:
+    """带内容哈希的枚举文件名"""
+    return f"enums.{content_hash}.json"
+
 
 class EnumGeneratorService:
     """枚举生成器服务"""
     
     def __init__(self, output_dir: str = "src/wealth_lite/ui/app/data"):
         self.output_dir = Path(output_dir)
-        self.output_file = self.output_dir / "enums.json"
-        
-    def generate_enums_file(self) -> bool:
-        """生成枚举JSON文件"""
+        self.output_file = self.output_dir / ENUMS_FILE_NAME
+        self._rendered: Optional[Tuple[str, str]] = None
+
+    def render(self) -> Tuple[str, str]:
+        """
+        生成枚举文件内容（结果缓存，枚举在进程内不会变化）
+
+        Returns:
+            (JSON文本, 内容哈希)
+        """
+        if self._rendered is None:
+            data = self._generate_enums_data()
+            canonical = json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+            content_hash = hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:ENUMS_HASH_LENGTH]
+            data["meta"]["content_hash"] = content_hash
+            self._rendered = (json.dumps(data, ensure_ascii=False, indent=2), content_hash)
+        return self._rendered
+
+    @property
+    def content_hash(self) -> str:
+        """枚举内容哈希"""
+        return self.render()[1]
+
+    def generate_enums_file(self, hashed: bool = False) -> bool:
+        """
+        生成枚举JSON文件（内容未变化时跳过写入）
+
+        Args:
+            hashed: 是否同时生成带内容哈希的文件（并删除旧哈希的文件），供构建产物使用
+        """
         try:
             # 确保输出目录存在
             self.output_dir.mkdir(parents=True, exist_ok=True)
-            
+
             # 生成枚举数据
-            enums_data = self._generate_enums_data()
-            
-            # 写入JSON文件
-            with open(self.output_file, 'w', encoding='utf-8') as f:
-                json.dump(enums_data, f, ensure_ascii=False, indent=2)
-            
-            logging.info(f"✅ 枚举文件生成成功: {self.output_file}")
+            content, content_hash = self.render()
+            targets = [self.output_file]
+            if hashed:
+                targets.append(self.output_dir / hashed_file_name(content_hash))
+                for stale in self.output_dir.glob(hashed_file_name("*")):
+                    if stale.name != targets[-1].name:
+                        stale.unlink()
+
+            for target in targets:
+                # 内容与现有文件一致时不重写，避免每次启动都改动文件
+                if target.exists() and target.read_text(encoding='utf-8') == content:
+                    logging.debug(f"枚举文件已是最新，跳过生成: {target}")
+                    continue
+
+                # 写入JSON文件
+                target.write_text(content, encoding='utf-8')
+                logging.info(f"✅ 枚举文件生成成功: {target}")
             return True
             
         except Exception as e:
@@ -46,7 +96,6 @@ class EnumGeneratorService:
             # 元数据
             "meta": {
                 "version": "1.0.0",
-                "generated_at": "2025-01-21T00:00:00Z",
                 "description": "WealthLite系统枚举定义，由后端自动生成"
             },
             
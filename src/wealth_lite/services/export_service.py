@@ -0,0 +1,275 @@
+"""
+数据导出服务
+
+将交易、持仓和快照流式导出为CSV/JSONL/XLSX：
+- 数据从SQLite游标分批读取（DatabaseManager.iter_query），不整体加载到内存
+- 各格式写出器均为生成器，逐块产出字节，可直接用于StreamingResponse
+- XLSX使用xlsxwriter的constant_memory模式，写完一行即刷新到磁盘
+- 金额列在库中为最小单位整数，聚合在SQL中以整数完成，输出时再换算为元
+"""
+
+import csv
+import io
+import json
+import logging
+import os
+import tempfile
+from datetime import date
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from ..data.database import DatabaseManager
+from ..models.money import MONEY_COLUMNS, minor_to_float
+
+
+# 每次从游标读取/向输出写入的行数
+EXPORT_CHUNK_SIZE = 1000
+
+# 支持的导出格式及其MIME类型
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'jsonl': 'application/x-ndjson',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+# 交易导出：主表与各详情表左连接展开为一行
+TRANSACTION_EXPORT_QUERY = """
+    SELECT
+        t.transaction_id, t.asset_id, a.asset_name, a.asset_type,
+        t.transaction_date, t.transaction_type, t.amount, t.currency,
+        t.exchange_rate, t.amount_base_currency, t.notes, t.created_date,
+        c.account_type, c.interest_rate, c.compound_frequency,
+        f.annual_rate, f.start_date, f.maturity_date, f.interest_type,
+        f.payment_frequency, f.face_value, f.coupon_rate,
+        e.quantity, e.price_per_share, e.dividend_amount, e.split_ratio
+    FROM transactions t
+    LEFT JOIN assets a ON a.asset_id = t.asset_id
+    LEFT JOIN cash_transactions c ON c.transaction_id = t.transaction_id
+    LEFT JOIN fixed_income_transactions f ON f.transaction_id = t.transaction_id
+    LEFT JOIN equity_transactions e ON e.transaction_id = t.transaction_id
+    ORDER BY t.transaction_date, t.created_date
+"""
+
+# 持仓导出：在SQL中按资产做整数聚合，口径与Position模型一致（基础货币）
+POSITION_EXPORT_QUERY = """
+    SELECT
+        a.asset_id, a.asset_name, a.asset_type, a.currency,
+        COUNT(t.transaction_id) AS transaction_count,
+        MIN(t.transaction_date) AS first_transaction_date,
+        MAX(t.transaction_date) AS last_transaction_date,
+        COALESCE(SUM(CASE WHEN t.transaction_type IN ('BUY', 'DEPOSIT', 'TRANSFER_IN')
+                     THEN t.amount_base_currency END), 0) AS total_invested,
+        COALESCE(SUM(CASE WHEN t.transaction_type IN ('SELL', 'WITHDRAW', 'TRANSFER_OUT')
+                     THEN t.amount_base_currency END), 0) AS total_withdrawn,
+        COALESCE(SUM(CASE WHEN t.transaction_type IN ('INTEREST', 'DIVIDEND')
+                     THEN t.amount_base_currency END), 0) AS total_income,
+        COALESCE(SUM(CASE WHEN t.transaction_type = 'FEE'
+                     THEN t.amount_base_currency END), 0) AS total_fees
+    FROM assets a
+    JOIN transactions t ON t.asset_id = a.asset_id
+    GROUP BY a.asset_id
+    ORDER BY a.asset_type, a.asset_name
+"""
+
+SNAPSHOT_EXPORT_QUERY = """
+    SELECT * FROM portfolio_snapshots ORDER BY snapshot_date, snapshot_type
+"""
+
+
+# 持仓导出中以最小单位整数表示的金额列（含派生字段）
+POSITION_MONEY_COLUMNS = (
+    'total_invested', 'total_withdrawn', 'total_income', 'total_fees',
+    'net_invested', 'principal_amount', 'current_book_value',
+)
+
+# 交易导出中的金额列
+TRANSACTION_MONEY_COLUMNS = (
+    MONEY_COLUMNS['transactions'] + MONEY_COLUMNS['fixed_income_transactions']
+)
+
+
+def _position_rows(rows: Iterable) -> Iterator[Tuple]:
+    """为持仓聚合行补充派生字段（净投入、本金、账面价值），整数运算"""
+    for row in rows:
+        values = tuple(row)
+        total_invested, total_withdrawn, total_income, total_fees = values[-4:]
+        net_invested = total_invested - total_withdrawn
+        principal_amount = net_invested - total_fees
+        yield values + (net_invested, principal_amount, principal_amount + total_income)
+
+
+def _money_rows(columns: Sequence[str], money_columns: Sequence[str],
+                rows: Iterable[Tuple]) -> Iterator[Tuple]:
+    """将金额列从最小单位整数换算为元（float），其余列原样输出"""
+    indexes = [i for i, name in enumerate(columns) if name in money_columns]
+    if not indexes:
+        yield from rows
+        return
+    for row in rows:
+        values = list(row)
+        for i in indexes:
+            if values[i] is not None:
+                values[i] = minor_to_float(values[i])
+        yield tuple(values)
+
+
+# ==================== 格式写出器 ====================
+
+def iter_csv(columns: Sequence[str], rows: Iterable[Sequence[Any]],
+             chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[bytes]:
+    """逐块生成CSV字节（带BOM，便于Excel识别UTF-8）"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write('\ufeff')
+    writer.writerow(columns)
+    pending = 0
+    for row in rows:
+        writer.writerow(row)
+        pending += 1
+        if pending >= chunk_size:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate(0)
+            pending = 0
+    yield buffer.getvalue().encode('utf-8')
+
+
+def iter_jsonl(columns: Sequence[str], rows: Iterable[Sequence[Any]],
+               chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[bytes]:
+    """逐块生成JSON Lines字节，每行一个对象"""
+    lines: List[str] = []
+    for row in rows:
+        lines.append(json.dumps(dict(zip(columns, row)), ensure_ascii=False, default=str))
+        if len(lines) >= chunk_size:
+            lines.append('')
+            yield '\n'.join(lines).encode('utf-8')
+            lines = []
+    if lines:
+        lines.append('')
+        yield '\n'.join(lines).encode('utf-8')
+
+
+def _load_xlsxwriter():
+    """按需导入xlsxwriter"""
+    try:
+        import xlsxwriter
+    except ImportError as e:
+        raise RuntimeError("导出XLSX文件需要安装xlsxwriter: pip install xlsxwriter") from e
+    return xlsxwriter
+
+
+def write_xlsx(columns: Sequence[str], rows: Iterable[Sequence[Any]], path: str,
+               sheet_name: str = 'data') -> int:
+    """
+    以constant_memory模式写出XLSX文件
+
+    Returns:
+        写出的数据行数
+    """
+    xlsxwriter = _load_xlsxwriter()
+    workbook = xlsxwriter.Workbook(path, {'constant_memory': True})
+    try:
+        worksheet = workbook.add_worksheet(sheet_name)
+        header_format = workbook.add_format({'bold': True})
+        worksheet.write_row(0, 0, columns, header_format)
+        count = 0
+        for count, row in enumerate(rows, start=1):
+            worksheet.write_row(count, 0, row)
+    finally:
+        workbook.close()
+    return count
+
+
+def iter_xlsx(columns: Sequence[str], rows: Iterable[Sequence[Any]], sheet_name: str = 'data',
+              chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """写出临时XLSX文件后按块读取，读取完毕即删除临时文件"""
+    fd, path = tempfile.mkstemp(suffix='.xlsx', prefix='wealth_lite_export_')
+    os.close(fd)
+    try:
+        write_xlsx(columns, rows, path, sheet_name)
+        with open(path, 'rb') as f:
+            while True:
+                data = f.read(chunk_size)
+                if not data:
+                    break
+                yield data
+    finally:
+        os.unlink(path)
+
+
+class ExportService:
+    """数据导出服务"""
+
+    DATASETS = ('transactions', 'positions', 'snapshots')
+
+    def __init__(self, db_manager: DatabaseManager):
+        self.db_manager = db_manager
+        self.logger = logging.getLogger(__name__)
+
+    def iter_rows(self, dataset: str, chunk_size: int = EXPORT_CHUNK_SIZE) -> Tuple[List[str], Iterator[Tuple]]:
+        """
+        获取数据集的列名与行迭代器
+
+        Returns:
+            (列名列表, 按行产出元组的迭代器)
+        """
+        if dataset == 'transactions':
+            query = TRANSACTION_EXPORT_QUERY
+        elif dataset == 'positions':
+            query = POSITION_EXPORT_QUERY
+        elif dataset == 'snapshots':
+            query = SNAPSHOT_EXPORT_QUERY
+        else:
+            raise ValueError(f"不支持的导出数据集: {dataset}")
+
+        columns = self._query_columns(query)
+        rows = (tuple(row) for row in self.db_manager.iter_query(query, chunk_size=chunk_size))
+        if dataset == 'positions':
+            columns += ['net_invested', 'principal_amount', 'current_book_value']
+            rows = _position_rows(rows)
+            money_columns = POSITION_MONEY_COLUMNS
+        elif dataset == 'transactions':
+            money_columns = TRANSACTION_MONEY_COLUMNS
+        else:
+            money_columns = MONEY_COLUMNS['portfolio_snapshots']
+        return columns, _money_rows(columns, money_columns, rows)
+
+    def stream(self, dataset: str, export_format: str) -> Iterator[bytes]:
+        """按指定格式流式生成导出内容"""
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"不支持的导出格式: {export_format}")
+        if export_format == 'xlsx':
+            # 在开始输出前检查依赖，避免响应头发出后才失败
+            _load_xlsxwriter()
+
+        columns, rows = self.iter_rows(dataset)
+        self.logger.info(f"开始导出 {dataset} ({export_format})")
+        if export_format == 'csv':
+            return iter_csv(columns, rows)
+        if export_format == 'jsonl':
+            return iter_jsonl(columns, rows)
+        return iter_xlsx(columns, rows, sheet_name=dataset)
+
+    def export_to_file(self, dataset: str, export_format: str, path: str) -> None:
+        """导出到文件"""
+        if export_format == 'xlsx':
+            columns, rows = self.iter_rows(dataset)
+            count = write_xlsx(columns, rows, path, sheet_name=dataset)
+            self.logger.info(f"导出完成: {path} ({count} 行)")
+            return
+
+        with open(path, 'wb') as f:
+            for chunk in self.stream(dataset, export_format):
+                f.write(chunk)
+        self.logger.info(f"导出完成: {path}")
+
+    @staticmethod
+    def build_filename(dataset: str, export_format: str, export_date: Optional[date] = None) -> str:
+        """生成导出文件名"""
+        export_date = export_date or date.today()
+        return f"wealth_lite_{dataset}_{export_date.strftime('%Y%m%d')}.{export_format}"
+
+    def _query_columns(self, query: str) -> List[str]:
+        """获取查询结果的列名（不读取数据行）"""
+        with self.db_manager.get_connection() as conn:
+            cursor = conn.execute(f"SELECT * FROM ({query}) LIMIT 0")
+            return [d[0] for d in cursor.description]
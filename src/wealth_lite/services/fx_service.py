@@ -0,0 +1,382 @@
+"""
+汇率服务
+
+提供多币种折算能力：
+- 汇率存储在 fx_rates 表，支持从本地CSV批量导入
+- FxRateIndex: 内存中的按货币对分组、按日期排序的区间索引，
+  as-of查询（取不晚于指定日期的最近汇率）为二分查找
+- 直接汇率缺失时通过中间货币（默认USD）合成交叉汇率，合成后的序列会被缓存
+- 组合重估：按持仓币种分组取汇率，批量折算（安装numpy时向量化）
+"""
+
+import csv
+import logging
+import os
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..data.database import DatabaseManager
+from ..data.fx_repository import FxRateRepository
+from ..models.enums import Currency
+from ..models.money import from_minor, to_minor
+from ..models.portfolio import Portfolio
+from ..models.position import Position
+
+
+# 交叉汇率默认使用的中间货币
+DEFAULT_PIVOT = Currency.USD
+
+# 汇率精度（小数位）
+RATE_QUANTUM = Decimal('1e-10')
+
+# 每批写入的汇率行数
+FX_BATCH_SIZE = 10000
+
+# CSV表头别名 -> 标准字段名
+FX_FIELD_ALIASES = {
+    'date': 'rate_date', 'rate_date': 'rate_date', '日期': 'rate_date',
+    'base': 'base_currency', 'base_currency': 'base_currency', '基础货币': 'base_currency',
+    'quote': 'quote_currency', 'quote_currency': 'quote_currency', '报价货币': 'quote_currency',
+    'pair': 'pair', '货币对': 'pair',
+    'rate': 'rate', '汇率': 'rate',
+}
+
+# 汇率序列：(日期序数列表, 汇率列表)，日期升序
+RateSeries = Tuple[List[int], List[float]]
+
+
+def _load_numpy():
+    """按需导入numpy（未安装时返回None，使用逐项计算）"""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _invert(series: RateSeries) -> RateSeries:
+    """反向汇率序列"""
+    dates, rates = series
+    return dates, [1.0 / r for r in rates]
+
+
+def _cross(first: RateSeries, second: RateSeries) -> RateSeries:
+    """
+    合成交叉汇率序列：A/B = A/P × P/B
+
+    在两条序列日期的并集上取各自as-of值相乘，只保留两边都有汇率的日期。
+    """
+    (dates_a, rates_a), (dates_b, rates_b) = first, second
+    dates: List[int] = []
+    rates: List[float] = []
+    i = j = 0
+    current_a = current_b = None
+    while i < len(dates_a) or j < len(dates_b):
+        next_a = dates_a[i] if i < len(dates_a) else None
+        next_b = dates_b[j] if j < len(dates_b) else None
+        if next_b is None or (next_a is not None and next_a <= next_b):
+            day = next_a
+        else:
+            day = next_b
+        if next_a == day:
+            current_a = rates_a[i]
+            i += 1
+        if next_b == day:
+            current_b = rates_b[j]
+            j += 1
+        if current_a is not None and current_b is not None:
+            dates.append(day)
+            rates.append(current_a * current_b)
+    return dates, rates
+
+
+class FxRateIndex:
+    """
+    汇率区间索引
+
+    每个货币对保存按日期排序的序列，日期区间 [d_i, d_i+1) 内使用汇率 r_i。
+    """
+
+    def __init__(self, pivot: Currency = DEFAULT_PIVOT):
+        self.pivot = pivot.name
+        self._series: Dict[Tuple[str, str], RateSeries] = {}
+        self._resolved: Dict[Tuple[str, str], Optional[RateSeries]] = {}
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Tuple[Any, str, str, float]],
+                  pivot: Currency = DEFAULT_PIVOT) -> 'FxRateIndex':
+        """从 (日期, 基础货币, 报价货币, 汇率) 行构建，日期可为date或ISO文本"""
+        index = cls(pivot)
+        grouped: Dict[Tuple[str, str], List[Tuple[int, float]]] = {}
+        for rate_date, base, quote, rate in rows:
+            if isinstance(rate_date, str):
+                rate_date = date.fromisoformat(rate_date[:10])
+            grouped.setdefault((base, quote), []).append((rate_date.toordinal(), float(rate)))
+        for pair, points in grouped.items():
+            points.sort()
+            index._series[pair] = ([d for d, _ in points], [r for _, r in points])
+        return index
+
+    @property
+    def pairs(self) -> List[Tuple[str, str]]:
+        """已加载的货币对"""
+        return sorted(self._series)
+
+    def series(self, base: str, quote: str) -> Optional[RateSeries]:
+        """获取货币对的汇率序列（直接、反向或经中间货币交叉），结果缓存"""
+        key = (base, quote)
+        if key not in self._resolved:
+            self._resolved[key] = self._resolve(base, quote)
+        return self._resolved[key]
+
+    def rate(self, base: str, quote: str, as_of: Optional[date] = None) -> Optional[float]:
+        """
+        as-of汇率：取不晚于as_of的最近一个汇率，as_of为空时取最新汇率
+
+        Returns:
+            汇率，无可用汇率时返回None
+        """
+        if base == quote:
+            return 1.0
+        series = self.series(base, quote)
+        if not series:
+            return None
+        dates, rates = series
+        if as_of is None:
+            return rates[-1]
+        position = bisect_right(dates, as_of.toordinal()) - 1
+        return rates[position] if position >= 0 else None
+
+    def _resolve(self, base: str, quote: str) -> Optional[RateSeries]:
+        """依次尝试直接、反向、交叉汇率"""
+        direct = self._direct(base, quote)
+        if direct or self.pivot in (base, quote):
+            return direct
+        first = self._direct(base, self.pivot)
+        second = self._direct(self.pivot, quote)
+        if not first or not second:
+            return None
+        crossed = _cross(first, second)
+        return crossed if crossed[0] else None
+
+    def _direct(self, base: str, quote: str) -> Optional[RateSeries]:
+        """直接或反向汇率序列"""
+        series = self._series.get((base, quote))
+        if series:
+            return series
+        inverse = self._series.get((quote, base))
+        return _invert(inverse) if inverse else None
+
+
+@dataclass
+class PositionValuation:
+    """单个持仓的折算结果"""
+    asset_id: str
+    asset_name: str
+    currency: str
+    local_value: Decimal       # 原币市值
+    rate: float                # 原币 -> 目标币种汇率
+    value: Decimal             # 目标币种市值
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'asset_id': self.asset_id,
+            'asset_name': self.asset_name,
+            'currency': self.currency,
+            'local_value': float(self.local_value),
+            'rate': self.rate,
+            'value': float(self.value),
+        }
+
+
+@dataclass
+class PortfolioValuation:
+    """组合按目标币种重估的结果"""
+    currency: Currency
+    as_of: Optional[date]
+    total_value: Decimal = Decimal('0')
+    positions: List[PositionValuation] = field(default_factory=list)
+
+    def to_dict(self, include_positions: bool = True) -> Dict[str, Any]:
+        result = {
+            'currency': self.currency.name,
+            'as_of': self.as_of.isoformat() if self.as_of else None,
+            'total_value': float(self.total_value),
+            'position_count': len(self.positions),
+        }
+        if include_positions:
+            result['positions'] = [p.to_dict() for p in self.positions]
+        return result
+
+
+class FxService:
+    """汇率服务"""
+
+    def __init__(self, db_manager: DatabaseManager, pivot: Currency = DEFAULT_PIVOT):
+        self.repository = FxRateRepository(db_manager)
+        self.pivot = pivot
+        self.logger = logging.getLogger(__name__)
+        self._index: Optional[FxRateIndex] = None
+
+    # ==================== 汇率数据 ====================
+
+    @property
+    def index(self) -> FxRateIndex:
+        """内存汇率索引（首次使用时从数据库加载）"""
+        if self._index is None:
+            self._index = FxRateIndex.from_rows(self.repository.iter_all(), self.pivot)
+        return self._index
+
+    def invalidate(self) -> None:
+        """汇率数据变化后清空内存索引与交叉汇率缓存"""
+        self._index = None
+
+    def add_rates(self, rows: Iterable[Tuple[date, Currency, Currency, Any]], source: Optional[str] = None) -> int:
+        """批量写入汇率"""
+        count = self.repository.save_many(
+            (rate_date, base.name, quote.name, float(rate), source)
+            for rate_date, base, quote, rate in rows
+        )
+        self.invalidate()
+        return count
+
+    def load_csv(self, file_path: str, batch_size: int = FX_BATCH_SIZE) -> int:
+        """
+        从本地CSV批量导入汇率
+
+        表头支持 date,base,quote,rate 或 date,pair,rate（pair形如USD/CNY或USDCNY），
+        也支持对应的中文表头。按批写入，单批在一个事务中完成。
+
+        Returns:
+            导入的行数
+        """
+        source = os.path.basename(file_path)
+        total = 0
+        batch = []
+        with open(file_path, 'r', encoding='utf-8-sig', newline='') as f:
+            reader = csv.DictReader(f)
+            for line_number, record in enumerate(reader, start=2):
+                batch.append(self._parse_csv_record(record, line_number) + (source,))
+                if len(batch) >= batch_size:
+                    total += self.repository.save_many(batch)
+                    batch = []
+        total += self.repository.save_many(batch)
+        self.invalidate()
+        self.logger.info(f"汇率导入完成: {file_path} ({total} 行)")
+        return total
+
+    @staticmethod
+    def _parse_csv_record(record: Dict[str, str], line_number: int) -> Tuple[date, str, str, float]:
+        """解析一行CSV汇率记录"""
+        fields = {}
+        for key, value in record.items():
+            name = FX_FIELD_ALIASES.get((key or '').strip().lower())
+            if name:
+                fields[name] = (value or '').strip()
+
+        try:
+            if fields.get('pair'):
+                pair = fields['pair'].replace('/', '').upper()
+                base, quote = pair[:3], pair[3:]
+            else:
+                base = fields['base_currency'].upper()
+                quote = fields['quote_currency'].upper()
+            rate = float(fields['rate'])
+            rate_date = date.fromisoformat(fields['rate_date'][:10])
+        except (KeyError, ValueError) as e:
+            raise ValueError(f"第{line_number}行汇率数据无效: {e}") from e
+
+        if len(base) != 3 or len(quote) != 3 or rate <= 0:
+            raise ValueError(f"第{line_number}行汇率数据无效: {base}/{quote}={rate}")
+        return rate_date, base, quote, rate
+
+    # ==================== 汇率查询与折算 ====================
+
+    def get_rate(self, base: Currency, quote: Currency, as_of: Optional[date] = None) -> Decimal:
+        """
+        获取汇率（1单位base = ? 单位quote），保留10位小数以去除交叉汇率的浮点尾差
+
+        Raises:
+            ValueError: 没有可用汇率
+        """
+        rate = self.index.rate(base.name, quote.name, as_of)
+        if rate is None:
+            raise ValueError(f"缺少汇率: {base.name}/{quote.name} @ {as_of or '最新'}")
+        return Decimal(str(rate)).quantize(RATE_QUANTUM).normalize()
+
+    def convert(self, amount: Decimal, from_currency: Currency, to_currency: Currency,
+                as_of: Optional[date] = None) -> Decimal:
+        """金额折算，结果保留4位小数"""
+        return from_minor(to_minor(amount * self.get_rate(from_currency, to_currency, as_of)))
+
+    def convert_minor_many(self, amounts: Sequence[int], currencies: Sequence[Currency],
+                           target: Currency, as_of: Optional[date] = None) -> Tuple[List[int], Dict[str, float]]:
+        """
+        批量折算最小单位金额
+
+        每个币种只查询一次汇率，再按币种码对整列做乘法（安装numpy时向量化）。
+
+        Returns:
+            (折算后的最小单位金额列表, 币种 -> 汇率)
+        """
+        codes: Dict[Currency, int] = {}
+        currency_index = [codes.setdefault(c, len(codes)) for c in currencies]
+        rates = []
+        for currency in codes:
+            rate = self.index.rate(currency.name, target.name, as_of)
+            if rate is None:
+                raise ValueError(f"缺少汇率: {currency.name}/{target.name} @ {as_of or '最新'}")
+            rates.append(rate)
+        rate_map = {c.name: rates[i] for c, i in codes.items()}
+
+        np = _load_numpy()
+        if np is None:
+            converted = [round(a * rates[i]) for a, i in zip(amounts, currency_index)]
+            return converted, rate_map
+        values = np.asarray(amounts, dtype=np.float64) * np.asarray(rates)[np.asarray(currency_index, dtype=np.intp)]
+        return np.rint(values).astype(np.int64).tolist(), rate_map
+
+    def revalue_portfolio(self, portfolio: Portfolio, currency: Currency,
+                          as_of: Optional[date] = None) -> PortfolioValuation:
+        """
+        按目标币种与日期重估组合
+
+        持仓市值先按平均记账汇率还原为资产币种，再按as_of日的汇率折算到目标币种。
+        """
+        positions = portfolio.positions
+        local_values = [self._local_value(p, portfolio.base_currency) for p in positions]
+        currencies = [p.asset.currency for p in positions]
+        converted, rates = self.convert_minor_many(
+            [to_minor(v) for v in local_values], currencies, currency, as_of
+        )
+
+        valuation = PortfolioValuation(currency=currency, as_of=as_of)
+        valuation.total_value = from_minor(sum(converted))
+        valuation.positions = [
+            PositionValuation(
+                asset_id=p.asset.asset_id,
+                asset_name=p.asset_name,
+                currency=p.asset.currency.name,
+                local_value=local,
+                rate=rates[p.asset.currency.name],
+                value=from_minor(value),
+            )
+            for p, local, value in zip(positions, local_values, converted)
+        ]
+        return valuation
+
+    @staticmethod
+    def _local_value(position: Position, base_currency: Currency) -> Decimal:
+        """持仓市值（资产币种）"""
+        value = position.calculate_current_value()
+        if position.asset.currency == base_currency:
+            return value
+        book_base = position.current_book_value
+        book_local = position.current_book_value_original_currency
+        if not book_base or value == book_base:
+            return book_local
+        # 按平均记账汇率把基础货币市值还原为原币
+        return value * book_local / book_base
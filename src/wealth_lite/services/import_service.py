@@ -0,0 +1,423 @@
+"""
+交易批量导入服务
+
+支持从CSV/XLSX银行流水或券商对账单批量导入交易：
+- 流式读取：逐行生成记录，不把整个文件读入内存
+- 资产缓存：导入开始时一次性加载资产，避免逐行查询
+- 分块校验与写入：每块使用executemany批量插入并单独提交
+- 行级错误报告：无效行被跳过并记录原因，不影响其他行
+"""
+
+import csv
+import logging
+import sqlite3
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..models.asset import Asset
+from ..models.enums import AssetType, Currency, TransactionType
+from ..models.transaction import BaseTransaction, CashTransaction, FixedIncomeTransaction
+from ..data.database import DatabaseManager
+from ..data.repositories import RepositoryManager
+
+
+# 默认每块处理的行数
+DEFAULT_BATCH_SIZE = 10000
+
+# 字段别名（兼容前端与常见对账单的列名）
+FIELD_ALIASES = {
+    'type': 'transaction_type',
+    'date': 'transaction_date',
+    'asset': 'asset_name',
+}
+
+
+@dataclass
+class ImportRowError:
+    """导入失败的行"""
+    row_number: int
+    message: str
+    record: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典格式"""
+        return {
+            'row_number': self.row_number,
+            'message': self.message,
+            'record': self.record
+        }
+
+
+@dataclass
+class ImportProgress:
+    """导入进度"""
+    rows_read: int = 0
+    rows_imported: int = 0
+    rows_failed: int = 0
+    batches_committed: int = 0
+
+
+@dataclass
+class ImportResult:
+    """导入结果汇总"""
+    rows_read: int = 0
+    rows_imported: int = 0
+    errors: List[ImportRowError] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+
+    @property
+    def rows_failed(self) -> int:
+        """失败行数"""
+        return len(self.errors)
+
+    def write_error_report(self, path: str) -> None:
+        """将失败行写入CSV错误报告"""
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['row_number', 'message', 'record'])
+            for error in self.errors:
+                writer.writerow([error.row_number, error.message, error.record])
+
+    def to_dict(self, max_errors: Optional[int] = None) -> Dict[str, Any]:
+        """转换为字典格式"""
+        errors = self.errors if max_errors is None else self.errors[:max_errors]
+        return {
+            'rows_read': self.rows_read,
+            'rows_imported': self.rows_imported,
+            'rows_failed': self.rows_failed,
+            'elapsed_seconds': round(self.elapsed_seconds, 3),
+            'errors': [e.to_dict() for e in errors]
+        }
+
+
+# ==================== 文件读取 ====================
+
+def normalize_record(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """统一列名（小写、去空格、应用别名），丢弃空值"""
+    record = {}
+    for key, value in raw.items():
+        if key is None:
+            continue
+        name = str(key).strip().lower()
+        name = FIELD_ALIASES.get(name, name)
+        if isinstance(value, str):
+            value = value.strip()
+        if value is None or value == '':
+            continue
+        record.setdefault(name, value)
+    return record
+
+
+def iter_csv_records(path: str, encoding: str = 'utf-8-sig') -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    逐行读取CSV文件
+
+    Yields:
+        (行号, 记录字典)，行号从数据第一行开始计为2（第1行为表头）
+    """
+    with open(path, 'r', newline='', encoding=encoding) as f:
+        reader = csv.DictReader(f)
+        for row_number, row in enumerate(reader, start=2):
+            yield row_number, normalize_record(row)
+
+
+def iter_xlsx_records(path: str) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    逐行读取XLSX文件（只读模式，按行流式加载）
+
+    需要安装openpyxl。
+    """
+    try:
+        from openpyxl import load_workbook
+    except ImportError as e:
+        raise RuntimeError("导入XLSX文件需要安装openpyxl: pip install openpyxl") from e
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        for row_number, values in enumerate(rows, start=2):
+            if values is None or all(v is None for v in values):
+                continue
+            yield row_number, normalize_record(dict(zip(header, values)))
+    finally:
+        workbook.close()
+
+
+def iter_records(path: str) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """根据文件扩展名选择读取器"""
+    suffix = Path(path).suffix.lower()
+    if suffix == '.csv':
+        return iter_csv_records(path)
+    if suffix in ('.xlsx', '.xlsm'):
+        return iter_xlsx_records(path)
+    raise ValueError(f"不支持的文件格式: {suffix}")
+
+
+def _chunked(items: Iterable, size: int) -> Iterator[List]:
+    """将可迭代对象按固定大小分块"""
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# ==================== 记录解析 ====================
+
+def _parse_decimal(value: Any, field_name: str) -> Decimal:
+    """解析金额/利率，兼容千分位分隔符"""
+    if isinstance(value, Decimal):
+        return value
+    if isinstance(value, (int, float)):
+        return Decimal(str(value))
+    try:
+        return Decimal(str(value).replace(',', ''))
+    except InvalidOperation:
+        raise ValueError(f"无效的数值 {field_name}: {value}")
+
+
+def _parse_date(value: Any, field_name: str) -> date:
+    """解析日期（支持ISO字符串及XLSX中的日期单元格）"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    text = str(value).strip()
+    try:
+        return date.fromisoformat(text[:10])
+    except ValueError:
+        raise ValueError(f"无效的日期 {field_name}: {value}")
+
+
+def _parse_enum(enum_cls, value: Any, field_name: str):
+    """按英文名称查找枚举，兼容中文显示值"""
+    text = str(value).strip()
+    try:
+        return enum_cls[text.upper()]
+    except KeyError:
+        for member in enum_cls:
+            if member.value == text:
+                return member
+    raise ValueError(f"无效的{field_name}: {value}")
+
+
+def build_transaction_from_record(record: Dict[str, Any], asset: Asset) -> BaseTransaction:
+    """
+    根据资产类型将一条记录构建为交易对象
+
+    字段规则与 POST /api/transactions 保持一致；货币缺省时使用资产货币。
+
+    Raises:
+        ValueError: 字段缺失或格式无效
+    """
+    if 'transaction_type' not in record:
+        raise ValueError("缺少交易类型字段: type/transaction_type")
+    if 'transaction_date' not in record:
+        raise ValueError("缺少交易日期字段: date/transaction_date")
+    if 'amount' not in record:
+        raise ValueError("缺少金额字段: amount")
+
+    common = dict(
+        asset_id=asset.asset_id,
+        transaction_type=_parse_enum(TransactionType, record['transaction_type'], '交易类型'),
+        amount=_parse_decimal(record['amount'], 'amount'),
+        transaction_date=_parse_date(record['transaction_date'], 'transaction_date'),
+        currency=_parse_enum(Currency, record['currency'], '货币类型') if 'currency' in record else asset.currency,
+        exchange_rate=_parse_decimal(record.get('exchange_rate', '1.0'), 'exchange_rate'),
+        notes=record.get('notes'),
+    )
+    if 'transaction_id' in record:
+        common['transaction_id'] = str(record['transaction_id'])
+
+    if asset.asset_type == AssetType.CASH:
+        return CashTransaction(
+            account_type=record.get('account_type'),
+            interest_rate=_parse_decimal(record['interest_rate'], 'interest_rate') if 'interest_rate' in record else None,
+            compound_frequency=record.get('compound_frequency'),
+            **common
+        )
+
+    if asset.asset_type == AssetType.FIXED_INCOME:
+        return FixedIncomeTransaction(
+            annual_rate=_parse_decimal(record['annual_rate'], 'annual_rate') if 'annual_rate' in record else None,
+            start_date=_parse_date(record['start_date'], 'start_date') if 'start_date' in record else None,
+            maturity_date=_parse_date(record['maturity_date'], 'maturity_date') if 'maturity_date' in record else None,
+            interest_type=record.get('interest_type'),
+            payment_frequency=record.get('payment_frequency'),
+            face_value=_parse_decimal(record['face_value'], 'face_value') if 'face_value' in record else None,
+            coupon_rate=_parse_decimal(record['coupon_rate'], 'coupon_rate') if 'coupon_rate' in record else None,
+            **common
+        )
+
+    raise ValueError(f"暂不支持的资产类型: {asset.asset_type}")
+
+
+class AssetLookup:
+    """资产查找缓存（按ID或名称），导入开始时一次性加载"""
+
+    def __init__(self, assets: Iterable[Asset]):
+        self._by_id: Dict[str, Asset] = {}
+        self._by_name: Dict[str, Asset] = {}
+        for asset in assets:
+            self._by_id[asset.asset_id] = asset
+            self._by_name[asset.asset_name] = asset
+
+    def resolve(self, record: Dict[str, Any]) -> Asset:
+        """根据记录中的asset_id或asset_name查找资产"""
+        asset_id = record.get('asset_id')
+        if asset_id is not None:
+            asset = self._by_id.get(str(asset_id))
+            if asset is None:
+                raise ValueError(f"资产不存在: {asset_id}")
+            return asset
+
+        asset_name = record.get('asset_name')
+        if asset_name is not None:
+            asset = self._by_name.get(str(asset_name))
+            if asset is None:
+                raise ValueError(f"资产不存在: {asset_name}")
+            return asset
+
+        raise ValueError("缺少资产字段: asset_id/asset_name")
+
+
+def parse_records(
+    records: Iterable[Dict[str, Any]],
+    assets: AssetLookup
+) -> Tuple[List[BaseTransaction], List[ImportRowError]]:
+    """
+    解析一组原始记录（如API请求体），返回(交易列表, 错误列表)
+
+    错误中的row_number为记录在列表中的下标（从0开始）。
+    """
+    transactions = []
+    errors = []
+    for index, raw in enumerate(records):
+        record = normalize_record(raw)
+        try:
+            transactions.append(build_transaction_from_record(record, assets.resolve(record)))
+        except (ValueError, TypeError) as e:
+            errors.append(ImportRowError(index, str(e), record))
+    return transactions, errors
+
+
+# ==================== 导入服务 ====================
+
+class TransactionImportService:
+    """交易批量导入服务"""
+
+    def __init__(self, db_manager: DatabaseManager):
+        self.db_manager = db_manager
+        self.repositories = RepositoryManager(db_manager)
+        self.logger = logging.getLogger(__name__)
+
+    def import_file(
+        self,
+        path: str,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        progress_callback: Optional[Callable[[ImportProgress], None]] = None
+    ) -> ImportResult:
+        """
+        导入CSV/XLSX文件中的交易
+
+        Args:
+            path: 文件路径（.csv / .xlsx）
+            batch_size: 每块校验并提交的行数
+            progress_callback: 每块提交后调用，参数为当前进度
+
+        Returns:
+            导入结果，包含行级错误
+        """
+        self.logger.info(f"开始导入交易文件: {path}")
+        return self.import_records(iter_records(path), batch_size, progress_callback)
+
+    def import_records(
+        self,
+        records: Iterable[Tuple[int, Dict[str, Any]]],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        progress_callback: Optional[Callable[[ImportProgress], None]] = None
+    ) -> ImportResult:
+        """
+        导入(行号, 记录)序列
+
+        每块在独立事务中写入；某块写入失败时回滚该块并逐行重试，
+        以便精确定位冲突行（如重复的transaction_id）。
+        """
+        started = datetime.now()
+        result = ImportResult()
+        progress = ImportProgress()
+        assets = AssetLookup(self.repositories.assets.get_all())
+
+        with self.db_manager.get_connection() as conn:
+            for chunk in _chunked(records, batch_size):
+                transactions: List[BaseTransaction] = []
+                valid_rows: List[Tuple[int, Dict[str, Any]]] = []
+                for row_number, record in chunk:
+                    try:
+                        transactions.append(build_transaction_from_record(record, assets.resolve(record)))
+                        valid_rows.append((row_number, record))
+                    except (ValueError, TypeError) as e:
+                        result.errors.append(ImportRowError(row_number, str(e), record))
+
+                result.rows_read += len(chunk)
+                result.rows_imported += self._write_chunk(conn, transactions, valid_rows, result)
+
+                progress.rows_read = result.rows_read
+                progress.rows_imported = result.rows_imported
+                progress.rows_failed = result.rows_failed
+                progress.batches_committed += 1
+                self.logger.info(
+                    f"导入进度: 已读取 {progress.rows_read} 行, "
+                    f"成功 {progress.rows_imported} 行, 失败 {progress.rows_failed} 行"
+                )
+                if progress_callback:
+                    progress_callback(progress)
+
+        result.elapsed_seconds = (datetime.now() - started).total_seconds()
+        self.logger.info(
+            f"导入完成: 成功 {result.rows_imported} 行, 失败 {result.rows_failed} 行, "
+            f"耗时 {result.elapsed_seconds:.2f} 秒"
+        )
+        return result
+
+    def _write_chunk(
+        self,
+        conn: sqlite3.Connection,
+        transactions: List[BaseTransaction],
+        rows: List[Tuple[int, Dict[str, Any]]],
+        result: ImportResult
+    ) -> int:
+        """写入一块交易并提交，返回成功写入的行数"""
+        if not transactions:
+            return 0
+
+        repo = self.repositories.transactions
+        try:
+            repo.insert_batch(conn, transactions)
+            conn.commit()
+            self.db_manager.data_version.bump({t.asset_id for t in transactions})
+            return len(transactions)
+        except sqlite3.Error as e:
+            conn.rollback()
+            self.logger.warning(f"批量写入失败，改为逐行写入以定位错误行: {e}")
+
+        written = 0
+        for (row_number, record), transaction in zip(rows, transactions):
+            try:
+                repo.insert_batch(conn, [transaction])
+                conn.commit()
+                self.db_manager.data_version.bump([transaction.asset_id])
+                written += 1
+            except sqlite3.Error as e:
+                conn.rollback()
+                result.errors.append(ImportRowError(row_number, f"写入失败: {e}", record))
+        return written
@@ -0,0 +1,64 @@
+"""
+WealthLite 批次成本服务
+
+维护权益类持仓的持久化批次账簿（LotBook）：
+- 首次查询时按（交易日期, rowid）顺序重放交易并保存账簿
+- 之后只应用rowid更大的新交易；若有交易被删除、或新交易日期早于账簿最后日期，
+  则整体重建
+- 交易被修改或删除时，数据库触发器在同一事务中清除涉及资产的账簿并递增失效计数；
+  保存时校验失效计数，读取期间交易发生变化的账簿不保存
+"""
+
+import logging
+from typing import Optional
+
+from ..data.database import DatabaseManager
+from ..data.lot_repository import LotRepository
+from ..models.enums import CostBasisMethod
+from ..models.lots import LotBook
+
+
+class LotService:
+    """批次成本服务"""
+
+    def __init__(self, db_manager: DatabaseManager, method: CostBasisMethod = CostBasisMethod.FIFO):
+        self.repository = LotRepository(db_manager)
+        self.method = method
+        self.logger = logging.getLogger(__name__)
+
+    def get_book(self, asset_id: str, method: Optional[CostBasisMethod] = None) -> LotBook:
+        """
+        获取资产的批次账簿（增量更新并持久化）
+
+        Raises:
+            ValueError: 交易中卖出数量超过持有数量
+        """
+        method = method or self.method
+        # 先于账簿与交易读取，保存时据此判断期间是否有交易被修改或删除
+        generation = self.repository.get_generation(asset_id)
+        stored = self.repository.load(asset_id, method)
+        if stored is not None:
+            book, last_rowid = stored
+            applied, earliest_new = self.repository.get_transaction_stats(asset_id, last_rowid)
+            if applied != book.applied_count or (
+                earliest_new is not None and book.last_date is not None
+                and earliest_new < book.last_date.isoformat()
+            ):
+                self.logger.debug("批次账簿需要重建: %s (%s)", asset_id, method.name)
+                book, last_rowid = LotBook(method), 0
+            elif earliest_new is None:
+                return book
+        else:
+            book, last_rowid = LotBook(method), 0
+
+        for rowid, transaction_id, transaction_date, transaction_type, quantity, amount, split_ratio \
+                in list(self.repository.iter_events(asset_id, last_rowid)):
+            book.apply_event(transaction_id, transaction_date, transaction_type, quantity, amount, split_ratio)
+            last_rowid = max(last_rowid, rowid)
+
+        self.repository.save(asset_id, book, last_rowid, generation)
+        return book
+
+    def invalidate(self, asset_id: str) -> None:
+        """清除资产的批次账簿（下次查询时重建）"""
+        self.repository.delete(asset_id)
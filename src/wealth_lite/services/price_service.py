@@ -0,0 +1,247 @@
+"""
+WealthLite 市场价格服务
+
+维护资产收盘价历史并按市价估值权益类持仓：
+- 价格批量导入（Python行数据或本地CSV），单批一个事务
+- 最新价缓存：每个估值日期只查询一次各资产的最新收盘价，导入后失效
+- 批量估值：一次SQL汇总全部持仓的数量，再与最新价逐项相乘
+- 过期策略：超过stale_after_days的价格仍使用但标记为过期；
+  超过expire_after_days或没有价格时回退到账面价值
+"""
+
+import csv
+import logging
+import os
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ..data.database import DatabaseManager
+from ..data.price_repository import PriceRepository
+from ..data.repositories import TransactionRepository
+from ..models.money import MONEY_FACTOR, from_minor, to_minor
+from ..models.position import Position
+
+
+# 每批写入的价格行数
+PRICE_BATCH_SIZE = 10000
+
+# 最新价缓存保留的估值日期数
+PRICE_CACHE_SIZE = 16
+
+# CSV表头别名 -> 标准字段名
+PRICE_FIELD_ALIASES = {
+    'asset_id': 'asset_id', '资产id': 'asset_id',
+    'symbol': 'symbol', 'code': 'symbol', '代码': 'symbol', '交易代码': 'symbol',
+    'date': 'price_date', 'price_date': 'price_date', '日期': 'price_date',
+    'close': 'close', 'close_price': 'close', 'price': 'close', '收盘价': 'close',
+}
+
+# 价格状态
+PRICE_FRESH = 'fresh'
+PRICE_STALE = 'stale'
+PRICE_EXPIRED = 'expired'
+PRICE_MISSING = 'missing'
+
+
+@dataclass
+class StalenessPolicy:
+    """价格过期策略"""
+    stale_after_days: int = 5    # 超过该天数标记为过期，但仍用于估值（覆盖周末与节假日）
+    expire_after_days: int = 30  # 超过该天数不再使用，回退到账面价值
+
+    def classify(self, age_days: Optional[int]) -> str:
+        """根据价格距估值日的天数返回价格状态"""
+        if age_days is None:
+            return PRICE_MISSING
+        if age_days > self.expire_after_days:
+            return PRICE_EXPIRED
+        if age_days > self.stale_after_days:
+            return PRICE_STALE
+        return PRICE_FRESH
+
+
+@dataclass
+class MarketValuation:
+    """单个持仓的市价估值结果"""
+    asset_id: str
+    quantity: Decimal
+    price: Optional[Decimal]
+    price_date: Optional[date]
+    status: str
+    value: Decimal  # 基础货币
+    source: str     # market: 数量×价格; book: 回退到账面价值
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典格式"""
+        return {
+            'asset_id': self.asset_id,
+            'quantity': float(self.quantity),
+            'price': float(self.price) if self.price is not None else None,
+            'price_date': self.price_date.isoformat() if self.price_date else None,
+            'status': self.status,
+            'value': round(float(self.value), 2),
+            'source': self.source,
+        }
+
+
+class PriceService:
+    """市场价格服务"""
+
+    def __init__(self, db_manager: DatabaseManager, policy: Optional[StalenessPolicy] = None):
+        self.data_version = db_manager.data_version
+        self.repository = PriceRepository(db_manager)
+        self.transactions = TransactionRepository(db_manager)
+        self.policy = policy or StalenessPolicy()
+        self.logger = logging.getLogger(__name__)
+        # 最新价缓存以数据版本为准，其他实例或进程写入价格后自动失效
+        self._latest_cache: Dict[Optional[date], Dict[str, Tuple[date, int]]] = {}
+        self._cache_version: Optional[int] = None
+
+    # ==================== 价格导入 ====================
+
+    def invalidate(self) -> None:
+        """价格数据变化后清空最新价缓存"""
+        self._latest_cache.clear()
+
+    def add_prices(self, rows: Iterable[Tuple[str, date, Any]], source: Optional[str] = None) -> int:
+        """批量写入收盘价：(资产ID, 日期, 收盘价)"""
+        count = self.repository.save_many(
+            (asset_id, price_date, Decimal(str(close)), source)
+            for asset_id, price_date, close in rows
+        )
+        self.invalidate()
+        return count
+
+    def load_csv(self, file_path: str, batch_size: int = PRICE_BATCH_SIZE) -> int:
+        """
+        从本地CSV批量导入收盘价
+
+        表头支持 asset_id,date,close 或 symbol,date,close（按资产交易代码匹配），
+        也支持对应的中文表头。按批写入，单批在一个事务中完成。
+
+        Returns:
+            导入的行数
+        """
+        source = os.path.basename(file_path)
+        symbols = self._symbol_map()
+        total = 0
+        batch = []
+        with open(file_path, 'r', encoding='utf-8-sig', newline='') as f:
+            reader = csv.DictReader(f)
+            for line_number, record in enumerate(reader, start=2):
+                batch.append(self._parse_csv_record(record, line_number, symbols) + (source,))
+                if len(batch) >= batch_size:
+                    total += self.repository.save_many(batch)
+                    batch = []
+        total += self.repository.save_many(batch)
+        self.invalidate()
+        self.logger.info(f"价格导入完成: {file_path} ({total} 行)")
+        return total
+
+    def _symbol_map(self) -> Dict[str, str]:
+        """交易代码（资产扩展属性symbol）-> 资产ID"""
+        query = """
+            SELECT asset_id, json_extract(extended_attributes, '$.symbol') AS symbol FROM assets
+            WHERE json_valid(extended_attributes) AND symbol IS NOT NULL AND symbol != ''
+        """
+        return {str(row['symbol']).upper(): row['asset_id'] for row in self.repository.db.execute_query(query)}
+
+    @staticmethod
+    def _parse_csv_record(record: Dict[str, str], line_number: int,
+                          symbols: Dict[str, str]) -> Tuple[str, date, Decimal]:
+        """解析一行CSV价格记录"""
+        fields = {}
+        for key, value in record.items():
+            name = PRICE_FIELD_ALIASES.get((key or '').strip().lower())
+            if name:
+                fields[name] = (value or '').strip()
+
+        try:
+            asset_id = fields.get('asset_id') or symbols[fields['symbol'].upper()]
+            close = Decimal(fields['close'])
+            price_date = date.fromisoformat(fields['price_date'][:10])
+        except (KeyError, ArithmeticError, ValueError) as e:
+            raise ValueError(f"第{line_number}行价格数据无效: {e}") from e
+
+        if not close.is_finite() or close <= 0:
+            raise ValueError(f"第{line_number}行价格数据无效: {asset_id} {price_date} {close}")
+        return asset_id, price_date, close
+
+    # ==================== 价格查询 ====================
+
+    def get_latest_prices(self, as_of: Optional[date] = None) -> Dict[str, Tuple[date, int]]:
+        """
+        各资产在as_of（含）之前的最新收盘价（带缓存）
+
+        Returns:
+            资产ID -> (价格日期, 收盘价最小单位)
+        """
+        version = self.data_version.version
+        if version != self._cache_version:
+            self._latest_cache = {}
+            self._cache_version = version
+        latest = self._latest_cache.get(as_of)
+        if latest is None:
+            if len(self._latest_cache) >= PRICE_CACHE_SIZE:
+                self._latest_cache.clear()
+            latest = {
+                asset_id: (date.fromisoformat(price_date), close)
+                for asset_id, (price_date, close) in self.repository.get_latest(as_of).items()
+            }
+            self._latest_cache[as_of] = latest
+        return latest
+
+    def get_price(self, asset_id: str, as_of: Optional[date] = None) -> Optional[Tuple[date, Decimal]]:
+        """获取资产在as_of（含）之前的最新收盘价：(价格日期, 收盘价)"""
+        latest = self.get_latest_prices(as_of).get(asset_id)
+        if latest is None:
+            return None
+        return latest[0], from_minor(latest[1])
+
+    # ==================== 市价估值 ====================
+
+    def value_positions(self, positions: List[Position], as_of: Optional[date] = None) -> List[MarketValuation]:
+        """
+        按市价批量估值持仓，并将市值注入Position
+
+        数量来自一次SQL汇总（不遍历交易对象），价格来自最新价缓存；
+        市值 = 数量 × 收盘价，按整数最小单位计算后折算为基础货币。
+        价格过期或缺失时回退到账面价值。
+        """
+        valuation_date = as_of or date.today()
+        quantities = self.transactions.load_quantities(as_of)
+        latest = self.get_latest_prices(as_of)
+
+        results = []
+        for position in positions:
+            asset_id = position.asset.asset_id
+            quantity = quantities.get(asset_id, Decimal('0'))
+            price = latest.get(asset_id)
+            age_days = (valuation_date - price[0]).days if price else None
+            status = self.policy.classify(age_days)
+
+            if quantity > 0 and status in (PRICE_FRESH, PRICE_STALE):
+                local_minor = to_minor(quantity * price[1] / MONEY_FACTOR)
+                value = position.to_base_currency(from_minor(local_minor))
+                position.set_market_value(value)
+                source = 'market'
+            else:
+                position.set_market_value(None)
+                value = position.calculate_current_value()
+                source = 'book'
+
+            if status != PRICE_FRESH:
+                self.logger.debug("价格%s: %s (%s)", status, asset_id, price[0] if price else '无价格')
+
+            results.append(MarketValuation(
+                asset_id=asset_id,
+                quantity=quantity,
+                price=from_minor(price[1]) if price else None,
+                price_date=price[0] if price else None,
+                status=status,
+                value=value,
+                source=source,
+            ))
+        return results
@@ -0,0 +1,75 @@
+"""
+WealthLite 响应缓存
+
+以数据版本为键缓存已序列化的JSON响应体：
+- 数据版本与日期都未变化时直接返回缓存的字节串，不访问数据库
+- ETag由（boot_id, 数据版本, 日期）组成，客户端携带If-None-Match时可返回304
+- 压缩后的响应体按编码缓存在CachedResponse上，同一版本只压缩一次
+"""
+
+import threading
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from ..data.data_version import DataVersion
+from ..utils.serialization import choose_encoding, compress, dumps
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """已序列化的响应"""
+    stamp: Tuple[int, int]  # (数据版本, 日期序数)
+    etag: str
+    body: bytes
+    _compressed: Dict[str, bytes] = field(default_factory=dict, compare=False, repr=False)
+
+    def encoded_body(self, accept_encoding: Optional[str]) -> Tuple[bytes, Optional[str]]:
+        """按Accept-Encoding返回（可能压缩过的）响应体与Content-Encoding"""
+        encoding = choose_encoding(accept_encoding, len(self.body))
+        if encoding is None:
+            return self.body, None
+        if encoding not in self._compressed:
+            self._compressed[encoding] = compress(self.body, encoding)
+        return self._compressed[encoding], encoding
+
+
+class ResponseCache:
+    """按数据版本失效的响应缓存"""
+
+    def __init__(self, data_version: DataVersion):
+        self.data_version = data_version
+        self._lock = threading.Lock()
+        self._entries: Dict[str, CachedResponse] = {}
+
+    def get(self, key: str, builder: Callable[[], Any]) -> CachedResponse:
+        """
+        获取缓存的响应，版本变化时调用builder重新生成
+
+        版本号在生成之前读取：生成期间发生的写入会使下一次请求重新生成。
+        builder抛出的异常直接向上传递，不写入缓存。
+        """
+        stamp = (self.data_version.version, date.today().toordinal())
+        cached = self._entries.get(key)
+        if cached is not None and cached.stamp == stamp:
+            return cached
+
+        body = dumps(builder())
+        etag = f'"{self.data_version.boot_id}-{stamp[0]}-{stamp[1]}"'
+        cached = CachedResponse(stamp, etag, body)
+        with self._lock:
+            self._entries[key] = cached
+        return cached
+
+    def clear(self) -> None:
+        """清空全部缓存"""
+        with self._lock:
+            self._entries.clear()
+
+    @staticmethod
+    def matches(if_none_match: str, etag: str) -> bool:
+        """If-None-Match请求头是否匹配ETag"""
+        if not if_none_match:
+            return False
+        candidates = [tag.strip() for tag in if_none_match.split(',')]
+        return '*' in candidates or etag in candidates or f'W/{etag}' in candidates
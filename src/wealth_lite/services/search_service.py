@@ -0,0 +1,86 @@
+"""
+WealthLite 搜索服务
+
+对资产与交易备注做全文检索，返回按相关度排序的结果与HTML高亮片段。
+高亮片段中的原文已做HTML转义，只有<mark>标签是由服务生成的。
+"""
+
+import html
+import logging
+import re
+from typing import Any, Dict, List, Optional
+
+from ..data.database import DatabaseManager
+from ..data.search_repository import SearchRepository
+from ..models.money import from_minor
+
+# 单次检索每类结果的最大条数
+MAX_SEARCH_LIMIT = 100
+
+
+class SearchService:
+    """搜索服务"""
+
+    def __init__(self, db_manager: DatabaseManager):
+        self.repository = SearchRepository(db_manager)
+        self.logger = logging.getLogger(__name__)
+
+    def search(self, query: str, limit: int = 20) -> Dict[str, Any]:
+        """
+        检索资产与交易备注
+
+        Args:
+            query: 查询文本，按空白拆分为多个词（AND关系）
+            limit: 每类结果的最大条数
+
+        Returns:
+            {"query", "assets": [...], "transactions": [...]}
+        """
+        terms = query.split()
+        limit = max(1, min(limit, MAX_SEARCH_LIMIT))
+        result = {"query": query, "assets": [], "transactions": []}
+        if not terms:
+            return result
+
+        for row in self.repository.search_assets(terms, limit):
+            result["assets"].append({
+                "id": row["asset_id"],
+                "name": row["asset_name"],
+                "asset_type": row["asset_type"],
+                "currency": row["currency"],
+                "description": row["description"],
+                "issuer": row["issuer"],
+                "highlights": {
+                    field: self._highlight(row[column], terms)
+                    for field, column in (("name", "asset_name"), ("description", "description"), ("issuer", "issuer"))
+                    if row[column]
+                },
+            })
+
+        for row in self.repository.search_transactions(terms, limit):
+            result["transactions"].append({
+                "id": row["transaction_id"],
+                "asset_id": row["asset_id"],
+                "asset_name": row["asset_name"],
+                "date": row["transaction_date"],
+                "type": row["transaction_type"],
+                "amount": float(from_minor(row["amount"])),
+                "currency": row["currency"],
+                "notes": row["notes"],
+                "highlights": {"notes": self._highlight(row["notes"], terms)},
+            })
+        return result
+
+    @staticmethod
+    def _highlight(text: Optional[str], terms: List[str]) -> Optional[str]:
+        """生成HTML高亮片段：原文转义，命中的查询词（不区分大小写）用<mark>包裹"""
+        if text is None:
+            return None
+        pattern = re.compile("|".join(re.escape(t) for t in sorted(terms, key=len, reverse=True)), re.IGNORECASE)
+        parts, start = [], 0
+        for match in pattern.finditer(text):
+            parts.append(html.escape(text[start:match.start()]))
+            parts.append(f"<mark>{html.escape(match.group())}</mark>")
+            start = match.end()
+        parts.append(html.escape(text[start:]))
+        return "".join(parts)
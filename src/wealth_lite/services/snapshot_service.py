@@ -10,7 +10,6 @@ WealthLite 快照服务层
 import json
 import time
 import logging
-import requests
 from datetime import date, datetime, timedelta
 from typing import List, Optional, Dict, Any
 
@@ -19,6 +18,15 @@ from ..data.snapshot_repository import SnapshotRepository, AIConfigRepository, A
 from ..models.snapshot import PortfolioSnapshot, AIAnalysisConfig, AIAnalysisResult
 from ..models.enums import SnapshotType, AIType
 from ..services.wealth_service import WealthService
+from ..utils.metrics import ai_call
+
+
+def __getattr__(name: str):
+    """按需导入requests（仅本地AI调用使用），避免拖慢应用启动"""
+    if name == "requests":
+        import requests
+        return requests
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class SnapshotService:
@@ -418,11 +426,13 @@ class AIAnalysisService:
             }
         }
         
-        response = requests.post(
-            url, 
-            json=payload, 
-            timeout=config.timeout_seconds
-        )
+        import requests
+        with ai_call():
+            response = requests.post(
+                url, 
+                json=payload, 
+                timeout=config.timeout_seconds
+            )
         response.raise_for_status()
         
         return response.json().get('response', '')
@@ -12,12 +12,18 @@ from decimal import Decimal
 import logging
 
 from ..models.asset import Asset
-from ..models.transaction import BaseTransaction, CashTransaction, FixedIncomeTransaction
-from ..models.position import Position
+from ..models.transaction import BaseTransaction, CashTransaction, FixedIncomeTransaction, EquityTransaction
+from ..models.position import Position, LazyPosition
+from ..models.ledger import Ledger
 from ..models.portfolio import Portfolio, PortfolioSnapshot
 from ..models.enums import AssetType, TransactionType, Currency, AssetSubType
 from ..data.database import DatabaseManager
 from ..data.repositories import RepositoryManager
+from .price_service import PriceService
+from .lot_service import LotService
+
+# 按资产过滤加载账本的最大资产数，超过时整表加载（IN列表过长反而更慢）
+LEDGER_FILTER_MAX_ASSETS = 500
 
 
 class WealthService:
@@ -35,6 +41,8 @@ class WealthService:
         """
         self.db_manager = db_manager
         self.repositories = RepositoryManager(self.db_manager)
+        self.prices = PriceService(self.db_manager)
+        self.lots = LotService(self.db_manager)
     
     # ==================== 资产管理 ====================
     
@@ -69,9 +77,9 @@ class WealthService:
             ValueError: 输入参数无效
             RuntimeError: 创建失败
         """
-        logging.debug(f"[create_asset] 参数: name={asset_name}, type={asset_type}, "
-                     f"subtype={asset_subtype}, currency={currency}, desc={description}, "
-                     f"issuer={issuer}, credit={credit_rating}, ext={extended_attributes}")
+        logging.debug("[create_asset] 参数: name=%s, type=%s, subtype=%s, currency=%s, desc=%s, "
+                      "issuer=%s, credit=%s, ext=%s", asset_name, asset_type, asset_subtype, currency,
+                      description, issuer, credit_rating, extended_attributes)
         
         # 输入验证
         if not asset_name or not asset_name.strip():
@@ -96,7 +104,7 @@ class WealthService:
             credit_rating=credit_rating,
             extended_attributes=extended_attributes if extended_attributes else None
         )
-        logging.info(f"[create_asset] 创建资产对象: {asset}")
+        logging.debug("[create_asset] 创建资产对象: %s", asset)
         
         # 保存到数据库
         try:
@@ -104,7 +112,7 @@ class WealthService:
             if not result:
                 logging.error(f"[create_asset] 保存资产到数据库失败: {asset_name}")
                 raise RuntimeError(f"创建资产失败: {asset_name}")
-            logging.info(f"[create_asset] 资产已保存到数据库: {asset.asset_id}")
+            logging.info("[create_asset] 资产已保存到数据库: %s", asset.asset_id)
         except Exception as e:
             logging.error(f"[create_asset] 资产保存异常: {e}", exc_info=True)
             raise
@@ -345,13 +353,60 @@ class WealthService:
         return self.repositories.transactions.get_all()
     
     def update_transaction(self, transaction: BaseTransaction) -> bool:
-        """更新交易"""
+        """更新交易（涉及资产的批次账簿由数据库触发器在同一事务中清除）"""
         return self.repositories.transactions.update(transaction)
     
     def delete_transaction(self, transaction_id: str) -> bool:
         """删除交易"""
         return self.repositories.transactions.delete(transaction_id)
-    
+
+    def create_transactions(self, transactions: List[BaseTransaction]) -> List[BaseTransaction]:
+        """
+        批量创建交易（全部成功或全部回滚）
+
+        Args:
+            transactions: 交易对象列表（现金类或固定收益类）
+
+        Returns:
+            创建的交易对象列表
+        """
+        self._validate_transaction_assets(transactions)
+
+        if not self.repositories.transactions.create_many(transactions):
+            raise RuntimeError(f"批量创建交易失败: {len(transactions)} 条")
+
+        return transactions
+
+    def update_transactions(self, transactions: List[BaseTransaction]) -> bool:
+        """批量更新交易（全部成功或全部回滚）"""
+        self._validate_transaction_assets(transactions)
+        return self.repositories.transactions.update_many(transactions)
+
+    def delete_transactions(self, transaction_ids: List[str]) -> bool:
+        """批量删除交易（全部成功或全部回滚）"""
+        return self.repositories.transactions.delete_many(transaction_ids)
+
+    def _validate_transaction_assets(self, transactions: List[BaseTransaction]) -> None:
+        """校验交易关联的资产存在且类型匹配（每个资产只查询一次）"""
+        expected_types = {
+            CashTransaction: AssetType.CASH,
+            FixedIncomeTransaction: AssetType.FIXED_INCOME,
+            EquityTransaction: AssetType.EQUITY,
+        }
+        assets: Dict[str, Optional[Asset]] = {}
+        for transaction in transactions:
+            if transaction.asset_id not in assets:
+                assets[transaction.asset_id] = self.get_asset(transaction.asset_id)
+            asset = assets[transaction.asset_id]
+            if not asset:
+                raise ValueError(f"资产不存在: {transaction.asset_id}")
+
+            expected = expected_types.get(type(transaction))
+            if expected is None:
+                raise ValueError(f"暂不支持的交易类型: {type(transaction).__name__}")
+            if asset.asset_type != expected:
+                raise ValueError(f"资产类型不匹配，期望: {expected}, 实际: {asset.asset_type}")
+
     # ==================== 持仓管理 ====================
     
     def get_position(self, asset_id: str) -> Optional[Position]:
@@ -375,24 +430,93 @@ class WealthService:
             return None
         
         # 创建持仓对象
-        return Position(asset=asset, transactions=transactions)
+        position = Position(asset=asset, transactions=transactions)
+        if asset.asset_type == AssetType.EQUITY:
+            self._attach_lot_books([position])
+        return position
     
     def get_all_positions(self) -> List[Position]:
         """
         获取所有持仓信息
         
         Returns:
-            持仓列表
+            持仓列表（只包含有持仓的资产）
         """
-        positions = []
-        assets = self.get_all_assets()
+        return self.get_positions(self.get_all_assets())
+    
+    def get_positions(self, assets: List[Asset]) -> List[Position]:
+        """
+        获取指定资产的持仓
+        
+        安装了numpy时由列式账本的汇总、交易笔数与首末日期构建LazyPosition，
+        不加载交易明细（固定收益估值等需要明细时再按资产加载）；否则逐个资产计算。
+        权益类持仓随后按最新收盘价批量估值，并注入持久化批次账簿。
+        
+        Args:
+            assets: 资产列表
+            
+        Returns:
+            持仓列表（只包含有持仓的资产，顺序与assets一致）
+        """
+        if not assets:
+            return []
+        
+        asset_ids = [asset.asset_id for asset in assets]
+        try:
+            # 资产较少时只加载这些资产的交易，否则整表加载
+            ledger = self.get_ledger(asset_ids if len(asset_ids) <= LEDGER_FILTER_MAX_ASSETS else None)
+        except RuntimeError:
+            ledger = None
         
-        for asset in assets:
-            position = self.get_position(asset.asset_id)
-            if position and position.net_invested > 0:  # 只返回有持仓的资产
-                positions.append(position)
+        positions = []
+        if ledger is not None:
+            all_totals = ledger.all_position_totals()
+            activity = ledger.activity()
+            for asset in assets:
+                totals = all_totals.get(asset.asset_id)
+                # 只返回有持仓的资产（净投入 = 投入 - 取出）
+                if not totals or totals['invested'] - totals['withdrawn'] <= 0:
+                    continue
+                count, first_date, last_date = activity[asset.asset_id]
+                positions.append(LazyPosition(
+                    asset, self.get_transactions_by_asset, totals, count, first_date, last_date
+                ))
+        else:
+            for asset in assets:
+                position = self.get_position(asset.asset_id)
+                if position and position.net_invested > 0:  # 只返回有持仓的资产
+                    positions.append(position)
+        
+        equity_positions = [p for p in positions if p.asset.asset_type == AssetType.EQUITY]
+        if equity_positions:
+            self.prices.value_positions(equity_positions)
+            self._attach_lot_books(equity_positions)
         
         return positions
+
+    def _attach_lot_books(self, positions: List[Position]) -> None:
+        """
+        为权益类持仓注入持久化批次账簿（已实现/未实现损益由账簿增量计算，不再逐笔重放）
+
+        账簿无法构建（如卖出数量超过持有数量）时不注入，计算损益时按交易重放并报出同样的错误。
+        """
+        for position in positions:
+            try:
+                position.set_lot_book(self.lots.get_book(position.asset.asset_id))
+            except ValueError as e:
+                logging.warning("批次账簿构建失败: %s (%s)", position.asset.asset_id, e)
+    
+    def get_ledger(self, asset_ids: Optional[List[str]] = None) -> Ledger:
+        """
+        构建交易的列式账本（需要numpy）
+        
+        Args:
+            asset_ids: 只包含这些资产的交易，默认全部
+            
+        Returns:
+            Ledger对象
+        """
+        return self.repositories.transactions.load_ledger(asset_ids)
     
     # ==================== 投资组合管理 ====================
     
@@ -461,22 +585,21 @@ class WealthService:
     
     # ==================== 分析功能 ====================
     
-    def get_asset_allocation(self, base_currency: Currency = Currency.CNY) -> Dict[str, Decimal]:
+    def get_asset_allocation(self, base_currency: Currency = Currency.CNY) -> Dict[str, Dict[str, Any]]:
         """
-        获取资产配置比例
+        获取资产配置（按当前持仓的当前价值，与get_performance_summary口径一致）
         
         Args:
             base_currency: 基础货币
             
         Returns:
-            资产配置字典 {资产类型: 比例}
+            资产配置字典 {资产类型: {'value', 'percentage', 'count', 'positions'}}
         """
-        portfolio = self.get_portfolio(base_currency)
-        return portfolio.get_asset_allocation()
+        return self.get_portfolio(base_currency).calculate_asset_allocation()
     
     def get_performance_summary(self, base_currency: Currency = Currency.CNY) -> Dict[str, Any]:
         """
-        获取业绩摘要
+        获取业绩摘要（按当前持仓汇总）
         
         Args:
             base_currency: 基础货币
@@ -489,8 +612,12 @@ class WealthService:
         return {
             'total_value': portfolio.total_value,
             'total_cost': portfolio.total_cost,
-            'total_return': portfolio.total_return,
-            'total_return_rate': portfolio.total_return_rate,
+            'total_return': portfolio.calculate_total_return(),
+            'total_return_rate': portfolio.calculate_total_return_rate(),
+            'total_invested': portfolio.total_invested,
+            'total_withdrawn': portfolio.total_withdrawn,
+            'total_income': portfolio.total_income,
+            'total_fees': portfolio.total_fees,
             'asset_count': len(portfolio.positions),
             'base_currency': base_currency.value,
             'last_updated': datetime.now().isoformat()
@@ -510,4 +637,21 @@ class WealthService:
 
     def get_recent_transactions(self, limit: int = 50):
         """获取最近的交易记录"""
-        return self.repositories.transactions.get_recent(limit) 
\ No newline at end of file
+        return self.repositories.transactions.get_recent(limit)
+
+    def find_transactions(self, limit: int = 50, cursor: Optional[str] = None, **filters):
+        """
+        按条件分页查询交易（键集分页）
+        
+        Args:
+            limit: 每页条数
+            cursor: 上一页返回的游标
+            **filters: 过滤条件，见TransactionRepository.find_page
+            
+        Returns:
+            (交易列表, 下一页游标或None)
+            
+        Raises:
+            ValueError: 游标格式无效
+        """
+        return self.repositories.transactions.find_page(limit=limit, cursor=cursor, **filters)
@@ -2,24 +2,67 @@
 # -*- coding: utf-8 -*-
 """
 WealthLite UI 构建脚本
-将src目录的源码构建到dist目录，包括压缩、优化等
+将app目录的源码构建到dist目录，包括压缩、优化等
+
+生产模式（python build.py --production 或 BUILD_MODE=production）：
+- 不合并文件，逐个静态资源按内容哈希重命名（如 js/chart.umd.3f2a9c1b0d.js），
+  并改写HTML与CSS中的引用；HTML保留原文件名作为入口
+- 为文本资源预生成 .gz / .br（安装了brotli时）压缩版本
+- 写出 asset-manifest.json（原路径 -> 带哈希路径），由 PrecompressedStaticFiles
+  据此对带哈希的文件返回 Cache-Control: immutable
 """
 
 import os
 import sys
 import json
+import gzip
 import shutil
+import hashlib
 import re
 from pathlib import Path
 from datetime import datetime
 
+# 添加项目根目录到Python路径（枚举数据由后端枚举定义生成）
+project_root = Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(project_root))
+
+from src.wealth_lite.utils.static_files import ASSET_MANIFEST_FILE, PRECOMPRESS_MIN_BYTES, PRECOMPRESS_SUFFIXES
+
+# UI中引用枚举文件的路径，构建时替换为带内容哈希的文件名
+ENUMS_URL = "/static/data/enums.json"
+
+# 文件名中内容哈希的长度（十六进制字符）
+ASSET_HASH_LENGTH = 10
+
+# HTML中的相对资源引用（src/href属性）
+HTML_REFERENCE = re.compile(r'(\b(?:src|href)=")([^"#?:]+)(")')
+
+# CSS中的url()/@import引用
+CSS_REFERENCE = re.compile(r'(url\(\s*[\'"]?)([^\'")#?:]+)([\'"]?\s*\))')
+
+# JS模块的相对路径导入（import ... from './x.js'、import('./x.js')）
+JS_IMPORT = re.compile(r'(\b(?:from|import)\s*\(?\s*[\'"])(\.{1,2}/[^\'"]+)([\'"])')
+
+# 各类文件中需要改写的引用
+REFERENCE_PATTERNS = {
+    ".html": (HTML_REFERENCE, JS_IMPORT),
+    ".css": (CSS_REFERENCE,),
+    ".js": (JS_IMPORT,),
+}
+
 class WealthLiteBuilder:
     """WealthLite UI构建器"""
     
-    def __init__(self):
-        self.src_dir = Path("src")
+    def __init__(self, production: bool = False):
+        self.production = production
+        self.src_dir = Path("app")
         self.dist_dir = Path("dist")
         self.assets_dir = self.src_dir / "assets"
+        self.enums_hash = None
+        # 原路径 -> 带哈希路径（相对dist目录，使用/分隔）
+        self.manifest = {}
+        # 参与哈希重命名的源文件：相对路径 -> 文件
+        self.sources = {}
         self.build_info = {
             "build_time": datetime.now().isoformat(),
             "version": "1.0.0"
@@ -98,8 +141,10 @@ class WealthLiteBuilder:
             all_js.append(content)
             all_js.append("")
         
-        # 写入合并的JS文件
+        # 写入合并的JS文件，枚举文件引用替换为带哈希的文件名
         combined_js = "\n".join(all_js)
+        if self.enums_hash:
+            combined_js = combined_js.replace(ENUMS_URL, ENUMS_URL.replace("enums.json", f"enums.{self.enums_hash}.json"))
         
         # 压缩JS（可选）
         if self.should_minify():
@@ -116,6 +161,15 @@ class WealthLiteBuilder:
             shutil.copytree(self.assets_dir, dist_assets, dirs_exist_ok=True)
             print(f"📁 已复制静态资源")
     
+    def generate_enums(self):
+        """生成带内容哈希的枚举文件（可长期缓存）"""
+        from src.wealth_lite.services.enum_generator import EnumGeneratorService, hashed_file_name
+        generator = EnumGeneratorService(str(self.dist_dir / "data"))
+        if not generator.generate_enums_file(hashed=True):
+            raise RuntimeError("枚举文件生成失败")
+        self.enums_hash = generator.content_hash
+        print(f"🔖 已生成枚举文件: data/{hashed_file_name(self.enums_hash)}")
+    
     def update_resource_paths(self, html_content):
         """更新HTML中的资源路径"""
         # 更新CSS路径
@@ -222,17 +276,116 @@ WealthLite UI - 构建信息
         )
         print(f"📊 构建信息: {len(file_list)}个文件, 总大小: {total_size:,}字节")
     
+    # ==================== 生产模式 ====================
+    
+    def fingerprint_assets(self):
+        """逐个复制静态资源并按内容哈希重命名"""
+        self.sources = {f.relative_to(self.src_dir).as_posix(): f for f in self.src_dir.rglob("*")
+                        if f.is_file() and f.suffix != ".html" and f.relative_to(self.src_dir).parts[0] != "data"}
+        for relative in sorted(self.sources):
+            self.fingerprint(relative, set())
+        print(f"🔖 已按内容哈希重命名: {len(self.sources)}个文件")
+    
+    def fingerprint(self, relative, visiting):
+        """
+        按内容哈希重命名单个资源，返回带哈希的路径
+        
+        CSS/JS中引用的其他资源先行处理（引用改写后内容才确定），循环引用保持原路径。
+        """
+        if relative in self.manifest:
+            return self.manifest[relative]
+        visiting.add(relative)
+        source = self.sources[relative]
+        base_dir = Path(relative).parent
+        if source.suffix in (".css", ".js"):
+            content = source.read_text(encoding='utf-8')
+            if source.suffix == ".js" and self.enums_hash:
+                content = content.replace(ENUMS_URL, ENUMS_URL.replace("enums.json", f"enums.{self.enums_hash}.json"))
+            for pattern in REFERENCE_PATTERNS[source.suffix]:
+                content = self.rewrite_references(content, pattern, base_dir, visiting)
+            data = content.encode('utf-8')
+        else:
+            data = source.read_bytes()
+        
+        digest = hashlib.sha256(data).hexdigest()[:ASSET_HASH_LENGTH]
+        hashed = Path(relative).with_name(f"{source.stem}.{digest}{source.suffix}")
+        target = self.dist_dir / hashed
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(data)
+        self.manifest[relative] = hashed.as_posix()
+        return self.manifest[relative]
+    
+    def rewrite_references(self, content, pattern, base_dir, visiting=None):
+        """将相对base_dir的资源引用替换为带哈希的路径（未知或循环的引用保持不变）"""
+        def replace(match):
+            reference = match.group(2).strip()
+            resolved = os.path.normpath((base_dir / reference).as_posix()).replace(os.sep, "/")
+            if resolved not in self.sources or resolved in (visiting or ()):
+                return match.group(0)
+            hashed = self.fingerprint(resolved, visiting if visiting is not None else set())
+            rewritten = os.path.relpath(hashed, base_dir.as_posix() or ".").replace(os.sep, "/")
+            if reference.startswith("./") and not rewritten.startswith("."):
+                rewritten = "./" + rewritten  # ES模块的相对路径须以./开头
+            return f"{match.group(1)}{rewritten}{match.group(3)}"
+        return pattern.sub(replace, content)
+    
+    def process_html_production(self):
+        """复制HTML入口文件并改写其中的资源引用"""
+        for html_file in self.src_dir.glob("*.html"):
+            content = html_file.read_text(encoding='utf-8')
+            for pattern in REFERENCE_PATTERNS[".html"]:
+                content = self.rewrite_references(content, pattern, Path(""))
+            content = self.add_build_info(content)
+            (self.dist_dir / html_file.name).write_text(content, encoding='utf-8')
+            print(f"📄 已处理: {html_file.name}")
+    
+    def precompress(self):
+        """为文本资源预生成gzip/brotli压缩版本"""
+        try:
+            import brotli
+        except ImportError:
+            brotli = None
+            print("ℹ️ 未安装brotli，只生成.gz")
+        
+        count = 0
+        for path in list(self.dist_dir.rglob("*")):
+            if not path.is_file() or path.suffix not in PRECOMPRESS_SUFFIXES:
+                continue
+            data = path.read_bytes()
+            if len(data) < PRECOMPRESS_MIN_BYTES:
+                continue
+            path.with_name(path.name + ".gz").write_bytes(gzip.compress(data, compresslevel=9, mtime=0))
+            if brotli is not None:
+                path.with_name(path.name + ".br").write_bytes(brotli.compress(data, quality=11))
+            count += 1
+        print(f"🗜️ 已预压缩: {count}个文件")
+    
+    def write_manifest(self):
+        """写出资源清单"""
+        if self.enums_hash:
+            self.manifest["data/enums.json"] = f"data/enums.{self.enums_hash}.json"
+        (self.dist_dir / ASSET_MANIFEST_FILE).write_text(
+            json.dumps(self.manifest, indent=2, ensure_ascii=False), encoding='utf-8'
+        )
+    
     def build(self):
         """执行完整构建"""
-        print("🏗️ 开始构建 WealthLite UI...")
+        print(f"🏗️ 开始构建 WealthLite UI{'（生产模式）' if self.production else ''}...")
         print("=" * 50)
         
         try:
             self.clean_dist()
-            self.copy_html_files()
-            self.process_css_files()
-            self.process_js_files()
-            self.copy_assets()
+            self.generate_enums()
+            if self.production:
+                self.fingerprint_assets()
+                self.process_html_production()
+                self.write_manifest()
+                self.precompress()
+            else:
+                self.copy_html_files()
+                self.process_css_files()
+                self.process_js_files()
+                self.copy_assets()
             self.generate_build_info()
             
             print("=" * 50)
@@ -247,13 +400,14 @@ WealthLite UI - 构建信息
 def main():
     """主函数"""
     # 检查是否在正确的目录
-    if not os.path.exists('src'):
+    if not os.path.exists('app'):
         print("❌ 错误: 请在ui目录下运行此脚本")
         print("💡 提示: cd ui && python build.py")
         sys.exit(1)
     
     # 执行构建
-    builder = WealthLiteBuilder()
+    production = '--production' in sys.argv[1:] or os.getenv('BUILD_MODE', '').lower() == 'production'
+    builder = WealthLiteBuilder(production=production)
     builder.build()
 
 if __name__ == "__main__":
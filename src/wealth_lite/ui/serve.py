@@ -3,21 +3,32 @@
 """
 WealthLite UI 开发服务器
 提供开发环境的HTTP服务和热重载功能
+
+- 多线程服务：慢的API请求（如AI分析）不会阻塞静态文件
+- /api/* 请求经由到API服务器的长连接池转发，响应体边读边写（支持SSE等流式响应）
+- API服务器地址可通过命令行参数、环境变量 WEALTH_LITE_API_HOST / WEALTH_LITE_API_PORT
+  或 package.json 的 config.api_host / config.api_port 配置
 """
 
 import os
 import sys
 import json
+import queue
+import socket
+import argparse
 import webbrowser
 import threading
 import time
-import urllib.request
-import urllib.error
-import urllib.parse
-from http.server import HTTPServer, SimpleHTTPRequestHandler
+import http.client
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
 from pathlib import Path
-from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:  # 文件监听为可选功能
+    Observer = None
+    FileSystemEventHandler = object
 
 # 确保stdout使用utf-8编码，解决emoji显示问题
 if sys.stdout.encoding != 'utf-8':
@@ -28,21 +39,88 @@ if sys.stdout.encoding != 'utf-8':
         sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
         sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
 
+# 默认API服务器地址（与 main.py 的默认端口一致）
+DEFAULT_API_HOST = "127.0.0.1"
+DEFAULT_API_PORT = 8080
+
+# 连接池保留的空闲连接数、上游超时（秒）与流式转发的块大小
+PROXY_POOL_SIZE = 8
+PROXY_TIMEOUT = 300
+PROXY_CHUNK_SIZE = 64 * 1024
+
+# 逐跳头部，不在代理两端之间转发
+HOP_BY_HOP_HEADERS = {
+    'connection', 'keep-alive', 'proxy-authenticate', 'proxy-authorization',
+    'te', 'trailer', 'transfer-encoding', 'upgrade',
+}
+
+
+class UpstreamPool:
+    """到API服务器的HTTP长连接池（线程安全）"""
+    
+    def __init__(self, host: str, port: int, size: int = PROXY_POOL_SIZE, timeout: float = PROXY_TIMEOUT):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._idle = queue.LifoQueue(maxsize=size)
+    
+    def acquire(self):
+        """
+        取出一个连接
+        
+        Returns:
+            (连接, 是否为复用的空闲连接)
+        """
+        try:
+            return self._idle.get_nowait(), True
+        except queue.Empty:
+            return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout), False
+    
+    def release(self, conn, reusable: bool = True):
+        """归还连接；不可复用或池已满时关闭"""
+        if reusable:
+            try:
+                self._idle.put_nowait(conn)
+                return
+            except queue.Full:
+                pass
+        conn.close()
+    
+    def close(self):
+        """关闭所有空闲连接"""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+    
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+
 class WealthLiteDevHandler(SimpleHTTPRequestHandler):
     """开发环境HTTP处理器"""
     
+    # 与浏览器保持长连接；静态文件与错误响应都带Content-Length，流式代理响应使用分块传输
+    protocol_version = "HTTP/1.1"
+    
+    # 由 create_server 设置
+    upstream: UpstreamPool = None
+    
     def __init__(self, *args, **kwargs):
-        # 不再传递directory参数，避免重复
+        self._proxying = False
         super().__init__(*args, **kwargs)
     
     def end_headers(self):
-        # 添加CORS头部和开发环境头部
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
-        self.send_header('Cache-Control', 'no-cache, no-store, must-revalidate')
-        self.send_header('Pragma', 'no-cache')
-        self.send_header('Expires', '0')
+        # 添加CORS头部和开发环境头部（代理的API响应保持API服务器的缓存头部）
+        if not self._proxying:
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.send_header('Access-Control-Allow-Methods', 'GET, POST, PUT, DELETE, OPTIONS')
+            self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+            self.send_header('Cache-Control', 'no-cache, no-store, must-revalidate')
+            self.send_header('Pragma', 'no-cache')
+            self.send_header('Expires', '0')
         super().end_headers()
     
     def do_GET(self):
@@ -54,14 +132,28 @@ class WealthLiteDevHandler(SimpleHTTPRequestHandler):
             # 否则正常处理
             super().do_GET()
     
-    def do_POST(self):
-        """处理POST请求"""
-        # 如果是API请求，转发到API服务器
+    def do_HEAD(self):
+        """处理HEAD请求"""
         if self.path.startswith('/api/'):
-            self.proxy_request('POST')
+            self.proxy_request('HEAD')
         else:
-            # 否则正常处理
-            super().do_POST()
+            super().do_HEAD()
+    
+    def do_POST(self):
+        """处理POST请求"""
+        self._api_only('POST')
+    
+    def do_PUT(self):
+        """处理PUT请求"""
+        self._api_only('PUT')
+    
+    def do_DELETE(self):
+        """处理DELETE请求"""
+        self._api_only('DELETE')
+    
+    def do_PATCH(self):
+        """处理PATCH请求"""
+        self._api_only('PATCH')
     
     def do_OPTIONS(self):
         """处理OPTIONS请求"""
@@ -71,129 +163,113 @@ class WealthLiteDevHandler(SimpleHTTPRequestHandler):
         else:
             # 否则正常处理
             self.send_response(200)
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-            self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+            self.send_header('Content-Length', '0')
             self.end_headers()
     
+    def _api_only(self, method):
+        """只有API请求支持的方法"""
+        if self.path.startswith('/api/'):
+            self.proxy_request(method)
+        else:
+            self.send_error(405, f"{method} 只支持 /api/ 请求")
+    
     def proxy_request(self, method):
-        """将请求代理到API服务器"""
-        api_url = f"http://localhost:8081{self.path}"
+        """将请求经由连接池代理到API服务器，响应体流式转发"""
+        content_length = int(self.headers.get('Content-Length', 0))
+        body = self.rfile.read(content_length) if content_length > 0 else None
+        headers = {k: v for k, v in self.headers.items()
+                   if k.lower() not in HOP_BY_HOP_HEADERS and k.lower() not in ('host', 'content-length')}
+        if body is not None:
+            headers['Content-Length'] = str(len(body))
         
-        try:
-            # 读取请求体
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length) if content_length > 0 else None
-            
-            # 创建请求
-            headers = {k: v for k, v in self.headers.items() 
-                      if k.lower() not in ('host', 'content-length')}
-            
-            # 确保设置正确的Content-Type
-            if method == 'POST' and 'content-type' not in map(str.lower, headers.keys()):
-                headers['Content-Type'] = 'application/json'
-            
-            req = urllib.request.Request(
-                api_url,
-                data=body,
-                headers=headers,
-                method=method
-            )
-            
-            # 发送请求到API服务器
-            with urllib.request.urlopen(req) as response:
-                # 设置响应状态码
-                self.send_response(response.status)
-                
-                # 读取响应体
-                response_data = response.read()
-                
-                # 设置响应头
-                for header, value in response.getheaders():
-                    if header.lower() not in ('transfer-encoding', 'content-encoding', 'content-length'):
-                        self.send_header(header, value)
-                
-                # 设置正确的Content-Length
-                self.send_header('Content-Length', str(len(response_data)))
-                
-                # 确保设置正确的Content-Type
-                if 'content-type' not in map(str.lower, dict(response.getheaders()).keys()):
-                    self.send_header('Content-Type', 'application/json')
-                
-                # 结束头部
-                self.end_headers()
-                
-                # 发送响应体
-                self.wfile.write(response_data)
-                
-                # 记录成功的API请求
-                print(f"API代理: {method} {self.path} -> {response.status}")
-                
-        except urllib.error.HTTPError as e:
-            # 处理HTTP错误
-            self.send_response(e.code)
-            self.send_header('Content-Type', 'application/json')
-            
-            # 尝试读取错误响应
+        # 复用的空闲连接可能已被API服务器关闭，此时换新连接重试一次
+        while True:
+            conn, reused = self.upstream.acquire()
             try:
-                error_data = e.read()
-                error_json = json.loads(error_data)
-                error_message = json.dumps(error_json)
-            except:
-                error_message = json.dumps({
-                    "success": False,
-                    "error": f"API服务器错误: {str(e)}"
-                })
-            
-            # 设置正确的Content-Length
-            error_bytes = error_message.encode('utf-8')
-            self.send_header('Content-Length', str(len(error_bytes)))
-            self.end_headers()
-            
-            self.wfile.write(error_bytes)
-            print(f"API代理错误: {method} {self.path} -> {e.code}")
-            
-        except urllib.error.URLError as e:
-            # 处理连接错误
-            self.send_response(503)  # Service Unavailable
-            self.send_header('Content-Type', 'application/json')
-            
-            error_message = json.dumps({
-                "success": False,
-                "error": f"无法连接到API服务器: {str(e.reason)}"
-            })
-            
-            # 设置正确的Content-Length
-            error_bytes = error_message.encode('utf-8')
-            self.send_header('Content-Length', str(len(error_bytes)))
-            self.end_headers()
-            
-            self.wfile.write(error_bytes)
-            print(f"API代理连接失败: {method} {self.path} -> {str(e.reason)}")
-            
+                conn.request(method, self.path, body=body, headers=headers)
+                response = conn.getresponse()
+                break
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError) as e:
+                conn.close()
+                if reused:
+                    continue
+                self._send_proxy_error(502, f"API服务器断开连接: {e}")
+                return
+            except OSError as e:
+                conn.close()
+                self._send_proxy_error(503, f"无法连接到API服务器 {self.upstream.url}: {e}")
+                print(f"API代理连接失败: {method} {self.path} -> {e}")
+                return
+        
+        try:
+            self._relay_response(method, response)
+            self.upstream.release(conn, reusable=not response.will_close)
+            print(f"API代理: {method} {self.path} -> {response.status}")
+        except (ConnectionResetError, BrokenPipeError):
+            # 浏览器已断开（如关闭了SSE页面），上游连接无法复用
+            conn.close()
+            self.close_connection = True
         except Exception as e:
-            # 处理其他错误
-            self.send_response(500)
-            self.send_header('Content-Type', 'application/json')
-            
-            error_message = json.dumps({
-                "success": False,
-                "error": f"代理请求错误: {str(e)}"
-            })
-            
-            # 设置正确的Content-Length
-            error_bytes = error_message.encode('utf-8')
-            self.send_header('Content-Length', str(len(error_bytes)))
+            conn.close()
+            self.close_connection = True
+            print(f"API代理错误: {method} {self.path} -> {e}")
+    
+    def _relay_response(self, method, response):
+        """转发响应：有Content-Length时原样转发，否则以分块传输边读边写"""
+        self._proxying = True
+        try:
+            self.send_response(response.status, response.reason)
+            length = response.getheader('Content-Length')
+            for header, value in response.getheaders():
+                if header.lower() not in HOP_BY_HOP_HEADERS:
+                    self.send_header(header, value)
+            chunked = length is None and method != 'HEAD' and response.status not in (204, 304)
+            if chunked:
+                self.send_header('Transfer-Encoding', 'chunked')
             self.end_headers()
-            
-            self.wfile.write(error_bytes)
-            print(f"API代理错误: {method} {self.path} -> {str(e)}")
+        finally:
+            self._proxying = False
+        
+        while True:
+            data = response.read1(PROXY_CHUNK_SIZE)
+            if not data:
+                break
+            if chunked:
+                self.wfile.write(f"{len(data):X}\r\n".encode('ascii') + data + b"\r\n")
+            else:
+                self.wfile.write(data)
+            self.wfile.flush()
+        if chunked:
+            self.wfile.write(b"0\r\n\r\n")
+            self.wfile.flush()
+        # 响应已读完：标记结束，连接才能发送下一个请求
+        response.close()
+    
+    def _send_proxy_error(self, status, message):
+        """返回JSON格式的代理错误"""
+        error_bytes = json.dumps({"success": False, "error": message}, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(error_bytes)))
+        self.end_headers()
+        self.wfile.write(error_bytes)
     
     def log_message(self, format, *args):
         # 简化日志输出
         timestamp = time.strftime('%H:%M:%S')
         print(f"[{timestamp}] {format % args}")
 
+
+def create_server(port: int, app_dir: Path, api_host: str = DEFAULT_API_HOST, api_port: int = DEFAULT_API_PORT,
+                  bind: str = 'localhost') -> ThreadingHTTPServer:
+    """创建多线程开发服务器（每个服务器实例有独立的API连接池）"""
+    handler = type('BoundDevHandler', (WealthLiteDevHandler,), {'upstream': UpstreamPool(api_host, api_port)})
+    server = ThreadingHTTPServer(
+        (bind, port), lambda *args, **kwargs: handler(*args, directory=str(app_dir), **kwargs)
+    )
+    server.daemon_threads = True
+    return server
+
 class FileWatcher(FileSystemEventHandler):
     """文件变更监听器"""
     
@@ -218,10 +294,10 @@ class FileWatcher(FileSystemEventHandler):
         self.last_modified[event.src_path] = current_time
         self.callback(event.src_path)
 
-def load_config():
+def load_config(path='package.json'):
     """加载配置文件"""
     try:
-        with open('package.json', 'r', encoding='utf-8') as f:
+        with open(path, 'r', encoding='utf-8') as f:
             config = json.load(f)
             return config.get('config', {})
     except FileNotFoundError:
@@ -255,7 +331,10 @@ def open_browser(url, delay=2):
     thread.start()
 
 def start_file_watcher():
-    """启动文件监听器"""
+    """启动文件监听器（未安装watchdog时返回None）"""
+    if Observer is None:
+        return None
+    
     def on_file_changed(file_path):
         rel_path = os.path.relpath(file_path)
         print(f"文件已更改: {rel_path}")
@@ -267,6 +346,17 @@ def start_file_watcher():
     observer.start()
     return observer
 
+def parse_args(config):
+    """解析命令行参数（默认值依次取环境变量、package.json配置）"""
+    parser = argparse.ArgumentParser(description='WealthLite UI 开发服务器')
+    parser.add_argument('--port', type=int, default=config.get('dev_port', 8000), help='开发服务器起始端口')
+    parser.add_argument('--api-host', default=os.getenv('WEALTH_LITE_API_HOST', config.get('api_host', DEFAULT_API_HOST)),
+                        help='API服务器主机')
+    parser.add_argument('--api-port', type=int,
+                        default=int(os.getenv('WEALTH_LITE_API_PORT', config.get('api_port', DEFAULT_API_PORT))),
+                        help='API服务器端口')
+    return parser.parse_args()
+
 def main():
     """主函数"""
     print("启动 WealthLite UI 开发服务器...")
@@ -279,31 +369,35 @@ def main():
         sys.exit(1)
     
     # 加载配置
-    config = load_config()
-    default_port = config.get('dev_port', 8000)
+    config = load_config(base_dir / 'package.json')
+    args = parse_args(config)
+    observer = None
     
     try:
         # 查找可用端口
-        port = find_free_port(default_port)
+        port = find_free_port(args.port)
         
         print(f"开发服务器地址: http://localhost:{port}")
         print(f"服务目录: {app_dir.absolute()}")
         print(f"开发模式: 启用CORS和热重载提示")
-        print(f"API代理: 将 /api/* 请求转发到 http://localhost:8081")
+        print(f"API代理: 将 /api/* 请求转发到 http://{args.api_host}:{args.api_port}（长连接池，流式转发）")
         
         # 启动文件监听器
-        def on_file_changed(file_path):
-            rel_path = os.path.relpath(file_path, app_dir)
-            print(f"文件已更改: {rel_path}")
-            print("请刷新浏览器查看更改")
-        event_handler = FileWatcher(on_file_changed)
-        observer = Observer()
-        observer.schedule(event_handler, path=str(app_dir), recursive=True)
-        observer.start()
-        print("文件监听器: 已启动")
+        if Observer is not None:
+            def on_file_changed(file_path):
+                rel_path = os.path.relpath(file_path, app_dir)
+                print(f"文件已更改: {rel_path}")
+                print("请刷新浏览器查看更改")
+            event_handler = FileWatcher(on_file_changed)
+            observer = Observer()
+            observer.schedule(event_handler, path=str(app_dir), recursive=True)
+            observer.start()
+            print("文件监听器: 已启动")
+        else:
+            print("文件监听器: 未安装watchdog，已禁用")
         
-        # 创建服务器
-        server = HTTPServer(('localhost', port), lambda *args, **kwargs: WealthLiteDevHandler(*args, directory=str(app_dir), **kwargs))
+        # 创建服务器（多线程，慢请求不阻塞其他请求）
+        server = create_server(port, app_dir, args.api_host, args.api_port)
         
         print("开发提示:")
         print("  - 修改文件后刷新浏览器查看更改")
@@ -327,7 +421,7 @@ def main():
         
     except KeyboardInterrupt:
         print("\n正在停止服务器...")
-        if 'observer' in locals():
+        if observer is not None:
             observer.stop()
             observer.join()
         print("服务器已停止")
@@ -336,4 +430,4 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
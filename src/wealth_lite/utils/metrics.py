@@ -0,0 +1,253 @@
+"""
+请求级性能指标
+
+- MetricsMiddleware: ASGI中间件，按路由模板（如 /api/assets/{asset_id}）记录请求耗时直方图，
+  并通过 Server-Timing 响应头向浏览器展示本次请求的 SQL / AI 耗时分解
+- record_query: DatabaseManager的查询钩子，统计SQL次数、耗时与读取行数
+- ai_call: AI接口调用计时的上下文管理器
+- MetricsRegistry.render: 输出Prometheus文本格式，由 /api/metrics 提供
+
+单次请求的统计保存在ContextVar中，线程池中执行的同步代码同样能记录到所属请求。
+"""
+
+import copy
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# 请求耗时直方图的桶上界（秒）
+LATENCY_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# 未匹配到路由的请求统一使用的标签，避免任意路径导致指标基数膨胀
+UNMATCHED_ROUTE = "<unmatched>"
+
+# Starlette会为text/*类型自动追加 charset=utf-8
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4"
+
+
+@dataclass
+class RequestMetrics:
+    """单次请求的统计"""
+    sql_count: int = 0
+    sql_seconds: float = 0.0
+    rows: int = 0
+    ai_count: int = 0
+    ai_seconds: float = 0.0
+    # 请求描述（方法 + 路径）与按查询指纹的执行次数，供SQL分析器检测N+1
+    path: str = ""
+    statements: Counter = field(default_factory=Counter)
+
+
+_current: ContextVar[Optional[RequestMetrics]] = ContextVar("wealth_lite_request_metrics", default=None)
+
+
+def current_request_metrics() -> Optional[RequestMetrics]:
+    """当前请求的统计（不在请求中时为None）"""
+    return _current.get()
+
+
+@dataclass
+class Histogram:
+    """累积直方图"""
+    buckets: Tuple[float, ...] = LATENCY_BUCKETS
+    counts: List[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+    total: float = 0.0
+    count: int = 0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.total += value
+        self.count += 1
+
+
+@dataclass
+class RouteStats:
+    """单个路由（方法 + 路由模板）的累计统计"""
+    latency: Histogram = field(default_factory=Histogram)
+    statuses: Dict[int, int] = field(default_factory=dict)
+    sql_count: int = 0
+    sql_seconds: float = 0.0
+    rows: int = 0
+    ai_count: int = 0
+    ai_seconds: float = 0.0
+
+
+class MetricsRegistry:
+    """指标注册表（线程安全）"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: Dict[Tuple[str, str], RouteStats] = {}
+        # 请求之外（启动、后台线程）的SQL统计
+        self._background = RequestMetrics()
+
+    def observe_request(self, method: str, route: str, status: int, seconds: float,
+                        request: RequestMetrics) -> None:
+        """记录一次请求"""
+        with self._lock:
+            stats = self._routes.get((method, route))
+            if stats is None:
+                stats = self._routes[(method, route)] = RouteStats()
+            stats.latency.observe(seconds)
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+            stats.sql_count += request.sql_count
+            stats.sql_seconds += request.sql_seconds
+            stats.rows += request.rows
+            stats.ai_count += request.ai_count
+            stats.ai_seconds += request.ai_seconds
+
+    def observe_background_query(self, seconds: float, rows: int) -> None:
+        """记录请求之外执行的查询"""
+        with self._lock:
+            self._background.sql_count += 1
+            self._background.sql_seconds += seconds
+            self._background.rows += rows
+
+    def reset(self) -> None:
+        """清空全部指标"""
+        with self._lock:
+            self._routes.clear()
+            self._background = RequestMetrics()
+
+    def render(self) -> str:
+        """输出Prometheus文本格式"""
+        with self._lock:
+            snapshot = copy.deepcopy(sorted(self._routes.items()))
+            background = copy.deepcopy(self._background)
+
+        lines = [
+            "# HELP wealthlite_http_request_duration_seconds HTTP request latency by route.",
+            "# TYPE wealthlite_http_request_duration_seconds histogram",
+        ]
+        for (method, route), stats in snapshot:
+            labels = f'method="{method}",route="{_escape(route)}"'
+            cumulative = 0
+            for bound, count in zip(stats.latency.buckets, stats.latency.counts):
+                cumulative += count
+                lines.append(f'wealthlite_http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'wealthlite_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {stats.latency.count}')
+            lines.append(f"wealthlite_http_request_duration_seconds_sum{{{labels}}} {stats.latency.total:.6f}")
+            lines.append(f"wealthlite_http_request_duration_seconds_count{{{labels}}} {stats.latency.count}")
+
+        counters = [
+            ("wealthlite_http_requests_total", "HTTP requests by route and status.", None),
+            ("wealthlite_sql_queries_total", "SQL statements executed.", "sql_count"),
+            ("wealthlite_sql_query_seconds_total", "Time spent executing SQL.", "sql_seconds"),
+            ("wealthlite_sql_rows_total", "Rows fetched from SQL queries.", "rows"),
+            ("wealthlite_ai_calls_total", "AI provider calls.", "ai_count"),
+            ("wealthlite_ai_call_seconds_total", "Time spent waiting for AI providers.", "ai_seconds"),
+        ]
+        for name, help_text, attr in counters:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for (method, route), stats in snapshot:
+                labels = f'method="{method}",route="{_escape(route)}"'
+                if attr is None:
+                    for status, count in sorted(stats.statuses.items()):
+                        lines.append(f'{name}{{{labels},status="{status}"}} {count}')
+                else:
+                    lines.append(f"{name}{{{labels}}} {_format(getattr(stats, attr))}")
+            if attr in ("sql_count", "sql_seconds", "rows"):
+                lines.append(f'{name}{{method="",route="<background>"}} {_format(getattr(background, attr))}')
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    """转义Prometheus标签值"""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format(value) -> str:
+    return f"{value:.6f}" if isinstance(value, float) else str(value)
+
+
+# 进程内全局指标注册表
+METRICS = MetricsRegistry()
+
+
+def record_query(sql: str, seconds: float, rows: int) -> None:
+    """DatabaseManager查询钩子：计入当前请求，不在请求中时计入后台统计"""
+    request = _current.get()
+    if request is None:
+        METRICS.observe_background_query(seconds, rows)
+        return
+    request.sql_count += 1
+    request.sql_seconds += seconds
+    request.rows += rows
+
+
+@contextmanager
+def ai_call() -> Iterator[None]:
+    """记录一次AI接口调用的耗时"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        request = _current.get()
+        if request is not None:
+            request.ai_count += 1
+            request.ai_seconds += time.perf_counter() - started
+
+
+def server_timing(total: float, request: RequestMetrics) -> str:
+    """生成Server-Timing响应头"""
+    parts = [f"app;dur={total * 1000:.1f}"]
+    if request.sql_count:
+        parts.append(f'db;dur={request.sql_seconds * 1000:.1f};desc="{request.sql_count} queries, {request.rows} rows"')
+    if request.ai_count:
+        parts.append(f'ai;dur={request.ai_seconds * 1000:.1f};desc="{request.ai_count} calls"')
+    return ", ".join(parts)
+
+
+class MetricsMiddleware:
+    """请求指标ASGI中间件"""
+
+    def __init__(self, app, registry: MetricsRegistry = METRICS):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = RequestMetrics(path=f"{scope['method']} {scope['path']}")
+        token = _current.set(request)
+        started = time.perf_counter()
+        root_path = scope.get("root_path", "")
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                timing = server_timing(time.perf_counter() - started, request).encode("latin-1")
+                message = {**message, "headers": [*message.get("headers", []), (b"server-timing", timing)]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            self.registry.observe_request(scope["method"], self._route_label(scope, root_path), status,
+                                          time.perf_counter() - started, request)
+
+    @staticmethod
+    def _route_label(scope, root_path: str) -> str:
+        """路由模板；挂载的子应用（如 /static）记为 挂载路径/*"""
+        route = scope.get("route")
+        if route is not None:
+            return route.path
+        mounted = scope.get("root_path", "")
+        if mounted != root_path:
+            return f"{mounted[len(root_path):]}/*"
+        return UNMATCHED_ROUTE
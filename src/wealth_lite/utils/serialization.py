@@ -0,0 +1,269 @@
+"""
+WealthLite JSON序列化
+
+API响应的快速序列化：
+- dumps(): 安装了orjson时使用orjson，否则回退到标准库json；Decimal转为float，
+  未经编码器处理的枚举按值输出（与orjson的内置行为一致）
+- 按模型预编译的编码器：字段列表与转换函数在导入时确定，编码时不再做hasattr探测
+- choose_encoding()/compress(): 按Accept-Encoding对较大的响应体做br/gzip压缩
+"""
+
+import gzip
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Type
+
+from ..models.position import Position
+from ..models.snapshot import PortfolioSnapshot
+from ..models.transaction import (
+    BaseTransaction, CashTransaction, EquityTransaction, FixedIncomeTransaction, RealEstateTransaction
+)
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson为可选依赖
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli为可选依赖
+    brotli = None
+
+
+# 响应体超过该字节数才压缩
+COMPRESS_MIN_BYTES = 4096
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4
+
+
+def _default(value: Any) -> Any:
+    """JSON编码器无法处理的类型"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+def dumps(content: Any) -> bytes:
+    """序列化为UTF-8编码的JSON字节串"""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, ensure_ascii=False, separators=(',', ':'), default=_default).encode('utf-8')
+
+
+def choose_encoding(accept_encoding: Optional[str], size: int) -> Optional[str]:
+    """根据Accept-Encoding与响应体大小选择压缩编码，不压缩时返回None"""
+    if size < COMPRESS_MIN_BYTES or not accept_encoding:
+        return None
+    accepted = {part.split(';')[0].strip().lower() for part in accept_encoding.split(',')}
+    if brotli is not None and 'br' in accepted:
+        return 'br'
+    if 'gzip' in accepted:
+        return 'gzip'
+    return None
+
+
+def compress(body: bytes, encoding: Optional[str]) -> bytes:
+    """按choose_encoding()选出的编码压缩响应体"""
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    if encoding == 'gzip':
+        return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+    return body
+
+
+# ==================== 预编译编码器 ====================
+
+# 转换函数：值 -> JSON兼容值
+def _float(value) -> float:
+    return float(value)
+
+
+def _money(value) -> float:
+    return round(float(value), 2)
+
+
+def _iso(value) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def _name(value) -> Any:
+    return value.name if hasattr(value, 'name') else str(value)
+
+
+def _identity(value):
+    return value
+
+
+# 字段定义：(输出键, 属性名或取值函数, 转换函数, 值为假时是否省略)
+FieldSpec = Tuple[str, Any, Callable[[Any], Any], bool]
+
+
+class ModelEncoder:
+    """按字段定义预编译的模型编码器"""
+
+    __slots__ = ('fields', 'constants')
+
+    def __init__(self, fields: Sequence[FieldSpec], constants: Optional[Dict[str, Any]] = None):
+        self.fields = tuple(
+            (key, attrgetter(source) if isinstance(source, str) else source, convert, omit_falsy)
+            for key, source, convert, omit_falsy in fields
+        )
+        self.constants = dict(constants or {})
+
+    def encode(self, obj) -> Dict[str, Any]:
+        """编码单个对象"""
+        result = {}
+        for key, getter, convert, omit_falsy in self.fields:
+            value = getter(obj)
+            if omit_falsy and not value:
+                continue
+            result[key] = convert(value)
+        if self.constants:
+            result.update(self.constants)
+        return result
+
+    def encode_many(self, objects: Iterable) -> List[Dict[str, Any]]:
+        """编码多个对象"""
+        encode = self.encode
+        return [encode(obj) for obj in objects]
+
+
+ASSET_ENCODER = ModelEncoder([
+    ('id', 'asset_id', _identity, False),
+    ('name', 'asset_name', _identity, False),
+    ('asset_type', 'asset_type', _name, False),
+    ('asset_subtype', lambda a: a.asset_subtype.name if a.asset_subtype else None, _identity, False),
+    ('currency', 'currency', _name, False),
+    ('description', 'description', _identity, False),
+    ('created_at', 'created_date', _iso, False),
+])
+
+_TRANSACTION_BASE_FIELDS: List[FieldSpec] = [
+    ('id', 'transaction_id', _identity, False),
+    ('asset_id', 'asset_id', _identity, False),
+    ('type', 'transaction_type', _name, False),
+    ('amount', 'amount', _float, False),
+    ('date', 'transaction_date', _iso, False),
+    ('currency', 'currency', _name, False),
+    ('exchange_rate', lambda t: float(t.exchange_rate) if t.exchange_rate else 1.0, _identity, False),
+    ('amount_base_currency',
+     lambda t: float(t.amount_base_currency) if t.amount_base_currency else float(t.amount), _identity, False),
+    ('notes', 'notes', _identity, False),
+    ('reference_number', 'reference_number', _identity, False),
+    ('created_date', 'created_date', _iso, False),
+]
+
+# 各交易子类的特有字段（与交易列表API原有的输出一致：数值与日期字段为零或空时省略）
+_TRANSACTION_SPECIFIC_FIELDS: Dict[Type[BaseTransaction], List[FieldSpec]] = {
+    CashTransaction: [
+        ('account_type', 'account_type', _identity, False),
+        ('interest_rate', 'interest_rate', _float, True),
+        ('compound_frequency', 'compound_frequency', _identity, False),
+    ],
+    FixedIncomeTransaction: [
+        ('annual_rate', 'annual_rate', _float, True),
+        ('start_date', 'start_date', _iso, True),
+        ('maturity_date', 'maturity_date', _iso, True),
+        ('interest_type', 'interest_type', _name, False),
+        ('payment_frequency', 'payment_frequency', _name, False),
+        ('face_value', 'face_value', _float, True),
+        ('coupon_rate', 'coupon_rate', _float, True),
+    ],
+    EquityTransaction: [
+        ('quantity', 'quantity', _float, True),
+        ('price_per_share', 'price_per_share', _float, True),
+        ('commission', 'commission', _float, True),
+    ],
+    RealEstateTransaction: [
+        ('property_area', 'property_area', _float, True),
+        ('price_per_unit', 'price_per_unit', _float, True),
+        ('rental_income', 'rental_income', _float, True),
+        ('property_type', 'property_type', _identity, False),
+        ('location', 'location', _identity, False),
+        ('tax_amount', 'tax_amount', _float, True),
+    ],
+}
+
+_transaction_encoders: Dict[type, ModelEncoder] = {}
+
+
+def transaction_encoder(cls: type) -> ModelEncoder:
+    """获取交易类的编码器（按类缓存）"""
+    encoder = _transaction_encoders.get(cls)
+    if encoder is None:
+        # 按类名匹配：应用以src.wealth_lite与wealth_lite两种路径导入模型时类对象并不相同
+        specific_by_name = {base.__name__: fields for base, fields in _TRANSACTION_SPECIFIC_FIELDS.items()}
+        specific = next((specific_by_name[c.__name__] for c in cls.__mro__ if c.__name__ in specific_by_name), [])
+        encoder = ModelEncoder(_TRANSACTION_BASE_FIELDS + specific, {'transaction_class': cls.__name__})
+        _transaction_encoders[cls] = encoder
+    return encoder
+
+
+def encode_transactions(transactions: Iterable[BaseTransaction]) -> List[Dict[str, Any]]:
+    """编码交易列表"""
+    encoders = _transaction_encoders
+    result = []
+    for tx in transactions:
+        encoder = encoders.get(tx.__class__) or transaction_encoder(tx.__class__)
+        result.append(encoder.encode(tx))
+    return result
+
+
+SNAPSHOT_SUMMARY_ENCODER = ModelEncoder([
+    ('snapshot_id', 'snapshot_id', _identity, False),
+    ('snapshot_date', 'snapshot_date', _iso, False),
+    ('snapshot_type', lambda s: s.snapshot_type.value, _identity, False),
+    ('total_value', 'total_value', _float, False),
+    ('total_return', 'total_return', _float, False),
+    ('total_return_rate', 'total_return_rate', _float, False),
+    ('notes', 'notes', _identity, False),
+    ('is_today', 'is_today', _identity, False),
+])
+
+
+def encode_snapshot_summaries(snapshots: Iterable[PortfolioSnapshot]) -> List[Dict[str, Any]]:
+    """编码快照列表（列表页使用的摘要字段）"""
+    return SNAPSHOT_SUMMARY_ENCODER.encode_many(snapshots)
+
+
+_POSITION_FIELDS = ModelEncoder([
+    ('position_id', 'position_id', _identity, False),
+    ('base_currency', 'base_currency', _name, False),
+    ('status', 'status', _name, False),
+    ('transaction_count', 'transaction_count', _identity, False),
+    ('first_transaction_date', 'first_transaction_date', _iso, False),
+    ('last_transaction_date', 'last_transaction_date', _iso, False),
+    ('holding_days', 'holding_days', _identity, False),
+    ('total_invested', 'total_invested', _money, False),
+    ('total_withdrawn', 'total_withdrawn', _money, False),
+    ('total_income', 'total_income', _money, False),
+    ('total_fees', 'total_fees', _money, False),
+    ('net_invested', 'net_invested', _money, False),
+    ('principal_amount', 'principal_amount', _money, False),
+    ('current_book_value', 'current_book_value', _money, False),
+])
+
+
+def encode_position(position: Position) -> Dict[str, Any]:
+    """
+    编码持仓（不含交易明细）
+
+    与Position.to_dict(include_transactions=False)的字段相同，但市值只计算一次并传给各收益计算。
+    """
+    result = _POSITION_FIELDS.encode(position)
+    result['asset'] = position.asset.to_dict()
+    current_value = position.calculate_current_value()
+    result['current_value'] = _money(current_value)
+    result['total_return'] = round(float(position.calculate_total_return(current_value)), 4)
+    result['total_return_rate'] = round(position.calculate_total_return_rate(current_value), 4)
+    result['annualized_return'] = round(position.calculate_annualized_return(current_value), 4)
+    result['unrealized_pnl'] = round(float(position.calculate_unrealized_pnl()), 4)
+    result['realized_pnl'] = round(float(position.calculate_realized_pnl()), 4)
+    return result
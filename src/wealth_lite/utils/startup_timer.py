@@ -0,0 +1,57 @@
+"""
+启动耗时统计
+
+按阶段记录应用启动各步骤的耗时，启动完成后输出汇总日志，
+并可通过 /api/health 查看，便于定位启动关键路径上的慢步骤。
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+class StartupTimer:
+    """启动阶段计时器"""
+
+    def __init__(self, started: Optional[float] = None):
+        """
+        Args:
+            started: 计时起点（time.perf_counter()），默认为创建时刻
+        """
+        self.started = started if started is not None else time.perf_counter()
+        self.finished: Optional[float] = None
+        self.phases: List[Tuple[str, float]] = []
+        self.logger = logging.getLogger(__name__)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """记录一个阶段的耗时（阶段抛出异常时同样记录）"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def record(self, name: str, seconds: float) -> None:
+        """记录阶段耗时（秒）"""
+        self.phases.append((name, seconds))
+        self.logger.debug("⏱️ 启动阶段 %s: %.1f ms", name, seconds * 1000)
+
+    @property
+    def elapsed(self) -> float:
+        """总耗时（秒）：启动完成前为从起点到现在，完成后固定为启动总耗时"""
+        return (self.finished or time.perf_counter()) - self.started
+
+    def report(self) -> None:
+        """标记启动完成并输出各阶段耗时汇总"""
+        self.finished = time.perf_counter()
+        details = ", ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in self.phases)
+        self.logger.info(f"⏱️ 启动耗时 {self.elapsed * 1000:.0f} ms（{details}）")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典（毫秒）"""
+        return {
+            "phases": [{"name": name, "ms": round(seconds * 1000, 1)} for name, seconds in self.phases],
+            "total_ms": round(self.elapsed * 1000, 1),
+        }
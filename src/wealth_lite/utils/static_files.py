@@ -0,0 +1,102 @@
+"""
+静态文件服务
+
+- NoCacheStaticFiles: 开发环境使用，所有文件禁用缓存，修改后刷新即可生效
+- PrecompressedStaticFiles: 生产环境使用，服务 build.py --production 的构建产物：
+  按Accept-Encoding返回预压缩的 .br/.gz 版本，资源清单中带内容哈希的文件
+  返回 Cache-Control: immutable，HTML等入口文件每次向服务端校验
+"""
+
+import json
+import logging
+import os
+from mimetypes import guess_type
+from typing import Optional, Set, Tuple
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+# 构建产物中的资源清单（原路径 -> 带哈希路径）
+ASSET_MANIFEST_FILE = "asset-manifest.json"
+
+# 预压缩的文件类型与最小大小
+PRECOMPRESS_SUFFIXES = {".js", ".css", ".html", ".json", ".svg", ".map", ".txt"}
+PRECOMPRESS_MIN_BYTES = 1024
+
+# 预压缩版本（按优先级）：(Content-Encoding, 文件后缀)
+PRECOMPRESSED_ENCODINGS: Tuple[Tuple[str, str], ...] = (("br", ".br"), ("gzip", ".gz"))
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+
+class NoCacheStaticFiles(StaticFiles):
+    """禁用缓存的静态文件服务（开发环境）"""
+
+    def file_response(self, *args, **kwargs) -> Response:
+        response = super().file_response(*args, **kwargs)
+        # 添加禁用缓存的响应头
+        response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
+        response.headers["Pragma"] = "no-cache"
+        response.headers["Expires"] = "0"
+        return response
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """支持预压缩与长期缓存的静态文件服务（生产环境）"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.logger = logging.getLogger(__name__)
+        self.immutable_paths = self._load_manifest()
+
+    def _load_manifest(self) -> Set[str]:
+        """读取资源清单中带哈希的文件（绝对路径）"""
+        if self.directory is None:
+            return set()
+        manifest_path = os.path.join(self.directory, ASSET_MANIFEST_FILE)
+        try:
+            with open(manifest_path, encoding='utf-8') as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            self.logger.warning(f"⚠️ 未找到资源清单 {manifest_path}，所有静态文件按需校验")
+            return set()
+        return {os.path.realpath(os.path.join(self.directory, path)) for path in manifest.values()}
+
+    @staticmethod
+    def _accepted_encodings(accept_encoding: Optional[str]) -> Set[str]:
+        """解析Accept-Encoding（忽略q=0的编码）"""
+        accepted = set()
+        for part in (accept_encoding or "").split(","):
+            name, _, params = part.strip().partition(";")
+            if name and params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+                accepted.add(name.strip().lower())
+        return accepted
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope: Scope,
+                      status_code: int = 200) -> Response:
+        request_headers = Headers(scope=scope)
+        path, encoding = str(full_path), None
+        accepted = self._accepted_encodings(request_headers.get("accept-encoding"))
+        for name, suffix in PRECOMPRESSED_ENCODINGS:
+            if name in accepted or "*" in accepted:
+                try:
+                    compressed_stat = os.stat(path + suffix)
+                except OSError:
+                    continue
+                path, stat_result, encoding = path + suffix, compressed_stat, name
+                break
+
+        # 媒体类型按原文件名判断；ETag由文件大小与修改时间生成，不同编码的ETag不同
+        response = FileResponse(path, status_code=status_code, stat_result=stat_result,
+                                method=scope["method"], media_type=guess_type(str(full_path))[0] or "text/plain")
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+        response.headers["Vary"] = "Accept-Encoding"
+        immutable = os.path.realpath(str(full_path)) in self.immutable_paths
+        response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
@@ -0,0 +1,6 @@
+"""
+WealthLite 基准测试包
+
+基于合成账本对仓储、持仓计算、快照与API接口计时，默认跳过：
+    python -m pytest tests/benchmarks --benchmark [--benchmark-scale medium] [--benchmark-save]
+"""
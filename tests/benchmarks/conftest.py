@@ -0,0 +1,172 @@
+"""
+基准测试基础设施
+
+- benchmark fixture（pytest-benchmark风格）：benchmark(func, *args, **kwargs) 预热一次后多轮计时，返回函数结果
+- 每次运行的结果写入 tests/benchmarks/results.json；--benchmark-save 时按规模写入基准线JSON
+- 基准线中已有同名条目时，中位数耗时超过基准线 (1 + 阈值) 倍即判定为性能回退；
+  阈值默认取 --benchmark-threshold，可在基准线条目中用 "threshold" 单独指定
+- ledger_db_path fixture：按 --benchmark-scale 生成的合成账本（文件数据库，整个会话共享）
+"""
+
+import json
+import statistics
+import time
+from dataclasses import asdict, dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import pytest
+
+from src.wealth_lite.data.database import DatabaseManager
+from src.wealth_lite.data.snapshot_repository import SnapshotRepository
+from src.wealth_lite.models.enums import SnapshotType
+from src.wealth_lite.models.snapshot import PortfolioSnapshot
+from src.wealth_lite.services.wealth_service import WealthService
+from tests.factories import LedgerFactory
+
+# 合成账本规模：(交易笔数, 资产数量)
+SCALES: Dict[str, Tuple[int, int]] = {
+    "small": (1_000, 10),
+    "medium": (100_000, 1_000),
+    "large": (1_000_000, 10_000),
+}
+
+# 合成账本中的每日自动快照数量
+SNAPSHOT_DAYS = 365
+
+# 每个基准的计时预算：单次耗时较短时多轮计时，超过预算时只计一轮
+TIME_BUDGET_SECONDS = 1.0
+MIN_ROUNDS = 3
+MAX_ROUNDS = 50
+
+RESULTS_FILE = Path(__file__).parent / "results.json"
+
+
+@dataclass
+class BenchmarkResult:
+    """单个基准的计时结果（秒）"""
+    rounds: int
+    min: float
+    median: float
+    mean: float
+    stddev: float
+
+
+class BenchmarkRecorder:
+    """收集本次运行的结果，与基准线比较并写入JSON"""
+
+    def __init__(self, scale: str, baseline_path: Path, save: bool, threshold: float):
+        self.scale = scale
+        self.baseline_path = baseline_path
+        self.save = save
+        self.threshold = threshold
+        self.baseline: Dict[str, Dict[str, Any]] = {}
+        if baseline_path.exists():
+            self.baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+        self.results: Dict[str, BenchmarkResult] = {}
+
+    def record(self, name: str, result: BenchmarkResult) -> Optional[str]:
+        """记录结果；相对基准线回退超过阈值时返回说明"""
+        self.results[name] = result
+        reference = self.baseline.get(self.scale, {}).get(name)
+        if self.save or not reference:
+            return None
+        threshold = reference.get("threshold", self.threshold)
+        limit = reference["median"] * (1 + threshold)
+        if result.median > limit:
+            return (f"{name} 性能回退: 中位数 {result.median * 1000:.2f} ms，"
+                    f"基准线 {reference['median'] * 1000:.2f} ms（阈值 +{threshold:.0%}）")
+        return None
+
+    def write(self) -> None:
+        """写入本次结果；--benchmark-save 时合并到基准线（保留已有条目的阈值设置）"""
+        if not self.results:
+            return
+        current = {name: asdict(result) for name, result in sorted(self.results.items())}
+        RESULTS_FILE.write_text(json.dumps({"scale": self.scale, "results": current}, indent=2), encoding="utf-8")
+        if self.save:
+            entries = self.baseline.setdefault(self.scale, {})
+            for name, result in current.items():
+                if "threshold" in entries.get(name, {}):
+                    result["threshold"] = entries[name]["threshold"]
+                entries[name] = result
+            self.baseline_path.write_text(json.dumps(self.baseline, indent=2, sort_keys=True), encoding="utf-8")
+
+
+class Benchmark:
+    """benchmark(func, *args, **kwargs)：计时并返回func的结果"""
+
+    def __init__(self, name: str, recorder: BenchmarkRecorder):
+        self.name = name
+        self.recorder = recorder
+
+    def __call__(self, func: Callable, *args, **kwargs):
+        # 预热（建立缓存、预编译语句等），耗时超过预算时直接作为唯一样本
+        started = time.perf_counter()
+        value = func(*args, **kwargs)
+        first = time.perf_counter() - started
+        samples = [first]
+        if first < TIME_BUDGET_SECONDS:
+            rounds = max(MIN_ROUNDS, min(MAX_ROUNDS, int(TIME_BUDGET_SECONDS / max(first, 1e-6))))
+            samples = []
+            for _ in range(rounds):
+                started = time.perf_counter()
+                value = func(*args, **kwargs)
+                samples.append(time.perf_counter() - started)
+
+        result = BenchmarkResult(
+            rounds=len(samples),
+            min=min(samples),
+            median=statistics.median(samples),
+            mean=statistics.fmean(samples),
+            stddev=statistics.pstdev(samples),
+        )
+        failure = self.recorder.record(self.name, result)
+        if failure:
+            pytest.fail(failure)
+        return value
+
+
+@pytest.fixture(scope="session")
+def benchmark_recorder(request):
+    config = request.config
+    recorder = BenchmarkRecorder(
+        scale=config.getoption("--benchmark-scale"),
+        baseline_path=Path(config.getoption("--benchmark-baseline")),
+        save=config.getoption("--benchmark-save"),
+        threshold=config.getoption("--benchmark-threshold"),
+    )
+    yield recorder
+    recorder.write()
+
+
+@pytest.fixture
+def benchmark(request, benchmark_recorder) -> Benchmark:
+    return Benchmark(request.node.name, benchmark_recorder)
+
+
+@pytest.fixture(scope="session")
+def benchmark_scale(request) -> Tuple[int, int]:
+    """(交易笔数, 资产数量)"""
+    return SCALES[request.config.getoption("--benchmark-scale")]
+
+
+@pytest.fixture(scope="session")
+def ledger_db_path(tmp_path_factory, benchmark_scale) -> str:
+    """合成账本数据库（含 SNAPSHOT_DAYS 个每日自动快照）"""
+    transactions, assets = benchmark_scale
+    db_path = str(tmp_path_factory.mktemp("benchmark") / "ledger.db")
+    db_manager = DatabaseManager(db_path)
+    try:
+        LedgerFactory.populate(db_manager, transactions, assets)
+        snapshot = PortfolioSnapshot.from_portfolio(WealthService(db_manager).get_portfolio(),
+                                                    snapshot_type=SnapshotType.AUTO)
+        repository = SnapshotRepository(db_manager)
+        for day in range(SNAPSHOT_DAYS):
+            snapshot.snapshot_id = f"bench-snapshot-{day:04d}"
+            snapshot.snapshot_date = date.today() - timedelta(days=day)
+            repository.save(snapshot)
+    finally:
+        db_manager.close()
+    return db_path
@@ -0,0 +1,69 @@
+"""
+基准测试：仓储、持仓计算、快照与API接口
+
+    python -m pytest tests/benchmarks --benchmark --benchmark-scale small
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.wealth_lite.data.database import DatabaseManager
+from src.wealth_lite.data.repositories import RepositoryManager
+from src.wealth_lite.data.snapshot_repository import SnapshotRepository
+from src.wealth_lite.models.enums import SnapshotType
+from src.wealth_lite.models.snapshot import PortfolioSnapshot
+from src.wealth_lite.services.wealth_service import WealthService
+from tests.benchmarks.conftest import SNAPSHOT_DAYS
+
+
+@pytest.fixture(scope="module")
+def db_manager(ledger_db_path):
+    manager = DatabaseManager(ledger_db_path)
+    yield manager
+    manager.close()
+
+
+@pytest.fixture(scope="module")
+def wealth_service(db_manager):
+    return WealthService(db_manager)
+
+
+@pytest.fixture(scope="module")
+def client(ledger_db_path):
+    from main import WealthLiteApp
+
+    with TestClient(WealthLiteApp(db_path=ledger_db_path).create_app()) as test_client:
+        yield test_client
+
+
+def test_transaction_repository_get_all(benchmark, db_manager, benchmark_scale):
+    transactions = benchmark(RepositoryManager(db_manager).transactions.get_all)
+    assert len(transactions) == benchmark_scale[0]
+
+
+def test_wealth_service_get_portfolio(benchmark, wealth_service):
+    portfolio = benchmark(wealth_service.get_portfolio)
+    assert portfolio.positions
+
+
+def test_snapshot_from_portfolio(benchmark, wealth_service):
+    portfolio = wealth_service.get_portfolio()
+    snapshot = benchmark(PortfolioSnapshot.from_portfolio, portfolio, SnapshotType.AUTO)
+    assert snapshot.total_value == portfolio.total_value
+
+
+def test_snapshot_repository_get_by_type(benchmark, db_manager):
+    snapshots = benchmark(SnapshotRepository(db_manager).get_by_type, SnapshotType.AUTO, SNAPSHOT_DAYS)
+    assert len(snapshots) == SNAPSHOT_DAYS
+
+
+def test_api_dashboard_summary(benchmark, client):
+    response = benchmark(client.get, "/api/dashboard/summary")
+    assert response.status_code == 200
+    assert response.json()["assets"]
+
+
+def test_api_transactions_page(benchmark, client):
+    response = benchmark(client.get, "/api/transactions", params={"limit": 200})
+    assert response.status_code == 200
+    assert len(response.json()) == 200
@@ -138,6 +138,21 @@ def clean_test_data():
 
 
 # pytest配置
+def pytest_addoption(parser):
+    """基准测试命令行参数（见 tests/benchmarks）"""
+    group = parser.getgroup("benchmark", "WealthLite基准测试")
+    group.addoption("--benchmark", action="store_true", default=False,
+                    help="运行 tests/benchmarks 下的基准测试（默认跳过）")
+    group.addoption("--benchmark-scale", default="small", choices=["small", "medium", "large"],
+                    help="合成账本规模：small=1千笔/10个资产，medium=10万笔/1千个资产，large=100万笔/1万个资产")
+    group.addoption("--benchmark-baseline", default=str(project_root / "tests" / "benchmarks" / "baseline.json"),
+                    help="基准线JSON文件")
+    group.addoption("--benchmark-save", action="store_true", default=False,
+                    help="将本次结果写入基准线（不做回归比较）")
+    group.addoption("--benchmark-threshold", type=float, default=0.25,
+                    help="中位数耗时超过基准线的比例阈值，超过则判定为性能回退")
+
+
 def pytest_configure(config):
     """pytest启动时的配置"""
     # 设置测试环境变量
@@ -150,13 +165,21 @@ def pytest_configure(config):
     config.addinivalue_line(
         "markers", "integration: 标记集成测试"
     )
+    config.addinivalue_line(
+        "markers", "benchmark: 标记基准测试（需 --benchmark 才运行）"
+    )
 
 
 def pytest_collection_modifyitems(config, items):
     """修改测试收集行为"""
     # 自动为不同目录的测试添加标记
+    skip_benchmark = pytest.mark.skip(reason="基准测试需使用 --benchmark 运行")
     for item in items:
         if "unit" in str(item.fspath):
             item.add_marker(pytest.mark.unit)
         elif "integration" in str(item.fspath):
-            item.add_marker(pytest.mark.integration) 
\ No newline at end of file
+            item.add_marker(pytest.mark.integration)
+        elif "benchmarks" in str(item.fspath):
+            item.add_marker(pytest.mark.benchmark)
+            if not config.getoption("--benchmark"):
+                item.add_marker(skip_benchmark) 
\ No newline at end of file
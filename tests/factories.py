@@ -7,13 +7,14 @@ WealthLite 测试数据工厂
 import uuid
 from decimal import Decimal
 from datetime import date, datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 from src.wealth_lite.models import (
     Asset, AssetType, AssetSubType, Currency, RiskLevel, LiquidityLevel,
     BaseTransaction, CashTransaction, FixedIncomeTransaction,
     TransactionType, InterestType, PaymentFrequency, Position, Portfolio
 )
+from src.wealth_lite.data.ledger_generator import LedgerGenerator
 
 # Phase 1: 只导入现金和固定收益相关的模型
 # EquityTransaction, RealEstateTransaction 将在Phase 2/3中添加
@@ -292,4 +293,25 @@ class DataBuilder:
     def build_data(self) -> tuple[list[Asset], list[BaseTransaction], Portfolio]:
         """构建所有数据"""
         portfolio = self.build_portfolio()
-        return self.assets.copy(), self.transactions.copy(), portfolio 
\ No newline at end of file
+        return self.assets.copy(), self.transactions.copy(), portfolio
+
+
+class LedgerFactory:
+    """合成账本工厂（基准测试用），数据由 LedgerGenerator 生成并批量写入"""
+
+    @staticmethod
+    def populate(db_manager, transactions: int, assets: int, seed: int = 42) -> List[str]:
+        """
+        向数据库写入合成账本（不生成快照）
+
+        Args:
+            db_manager: DatabaseManager
+            transactions: 交易笔数
+            assets: 资产数量
+            seed: 随机种子
+
+        Returns:
+            资产ID列表
+        """
+        generator = LedgerGenerator(seed=seed)
+        return generator.generate(db_manager, transactions, assets, snapshots=False).asset_ids
@@ -0,0 +1,155 @@
+"""
+测试列式分析快照导出
+"""
+
+import pytest
+from datetime import date
+from decimal import Decimal
+
+from src.wealth_lite.data.database import DatabaseManager
+from src.wealth_lite.data.snapshot_repository import SnapshotRepository
+from src.wealth_lite.models.enums import AssetType, TransactionType, SnapshotType
+from src.wealth_lite.models.snapshot import PortfolioSnapshot
+from src.wealth_lite.models.transaction import CashTransaction, EquityTransaction, FixedIncomeTransaction
+from src.wealth_lite.services.wealth_service import WealthService
+from src.wealth_lite.services.analytics_export import (
+    AnalyticsExportService, load_table, load_assets, load_transactions, load_snapshots,
+    to_scaled_int, from_scaled_int
+)
+
+pa = pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def service():
+    """创建使用内存数据库的WealthService"""
+    db_manager = DatabaseManager(":memory:")
+    yield WealthService(db_manager)
+    db_manager.close()
+
+
+@pytest.fixture
+def ledger(service):
+    """创建资产、交易与快照"""
+    cash = service.create_asset("活期存款", AssetType.CASH)
+    deposit = service.create_asset("定期存款", AssetType.FIXED_INCOME)
+    service.create_transactions([
+        CashTransaction(asset_id=cash.asset_id, transaction_type=TransactionType.DEPOSIT,
+                        amount=Decimal('1000.1234'), transaction_date=date(2024, 1, 1)),
+        FixedIncomeTransaction(asset_id=deposit.asset_id, transaction_type=TransactionType.DEPOSIT,
+                               amount=Decimal('5000'), transaction_date=date(2024, 2, 1),
+                               annual_rate=Decimal('2.75'), maturity_date=date(2025, 2, 1)),
+    ])
+    SnapshotRepository(service.db_manager).save(PortfolioSnapshot(
+        snapshot_date=date(2024, 3, 1), snapshot_type=SnapshotType.MANUAL,
+        total_value=Decimal('6000.12'), total_cost=Decimal('6000'), total_return=Decimal('0.12')
+    ))
+    return cash, deposit
+
+
+def test_scaled_int_round_trip():
+    assert to_scaled_int(1000.1234, 4) == 10001234
+    assert to_scaled_int(None, 4) is None
+    assert from_scaled_int(10001234, 4) == Decimal('1000.1234')
+
+
+@pytest.mark.parametrize("file_format", ["parquet", "arrow"])
+def test_export_and_load(tmp_path, service, ledger, file_format):
+    exporter = AnalyticsExportService(service.db_manager, str(tmp_path), file_format)
+    results = {r.table: r.rows for r in exporter.export_all()}
+    assert results == {'assets': 2, 'transactions': 2, 'portfolio_snapshots': 1}
+
+    table = load_table(str(tmp_path), 'transactions')
+    assert table.schema.field('amount').type == pa.int64()
+    assert table.schema.field('amount').metadata[b'scale'] == b'4'
+    assert table.schema.field('transaction_date').type == pa.date32()
+
+    transactions = {t.asset_id: t for t in load_transactions(str(tmp_path))}
+    cash, deposit = ledger
+    assert transactions[cash.asset_id].amount == Decimal('1000.1234')
+    assert isinstance(transactions[deposit.asset_id], FixedIncomeTransaction)
+    assert transactions[deposit.asset_id].maturity_date == date(2025, 2, 1)
+
+    assert {a.asset_name for a in load_assets(str(tmp_path))} == {"活期存款", "定期存款"}
+    snapshots = load_snapshots(str(tmp_path))
+    assert snapshots[0].total_value == Decimal('6000.12')
+
+
+def test_equity_round_trip(tmp_path, service):
+    stock = service.create_asset("示例股票", AssetType.EQUITY)
+    service.create_transactions([
+        EquityTransaction(asset_id=stock.asset_id, transaction_type=TransactionType.BUY,
+                          quantity=Decimal('12.5'), price_per_share=Decimal('8.1234'),
+                          split_ratio=Decimal('2'), transaction_date=date(2024, 1, 2)),
+    ])
+    AnalyticsExportService(service.db_manager, str(tmp_path)).export_all()
+
+    [transaction] = load_transactions(str(tmp_path))
+    assert isinstance(transaction, EquityTransaction)
+    assert (transaction.quantity, transaction.price_per_share, transaction.split_ratio) == \
+        (Decimal('12.5'), Decimal('8.1234'), Decimal('2'))
+
+
+def test_load_parts_missing_new_columns(tmp_path, service, ledger):
+    exporter = AnalyticsExportService(service.db_manager, str(tmp_path))
+    exporter.export_all()
+    # 模拟旧版本导出的part文件（没有权益列）
+    import pyarrow.parquet as pq
+    [part] = (tmp_path / 'transactions').glob('part-*')
+    pq.write_table(pq.read_table(str(part)).drop_columns(['quantity', 'split_ratio']), str(part))
+
+    table = load_table(str(tmp_path), 'transactions')
+    assert table.num_rows == 2 and table.column('quantity').null_count == 2
+    assert len(load_transactions(str(tmp_path))) == 2
+
+
+def test_incremental_export_appends_only_new_rows(tmp_path, service, ledger):
+    exporter = AnalyticsExportService(service.db_manager, str(tmp_path))
+    exporter.export_all()
+
+    assert exporter.export_table('transactions').rows == 0
+
+    cash, _ = ledger
+    service.create_transactions([
+        CashTransaction(asset_id=cash.asset_id, transaction_type=TransactionType.INTEREST,
+                        amount=Decimal('3.21'), transaction_date=date(2024, 3, 31))
+    ])
+    result = exporter.export_table('transactions')
+    assert result.rows == 1
+    assert result.path.endswith('part-00002.parquet')
+    assert len(load_transactions(str(tmp_path))) == 3
+
+
+def test_modifications_trigger_full_rewrite(tmp_path, service, ledger):
+    exporter = AnalyticsExportService(service.db_manager, str(tmp_path))
+    exporter.export_all()
+    cash, deposit = ledger
+    transactions = {t.asset_id: t for t in service.get_all_transactions()}
+
+    # 删除rowid最大的行后再插入，新行会复用该rowid
+    service.delete_transaction(transactions[deposit.asset_id].transaction_id)
+    service.create_transactions([
+        CashTransaction(asset_id=cash.asset_id, transaction_type=TransactionType.INTEREST,
+                        amount=Decimal('3.21'), transaction_date=date(2024, 3, 31))
+    ])
+    result = exporter.export_table('transactions')
+    assert result.rows == 2
+    assert [p.name for p in (tmp_path / 'transactions').iterdir()] == ['part-00002.parquet']
+    loaded = load_transactions(str(tmp_path))
+    assert sorted(t.amount for t in loaded) == [Decimal('3.21'), Decimal('1000.1234')]
+
+    # 原地修改同样会被导出
+    updated = transactions[cash.asset_id]
+    updated.notes = "已修改"
+    service.update_transaction(updated)
+    assert exporter.export_table('transactions').rows == 2
+    assert {t.transaction_id: t.notes for t in load_transactions(str(tmp_path))}[updated.transaction_id] == "已修改"
+    assert exporter.export_table('transactions').rows == 0
+
+
+def test_next_part_number_skips_existing(tmp_path, service, ledger):
+    exporter = AnalyticsExportService(service.db_manager, str(tmp_path))
+    table_dir = tmp_path / 'transactions'
+    table_dir.mkdir()
+    (table_dir / 'part-00003.parquet').touch()
+    assert exporter._next_part_number(table_dir) == 4
@@ -0,0 +1,135 @@
+"""
+测试UI开发服务器的API代理（多线程、长连接池、流式转发）
+"""
+
+import http.client
+import importlib.util
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+SERVE_SCRIPT = Path(__file__).resolve().parents[2] / "src" / "wealth_lite" / "ui" / "serve.py"
+
+
+def _load_serve():
+    spec = importlib.util.spec_from_file_location("wealth_lite_ui_serve", SERVE_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class FakeApiHandler(BaseHTTPRequestHandler):
+    """模拟API服务器"""
+    protocol_version = "HTTP/1.1"
+    connections = set()
+    release_stream = threading.Event()
+
+    def do_GET(self):
+        FakeApiHandler.connections.add(self.client_address)
+        if self.path == "/api/slow":
+            time.sleep(1.0)
+            self._json({"slow": True})
+        elif self.path == "/api/stream":
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for event in (b"data: first\n\n", b"data: second\n\n"):
+                self.wfile.write(f"{len(event):X}\r\n".encode() + event + b"\r\n")
+                self.wfile.flush()
+                FakeApiHandler.release_stream.wait(5)
+            self.wfile.write(b"0\r\n\r\n")
+        else:
+            self._json({"path": self.path})
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self._json({"echo": json.loads(body)})
+
+    def _json(self, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def servers(tmp_path):
+    serve = _load_serve()
+    serve.WealthLiteDevHandler.log_message = lambda *args: None
+    (tmp_path / "index.html").write_text("<html>ok</html>", encoding="utf-8")
+    FakeApiHandler.connections = set()
+    FakeApiHandler.release_stream.clear()
+
+    upstream = ThreadingHTTPServer(("127.0.0.1", 0), FakeApiHandler)
+    upstream.daemon_threads = True
+    dev = serve.create_server(0, tmp_path, "127.0.0.1", upstream.server_address[1], bind="127.0.0.1")
+    for server in (upstream, dev):
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield dev.server_address[1], upstream
+    FakeApiHandler.release_stream.set()
+    dev.shutdown()
+    upstream.shutdown()
+
+
+def _get(port, path, method="GET", body=None):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    conn.request(method, path, body=body, headers={"Content-Type": "application/json"} if body else {})
+    response = conn.getresponse()
+    return response, conn
+
+
+def test_proxy_reuses_upstream_connection(servers):
+    port, _ = servers
+    for i in range(3):
+        response, conn = _get(port, f"/api/item/{i}")
+        assert json.loads(response.read()) == {"path": f"/api/item/{i}"}
+        conn.close()
+    assert len(FakeApiHandler.connections) == 1
+
+    response, conn = _get(port, "/api/echo", "POST", json.dumps({"a": 1}))
+    assert json.loads(response.read()) == {"echo": {"a": 1}}
+
+
+def test_slow_api_does_not_block_static_files(servers):
+    port, _ = servers
+    slow = threading.Thread(target=lambda: _get(port, "/api/slow")[0].read())
+    slow.start()
+    time.sleep(0.1)
+    started = time.perf_counter()
+    response, _ = _get(port, "/index.html")
+    assert response.read() == b"<html>ok</html>"
+    assert time.perf_counter() - started < 0.5
+    slow.join()
+
+
+def test_streaming_passthrough(servers):
+    port, _ = servers
+    response, _ = _get(port, "/api/stream")
+    assert response.getheader("Content-Type") == "text/event-stream"
+    # 上游尚未发送第二个事件时，第一个事件已到达浏览器
+    assert response.read1(1024) == b"data: first\n\n"
+    FakeApiHandler.release_stream.set()
+    assert response.read() == b"data: second\n\n"
+
+
+def test_upstream_unavailable(tmp_path):
+    serve = _load_serve()
+    serve.WealthLiteDevHandler.log_message = lambda *args: None
+    dev = serve.create_server(0, tmp_path, "127.0.0.1", 1, bind="127.0.0.1")
+    threading.Thread(target=dev.serve_forever, daemon=True).start()
+    try:
+        response, _ = _get(dev.server_address[1], "/api/health")
+        assert response.status == 503
+        assert json.loads(response.read())["success"] is False
+    finally:
+        dev.shutdown()
@@ -0,0 +1,96 @@
+"""
+测试数据导出服务
+"""
+
+import csv
+import io
+import json
+import pytest
+from datetime import date
+from decimal import Decimal
+
+from src.wealth_lite.data.database import DatabaseManager
+from src.wealth_lite.models.enums import AssetType, TransactionType
+from src.wealth_lite.models.transaction import CashTransaction, FixedIncomeTransaction
+from src.wealth_lite.services.wealth_service import WealthService
+from src.wealth_lite.services.export_service import ExportService, iter_csv
+
+
+@pytest.fixture
+def db_manager():
+    """创建内存数据库管理器"""
+    manager = DatabaseManager(":memory:")
+    yield manager
+    manager.close()
+
+
+@pytest.fixture
+def export_service(db_manager):
+    """准备测试数据并创建导出服务"""
+    service = WealthService(db_manager)
+    cash = service.create_asset("活期存款", AssetType.CASH)
+    deposit = service.create_asset("定期存款", AssetType.FIXED_INCOME)
+    service.create_transactions([
+        CashTransaction(asset_id=cash.asset_id, transaction_type=TransactionType.DEPOSIT,
+                        amount=Decimal('1000'), transaction_date=date(2024, 1, 1)),
+        CashTransaction(asset_id=cash.asset_id, transaction_type=TransactionType.WITHDRAW,
+                        amount=Decimal('200'), transaction_date=date(2024, 1, 10)),
+        CashTransaction(asset_id=cash.asset_id, transaction_type=TransactionType.INTEREST,
+                        amount=Decimal('1.5'), transaction_date=date(2024, 1, 31), notes="利息"),
+        FixedIncomeTransaction(asset_id=deposit.asset_id, transaction_type=TransactionType.DEPOSIT,
+                               amount=Decimal('5000'), transaction_date=date(2024, 2, 1),
+                               annual_rate=Decimal('2.75')),
+    ])
+    return ExportService(db_manager)
+
+
+def read_csv(content: bytes):
+    """解析导出的CSV内容"""
+    return list(csv.DictReader(io.StringIO(content.decode('utf-8-sig'))))
+
+
+class TestExportService:
+    """测试导出流程"""
+
+    def test_iter_query_streams_in_chunks(self, db_manager, export_service):
+        rows = db_manager.iter_query("SELECT transaction_id FROM transactions", chunk_size=1)
+        assert len(list(rows)) == 4
+
+    def test_transactions_csv(self, export_service):
+        rows = read_csv(b''.join(export_service.stream('transactions', 'csv')))
+
+        assert len(rows) == 4
+        assert rows[0]['asset_name'] == '活期存款'
+        assert rows[2]['notes'] == '利息'
+        assert float(rows[3]['annual_rate']) == 2.75
+        assert 'quantity' in rows[0] and 'split_ratio' in rows[0]
+
+    def test_positions_jsonl(self, export_service):
+        content = b''.join(export_service.stream('positions', 'jsonl')).decode('utf-8')
+        positions = {p['asset_name']: p for p in map(json.loads, content.splitlines())}
+
+        cash = positions['活期存款']
+        assert cash['transaction_count'] == 3
+        assert cash['net_invested'] == 800
+        assert cash['current_book_value'] == 801.5
+        assert positions['定期存款']['total_invested'] == 5000
+
+    def test_snapshots_empty(self, export_service):
+        rows = read_csv(b''.join(export_service.stream('snapshots', 'csv')))
+        assert rows == []
+
+    def test_export_to_file(self, tmp_path, export_service):
+        path = tmp_path / "transactions.jsonl"
+        export_service.export_to_file('transactions', 'jsonl', str(path))
+        assert len(path.read_text(encoding='utf-8').splitlines()) == 4
+
+    def test_invalid_dataset_and_format(self, export_service):
+        with pytest.raises(ValueError):
+            export_service.stream('unknown', 'csv')
+        with pytest.raises(ValueError):
+            export_service.stream('transactions', 'pdf')
+
+    def test_csv_chunking(self):
+        chunks = list(iter_csv(['a', 'b'], ((i, i * 2) for i in range(5)), chunk_size=2))
+        assert len(chunks) == 3
+        assert read_csv(b''.join(chunks))[4] == {'a': '4', 'b': '8'}
@@ -0,0 +1,118 @@
+"""
+测试汇率服务（汇率索引、CSV导入与组合重估）
+"""
+
+import pytest
+from datetime import date
+from decimal import Decimal
+
+from src.wealth_lite.data.database import DatabaseManager
+from src.wealth_lite.models.asset import Asset
+from src.wealth_lite.models.enums import AssetType, Currency, TransactionType
+from src.wealth_lite.models.portfolio import Portfolio
+from src.wealth_lite.models.position import Position
+from src.wealth_lite.models.transaction import CashTransaction
+from src.wealth_lite.services.fx_service import FxRateIndex, FxService
+
+
+@pytest.fixture
+def service():
+    """创建使用内存数据库的FxService，并写入USD基准汇率"""
+    db_manager = DatabaseManager(":memory:")
+    fx = FxService(db_manager)
+    fx.add_rates([
+        (date(2024, 1, 1), Currency.USD, Currency.CNY, '7.0'),
+        (date(2024, 2, 1), Currency.USD, Currency.CNY, '7.2'),
+        (date(2024, 1, 1), Currency.EUR, Currency.USD, '1.1'),
+        (date(2024, 1, 15), Currency.EUR, Currency.USD, '1.2'),
+    ])
+    yield fx
+    db_manager.close()
+
+
+class TestFxRateIndex:
+    """测试汇率索引"""
+
+    def test_as_of_lookup(self):
+        index = FxRateIndex.from_rows([
+            ('2024-01-01', 'USD', 'CNY', 7.0),
+            ('2024-02-01', 'USD', 'CNY', 7.2),
+        ])
+        assert index.rate('USD', 'CNY', date(2023, 12, 31)) is None
+        assert index.rate('USD', 'CNY', date(2024, 1, 31)) == 7.0
+        assert index.rate('USD', 'CNY', date(2024, 2, 1)) == 7.2
+        assert index.rate('USD', 'CNY') == 7.2
+
+    def test_inverse_and_same_currency(self):
+        index = FxRateIndex.from_rows([('2024-01-01', 'USD', 'CNY', 8.0)])
+        assert index.rate('CNY', 'USD') == pytest.approx(0.125)
+        assert index.rate('CNY', 'CNY') == 1.0
+        assert index.rate('JPY', 'CNY') is None
+
+
+class TestFxService:
+    """测试FxService"""
+
+    def test_cross_rate_through_pivot(self, service):
+        # EUR/CNY = EUR/USD × USD/CNY，取两条腿在该日各自最新的汇率
+        assert service.get_rate(Currency.EUR, Currency.CNY, date(2024, 1, 10)) == Decimal('7.7')
+        assert service.get_rate(Currency.EUR, Currency.CNY, date(2024, 1, 20)) == Decimal('8.4')
+        assert service.get_rate(Currency.EUR, Currency.CNY, date(2024, 2, 5)) == Decimal('8.64')
+
+    def test_missing_rate(self, service):
+        with pytest.raises(ValueError):
+            service.get_rate(Currency.JPY, Currency.CNY)
+        with pytest.raises(ValueError):
+            service.get_rate(Currency.USD, Currency.CNY, date(2023, 6, 1))
+
+    def test_convert(self, service):
+        assert service.convert(Decimal('100'), Currency.USD, Currency.CNY, date(2024, 1, 5)) == Decimal('700')
+
+    def test_convert_minor_many(self, service):
+        converted, rates = service.convert_minor_many(
+            [10000, 20000, 30000], [Currency.USD, Currency.CNY, Currency.USD], Currency.CNY, date(2024, 1, 5)
+        )
+        assert converted == [70000, 20000, 210000]
+        assert rates == {'USD': 7.0, 'CNY': 1.0}
+
+    def test_add_rates_invalidates_index(self, service):
+        assert service.get_rate(Currency.USD, Currency.CNY) == Decimal('7.2')
+        service.add_rates([(date(2024, 3, 1), Currency.USD, Currency.CNY, '7.3')])
+        assert service.get_rate(Currency.USD, Currency.CNY) == Decimal('7.3')
+
+    def test_load_csv(self, service, tmp_path):
+        path = tmp_path / "rates.csv"
+        path.write_text("date,pair,rate\n2024-03-01,USD/JPY,150\n2024-03-02,USDJPY,151\n", encoding='utf-8')
+        assert service.load_csv(str(path), batch_size=1) == 2
+        assert service.get_rate(Currency.JPY, Currency.USD) == Decimal('0.0066225166')
+
+        path.write_text("日期,基础货币,报价货币,汇率\n2024-03-01,HKD,USD,0.128\n", encoding='utf-8')
+        assert service.load_csv(str(path)) == 1
+        assert service.repository.count() == 7
+
+    def test_load_csv_invalid_row(self, service, tmp_path):
+        path = tmp_path / "rates.csv"
+        path.write_text("date,base,quote,rate\n2024-03-01,USD,JPY,abc\n", encoding='utf-8')
+        with pytest.raises(ValueError, match="第2行"):
+            service.load_csv(str(path))
+
+    def test_revalue_portfolio(self, service):
+        usd_asset = Asset(asset_name="美元存款", asset_type=AssetType.CASH, currency=Currency.USD)
+        cny_asset = Asset(asset_name="人民币存款", asset_type=AssetType.CASH, currency=Currency.CNY)
+        portfolio = Portfolio(positions=[
+            Position(asset=usd_asset, transactions=[
+                CashTransaction(asset_id=usd_asset.asset_id, transaction_type=TransactionType.DEPOSIT,
+                                amount=Decimal('100'), currency=Currency.USD, exchange_rate=Decimal('7'),
+                                amount_base_currency=Decimal('700'), transaction_date=date(2024, 1, 1)),
+            ]),
+            Position(asset=cny_asset, transactions=[
+                CashTransaction(asset_id=cny_asset.asset_id, transaction_type=TransactionType.DEPOSIT,
+                                amount=Decimal('500'), transaction_date=date(2024, 1, 1)),
+            ]),
+        ])
+
+        valuation = service.revalue_portfolio(portfolio, Currency.CNY, date(2024, 2, 1))
+        assert valuation.total_value == Decimal('1220')
+        values = {p.asset_id: p.value for p in valuation.positions}
+        assert values == {usd_asset.asset_id: Decimal('720'), cny_asset.asset_id: Decimal('500')}
+        assert valuation.to_dict()['total_value'] == 1220.0
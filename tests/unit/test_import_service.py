@@ -0,0 +1,164 @@
+"""
+测试交易批量导入服务
+"""
+
+import pytest
+from datetime import date
+from decimal import Decimal
+
+from src.wealth_lite.data.database import DatabaseManager
+from src.wealth_lite.data.repositories import RepositoryManager
+from src.wealth_lite.models.asset import Asset
+from src.wealth_lite.models.enums import AssetType, Currency, TransactionType
+from src.wealth_lite.models.transaction import CashTransaction, FixedIncomeTransaction
+from src.wealth_lite.services.import_service import (
+    TransactionImportService, build_transaction_from_record, iter_records
+)
+
+
+CSV_HEADER = "asset_name,type,date,amount,currency,annual_rate,maturity_date,notes\n"
+
+
+@pytest.fixture
+def db_manager():
+    """创建内存数据库管理器"""
+    return DatabaseManager(":memory:")
+
+
+@pytest.fixture
+def repositories(db_manager):
+    """创建Repository管理器"""
+    return RepositoryManager(db_manager)
+
+
+@pytest.fixture
+def assets(repositories):
+    """创建现金与固定收益资产"""
+    cash = Asset(asset_name="招商银行活期", asset_type=AssetType.CASH, currency=Currency.CNY)
+    deposit = Asset(asset_name="工商银行定期", asset_type=AssetType.FIXED_INCOME, currency=Currency.USD)
+    repositories.assets.create(cash)
+    repositories.assets.create(deposit)
+    return cash, deposit
+
+
+@pytest.fixture
+def import_service(db_manager):
+    """创建导入服务"""
+    return TransactionImportService(db_manager)
+
+
+class TestBuildTransaction:
+    """测试记录解析"""
+
+    def test_cash_record(self, assets):
+        cash, _ = assets
+        tx = build_transaction_from_record(
+            {'transaction_type': 'DEPOSIT', 'transaction_date': '2024-01-05', 'amount': '1,200.50'}, cash
+        )
+        assert isinstance(tx, CashTransaction)
+        assert tx.amount == Decimal('1200.50')
+        assert tx.transaction_date == date(2024, 1, 5)
+        assert tx.currency == Currency.CNY
+
+    def test_fixed_income_record_defaults_to_asset_currency(self, assets):
+        _, deposit = assets
+        tx = build_transaction_from_record({
+            'transaction_type': 'deposit',
+            'transaction_date': '2024-01-05',
+            'amount': '5000',
+            'annual_rate': '2.5',
+            'maturity_date': '2025-01-05'
+        }, deposit)
+        assert isinstance(tx, FixedIncomeTransaction)
+        assert tx.currency == Currency.USD
+        assert tx.annual_rate == Decimal('2.5')
+        assert tx.maturity_date == date(2025, 1, 5)
+
+    def test_invalid_fields(self, assets):
+        cash, _ = assets
+        with pytest.raises(ValueError):
+            build_transaction_from_record({'transaction_type': 'DEPOSIT', 'amount': '100'}, cash)
+        with pytest.raises(ValueError):
+            build_transaction_from_record(
+                {'transaction_type': 'UNKNOWN', 'transaction_date': '2024-01-05', 'amount': '100'}, cash
+            )
+        with pytest.raises(ValueError):
+            build_transaction_from_record(
+                {'transaction_type': 'DEPOSIT', 'transaction_date': '2024-01-05', 'amount': '-5'}, cash
+            )
+
+
+class TestImportService:
+    """测试批量导入流程"""
+
+    def test_import_csv(self, tmp_path, import_service, repositories, assets):
+        path = tmp_path / "statement.csv"
+        path.write_text(
+            CSV_HEADER
+            + "招商银行活期,DEPOSIT,2024-01-01,1000,CNY,,,工资\n"
+            + "招商银行活期,INTEREST,2024-01-31,1.25,,,,\n"
+            + "工商银行定期,DEPOSIT,2024-02-01,5000,USD,2.75,2025-02-01,一年期\n",
+            encoding="utf-8"
+        )
+
+        result = import_service.import_file(str(path), batch_size=2)
+
+        assert result.rows_read == 3
+        assert result.rows_imported == 3
+        assert result.errors == []
+
+        cash, deposit = assets
+        cash_txs = repositories.transactions.get_by_asset(cash.asset_id)
+        assert sorted(tx.amount for tx in cash_txs) == [Decimal('1.25'), Decimal('1000')]
+
+        fixed_txs = repositories.transactions.get_by_asset(deposit.asset_id)
+        assert len(fixed_txs) == 1
+        assert fixed_txs[0].annual_rate == Decimal('2.75')
+        assert fixed_txs[0].maturity_date == date(2025, 2, 1)
+
+    def test_invalid_rows_are_reported(self, tmp_path, import_service, repositories, assets):
+        path = tmp_path / "statement.csv"
+        path.write_text(
+            CSV_HEADER
+            + "招商银行活期,DEPOSIT,2024-01-01,1000,CNY,,,\n"
+            + "不存在的资产,DEPOSIT,2024-01-01,1000,CNY,,,\n"
+            + "招商银行活期,DEPOSIT,not-a-date,1000,CNY,,,\n"
+            + "招商银行活期,WITHDRAW,2024-01-03,200,CNY,,,\n",
+            encoding="utf-8"
+        )
+        progress_updates = []
+
+        result = import_service.import_file(str(path), progress_callback=progress_updates.append)
+
+        assert result.rows_read == 4
+        assert result.rows_imported == 2
+        assert [e.row_number for e in result.errors] == [3, 4]
+        assert progress_updates and progress_updates[-1].rows_failed == 2
+
+        report = tmp_path / "errors.csv"
+        result.write_error_report(str(report))
+        assert "资产不存在" in report.read_text(encoding="utf-8")
+
+    def test_duplicate_ids_fall_back_to_row_inserts(self, import_service, repositories, assets):
+        cash, _ = assets
+        existing = CashTransaction(
+            transaction_id="dup-1", asset_id=cash.asset_id,
+            transaction_type=TransactionType.DEPOSIT, amount=Decimal('10')
+        )
+        repositories.transactions.create(existing)
+
+        records = [
+            (2, {'asset_id': cash.asset_id, 'transaction_id': 'new-1', 'transaction_type': 'DEPOSIT',
+                 'transaction_date': '2024-01-01', 'amount': '5'}),
+            (3, {'asset_id': cash.asset_id, 'transaction_id': 'dup-1', 'transaction_type': 'DEPOSIT',
+                 'transaction_date': '2024-01-01', 'amount': '5'}),
+        ]
+        result = import_service.import_records(records)
+
+        assert result.rows_imported == 1
+        assert [e.row_number for e in result.errors] == [3]
+        assert repositories.transactions.get_by_id('new-1') is not None
+
+    def test_unsupported_file_format(self, tmp_path):
+        with pytest.raises(ValueError):
+            iter_records(str(tmp_path / "statement.txt"))
@@ -0,0 +1,162 @@
+"""
+测试列式账本
+"""
+
+import pytest
+from datetime import date
+from decimal import Decimal
+
+pytest.importorskip("numpy")
+
+from src.wealth_lite.data.database import DatabaseManager
+from src.wealth_lite.models.asset import Asset
+from src.wealth_lite.models.enums import AssetType, Currency, TransactionType
+from src.wealth_lite.models.ledger import Ledger
+from src.wealth_lite.models.position import LazyPosition, Position
+from src.wealth_lite.models.transaction import CashTransaction
+from src.wealth_lite.services.wealth_service import WealthService
+
+
+def make_transactions(cash: Asset, usd: Asset):
+    """构建两个资产的交易"""
+    return [
+        CashTransaction(asset_id=cash.asset_id, transaction_type=TransactionType.DEPOSIT,
+                        amount=Decimal('1000'), transaction_date=date(2024, 1, 1)),
+        CashTransaction(asset_id=cash.asset_id, transaction_type=TransactionType.WITHDRAW,
+                        amount=Decimal('200.5'), transaction_date=date(2024, 2, 1)),
+        CashTransaction(asset_id=cash.asset_id, transaction_type=TransactionType.INTEREST,
+                        amount=Decimal('3.25'), transaction_date=date(2024, 3, 1)),
+        CashTransaction(asset_id=usd.asset_id, transaction_type=TransactionType.DEPOSIT,
+                        amount=Decimal('100'), currency=Currency.USD, exchange_rate=Decimal('7.1'),
+                        transaction_date=date(2024, 1, 15)),
+        CashTransaction(asset_id=usd.asset_id, transaction_type=TransactionType.FEE,
+                        amount=Decimal('1'), currency=Currency.USD, exchange_rate=Decimal('7.1'),
+                        transaction_date=date(2024, 2, 15)),
+    ]
+
+
+@pytest.fixture
+def assets():
+    return (Asset(asset_name="活期存款", asset_type=AssetType.CASH),
+            Asset(asset_name="美元存款", asset_type=AssetType.CASH, currency=Currency.USD))
+
+
+class TestLedger:
+    """测试账本汇总与Position口径一致"""
+
+    def test_matches_position(self, assets):
+        transactions = make_transactions(*assets)
+        ledger = Ledger.from_transactions(transactions)
+
+        assert len(ledger) == 5
+        for asset in assets:
+            position = Position(asset=asset, transactions=[t for t in transactions if t.asset_id == asset.asset_id])
+            expected = position._totals()
+            assert ledger.position_totals(asset.asset_id) == expected
+            assert ledger.all_position_totals()[asset.asset_id] == expected
+
+    def test_summary_and_book_values(self, assets):
+        ledger = Ledger.from_transactions(make_transactions(*assets))
+        summary = ledger.summary()
+
+        assert summary['total_invested'] == Decimal('1710')
+        assert summary['total_fees'] == Decimal('7.1')
+        assert summary['book_value'] == Decimal('1505.65')
+        assert ledger.book_values().tolist() == [8027500, 7029000]
+
+    def test_as_of(self, assets):
+        ledger = Ledger.from_transactions(make_transactions(*assets))
+        summary = ledger.summary(as_of=date(2024, 1, 31))
+        assert summary['book_value'] == Decimal('1710')
+
+    def test_allocation(self, assets):
+        cash, usd = assets
+        ledger = Ledger.from_transactions(make_transactions(cash, usd))
+        allocation = ledger.allocation({cash.asset_id: 'CASH', usd.asset_id: 'CASH'})
+        assert allocation['CASH']['count'] == 2
+        assert allocation['CASH']['percentage'] == 100.0
+
+    def test_activity(self, assets):
+        cash, usd = assets
+        activity = Ledger.from_transactions(make_transactions(cash, usd)).activity()
+        assert activity[cash.asset_id] == (3, date(2024, 1, 1), date(2024, 3, 1))
+        assert activity[usd.asset_id] == (2, date(2024, 1, 15), date(2024, 2, 15))
+
+    def test_empty(self):
+        ledger = Ledger.from_rows([])
+        assert ledger.summary()['book_value'] == 0
+        assert ledger.activity() == {}
+
+
+class TestLedgerRepository:
+    """测试从数据库构建账本"""
+
+    def test_load_ledger_and_positions(self):
+        db = DatabaseManager(":memory:")
+        service = WealthService(db)
+        cash = service.create_asset("活期存款", AssetType.CASH)
+        closed = service.create_asset("已清空", AssetType.CASH)
+        service.create_transactions([
+            CashTransaction(asset_id=cash.asset_id, transaction_type=TransactionType.DEPOSIT,
+                            amount=Decimal('500'), transaction_date=date(2024, 5, 20)),
+            CashTransaction(asset_id=closed.asset_id, transaction_type=TransactionType.DEPOSIT,
+                            amount=Decimal('50'), transaction_date=date(2024, 5, 1)),
+            CashTransaction(asset_id=closed.asset_id, transaction_type=TransactionType.WITHDRAW,
+                            amount=Decimal('50'), transaction_date=date(2024, 5, 2)),
+        ])
+
+        ledger = service.get_ledger()
+        assert ledger.date_ordinal.min() == date(2024, 5, 1).toordinal()
+        positions = service.get_all_positions()
+        assert [p.asset.asset_id for p in positions] == [cash.asset_id]
+        assert positions[0].current_book_value == Decimal('500')
+        db.close()
+
+    def test_positions_load_transactions_on_demand(self, monkeypatch):
+        db = DatabaseManager(":memory:")
+        service = WealthService(db)
+        cash = service.create_asset("活期存款", AssetType.CASH)
+        bond = service.create_asset("国债", AssetType.FIXED_INCOME)
+        service.create_cash_transaction(cash.asset_id, TransactionType.DEPOSIT, Decimal('800'), date(2024, 1, 1))
+        service.create_cash_transaction(cash.asset_id, TransactionType.INTEREST, Decimal('2'), date(2024, 3, 1))
+        service.create_fixed_income_transaction(
+            bond.asset_id, TransactionType.DEPOSIT, Decimal('1000'), date(2024, 1, 1),
+            annual_rate=Decimal('3'), start_date=date(2024, 1, 1), maturity_date=date(2099, 1, 1),
+        )
+        # 已取出全部本金、只剩利息的资产不算持仓
+        closed = service.create_asset("已清空", AssetType.CASH)
+        for transaction_type, amount in ((TransactionType.DEPOSIT, '100'), (TransactionType.WITHDRAW, '100'),
+                                         (TransactionType.INTEREST, '5')):
+            service.create_cash_transaction(closed.asset_id, transaction_type, Decimal(amount), date(2024, 1, 1))
+        expected = {a.asset_id: service.get_position(a.asset_id) for a in (cash, bond)}
+
+        loaded = []
+        original = service.get_transactions_by_asset
+        monkeypatch.setattr(service, 'get_transactions_by_asset',
+                            lambda asset_id: loaded.append(asset_id) or original(asset_id))
+        positions = {p.asset.asset_id: p for p in service.get_all_positions()}
+        assert all(isinstance(p, LazyPosition) for p in positions.values())
+
+        lazy = positions[cash.asset_id]
+        assert lazy.transaction_count == 2
+        assert (lazy.first_transaction_date, lazy.last_transaction_date) == (date(2024, 1, 1), date(2024, 3, 1))
+        assert lazy.calculate_current_value() == Decimal('802')
+        assert lazy.status == expected[cash.asset_id].status
+        assert loaded == []
+
+        # 固定收益估值需要交易明细，首次访问时加载一次
+        bond_position = positions[bond.asset_id]
+        assert bond_position.calculate_current_value() == expected[bond.asset_id].calculate_current_value()
+        assert bond_position.calculate_current_value() == expected[bond.asset_id].calculate_current_value()
+        assert loaded == [bond.asset_id]
+        assert bond_position.is_loaded and bond_position.transaction_count == 1
+
+        # 资产配置与业绩摘要基于同一组持仓
+        allocation = service.get_asset_allocation()
+        assert allocation['CASH']['value'] == Decimal('802') and allocation['CASH']['count'] == 1
+        assert allocation['FIXED_INCOME']['count'] == 1
+        summary = service.get_performance_summary()
+        assert summary['total_income'] == Decimal('2')
+        assert summary['asset_count'] == 2
+        assert summary['total_value'] == sum(info['value'] for info in allocation.values())
+        db.close()
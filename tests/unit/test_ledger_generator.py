@@ -0,0 +1,57 @@
+"""
+测试合成账本生成器（确定性、批量导入后的索引与全文检索、数据可被应用读取）
+"""
+
+from src.wealth_lite.data.database import DatabaseManager
+from src.wealth_lite.data.ledger_generator import LedgerGenerator
+from src.wealth_lite.data.repositories import TransactionRepository
+from src.wealth_lite.models.transaction import EquityTransaction, FixedIncomeTransaction
+
+SCHEMA_OBJECTS = "SELECT type, name FROM sqlite_master WHERE type IN ('index', 'trigger') ORDER BY name"
+
+
+def _checksum(db: DatabaseManager):
+    return [tuple(row) for row in db.execute_query(
+        "SELECT COUNT(*), SUM(amount), SUM(amount_base_currency), MIN(transaction_date), MAX(transaction_date) "
+        "FROM transactions"
+    )]
+
+
+def test_generator_is_deterministic_and_exact(tmp_path):
+    checksums = []
+    for name in ("a.db", "b.db"):
+        db = DatabaseManager(str(tmp_path / name))
+        result = LedgerGenerator(seed=7, years=3, batch_size=500).generate(db, 2000, 40)
+        assert result.transactions == 2000 and len(result.asset_ids) == 40
+        assert result.snapshots == 36 and result.fx_rates > 0 and result.prices > 0
+        assert db.execute_query("SELECT COUNT(*) FROM transactions")[0][0] == 2000
+        checksums.append(_checksum(db))
+    assert checksums[0] == checksums[1]
+
+    other = DatabaseManager(str(tmp_path / "c.db"))
+    LedgerGenerator(seed=8, years=3).generate(other, 2000, 40)
+    assert _checksum(other) != checksums[0]
+
+
+def test_bulk_load_restores_indexes_and_search(tmp_path):
+    db = DatabaseManager(str(tmp_path / "ledger.db"))
+    before = [tuple(row) for row in db.execute_query(SCHEMA_OBJECTS)]
+    LedgerGenerator(seed=1, years=2).generate(db, 3000, 30)
+    assert [tuple(row) for row in db.execute_query(SCHEMA_OBJECTS)] == before
+
+    noted = db.execute_query("SELECT COUNT(*) FROM transactions WHERE notes = '子女教育金'")[0][0]
+    matched = db.execute_query(
+        "SELECT COUNT(*) FROM transaction_notes_fts WHERE transaction_notes_fts MATCH '子女教育金'"
+    )[0][0]
+    assert noted > 0 and matched == noted
+
+
+def test_generated_transactions_load_as_models(tmp_path):
+    db = DatabaseManager(str(tmp_path / "ledger.db"))
+    result = LedgerGenerator(seed=3, years=2).generate(db, 600, 12, snapshots=False)
+    repository = TransactionRepository(db)
+    loaded = [t for asset_id in result.asset_ids for t in repository.get_by_asset(asset_id)]
+    assert len(loaded) == 600
+    assert all(t.amount > 0 for t in loaded)
+    kinds = {type(t) for t in loaded}
+    assert EquityTransaction in kinds or FixedIncomeTransaction in kinds
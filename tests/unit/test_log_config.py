@@ -0,0 +1,44 @@
+"""
+测试日志配置（按环境选择级别、后台队列写入、JSON格式）
+"""
+
+import json
+import logging
+
+from src.wealth_lite.config import log_config
+
+
+def test_log_level_by_environment(monkeypatch):
+    monkeypatch.delenv("WEALTH_LITE_LOG_LEVEL", raising=False)
+    monkeypatch.setenv("WEALTH_LITE_ENV", "test")
+    assert log_config.get_log_level() == logging.WARNING
+    monkeypatch.setenv("WEALTH_LITE_ENV", "production")
+    assert log_config.get_log_level() == logging.INFO
+    monkeypatch.setenv("WEALTH_LITE_LOG_LEVEL", "debug")
+    assert log_config.get_log_level() == logging.DEBUG
+    monkeypatch.setenv("WEALTH_LITE_LOG_LEVEL", "verbose")
+    assert log_config.get_log_level() == logging.INFO
+
+
+def test_json_log_file_written_by_listener(tmp_path, monkeypatch):
+    log_file = tmp_path / "wealth_lite.log"
+    monkeypatch.setattr(log_config, "LOG_DIR", str(tmp_path))
+    monkeypatch.setattr(log_config, "LOG_FILE", str(log_file))
+    monkeypatch.setenv("WEALTH_LITE_LOG_FORMAT", "json")
+    root = logging.getLogger()
+    previous_level = root.level
+    log_config.shutdown_logging()
+    try:
+        log_config.setup_logging(logging.INFO)
+        logger = logging.getLogger("wealth_lite.test")
+        logger.info("资产 %s 已保存", "a1")
+        logger.debug("低于日志级别，不输出")
+    finally:
+        # stop() 会先写完队列中剩余的日志
+        log_config.shutdown_logging()
+        root.setLevel(previous_level)
+
+    entries = [json.loads(line) for line in log_file.read_text(encoding="utf-8").splitlines()]
+    assert [(e["level"], e["logger"], e["message"]) for e in entries] == [
+        ("INFO", "wealth_lite.test", "资产 a1 已保存")
+    ]
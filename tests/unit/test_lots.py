@@ -0,0 +1,189 @@
+"""
+测试持仓批次（成本计价、拆股与增量持久化）
+"""
+
+import pytest
+from datetime import date
+from decimal import Decimal
+
+from src.wealth_lite.data.database import DatabaseManager
+from src.wealth_lite.models.enums import AssetType, CostBasisMethod, TransactionType
+from src.wealth_lite.models.lots import LotBook
+from src.wealth_lite.models.transaction import EquityTransaction
+from src.wealth_lite.services.wealth_service import WealthService
+
+
+def trade(asset_id, transaction_type, quantity, price, day, split_ratio='1'):
+    """构建一笔权益交易"""
+    return EquityTransaction(
+        asset_id=asset_id, transaction_type=transaction_type,
+        quantity=Decimal(quantity), price_per_share=Decimal(price),
+        split_ratio=Decimal(split_ratio), transaction_date=date(2024, 1, day),
+    )
+
+
+TRADES = [
+    ('BUY', '100', '10', 1),
+    ('BUY', '100', '20', 2),
+    ('SELL', '150', '30', 3),
+]
+
+
+@pytest.mark.parametrize("method, realized, open_cost", [
+    (CostBasisMethod.FIFO, Decimal('2500'), Decimal('1000')),   # 4500 - (1000 + 50×20)
+    (CostBasisMethod.LIFO, Decimal('2000'), Decimal('500')),    # 4500 - (2000 + 50×10)
+    (CostBasisMethod.AVERAGE, Decimal('2250'), Decimal('750')), # 4500 - 150×15
+])
+def test_cost_basis_methods(method, realized, open_cost):
+    transactions = [trade('a', TransactionType[t], q, p, d) for t, q, p, d in TRADES]
+    book = LotBook.from_transactions(transactions, method)
+
+    assert book.realized_pnl == realized
+    assert book.open_quantity == Decimal('50')
+    assert book.open_cost == open_cost * 10000
+    assert book.unrealized_pnl(Decimal('1500')) == Decimal('1500') - open_cost
+
+
+def test_split_adjusts_open_lots():
+    book = LotBook.from_transactions([
+        trade('a', TransactionType.BUY, '100', '10', 1),
+        # 1拆2：先调整已有批次，再计入本笔数量
+        trade('a', TransactionType.BUY, '10', '5', 2, split_ratio='2'),
+        trade('a', TransactionType.SELL, '210', '6', 3),
+    ])
+    assert book.open_quantity == 0
+    assert book.realized_pnl == Decimal('1260') - Decimal('1050')
+
+
+def test_oversell_raises():
+    with pytest.raises(ValueError):
+        LotBook.from_transactions([
+            trade('a', TransactionType.BUY, '10', '10', 1),
+            trade('a', TransactionType.SELL, '11', '10', 2),
+        ])
+
+
+class TestLotService:
+    """测试持久化批次账簿"""
+
+    @pytest.fixture
+    def service(self):
+        db_manager = DatabaseManager(":memory:")
+        yield WealthService(db_manager)
+        db_manager.close()
+
+    @pytest.fixture
+    def stock(self, service):
+        asset = service.create_asset("示例股票", AssetType.EQUITY)
+        service.create_transactions([trade(asset.asset_id, TransactionType[t], q, p, d) for t, q, p, d in TRADES])
+        return asset
+
+    def test_incremental_update(self, service, stock, monkeypatch):
+        book = service.lots.get_book(stock.asset_id)
+        assert book.applied_count == 3
+        assert book.realized_pnl == Decimal('2500')
+
+        service.create_transactions([trade(stock.asset_id, TransactionType.SELL, '50', '40', 4)])
+        events = []
+        original = service.lots.repository.iter_events
+
+        def recording_iter_events(*args):
+            events.extend(original(*args))
+            return iter(events)
+
+        monkeypatch.setattr(service.lots.repository, 'iter_events', recording_iter_events)
+        book = service.lots.get_book(stock.asset_id)
+        assert len(events) == 1
+        assert book.applied_count == 4
+        assert book.realized_pnl == Decimal('2500') + Decimal('2000') - Decimal('1000')
+        assert not book.lots
+
+    def test_backdated_transaction_rebuilds(self, service, stock):
+        service.lots.get_book(stock.asset_id)
+        service.create_transactions([trade(stock.asset_id, TransactionType.BUY, '100', '5', 1)])
+
+        book = service.lots.get_book(stock.asset_id)
+        assert book.applied_count == 4
+        # 1月1日的两笔买入（10元与5元）先于卖出匹配
+        assert book.realized_pnl == Decimal('4500') - Decimal('1000') - Decimal('250')
+
+    def test_update_invalidates(self, service, stock):
+        service.lots.get_book(stock.asset_id)
+        sell = next(t for t in service.get_transactions_by_asset(stock.asset_id)
+                    if t.transaction_type == TransactionType.SELL)
+        sell.amount = sell.amount_base_currency = Decimal('3000')
+        service.update_transaction(sell)
+
+        assert service.lots.get_book(stock.asset_id).realized_pnl == Decimal('1000')
+
+    def test_position_realized_pnl(self, service, stock):
+        position = service.get_position(stock.asset_id)
+        assert position.calculate_realized_pnl() == Decimal('2500')
+        assert position.calculate_unrealized_pnl() == 0
+        assert position.calculate_unrealized_pnl(Decimal('1200')) == Decimal('200')
+
+    def test_position_uses_persisted_book(self, service, stock, monkeypatch):
+        service.lots.get_book(stock.asset_id)
+
+        def no_replay(*args, **kwargs):
+            raise AssertionError("不应重放交易")
+
+        monkeypatch.setattr(LotBook, 'from_transactions', no_replay)
+        position = service.get_position(stock.asset_id)
+        assert position.calculate_realized_pnl() == Decimal('2500')
+
+    def test_moving_transaction_invalidates_both_books(self, service, stock):
+        other = service.create_asset("另一只股票", AssetType.EQUITY)
+        service.create_transactions([trade(other.asset_id, TransactionType.BUY, '200', '10', 1)])
+        assert service.lots.get_book(stock.asset_id).realized_pnl == Decimal('2500')
+        assert service.lots.get_book(other.asset_id).realized_pnl == 0
+
+        sell = next(t for t in service.get_transactions_by_asset(stock.asset_id)
+                    if t.transaction_type == TransactionType.SELL)
+        sell.asset_id = other.asset_id
+        service.update_transaction(sell)
+
+        assert service.lots.get_book(stock.asset_id).realized_pnl == 0
+        assert service.lots.get_book(stock.asset_id).open_quantity == Decimal('200')
+        assert service.lots.get_book(other.asset_id).realized_pnl == Decimal('4500') - Decimal('1500')
+
+        sell.asset_id = stock.asset_id
+        service.update_transactions([sell])
+        assert service.lots.get_book(stock.asset_id).realized_pnl == Decimal('2500')
+        assert service.lots.get_book(other.asset_id).realized_pnl == 0
+
+    def test_external_update_invalidates(self, service, stock):
+        service.lots.get_book(stock.asset_id)
+        # 不经服务层的写入（脚本、其他进程）同样由触发器清除账簿
+        service.db_manager.execute_update(
+            "UPDATE transactions SET amount_base_currency = ? WHERE asset_id = ? AND transaction_type = 'SELL'",
+            (30000000, stock.asset_id)
+        )
+        assert service.lots.get_book(stock.asset_id).realized_pnl == Decimal('1000')
+
+    def test_book_read_during_update_is_not_saved(self, service, stock, monkeypatch):
+        sell = next(t for t in service.get_transactions_by_asset(stock.asset_id)
+                    if t.transaction_type == TransactionType.SELL)
+        original = service.lots.repository.iter_events
+
+        def iter_events_then_update(*args):
+            events = list(original(*args))
+            # 读取交易之后、保存账簿之前，另一线程提交了修改
+            sell.amount = sell.amount_base_currency = Decimal('3000')
+            service.update_transaction(sell)
+            return iter(events)
+
+        monkeypatch.setattr(service.lots.repository, 'iter_events', iter_events_then_update)
+        assert service.lots.get_book(stock.asset_id).realized_pnl == Decimal('2500')
+        monkeypatch.setattr(service.lots.repository, 'iter_events', original)
+        assert service.lots.get_book(stock.asset_id).realized_pnl == Decimal('1000')
+
+    def test_oversold_position_falls_back(self, service, stock):
+        service.create_transactions([trade(stock.asset_id, TransactionType.SELL, '100', '30', 4)])
+        with pytest.raises(ValueError):
+            service.lots.get_book(stock.asset_id)
+
+        position = service.get_position(stock.asset_id)
+        assert position.calculate_realized_pnl() == position.total_income
+        assert position.calculate_unrealized_pnl(Decimal('100')) == \
+            Decimal('100') - position.principal_amount - position.total_income
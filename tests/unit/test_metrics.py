@@ -0,0 +1,77 @@
+"""
+测试请求级性能指标（路由耗时直方图、SQL/AI统计、Server-Timing、Prometheus输出）
+"""
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.wealth_lite.data.database import DatabaseManager
+from src.wealth_lite.utils.metrics import (
+    MetricsMiddleware, MetricsRegistry, UNMATCHED_ROUTE, ai_call, record_query
+)
+
+
+def _client(registry: MetricsRegistry, db: DatabaseManager) -> TestClient:
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware, registry=registry)
+
+    @app.get("/api/assets/{asset_id}")
+    def get_asset(asset_id: str):
+        db.execute_query("SELECT * FROM assets WHERE asset_id = ?", (asset_id,))
+        db.execute_query("SELECT * FROM transactions WHERE asset_id = ?", (asset_id,))
+        return {"asset_id": asset_id}
+
+    @app.post("/api/ai/analyze")
+    async def analyze():
+        with ai_call():
+            pass
+        return {"success": True}
+
+    return TestClient(app)
+
+
+def test_requests_are_grouped_by_route_template(tmp_path):
+    registry = MetricsRegistry()
+    # 同步路由在线程池中执行，使用文件数据库（每次调用新建连接）
+    db = DatabaseManager(str(tmp_path / "metrics.db"))
+    db.add_query_hook(record_query)
+    client = _client(registry, db)
+    try:
+        for asset_id in ("a1", "a2", "a3"):
+            response = client.get(f"/api/assets/{asset_id}")
+            assert response.status_code == 200
+            assert 'db;dur=' in response.headers["server-timing"]
+            assert '"2 queries, 0 rows"' in response.headers["server-timing"]
+
+        assert "ai;dur=" in client.post("/api/ai/analyze").headers["server-timing"]
+        assert client.get("/missing").status_code == 404
+
+        text = registry.render()
+        labels = 'method="GET",route="/api/assets/{asset_id}"'
+        assert f'wealthlite_http_request_duration_seconds_count{{{labels}}} 3' in text
+        assert f'wealthlite_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 3' in text
+        assert f'wealthlite_http_requests_total{{{labels},status="200"}} 3' in text
+        assert f'wealthlite_sql_queries_total{{{labels}}} 6' in text
+        assert 'wealthlite_ai_calls_total{method="POST",route="/api/ai/analyze"} 1' in text
+        assert f'route="{UNMATCHED_ROUTE}",status="404"' in text
+        assert "/api/assets/a1" not in text
+    finally:
+        db.remove_query_hook(record_query)
+        db.close()
+
+
+def test_query_hook_counts_rows_and_ignores_hook_errors():
+    db = DatabaseManager(":memory:")
+    calls = []
+    db.add_query_hook(lambda sql, seconds, rows: calls.append((sql, rows)))
+    db.add_query_hook(lambda sql, seconds, rows: 1 / 0)
+    try:
+        db.execute_update("CREATE TABLE t (x INTEGER)")
+        for i in range(5):
+            db.execute_insert("INSERT INTO t VALUES (?)", (i,))
+        assert len(db.execute_query("SELECT * FROM t")) == 5
+        assert len(list(db.iter_query("SELECT * FROM t", chunk_size=2))) == 5
+        assert calls[-2:] == [("SELECT * FROM t", 5), ("SELECT * FROM t", 5)]
+        assert len(calls) == 8
+    finally:
+        db.close()
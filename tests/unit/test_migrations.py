@@ -0,0 +1,96 @@
+"""
+测试数据库迁移框架
+"""
+
+import sqlite3
+from datetime import datetime
+from decimal import Decimal
+
+from src.wealth_lite.data.database import DatabaseManager
+from src.wealth_lite.data.migrations import (
+    Migration, MigrationRunner, STATUS_APPLIED, STATUS_RUNNING, add_column, rowid_batches
+)
+from src.wealth_lite.data.repositories import PortfolioSnapshotRepository
+from src.wealth_lite.models.portfolio import PortfolioSnapshot
+
+
+def _items_db(rows: int) -> sqlite3.Connection:
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, price REAL)")
+    conn.executemany("INSERT INTO items (price) VALUES (?)", [(i + 0.5,) for i in range(rows)])
+    conn.commit()
+    return conn
+
+
+def _cents_migration() -> Migration:
+    return Migration(
+        version=1,
+        name="price_cents",
+        schema=lambda conn: add_column(conn, "items", "cents", "INTEGER"),
+        batch=rowid_batches("items", "UPDATE items SET cents = CAST(price * 100 AS INTEGER) "
+                                     "WHERE rowid > ? AND rowid <= ?"),
+    )
+
+
+class TestMigrationRunner:
+    """测试迁移执行器"""
+
+    def test_batched_migration_resumes_from_checkpoint(self):
+        conn = _items_db(25)
+        runner = MigrationRunner(conn, [_cents_migration()], batch_size=10)
+
+        # 时间预算为0：只建立记录，不执行任何批次
+        assert runner.run(max_seconds=0) == []
+        assert [m.version for m in runner.pending()] == [1]
+        assert runner.history()[0]["status"] == STATUS_RUNNING
+
+        # 模拟执行了一批后中断
+        conn.execute("UPDATE items SET cents = CAST(price * 100 AS INTEGER) WHERE rowid <= 10")
+        conn.execute("UPDATE schema_version SET checkpoint = '{\"items\": 10}' WHERE version = 1")
+        conn.commit()
+
+        assert MigrationRunner(conn, [_cents_migration()], batch_size=10).run() == [1]
+        assert conn.execute("SELECT COUNT(*) FROM items WHERE cents = CAST(price * 100 AS INTEGER)").fetchone()[0] == 25
+        assert runner.current_version == 1
+        assert runner.pending() == []
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == 1
+
+    def test_already_applied_is_recorded_without_running(self):
+        conn = _items_db(3)
+        migration = Migration(version=1, name="noop", batch=lambda *args: 1 / 0,
+                              already_applied=lambda conn: True)
+        runner = MigrationRunner(conn, [migration])
+
+        assert runner.run() == [1]
+        assert runner.history()[0]["status"] == STATUS_APPLIED
+
+    def test_add_column_is_idempotent(self):
+        conn = _items_db(0)
+        assert add_column(conn, "items", "cents", "INTEGER") is True
+        assert add_column(conn, "items", "cents", "INTEGER") is False
+
+
+class TestVersionInfo:
+    """测试数据库版本信息"""
+
+    def test_new_database_is_up_to_date(self):
+        info = DatabaseManager(":memory:").get_version_info()
+        assert info["version"] == info["latest_version"]
+        assert info["pending"] == []
+
+
+class TestPortfolioSnapshotRepository:
+    """测试旧版快照模型与portfolio_snapshots表的映射"""
+
+    def test_round_trip(self):
+        repo = PortfolioSnapshotRepository(DatabaseManager(":memory:"))
+        snapshot = PortfolioSnapshot(snapshot_date=datetime(2024, 6, 30, 15, 0), description="半年度",
+                                     total_value=Decimal('1200'), total_cost=Decimal('1000'),
+                                     total_return=Decimal('200'), return_rate=0.2)
+
+        assert repo.create(snapshot)
+        loaded = repo.get_by_id(snapshot.snapshot_id)
+        assert loaded.description == "半年度"
+        assert loaded.total_value == Decimal('1200')
+        assert loaded.return_rate == 0.2
+        assert repo.delete(snapshot.snapshot_id)
@@ -151,6 +151,17 @@ class TestPhase1Transactions:
         assert restored.asset_id == transaction.asset_id
         assert restored.amount == transaction.amount
 
+    def test_transaction_slots(self):
+        """测试交易对象无实例__dict__"""
+        asset = AssetFactory.create_fixed_income_asset()
+        transaction = TransactionFactory.create_fixed_income_purchase(asset.asset_id)
+
+        assert not hasattr(transaction, '__dict__')
+        assert transaction.start_date == transaction.transaction_date
+        assert FixedIncomeTransaction.from_dict(transaction.to_dict()) == transaction
+        with pytest.raises(AttributeError):
+            transaction.unknown_field = 1
+
 
 class TestPhase1Positions:
     """Phase 1 持仓模型测试"""
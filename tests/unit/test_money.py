@@ -0,0 +1,135 @@
+"""
+测试定点金额与整数存储
+"""
+
+import sqlite3
+from datetime import date
+from decimal import Decimal
+
+from src.wealth_lite.data.database import DatabaseManager
+from src.wealth_lite.models.asset import Asset
+from src.wealth_lite.models.enums import AssetType, TransactionType
+from src.wealth_lite.models.money import Money, to_minor, from_minor, minor_to_float
+from src.wealth_lite.models.position import Position
+from src.wealth_lite.models.transaction import CashTransaction, FixedIncomeTransaction
+from src.wealth_lite.services.wealth_service import WealthService
+
+
+class TestMoneyConversion:
+    """测试金额转换"""
+
+    def test_round_trip(self):
+        assert to_minor(Decimal('1234.5678')) == 12345678
+        assert from_minor(12345678) == Decimal('1234.5678')
+        assert to_minor(0.1) == 1000
+        assert to_minor(7) == 70000
+
+    def test_rounding_half_up(self):
+        assert to_minor(Decimal('0.00005')) == 1
+        assert to_minor(Decimal('-0.00005')) == -1
+
+    def test_minor_to_float_is_exact_repr(self):
+        assert repr(minor_to_float(12345678901234)) == '1234567890.1234'
+
+    def test_money_arithmetic(self):
+        a = Money.from_decimal('10.10')
+        b = Money.from_decimal('0.20')
+        assert (a + b).to_decimal() == Decimal('10.3')
+        assert (a - b) == Money.from_decimal('9.9')
+        assert sum([a, b]) == Money(103000)
+        assert (a * 3).minor == 303000
+        assert a > b and not a < b
+
+    def test_hash_matches_equal_numbers(self):
+        amount = Money.from_decimal('10.10')
+        assert amount == Decimal('10.1') and hash(amount) == hash(Decimal('10.1'))
+        assert Money(20000) == 2 and hash(Money(20000)) == hash(2)
+        assert {Money(20000), 2, Decimal('2.00')} == {2}
+
+    def test_sqlite_adapter_and_converter(self):
+        conn = sqlite3.connect(':memory:', detect_types=sqlite3.PARSE_COLNAMES)
+        conn.execute("CREATE TABLE t (amount INTEGER)")
+        conn.execute("INSERT INTO t VALUES (?)", (Money.from_decimal('12.34'),))
+        raw, money = conn.execute('SELECT amount, amount AS "m [MONEY]" FROM t').fetchone()
+        assert raw == 123400
+        assert money == Money.from_decimal('12.34')
+        conn.close()
+
+
+class TestMoneyStorage:
+    """测试金额以最小单位整数存储"""
+
+    def test_transaction_round_trip(self):
+        db = DatabaseManager(":memory:")
+        service = WealthService(db)
+        asset = service.create_asset("定期存款", AssetType.FIXED_INCOME)
+        tx = FixedIncomeTransaction(
+            asset_id=asset.asset_id, transaction_type=TransactionType.DEPOSIT,
+            amount=Decimal('10000.1234'), transaction_date=date(2024, 1, 1),
+            face_value=Decimal('10000'), exchange_rate=Decimal('7.1'),
+        )
+        service.create_transactions([tx])
+
+        row = db.execute_query("SELECT amount, amount_base_currency FROM transactions")[0]
+        assert row['amount'] == 100001234
+        assert row['amount_base_currency'] == to_minor(Decimal('10000.1234') * Decimal('7.1'))
+
+        loaded = service.get_transaction(tx.transaction_id)
+        assert loaded.amount == Decimal('10000.1234')
+        assert loaded.amount_base_currency == Decimal('71000.8761')
+        assert loaded.face_value == Decimal('10000')
+        db.close()
+
+    def test_migrates_float_columns(self, tmp_path):
+        path = str(tmp_path / "legacy.db")
+        DatabaseManager(path).close()
+        conn = sqlite3.connect(path)
+        # 模拟迁移框架之前、金额列仍为浮点数的数据库
+        conn.execute("PRAGMA user_version = 0")
+        conn.execute("DROP TABLE schema_version")
+        conn.execute(
+            "INSERT INTO transactions (transaction_id, asset_id, transaction_date, transaction_type,"
+            " amount, currency, amount_base_currency) VALUES ('t1', 'a1', '2024-01-01', 'DEPOSIT', 100.25, 'CNY', 100.25)"
+        )
+        conn.commit()
+        conn.close()
+
+        db = DatabaseManager(path)
+        row = db.execute_query("SELECT amount, amount_base_currency FROM transactions")[0]
+        assert row['amount'] == 1002500
+        assert db.get_version_info()["pending"] == []
+
+        # 再次打开不会重复迁移
+        db = DatabaseManager(path)
+        assert db.execute_query("SELECT amount FROM transactions")[0]['amount'] == 1002500
+
+
+class TestPositionAggregation:
+    """测试持仓的整数聚合"""
+
+    def test_totals(self):
+        asset = Asset(asset_name="活期存款", asset_type=AssetType.CASH)
+        transactions = [
+            CashTransaction(asset_id=asset.asset_id, transaction_type=t, amount=Decimal(a))
+            for t, a in [
+                (TransactionType.DEPOSIT, '0.1'), (TransactionType.DEPOSIT, '0.2'),
+                (TransactionType.WITHDRAW, '0.05'), (TransactionType.INTEREST, '0.0001'),
+                (TransactionType.FEE, '0.01'),
+            ]
+        ]
+        position = Position(asset=asset, transactions=transactions)
+
+        assert position.total_invested == Decimal('0.3')
+        assert position.net_invested == Decimal('0.25')
+        assert position.current_book_value == Decimal('0.2401')
+
+        position.add_transaction(CashTransaction(
+            asset_id=asset.asset_id, transaction_type=TransactionType.DEPOSIT, amount=Decimal('1')))
+        assert position.total_invested == Decimal('1.3')
+
+        # 原地修改交易（数量不变）后重新汇总
+        transactions[0].update_exchange_rate(Decimal('2'))
+        assert position.total_invested == Decimal('1.4')
+        transactions[1].amount = transactions[1].amount_base_currency = Decimal('0.5')
+        assert position.total_invested == Decimal('1.7')
+        assert position.total_invested_original_currency == Decimal('1.6')
@@ -0,0 +1,118 @@
+"""
+测试市场价格服务（价格导入、过期策略与市价估值）
+"""
+
+import pytest
+from datetime import date
+from decimal import Decimal
+
+from src.wealth_lite.data.database import DatabaseManager
+from src.wealth_lite.models.enums import AssetType, TransactionType
+from src.wealth_lite.models.transaction import EquityTransaction
+from src.wealth_lite.services.price_service import PriceService, StalenessPolicy
+from src.wealth_lite.services.wealth_service import WealthService
+
+
+@pytest.fixture
+def service():
+    """创建使用内存数据库的WealthService"""
+    db_manager = DatabaseManager(":memory:")
+    yield WealthService(db_manager)
+    db_manager.close()
+
+
+@pytest.fixture
+def stock(service):
+    """创建权益资产并买入100股、卖出30股"""
+    asset = service.create_asset("示例股票", AssetType.EQUITY)
+    service.create_transactions([
+        EquityTransaction(asset_id=asset.asset_id, transaction_type=TransactionType.BUY,
+                          quantity=Decimal('100'), price_per_share=Decimal('10'),
+                          transaction_date=date(2024, 1, 2)),
+        EquityTransaction(asset_id=asset.asset_id, transaction_type=TransactionType.SELL,
+                          quantity=Decimal('30'), price_per_share=Decimal('12'),
+                          transaction_date=date(2024, 2, 1)),
+    ])
+    return asset
+
+
+def test_staleness_policy():
+    policy = StalenessPolicy(stale_after_days=5, expire_after_days=30)
+    assert policy.classify(None) == 'missing'
+    assert policy.classify(3) == 'fresh'
+    assert policy.classify(10) == 'stale'
+    assert policy.classify(31) == 'expired'
+
+
+def test_equity_details_round_trip(service, stock):
+    transactions = service.get_transactions_by_asset(stock.asset_id)
+    assert all(isinstance(t, EquityTransaction) for t in transactions)
+    assert sorted(t.quantity for t in transactions) == [Decimal('30'), Decimal('100')]
+    assert service.repositories.transactions.load_quantities() == {stock.asset_id: Decimal('70')}
+    assert service.repositories.transactions.load_quantities(date(2024, 1, 15)) == {stock.asset_id: Decimal('100')}
+
+
+def test_quantities_apply_splits(service, stock):
+    # 1拆2后再买入10股：(100 - 30) * 2 + 10
+    service.create_transactions([
+        EquityTransaction(asset_id=stock.asset_id, transaction_type=TransactionType.BUY,
+                          quantity=Decimal('10'), price_per_share=Decimal('6'), split_ratio=Decimal('2'),
+                          transaction_date=date(2024, 3, 1)),
+    ])
+    quantities = service.repositories.transactions.load_quantities()
+    assert quantities == {stock.asset_id: Decimal('150')}
+    assert quantities[stock.asset_id] == service.lots.get_book(stock.asset_id).open_quantity
+    assert service.repositories.transactions.load_quantities(date(2024, 2, 15)) == {stock.asset_id: Decimal('70')}
+
+
+def test_latest_price_cache(service, stock):
+    prices = service.prices
+    prices.add_prices([
+        (stock.asset_id, date(2024, 3, 1), '11.5'),
+        (stock.asset_id, date(2024, 3, 4), '12.25'),
+    ])
+    assert prices.get_price(stock.asset_id, date(2024, 3, 2)) == (date(2024, 3, 1), Decimal('11.5'))
+    assert prices.get_price(stock.asset_id) == (date(2024, 3, 4), Decimal('12.25'))
+    assert prices.get_price(stock.asset_id, date(2024, 2, 1)) is None
+
+    prices.add_prices([(stock.asset_id, date(2024, 3, 5), '13')])
+    assert prices.get_price(stock.asset_id) == (date(2024, 3, 5), Decimal('13'))
+
+    # 其他实例（或进程）写入的价格同样使缓存失效
+    PriceService(service.db_manager).add_prices([(stock.asset_id, date(2024, 3, 6), '14')])
+    assert prices.get_price(stock.asset_id) == (date(2024, 3, 6), Decimal('14'))
+
+
+def test_value_positions(service, stock):
+    service.prices.add_prices([(stock.asset_id, date(2024, 3, 1), '12.5')])
+    position = service.get_position(stock.asset_id)
+
+    fresh, = service.prices.value_positions([position], date(2024, 3, 4))
+    assert (fresh.status, fresh.source, fresh.value) == ('fresh', 'market', Decimal('875'))
+    assert position.calculate_current_value() == Decimal('875')
+
+    stale, = service.prices.value_positions([position], date(2024, 3, 20))
+    assert (stale.status, stale.source, stale.value) == ('stale', 'market', Decimal('875'))
+
+    expired, = service.prices.value_positions([position], date(2024, 6, 1))
+    assert (expired.status, expired.source) == ('expired', 'book')
+    assert expired.value == position.current_book_value
+
+
+def test_load_csv_by_symbol(service, tmp_path):
+    asset = service.create_asset("示例ETF", AssetType.EQUITY, symbol="510300")
+    path = tmp_path / "prices.csv"
+    path.write_text("代码,日期,收盘价\n510300,2024-03-01,3.512\n", encoding='utf-8')
+
+    assert service.prices.load_csv(str(path)) == 1
+    assert service.prices.get_price(asset.asset_id) == (date(2024, 3, 1), Decimal('3.512'))
+
+    path.write_text("symbol,date,close\nUNKNOWN,2024-03-01,1\n", encoding='utf-8')
+    with pytest.raises(ValueError, match="第2行"):
+        service.prices.load_csv(str(path))
+
+
+def test_portfolio_uses_market_value(service, stock):
+    service.prices.add_prices([(stock.asset_id, date.today(), '20')])
+    position, = service.get_all_positions()
+    assert position.calculate_current_value() == Decimal('1400')
@@ -0,0 +1,88 @@
+"""
+测试SQL查询分析器（指纹归一化、耗时分位数、慢查询计划、N+1检测）
+"""
+
+import logging
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.wealth_lite.data.database import DatabaseManager
+from src.wealth_lite.data.query_profiler import QueryProfiler, fingerprint
+from src.wealth_lite.utils.metrics import MetricsMiddleware, MetricsRegistry
+
+
+def test_fingerprint_matches_parameterized_and_expanded_statements():
+    assert fingerprint("SELECT * FROM t WHERE id = ? AND name = ?") == \
+        fingerprint("SELECT *\n  FROM t WHERE id = 42 AND name = 'it''s'")
+    assert fingerprint("SELECT * FROM t WHERE id IN (1, 2, 3)") == "SELECT * FROM t WHERE id IN (...)"
+    assert fingerprint("INSERT INTO t VALUES (?, ?), (?, ?)") == "INSERT INTO t VALUES (...)"
+    assert fingerprint("SELECT col2 FROM t2 LIMIT 10") == "SELECT col2 FROM t2 LIMIT ?"
+
+
+def test_profiler_aggregates_and_explains_slow_queries(caplog):
+    profiler = QueryProfiler(slow_query_ms=0)
+    db = DatabaseManager(":memory:", profiler=profiler)
+    try:
+        profiler.reset()
+        for asset_id in ("a1", "a2", "a3"):
+            db.execute_query("SELECT * FROM assets WHERE asset_id = ?", (asset_id,))
+        with db.get_connection() as conn:
+            conn.execute("SELECT COUNT(*) FROM transactions")
+
+        report = profiler.report()
+        by_fp = {q["fingerprint"]: q for q in report["queries"]}
+        asset_query = by_fp["SELECT * FROM assets WHERE asset_id = ?"]
+        assert asset_query["count"] == 3 and asset_query["timed"] == 3
+        assert 0 < asset_query["p50_ms"] <= asset_query["p99_ms"] <= asset_query["max_ms"]
+        # 直接在连接上执行的语句只计数，不计时
+        assert by_fp["SELECT COUNT(*) FROM transactions"]["timed"] == 0
+
+        slow = report["slow_queries"][0]
+        assert any("asset_id=?" in line for line in slow["plan"])
+        assert "慢查询" in caplog.text
+    finally:
+        db.close()
+
+
+def test_batch_writes_are_not_traced(monkeypatch):
+    profiler = QueryProfiler(slow_query_ms=10_000)
+    traced = []
+    monkeypatch.setattr(profiler, "trace", traced.append)
+    db = DatabaseManager(":memory:", profiler=profiler)
+    try:
+        traced.clear()
+        with db.transaction() as conn:
+            conn.executemany("INSERT INTO assets (asset_id, asset_name, asset_type) VALUES (?, ?, ?)",
+                             [(f"a{i}", f"资产{i}", "CASH") for i in range(100)])
+        assert traced == []
+
+        # 事务结束后恢复跟踪
+        db.execute_query("SELECT COUNT(*) FROM assets")
+        assert traced
+    finally:
+        db.close()
+
+
+def test_n_plus_one_detected_per_request(tmp_path, caplog):
+    profiler = QueryProfiler(slow_query_ms=10_000, n_plus_one_threshold=5)
+    db = DatabaseManager(str(tmp_path / "profiler.db"), profiler=profiler)
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware, registry=MetricsRegistry())
+
+    @app.get("/api/assets")
+    def list_assets(per_item: bool = True):
+        for i in range(6 if per_item else 1):
+            db.execute_query("SELECT * FROM transactions WHERE asset_id = ?", (f"a{i}",))
+        return {}
+
+    client = TestClient(app)
+    with caplog.at_level(logging.WARNING):
+        client.get("/api/assets", params={"per_item": False})
+        assert profiler.report()["n_plus_one"] == []
+        client.get("/api/assets")
+
+    events = profiler.report()["n_plus_one"]
+    assert events == [{"request": "GET /api/assets",
+                       "fingerprint": "SELECT * FROM transactions WHERE asset_id = ?"}]
+    assert "疑似N+1" in caplog.text
@@ -0,0 +1,168 @@
+"""
+测试数据版本、响应缓存、仪表板按资产增量重算与预计算
+"""
+
+import json
+
+import pytest
+from datetime import date
+from decimal import Decimal
+
+from src.wealth_lite.data.data_version import DataVersion
+from src.wealth_lite.data.database import DatabaseManager
+from src.wealth_lite.models.enums import AssetType, TransactionType
+from src.wealth_lite.services.dashboard_service import DashboardPrecomputer, DashboardService
+from src.wealth_lite.services.response_cache import ResponseCache
+from src.wealth_lite.services.wealth_service import WealthService
+
+
+@pytest.fixture
+def service():
+    """创建使用内存数据库的WealthService"""
+    db_manager = DatabaseManager(":memory:")
+    yield WealthService(db_manager)
+    db_manager.close()
+
+
+def test_data_version():
+    version = DataVersion()
+    version.bump(['a'])
+    assert (version.version, version.asset_version('a'), version.asset_version('b')) == (1, 1, 0)
+    version.bump()
+    assert version.asset_version('b') == 2
+
+    notified = []
+    version.subscribe(notified.append)
+    version.bump(['a'])
+    version.unsubscribe(notified.append)
+    version.bump()
+    assert notified == [3]
+
+
+def test_versions_shared_through_database(tmp_path):
+    """其他进程的写入与备份恢复都会被发现"""
+    db_manager = DatabaseManager(str(tmp_path / "wealth.db"))
+    data_version = db_manager.data_version
+    backup = db_manager.backup_database(str(tmp_path / "backup.db"))
+    notified = []
+    data_version.subscribe(notified.append)
+
+    # 模拟另一个进程：独立的内存状态，同一个数据库文件
+    other_process = DataVersion(db_manager.get_connection)
+    version = other_process.bump(['a'])
+    assert data_version.version == version
+    assert data_version.asset_version('a') == version and data_version.asset_version('b') < version
+    assert notified == [version]
+
+    db_manager.restore_database(backup)
+    assert data_version.version > version
+    assert data_version.asset_version('a') == data_version.version
+    db_manager.close()
+
+
+def test_repository_writes_bump_versions(service):
+    data_version = service.db_manager.data_version
+    cash = service.create_asset("活期存款", AssetType.CASH)
+    other = service.create_asset("另一个账户", AssetType.CASH)
+    other_version = data_version.asset_version(other.asset_id)
+
+    tx = service.create_cash_transaction(cash.asset_id, TransactionType.DEPOSIT, Decimal('100'), date(2024, 1, 1))
+    assert data_version.asset_version(cash.asset_id) == data_version.version
+    assert data_version.asset_version(other.asset_id) == other_version
+
+    before = data_version.version
+    service.delete_transaction(tx.transaction_id)
+    assert data_version.asset_version(cash.asset_id) == data_version.version > before
+
+
+def test_response_cache(service):
+    cache = ResponseCache(service.db_manager.data_version)
+    calls = []
+
+    def build():
+        calls.append(1)
+        return {"count": len(service.get_all_assets())}
+
+    first = cache.get("assets", build)
+    assert cache.get("assets", build) is first
+    assert len(calls) == 1
+    assert ResponseCache.matches(first.etag, first.etag)
+    assert ResponseCache.matches(f'"other", {first.etag}', first.etag)
+
+    service.create_asset("活期存款", AssetType.CASH)
+    second = cache.get("assets", build)
+    assert json.loads(second.body) == {"count": 1}
+    assert second.etag != first.etag
+    assert not ResponseCache.matches(first.etag, second.etag)
+
+
+def test_dashboard_recomputes_changed_assets_only(service, monkeypatch):
+    first = service.create_asset("活期存款", AssetType.CASH)
+    second = service.create_asset("定期存款", AssetType.CASH)
+    for asset in (first, second):
+        service.create_cash_transaction(asset.asset_id, TransactionType.DEPOSIT, Decimal('1000'), date(2024, 1, 1))
+
+    dashboard = DashboardService(service)
+    assert dashboard.get_summary()['total_assets'] == 2000.0
+
+    loaded, details = [], []
+    original = service.get_positions
+    monkeypatch.setattr(service, 'get_positions',
+                        lambda assets: loaded.extend(a.asset_id for a in assets) or original(assets))
+    monkeypatch.setattr(service, 'get_transactions_by_asset', details.append)
+
+    service.create_cash_transaction(first.asset_id, TransactionType.DEPOSIT, Decimal('500'), date(2024, 2, 1))
+    summary = dashboard.get_summary()
+    assert loaded == [first.asset_id]
+    # 现金持仓由账本汇总构建，不加载交易明细
+    assert details == []
+    assert summary['total_assets'] == 2500.0
+    assert [a['name'] for a in summary['assets']] == ["定期存款", "活期存款"]
+    assert dashboard.get_current_portfolio()['total_value'] == 2500.0
+
+
+def test_moving_transaction_refreshes_both_assets(service):
+    source = service.create_asset("活期存款", AssetType.CASH)
+    target = service.create_asset("定期存款", AssetType.CASH)
+    moved = service.create_cash_transaction(source.asset_id, TransactionType.DEPOSIT, Decimal('1000'), date(2024, 1, 1))
+    kept = service.create_cash_transaction(target.asset_id, TransactionType.DEPOSIT, Decimal('5'), date(2024, 1, 1))
+
+    dashboard = DashboardService(service)
+    assert dashboard.get_summary()['total_assets'] == 1005.0
+
+    moved.asset_id = target.asset_id
+    assert service.update_transaction(moved)
+    summary = dashboard.get_summary()
+    assert summary['total_assets'] == 1005.0
+    assert {a['name']: a['amount'] for a in summary['assets']}.get("定期存款") == 1005.0
+
+    moved.asset_id, kept.asset_id = source.asset_id, source.asset_id
+    assert service.update_transactions([moved, kept])
+    summary = dashboard.get_summary()
+    assert summary['total_assets'] == 1005.0
+    assert {a['name']: a['amount'] for a in summary['assets']}.get("活期存款") == 1005.0
+
+
+def test_dashboard_precomputer(service, monkeypatch):
+    cash = service.create_asset("活期存款", AssetType.CASH)
+    service.create_cash_transaction(cash.asset_id, TransactionType.DEPOSIT, Decimal('1000'), date(2024, 1, 1))
+    precomputer = DashboardPrecomputer(DashboardService(service))
+
+    # 未启动后台线程时同步重建
+    first = precomputer.get_response()
+    assert precomputer.get_response() is first
+    payload = json.loads(first.body)
+    assert (payload['total_assets'], payload['stale']) == (1000.0, False)
+
+    # 后台线程运行时，写入后读取返回标记为stale的旧快照
+    monkeypatch.setattr(DashboardPrecomputer, 'running', property(lambda self: True))
+    service.create_cash_transaction(cash.asset_id, TransactionType.DEPOSIT, Decimal('500'), date(2024, 2, 1))
+    stale = precomputer.get_response()
+    assert stale.etag != first.etag
+    assert json.loads(stale.body)['stale'] is True
+    assert json.loads(stale.body)['total_assets'] == 1000.0
+
+    fresh = precomputer.rebuild().response
+    assert precomputer.get_response() is fresh
+    assert json.loads(fresh.body)['total_assets'] == 1500.0
+    assert json.loads(fresh.body)['data_version'] == service.db_manager.data_version.version
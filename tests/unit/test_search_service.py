@@ -0,0 +1,78 @@
+"""
+测试资产与交易备注的全文检索
+"""
+
+import pytest
+from datetime import date
+from decimal import Decimal
+
+from src.wealth_lite.data.database import DatabaseManager
+from src.wealth_lite.models.enums import AssetType, TransactionType
+from src.wealth_lite.services.search_service import SearchService
+from src.wealth_lite.services.wealth_service import WealthService
+
+
+@pytest.fixture
+def service():
+    """创建使用内存数据库的WealthService"""
+    db_manager = DatabaseManager(":memory:")
+    yield WealthService(db_manager)
+    db_manager.close()
+
+
+def test_search_assets_and_notes(service):
+    bond = service.create_asset("国债2024", AssetType.FIXED_INCOME, issuer="财政部", description="三年期储蓄国债")
+    cash = service.create_asset("招商银行活期", AssetType.CASH, description="日常<消费>账户")
+    service.create_cash_transaction(cash.asset_id, TransactionType.DEPOSIT, Decimal('8000'), date(2024, 1, 5),
+                                    notes="一月工资发放")
+    service.create_cash_transaction(cash.asset_id, TransactionType.DEPOSIT, Decimal('500'), date(2024, 1, 9),
+                                    notes="年终奖金 bonus")
+    search = SearchService(service.db_manager)
+
+    result = search.search("储蓄国债")
+    assert [a["id"] for a in result["assets"]] == [bond.asset_id]
+    assert result["assets"][0]["highlights"]["description"] == "三年期<mark>储蓄国债</mark>"
+
+    # 前缀/子串匹配，不区分大小写
+    result = search.search("BON")
+    assert [t["notes"] for t in result["transactions"]] == ["年终奖金 bonus"]
+    assert result["transactions"][0]["highlights"]["notes"] == "年终奖金 <mark>bon</mark>us"
+    assert result["transactions"][0]["asset_name"] == "招商银行活期"
+
+    # 少于3个字符的词走LIKE过滤，多个词为AND关系
+    assert [t["amount"] for t in search.search("工资 一月")["transactions"]] == [8000.0]
+    assert search.search("工资 奖金")["transactions"] == []
+
+    # 高亮片段中的原文做HTML转义
+    assert search.search("消费")["assets"][0]["highlights"]["description"] == "日常&lt;<mark>消费</mark>&gt;账户"
+
+
+def test_search_index_follows_writes(service):
+    cash = service.create_asset("活期存款", AssetType.CASH)
+    tx = service.create_cash_transaction(cash.asset_id, TransactionType.DEPOSIT, Decimal('100'), date(2024, 1, 1),
+                                         notes="房租押金退回")
+    search = SearchService(service.db_manager)
+    assert len(search.search("押金退回")["transactions"]) == 1
+
+    tx.notes = "装修尾款"
+    service.update_transaction(tx)
+    assert search.search("押金退回")["transactions"] == []
+    assert len(search.search("装修尾款")["transactions"]) == 1
+
+    service.delete_transaction(tx.transaction_id)
+    assert search.search("装修尾款")["transactions"] == []
+
+    # 重建索引后结果不变
+    service.create_cash_transaction(cash.asset_id, TransactionType.DEPOSIT, Decimal('100'), date(2024, 2, 1),
+                                    notes="利息再投资")
+    service.db_manager.rebuild_search_index()
+    assert len(search.search("再投资")["transactions"]) == 1
+
+
+def test_search_query_syntax_is_literal(service):
+    cash = service.create_asset("活期存款", AssetType.CASH)
+    service.create_cash_transaction(cash.asset_id, TransactionType.DEPOSIT, Decimal('100'), date(2024, 1, 1),
+                                    notes='say "hi" OR NOT')
+    search = SearchService(service.db_manager)
+    assert len(search.search('"hi" OR')["transactions"]) == 1
+    assert search.search("   ")["transactions"] == []
@@ -0,0 +1,63 @@
+"""
+测试API序列化：预编译编码器、快速JSON与响应压缩
+"""
+
+import gzip
+import json
+from datetime import date
+from decimal import Decimal
+
+from src.wealth_lite.models.asset import Asset
+from src.wealth_lite.models.enums import AssetType, Currency, TransactionType
+from src.wealth_lite.models.position import Position
+from src.wealth_lite.models.transaction import (
+    CashTransaction, EquityTransaction, FixedIncomeTransaction, RealEstateTransaction
+)
+from src.wealth_lite.utils.serialization import (
+    COMPRESS_MIN_BYTES, choose_encoding, compress, dumps, encode_position, encode_transactions
+)
+
+
+def test_encode_transactions_per_class():
+    cash = CashTransaction(asset_id="a", transaction_type=TransactionType.DEPOSIT, amount=Decimal('100'),
+                           transaction_date=date(2024, 1, 2), notes="工资")
+    bond = FixedIncomeTransaction(asset_id="b", transaction_type=TransactionType.DEPOSIT, amount=Decimal('500'),
+                                  transaction_date=date(2024, 1, 3), annual_rate=Decimal('2.5'))
+    stock = EquityTransaction(asset_id="c", transaction_type=TransactionType.BUY, currency=Currency.USD,
+                              exchange_rate=Decimal('7'), quantity=Decimal('10'), price_per_share=Decimal('3'),
+                              transaction_date=date(2024, 1, 4))
+    house = RealEstateTransaction(asset_id="d", transaction_type=TransactionType.BUY, amount=Decimal('1000'),
+                                  transaction_date=date(2024, 1, 5))
+
+    encoded = encode_transactions([cash, bond, stock, house])
+    assert encoded[0]['transaction_class'] == 'CashTransaction'
+    assert (encoded[0]['amount'], encoded[0]['date'], encoded[0]['notes']) == (100.0, '2024-01-02', "工资")
+    assert 'interest_rate' not in encoded[0] and encoded[0]['account_type'] == 'SAVINGS'
+    assert encoded[1]['annual_rate'] == 2.5 and encoded[1]['interest_type'] == 'SIMPLE'
+    assert encoded[1]['start_date'] == '2024-01-03' and 'maturity_date' not in encoded[1]
+    assert (encoded[2]['quantity'], encoded[2]['amount_base_currency']) == (10.0, 210.0)
+    assert 'commission' not in encoded[2] and 'annual_rate' not in encoded[2]
+    assert encoded[3]['property_type'] == 'RESIDENTIAL' and 'quantity' not in encoded[3]
+
+
+def test_dumps_handles_model_values():
+    body = dumps({"amount": Decimal('1.5'), "currency": Currency.USD, "date": date(2024, 1, 1), "name": "现金"})
+    assert json.loads(body) == {"amount": 1.5, "currency": Currency.USD.value, "date": "2024-01-01", "name": "现金"}
+
+
+def test_compression_threshold():
+    small = b'{"a":1}'
+    assert choose_encoding("gzip, deflate", len(small)) is None
+    large = dumps([{"value": i} for i in range(COMPRESS_MIN_BYTES)])
+    assert choose_encoding("identity", len(large)) is None
+    encoding = choose_encoding("gzip;q=1.0, deflate", len(large))
+    assert encoding == 'gzip'
+    assert gzip.decompress(compress(large, encoding)) == large
+
+
+def test_encode_position_matches_to_dict():
+    asset = Asset(asset_name="活期存款", asset_type=AssetType.CASH)
+    tx = CashTransaction(asset_id=asset.asset_id, transaction_type=TransactionType.DEPOSIT,
+                         amount=Decimal('1000'), transaction_date=date(2024, 1, 1))
+    position = Position(asset=asset, transactions=[tx])
+    assert encode_position(position) == position.to_dict(include_transactions=False)
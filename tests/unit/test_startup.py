@@ -0,0 +1,68 @@
+"""
+测试服务容器、启动计时与枚举文件生成
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from src.wealth_lite.data.database import DatabaseManager
+from src.wealth_lite.services.container import ServiceContainer
+from src.wealth_lite.services.enum_generator import EnumGeneratorService, hashed_file_name
+from src.wealth_lite.utils.startup_timer import StartupTimer
+
+
+def test_container_shares_database_and_defers_snapshot_services():
+    timer = StartupTimer()
+    container = ServiceContainer(DatabaseManager(":memory:"), timer)
+    try:
+        assert container.dashboard_service.wealth_service is container.wealth_service
+        assert container.search_service.repository.db is container.db_manager
+        assert "snapshot_service" not in vars(container)
+        assert container.snapshot_service.db is container.db_manager
+        assert container.snapshot_service is container.snapshot_service
+
+        container.create_startup_snapshot()
+        assert [name for name, _ in timer.phases] == ["database", "services", "startup_snapshot"]
+    finally:
+        container.close()
+
+
+def test_ai_service_imports_optional_dependencies_lazily():
+    code = ("import sys; import src.wealth_lite.services.ai_service; "
+            "assert 'openai' not in sys.modules and 'requests' not in sys.modules")
+    root = Path(__file__).resolve().parents[2]
+    assert subprocess.run([sys.executable, "-c", code], cwd=root).returncode == 0
+
+
+def test_timer_report_freezes_total():
+    timer = StartupTimer()
+    with timer.phase("step"):
+        pass
+    timer.report()
+    total = timer.to_dict()["total_ms"]
+    assert timer.to_dict()["total_ms"] == total
+    assert timer.to_dict()["phases"][0]["name"] == "step"
+
+
+def test_enum_file_skips_unchanged_content(tmp_path):
+    generator = EnumGeneratorService(str(tmp_path))
+    assert generator.generate_enums_file()
+    mtime = generator.output_file.stat().st_mtime_ns
+
+    assert generator.generate_enums_file()
+    assert generator.output_file.stat().st_mtime_ns == mtime
+
+
+def test_enum_hashed_file_tracks_content(tmp_path):
+    generator = EnumGeneratorService(str(tmp_path))
+    stale = tmp_path / hashed_file_name("000000000000")
+    stale.write_text("{}", encoding='utf-8')
+
+    assert generator.generate_enums_file(hashed=True)
+    content, content_hash = generator.render()
+    assert json.loads(content)["meta"]["content_hash"] == content_hash
+    assert (tmp_path / hashed_file_name(content_hash)).read_text(encoding='utf-8') == content
+    assert not stale.exists()
+    assert EnumGeneratorService(str(tmp_path)).content_hash == content_hash
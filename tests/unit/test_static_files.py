@@ -0,0 +1,86 @@
+"""
+测试生产构建（内容哈希、引用改写、预压缩）与预压缩静态文件服务
+"""
+
+import gzip
+import importlib.util
+import json
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.wealth_lite.utils.static_files import ASSET_MANIFEST_FILE, PrecompressedStaticFiles
+
+BUILD_SCRIPT = Path(__file__).resolve().parents[2] / "src" / "wealth_lite" / "ui" / "build.py"
+
+
+def _load_builder():
+    spec = importlib.util.spec_from_file_location("wealth_lite_ui_build", BUILD_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.WealthLiteBuilder
+
+
+def _production_build(tmp_path, monkeypatch) -> Path:
+    app_dir = tmp_path / "app"
+    (app_dir / "js" / "components").mkdir(parents=True)
+    (app_dir / "styles" / "components").mkdir(parents=True)
+    (app_dir / "index.html").write_text(
+        '<html><head><link rel="stylesheet" href="styles/main.css"></head>'
+        '<body><script src="js/utils.js"></script>'
+        '<script type="module">import Widget from \'./js/components/widget.js\';</script></body></html>',
+        encoding='utf-8')
+    (app_dir / "styles" / "main.css").write_text("@import url('components/card.css');\nbody{margin:0}",
+                                                 encoding='utf-8')
+    (app_dir / "styles" / "components" / "card.css").write_text(".card{padding:4px}", encoding='utf-8')
+    (app_dir / "js" / "utils.js").write_text("// 工具函数\n" + "export const x = 1;\n" * 200, encoding='utf-8')
+    (app_dir / "js" / "components" / "widget.js").write_text(
+        "import { x } from '../utils.js';\nfetch('/static/data/enums.json');\nexport default x;", encoding='utf-8')
+
+    monkeypatch.chdir(tmp_path)
+    _load_builder()(production=True).build()
+    return tmp_path / "dist"
+
+
+def test_production_build_fingerprints_and_rewrites(tmp_path, monkeypatch):
+    dist = _production_build(tmp_path, monkeypatch)
+    manifest = json.loads((dist / ASSET_MANIFEST_FILE).read_text(encoding='utf-8'))
+
+    html = (dist / "index.html").read_text(encoding='utf-8')
+    assert f'href="{manifest["styles/main.css"]}"' in html
+    assert f'src="{manifest["js/utils.js"]}"' in html
+    assert f"from './{manifest['js/components/widget.js']}'" in html
+
+    main_css = (dist / manifest["styles/main.css"]).read_text(encoding='utf-8')
+    assert Path(manifest["styles/components/card.css"]).name in main_css
+
+    widget = (dist / manifest["js/components/widget.js"]).read_text(encoding='utf-8')
+    assert f"from '../{Path(manifest['js/utils.js']).name}'" in widget
+    assert manifest["data/enums.json"] in widget
+
+    utils = dist / manifest["js/utils.js"]
+    assert gzip.decompress(Path(str(utils) + ".gz").read_bytes()) == utils.read_bytes()
+
+
+def test_precompressed_static_files(tmp_path, monkeypatch):
+    dist = _production_build(tmp_path, monkeypatch)
+    manifest = json.loads((dist / ASSET_MANIFEST_FILE).read_text(encoding='utf-8'))
+    app = FastAPI()
+    app.mount("/static", PrecompressedStaticFiles(directory=str(dist), html=True), name="static")
+    client = TestClient(app)
+    url = "/static/" + manifest["js/utils.js"]
+
+    response = client.get(url, headers={"accept-encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["cache-control"] == "public, max-age=31536000, immutable"
+    assert response.headers["content-type"].startswith("text/javascript")
+    assert response.content == (dist / manifest["js/utils.js"]).read_bytes()
+
+    plain = client.get(url, headers={"accept-encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["etag"] != response.headers["etag"]
+
+    assert client.get(url, headers={"accept-encoding": "gzip",
+                                    "if-none-match": response.headers["etag"]}).status_code == 304
+    assert client.get("/static/index.html").headers["cache-control"] == "no-cache"
@@ -0,0 +1,171 @@
+"""
+测试交易批量写入（Repository与WealthService）
+"""
+
+import pytest
+from datetime import date
+from decimal import Decimal
+
+from src.wealth_lite.data import repositories
+from src.wealth_lite.data.database import DatabaseManager
+from src.wealth_lite.models.asset import Asset
+from src.wealth_lite.models.enums import AssetType, TransactionType
+from src.wealth_lite.models.transaction import CashTransaction, FixedIncomeTransaction
+from src.wealth_lite.services.wealth_service import WealthService
+
+
+@pytest.fixture
+def service():
+    """创建使用内存数据库的WealthService"""
+    db_manager = DatabaseManager(":memory:")
+    yield WealthService(db_manager)
+    db_manager.close()
+
+
+@pytest.fixture
+def assets(service):
+    """创建现金与固定收益资产"""
+    cash = service.create_asset("活期存款", AssetType.CASH)
+    deposit = service.create_asset("定期存款", AssetType.FIXED_INCOME)
+    return cash, deposit
+
+
+def make_transactions(cash: Asset, deposit: Asset):
+    """构建一组混合类型的交易"""
+    return [
+        CashTransaction(asset_id=cash.asset_id, transaction_type=TransactionType.DEPOSIT,
+                        amount=Decimal('1000'), transaction_date=date(2024, 1, 1)),
+        CashTransaction(asset_id=cash.asset_id, transaction_type=TransactionType.INTEREST,
+                        amount=Decimal('2.5'), transaction_date=date(2024, 1, 31)),
+        FixedIncomeTransaction(asset_id=deposit.asset_id, transaction_type=TransactionType.DEPOSIT,
+                               amount=Decimal('5000'), transaction_date=date(2024, 2, 1),
+                               annual_rate=Decimal('2.75'), maturity_date=date(2025, 2, 1)),
+    ]
+
+
+class TestRepositoryBatch:
+    """测试TransactionRepository批量方法"""
+
+    def test_create_many(self, service, assets):
+        repo = service.repositories.transactions
+        transactions = make_transactions(*assets)
+
+        assert repo.create_many(transactions)
+
+        assert len(repo.get_all()) == 3
+        fixed = repo.get_by_id(transactions[2].transaction_id)
+        assert fixed.annual_rate == Decimal('2.75')
+
+    def test_loaded_transactions_share_values(self, service, assets):
+        repo = service.repositories.transactions
+        cash, _ = assets
+        repo.create_many([
+            CashTransaction(asset_id=cash.asset_id, transaction_type=TransactionType.DEPOSIT,
+                            amount=Decimal(amount), transaction_date=date(2024, 3, 1))
+            for amount in ('100', '200')
+        ])
+
+        first, second = repo.get_by_asset(cash.asset_id)
+        assert first.asset_id is second.asset_id
+        assert first.transaction_date is second.transaction_date
+        assert first.amount_base_currency is first.amount
+
+    def test_create_many_rolls_back_on_conflict(self, service, assets):
+        repo = service.repositories.transactions
+        transactions = make_transactions(*assets)
+        assert repo.create(transactions[1])
+
+        assert not repo.create_many(transactions)
+        assert len(repo.get_all()) == 1
+
+    def test_update_many(self, service, assets):
+        repo = service.repositories.transactions
+        transactions = make_transactions(*assets)
+        repo.create_many(transactions)
+
+        transactions[0].notes = "工资"
+        transactions[2].annual_rate = Decimal('3.1')
+        assert repo.update_many([transactions[0], transactions[2]])
+
+        assert repo.get_by_id(transactions[0].transaction_id).notes == "工资"
+        assert repo.get_by_id(transactions[2].transaction_id).annual_rate == Decimal('3.1')
+
+    def test_update_many_missing_row_rolls_back(self, service, assets):
+        repo = service.repositories.transactions
+        transactions = make_transactions(*assets)
+        repo.create_many(transactions[:2])
+
+        transactions[0].notes = "不应写入"
+        assert not repo.update_many(transactions)
+        assert repo.get_by_id(transactions[0].transaction_id).notes != "不应写入"
+
+    def test_delete_many(self, service, assets):
+        repo = service.repositories.transactions
+        transactions = make_transactions(*assets)
+        repo.create_many(transactions)
+
+        assert not repo.delete_many([transactions[0].transaction_id, "missing"])
+        assert len(repo.get_all()) == 3
+
+        assert repo.delete_many([t.transaction_id for t in transactions])
+        assert repo.get_all() == []
+
+    def test_asset_ids_in_one_query(self, service, assets, monkeypatch):
+        repo = service.repositories.transactions
+        transactions = make_transactions(*assets)
+        repo.create_many(transactions)
+        monkeypatch.setattr(repositories, '_IN_CHUNK_SIZE', 2)
+
+        statements = []
+        with service.db_manager.get_connection() as conn:
+            conn.set_trace_callback(statements.append)
+            try:
+                asset_ids = repo._asset_ids_of(conn, [t.transaction_id for t in transactions] + ["missing"])
+            finally:
+                conn.set_trace_callback(None)
+        assert asset_ids == {a.asset_id for a in assets}
+        # 4个ID按每批2个分两次查询
+        assert len([s for s in statements if s.startswith("SELECT")]) == 2
+
+    def test_details_loaded_per_table(self, service, assets):
+        repo = service.repositories.transactions
+        repo.create_many(make_transactions(*assets))
+
+        statements = []
+        with service.db_manager.get_connection() as conn:
+            conn.set_trace_callback(statements.append)
+            try:
+                loaded = repo.get_all()
+            finally:
+                conn.set_trace_callback(None)
+        assert sorted(type(t).__name__ for t in loaded) == ['CashTransaction', 'CashTransaction', 'FixedIncomeTransaction']
+        # 主表1次 + 每个详情表1次，与交易笔数无关
+        assert len([s for s in statements if s.startswith("SELECT")]) == 4
+
+
+class TestServiceBatch:
+    """测试WealthService批量方法"""
+
+    def test_create_transactions(self, service, assets):
+        created = service.create_transactions(make_transactions(*assets))
+        assert len(created) == 3
+        assert len(service.get_all_transactions()) == 3
+
+    def test_create_transactions_validates_asset_type(self, service, assets):
+        cash, deposit = assets
+        transactions = make_transactions(cash, deposit)
+        transactions.append(CashTransaction(asset_id=deposit.asset_id, amount=Decimal('1')))
+
+        with pytest.raises(ValueError):
+            service.create_transactions(transactions)
+        assert service.get_all_transactions() == []
+
+    def test_update_and_delete_transactions(self, service, assets):
+        transactions = service.create_transactions(make_transactions(*assets))
+        for tx in transactions:
+            tx.notes = "批量更新"
+        assert service.update_transactions(transactions)
+        assert all(tx.notes == "批量更新" for tx in service.get_all_transactions())
+
+        assert service.delete_transactions([tx.transaction_id for tx in transactions])
+        assert service.get_all_transactions() == []
@@ -0,0 +1,72 @@
+"""
+测试交易列表的条件过滤与键集分页
+"""
+
+import pytest
+from datetime import date, timedelta
+from decimal import Decimal
+
+from src.wealth_lite.data.database import DatabaseManager
+from src.wealth_lite.models.enums import AssetType, TransactionType
+from src.wealth_lite.services.wealth_service import WealthService
+
+
+@pytest.fixture
+def service():
+    """创建包含两个资产、共25笔交易的WealthService"""
+    db_manager = DatabaseManager(":memory:")
+    service = WealthService(db_manager)
+    first = service.create_asset("活期存款", AssetType.CASH)
+    second = service.create_asset("货币基金", AssetType.CASH)
+    for i in range(25):
+        asset = first if i % 2 == 0 else second
+        # 每两笔交易同一天，分页需要靠创建时间和交易ID区分先后
+        service.create_cash_transaction(
+            asset.asset_id, TransactionType.DEPOSIT if i % 5 else TransactionType.INTEREST,
+            Decimal(100 + i), date(2024, 1, 1) + timedelta(days=i // 2),
+            notes="100%利息" if i == 7 else f"第{i}笔"
+        )
+    service.assets = (first, second)
+    yield service
+    db_manager.close()
+
+
+def collect_pages(service, limit, **filters):
+    """逐页读取全部结果"""
+    pages, cursor = [], None
+    while True:
+        transactions, cursor = service.find_transactions(limit, cursor, **filters)
+        pages.append(transactions)
+        if cursor is None:
+            return pages
+
+
+def test_pages_cover_all_transactions_in_order(service):
+    pages = collect_pages(service, 10)
+    assert [len(page) for page in pages] == [10, 10, 5]
+    ids = [tx.transaction_id for page in pages for tx in page]
+    assert ids == [tx.transaction_id for tx in service.repositories.transactions.get_all()]
+    assert len(set(ids)) == 25
+
+
+def test_filters(service):
+    first, second = service.assets
+    pages = collect_pages(service, 4, asset_id=second.asset_id)
+    assert sum(len(page) for page in pages) == 12
+    assert all(tx.asset_id == second.asset_id for page in pages for tx in page)
+
+    interest, _ = service.find_transactions(50, transaction_type=TransactionType.INTEREST)
+    assert len(interest) == 5
+
+    ranged, _ = service.find_transactions(50, min_amount=Decimal('110'), max_amount=Decimal('112'),
+                                          start_date=date(2024, 1, 6), end_date=date(2024, 1, 7))
+    assert sorted(tx.amount for tx in ranged) == [Decimal('110'), Decimal('111'), Decimal('112')]
+
+    # %按字面匹配
+    matched, _ = service.find_transactions(50, notes="0%")
+    assert [tx.notes for tx in matched] == ["100%利息"]
+
+
+def test_invalid_cursor(service):
+    with pytest.raises(ValueError):
+        service.find_transactions(10, "not-a-cursor")